@@ -0,0 +1,406 @@
+#Projet : Mayro Party
+#Auteurs : Hinata Bouaziz, Antoine Desrues, Alexandre Guillaume, Matisse Moreau
+
+# Suite de benchmarks du jeu (serveurs des mini-jeux, collisions, sérialisation, rendu des clients et démarrage).
+#
+# Utilisation (depuis la racine du projet):
+#     python benchmarks/bench.py                   -> lance les benchmarks et compare avec benchmarks/baseline.json
+#     python benchmarks/bench.py --save-baseline   -> lance les benchmarks et remplace la référence
+#     python benchmarks/bench.py --rapide          -> version plus courte (moins précise)
+#
+# Les résultats sont écrits dans benchmarks/results.json.
+
+# ------/ Importations des bibliothèques \------
+
+import os
+import sys
+import json
+import time
+import platform
+import subprocess
+import statistics
+from os import sep
+
+# Les scripts du jeu utilisent des chemins relatifs au dossier sources
+DOSSIER_BENCHMARKS = os.path.dirname(os.path.abspath(__file__))
+DOSSIER_SOURCES = os.path.join(os.path.dirname(DOSSIER_BENCHMARKS), "sources")
+os.chdir(DOSSIER_SOURCES)
+sys.path.insert(0, DOSSIER_SOURCES)
+
+# Pilotes SDL sans fenêtre ni son (les benchmarks doivent tourner sur une machine sans écran)
+os.environ["SDL_VIDEODRIVER"] = "dummy"
+os.environ["SDL_AUDIODRIVER"] = "dummy"
+os.environ["PYGAME_HIDE_SUPPORT_PROMPT"] = "1"
+
+import pygame
+import pygame.freetype
+
+import simulation
+from protocole import requete, opcode_requete, INPUTS
+
+# ------/ Constantes \------
+
+FICHIER_RESULTATS = os.path.join(DOSSIER_BENCHMARKS, "results.json")
+FICHIER_REFERENCE = os.path.join(DOSSIER_BENCHMARKS, "baseline.json")
+
+# Écart (en proportion) au-delà duquel un résultat est considéré comme une régression
+SEUIL_REGRESSION = 0.15
+
+# Graine utilisée pour toutes les simulations (les résultats sont donc comparables d'une exécution à l'autre)
+GRAINE = 1
+
+# Module client de chaque mini-jeu
+CLIENTS = {"archer_ival": "archer_ival_client",
+           "hexagon_heat": "hexagon_heat_client",
+           "pushy_penguins": "pushy_penguins_client",
+           "speed_hockey": "speed_hockey_client",
+           "trace_race": "trace_race_client"}
+
+
+# ------/ Fonctions utiliatires \------
+
+def resultat(valeur: float, unite: str, sens: str, seuil: float = SEUIL_REGRESSION) -> dict:
+    """
+    Cette fonction permet de créer l'entrée d'un résultat de benchmark.
+
+    Paramètres:
+        - valeur (float): Valeur mesurée.
+        - unite (str): Unité de la valeur.
+        - sens (str): "haut" si une valeur plus grande est meilleure, "bas" sinon.
+        - seuil (float): Écart toléré avant de signaler une régression (plus grand pour les mesures bruitées).
+    Renvois:
+        - dict: L'entrée du résultat.
+    """
+
+    assert sens in ("haut", "bas"), "Erreur: Le 3ème paramètre (sens) doit valoir haut ou bas."
+
+    return {"valeur": round(valeur, 4), "unite": unite, "sens": sens, "seuil": seuil}
+
+
+def meilleur_temps(fonction: "function", nb_appels: int, nb_series: int = 5) -> float:
+    """
+    Cette fonction permet de mesurer le temps moyen d'un appel, en gardant la meilleure de plusieurs séries
+    (le minimum est beaucoup moins sensible aux autres programmes de la machine que la moyenne).
+
+    Paramètres:
+        - fonction (function): Fonction à mesurer (sans paramètres).
+        - nb_appels (int): Nombre d'appels par série.
+        - nb_series (int): Nombre de séries.
+    Renvois:
+        - float: Meilleur temps moyen d'un appel en secondes.
+    """
+
+    meilleur = None
+    for serie in range(nb_series):
+        debut = time.perf_counter()
+        for i in range(nb_appels):
+            fonction()
+        duree = (time.perf_counter() - debut) / nb_appels
+
+        if meilleur is None or duree < meilleur:
+            meilleur = duree
+
+    return meilleur
+
+
+def avancer_jusqua(sim: simulation.Simulation, etat: str, max_ticks: int = 20000) -> None:
+    """
+    Cette fonction permet d'avancer une simulation jusqu'à un état donné du mini-jeu.
+
+    Paramètres:
+        - sim (Simulation): Simulation à avancer.
+        - etat (str): État à atteindre.
+        - max_ticks (int): Nombre de ticks maximum avant d'abandonner.
+    """
+
+    while sim.get_serveur().get_etat() != etat and sim.get_nb_ticks() < max_ticks and not sim.get_termine():
+        sim.executer(1, empreinte=False)
+
+
+def inputs_neutres(minijeu: str) -> str:
+    """
+    Cette fonction renvoie la requête d'inputs d'un joueur immobile pour un mini-jeu.
+    """
+
+    return requete(INPUTS, "|".join(["0"] * simulation.NB_INPUTS[minijeu]))
+
+
+# ------/ Classes \------
+
+# Classe d'un faux réseau: les requêtes du client sont données directement au serveur simulé
+class ReseauSimule:
+    def __init__(self, sim: simulation.Simulation, adresse: str = "1") -> None:
+        self.sim = sim
+        self.adresse_client = adresse
+
+    def send(self, data: str) -> str:
+        # Chaque envoi d'inputs correspond à un tick du serveur (comme un client à la même fréquence que le serveur)
+        if opcode_requete(data) == INPUTS:
+            self.sim.executer(1, empreinte=False)
+
+        return self.sim.get_serveur().client_thread(self.adresse_client, data)
+
+    def etat_minijeu(self, inputs: str) -> dict:
+        return json.loads(self.send(requete(INPUTS, inputs)))
+
+
+# ------/ Benchmarks \------
+
+def bench_ticks_serveurs(nb_parties: int) -> dict:
+    """
+    Mesure le nombre de ticks par seconde de chaque serveur de mini-jeu (parties complètes avec des graines fixes).
+    """
+
+    resultats = {}
+
+    for minijeu in simulation.MINIJEUX:
+        meilleur = 0
+
+        # Les mêmes parties sont rejouées plusieurs fois, on garde la plus rapide
+        for serie in range(3):
+            total = 0
+            debut = time.perf_counter()
+
+            for partie in range(nb_parties):
+                sim = simulation.Simulation(minijeu, GRAINE + partie)
+                total += len(sim.executer(100000, empreinte=False))
+
+            meilleur = max(meilleur, total / (time.perf_counter() - debut))
+
+        resultats["serveur." + minijeu + ".ticks_par_s"] = resultat(meilleur, "ticks/s", "haut")
+
+    return resultats
+
+
+def bench_collisions(nb_appels: int) -> dict:
+    """
+    Mesure le coût des collisions de la carapace de Speed Hockey pendant une partie (l'absence de traversée à 20,
+    30 et 60 ticks par seconde est vérifiée par tests/test_collisions.py).
+    """
+
+    resultats = {}
+
+    # Coût des collisions de la carapace avec tous les objets du terrain
+    sim = simulation.Simulation("speed_hockey", GRAINE)
+    avancer_jusqua(sim, "minigame_during")
+    serveur = sim.get_serveur()
+
+    def collisions_carapace() -> None:
+        serveur.carapace.calculer_velocite()
+        serveur.carapace.calculer_collisions(serveur.objets)
+
+    resultats["collisions.carapace_us"] = resultat(meilleur_temps(collisions_carapace, nb_appels) * 1e6, "us", "bas")
+
+    return resultats
+
+
+def bench_serialisation(nb_repetitions: int) -> dict:
+    """
+    Mesure le coût de la réponse à une requête d'inputs (client_thread) pendant la partie, ainsi que sa taille
+    et le coût de l'encodage de l'état fait une fois par tick (publier_snapshot).
+    """
+
+    resultats = {}
+
+    for minijeu in simulation.MINIJEUX:
+        sim = simulation.Simulation(minijeu, GRAINE)
+        avancer_jusqua(sim, "minigame_during")
+
+        # On laisse un peu la partie avancer pour avoir un état représentatif (pingouins, flèches...)
+        sim.executer(120, empreinte=False)
+
+        serveur = sim.get_serveur()
+        requete = inputs_neutres(minijeu)
+        reponse = serveur.client_thread("1", requete)
+
+        duree = meilleur_temps(lambda: serveur.client_thread("1", requete), nb_repetitions)
+        duree_publication = meilleur_temps(serveur.publier_snapshot, nb_repetitions)
+
+        resultats["serialisation." + minijeu + ".reponse_us"] = resultat(duree * 1e6, "us", "bas")
+        resultats["serialisation." + minijeu + ".publication_us"] = resultat(duree_publication * 1e6, "us", "bas")
+        resultats["serialisation." + minijeu + ".taille_octets"] = resultat(len(reponse.encode("utf-8")), "octets", "bas")
+
+    return resultats
+
+
+def bench_rendu_clients(nb_frames: int) -> dict:
+    """
+    Mesure le temps d'une frame (game_engine) de chaque client de mini-jeu avec le pilote vidéo dummy.
+    """
+
+    resultats = {}
+
+    pygame.mixer.pre_init(44100, -16, 2, 512)
+    pygame.mixer.init()
+    pygame.init()
+    screen = pygame.display.set_mode((1280, 720))
+    clock = pygame.time.Clock()
+
+    for minijeu, nom_module in CLIENTS.items():
+        module = __import__(nom_module)
+
+        sim = simulation.Simulation(minijeu, GRAINE)
+        avancer_jusqua(sim, "minigame_start")
+
+        # Création du client comme pendant le lancement du mini-jeu
+        client = module.MiniGame(screen, clock, 120)
+        client.set_net(ReseauSimule(sim))
+        client.screen_factor = ((screen.get_rect().size[0] / 1280), (screen.get_rect().size[1] / 720))
+        client.init_partie()
+
+        avancer_jusqua(sim, "minigame_during")
+
+        requete = [0] * simulation.NB_INPUTS[minijeu]
+        durees = []
+
+        for i in range(nb_frames):
+            debut = time.perf_counter()
+            client.game_engine(requete)
+            durees.append(time.perf_counter() - debut)
+
+        durees.sort()
+        resultats["client." + minijeu + ".frame_ms"] = resultat(statistics.median(durees) * 1000, "ms", "bas")
+        resultats["client." + minijeu + ".frame_p99_ms"] = resultat(durees[min(len(durees) - 1, int(len(durees) * 0.99))] * 1000, "ms", "bas", 0.5)
+
+    return resultats
+
+
+def bench_score_trace_race(nb_repetitions: int) -> dict:
+    """
+    Mesure le temps de calcul des pourcentages de fin de partie de Trace Race.
+    """
+
+    import trace_race_client
+
+    bg_traces = pygame.image.load(sep.join(["..", "data", "sprites", "minigames", "trace_race", "traces.png"]))
+    point = pygame.image.load(sep.join(["..", "data", "sprites", "minigames", "trace_race", "blue_pen.png"]))
+
+    # Création de tracés artificiels (une ligne de points pour chaque joueur)
+    traces = {}
+    for j in range(4):
+        traces[str(j + 1)] = pygame.sprite.Group()
+        for x in range(0, bg_traces.get_rect().w, 4):
+            sprite = pygame.sprite.Sprite()
+            sprite.image = point
+            sprite.rect = pygame.Rect(x, 40 + j * 150, point.get_rect().w, point.get_rect().h)
+            traces[str(j + 1)].add(sprite)
+
+    durees = []
+    for i in range(nb_repetitions):
+        debut = time.perf_counter()
+        trace_race_client.calculer_pourcentages(traces, bg_traces)
+        durees.append(time.perf_counter() - debut)
+
+    return {"trace_race.score_ms": resultat(statistics.median(durees) * 1000, "ms", "bas")}
+
+
+def bench_demarrage(nb_repetitions: int) -> dict:
+    """
+    Mesure le temps de démarrage du client (import de main, construction de main.Game puis première image de
+    l'écran titre) dans un processus neuf.
+    """
+
+    code = ("import time; debut = time.perf_counter(); import main; import_fini = time.perf_counter(); "
+            "jeu = main.Game(); fin = time.perf_counter(); "
+            "jeu.title_screen.title_screen_affichage(jeu.screen); main.pygame.display.flip(); titre = time.perf_counter(); "
+            "print(import_fini - debut, fin - import_fini, titre - debut)")
+
+    imports, constructions, titres = [], [], []
+    for i in range(nb_repetitions):
+        sortie = subprocess.run([sys.executable, "-c", code], cwd=DOSSIER_SOURCES, env=os.environ, capture_output=True, text=True, check=True)
+        duree_import, duree_game, duree_titre = [float(valeur) for valeur in sortie.stdout.strip().split("\n")[-1].split()]
+        imports.append(duree_import)
+        constructions.append(duree_game)
+        titres.append(duree_titre)
+
+    return {"demarrage.import_main_ms": resultat(min(imports) * 1000, "ms", "bas"),
+            "demarrage.game_init_ms": resultat(min(constructions) * 1000, "ms", "bas"),
+            "demarrage.total_ms": resultat(min(i + c for i, c in zip(imports, constructions)) * 1000, "ms", "bas"),
+            "demarrage.ecran_titre_ms": resultat(min(titres) * 1000, "ms", "bas")}
+
+
+# ------/ Comparaison \------
+
+def comparer(resultats: dict, reference: dict) -> list:
+    """
+    Cette fonction compare les résultats avec la référence et affiche un tableau.
+
+    Renvois:
+        - list: Noms des résultats en régression.
+    """
+
+    regressions = []
+
+    print()
+    print(f"{'benchmark':45} {'référence':>12} {'actuel':>12} {'écart':>9}")
+    for nom, mesure in resultats.items():
+        if not nom in reference:
+            print(f"{nom:45} {'-':>12} {mesure['valeur']:>12} {'nouveau':>9}  {mesure['unite']}")
+            continue
+
+        ancien = reference[nom]["valeur"]
+        ecart = (mesure["valeur"] - ancien) / ancien if ancien != 0 else 0.0
+
+        # Un écart positif est une amélioration quand une valeur plus grande est meilleure (et inversement)
+        pire = ecart < -mesure["seuil"] if mesure["sens"] == "haut" else ecart > mesure["seuil"]
+        if pire:
+            regressions.append(nom)
+
+        print(f"{nom:45} {ancien:>12} {mesure['valeur']:>12} {ecart * 100:>+8.1f}%  {mesure['unite']}" + ("  <-- RÉGRESSION" if pire else ""))
+
+    return regressions
+
+
+if '__main__' == __name__:
+    rapide = "--rapide" in sys.argv
+    facteur = 0.2 if rapide else 1
+
+    resultats = {}
+    etapes = [("ticks des serveurs", bench_ticks_serveurs, 5),
+              ("collisions", bench_collisions, 2000),
+              ("sérialisation", bench_serialisation, 500),
+              ("rendu des clients", bench_rendu_clients, 300),
+              ("score de Trace Race", bench_score_trace_race, 5),
+              ("démarrage du client", bench_demarrage, 3)]
+
+    for nom, bench, quantite in etapes:
+        print("Benchmark:", nom, "...")
+        resultats.update(bench(max(1, round(quantite * facteur))))
+
+    sortie = {
+        "meta": {
+            "date": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "python": platform.python_version(),
+            "pygame": pygame.version.ver,
+            "plateforme": platform.platform(),
+            "rapide": rapide
+        },
+        "resultats": resultats
+    }
+
+    with open(FICHIER_RESULTATS, "w", encoding="utf-8") as fichier:
+        json.dump(sortie, fichier, indent=4, ensure_ascii=False)
+    print("Résultats écrits dans", FICHIER_RESULTATS)
+
+    if "--save-baseline" in sys.argv:
+        with open(FICHIER_REFERENCE, "w", encoding="utf-8") as fichier:
+            json.dump(sortie, fichier, indent=4, ensure_ascii=False)
+        print("Référence mise à jour:", FICHIER_REFERENCE)
+
+    elif os.path.exists(FICHIER_REFERENCE):
+        with open(FICHIER_REFERENCE, encoding="utf-8") as fichier:
+            reference = json.load(fichier)
+
+        # La version rapide ne rejoue pas les mêmes parties, la comparaison est donc moins fiable
+        if reference["meta"]["rapide"] != rapide:
+            print("Attention: la référence n'a pas été mesurée avec le même mode (--rapide), la comparaison est indicative.")
+        reference = reference["resultats"]
+
+        regressions = comparer(resultats, reference)
+        if len(regressions) > 0:
+            print()
+            print(len(regressions), "régression(s) au-delà de", str(round(SEUIL_REGRESSION * 100)) + "%:", ", ".join(regressions))
+            sys.exit(1)
+
+    else:
+        print("Aucune référence trouvée (utilisez --save-baseline pour en créer une)")
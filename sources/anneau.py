@@ -0,0 +1,177 @@
+#Projet : Mayro Party
+#Auteurs : Hinata Bouaziz, Antoine Desrues, Alexandre Guillaume, Matisse Moreau
+
+# ------/ Importations des bibliothèques \------
+
+import struct
+from multiprocessing.shared_memory import SharedMemory
+
+# ------/ Constantes \------
+
+# En-tête du tampon: nombre d'enregistrements écrits depuis le début
+ENTETE = struct.Struct("<Q")
+
+# En-tête de chaque emplacement: numéro de l'enregistrement (0 pendant l'écriture) et taille des données
+ENTETE_EMPLACEMENT = struct.Struct("<QI")
+
+# ------/ Classes \------
+
+# Classe d'un tampon circulaire en mémoire partagée (un processus écrit, un autre lit)
+class AnneauPartage:
+
+    # ------/ Constructeur \------
+
+    def __init__(self, taille_enregistrement: int, nb_emplacements: int, nom: str = None) -> None:
+        """
+        Constructeur de la classe AnneauPartage.
+
+        Attributs à définir:
+            - taille_enregistrement (int): Taille maximale (en octets) d'un enregistrement.
+            - nb_emplacements (int): Nombre d'enregistrements gardés avant d'écraser les plus anciens.
+            - nom (str): Nom d'un tampon déjà créé par un autre processus, un nouveau tampon est créé à défaut.
+
+        Attributs internes:
+            - memoire (SharedMemory): Mémoire partagée entre les deux processus.
+            - taille_emplacement (int): Taille d'un emplacement (en-tête compris).
+            - nb_ecrits (int): Nombre d'enregistrements écrits par ce processus (uniquement pour celui qui écrit).
+            - createur (bool): Indique si ce processus a créé le tampon (c'est lui qui le détruit).
+        """
+
+        # Tests du type des paramètres donnés
+        assert type(taille_enregistrement) == int and taille_enregistrement > 0, "Erreur: Le 1er paramètre (taille_enregistrement) est censé être un entier positif."
+        assert type(nb_emplacements) == int and nb_emplacements > 0, "Erreur: Le 2ème paramètre (nb_emplacements) est censé être un entier positif."
+
+        self.taille_enregistrement = taille_enregistrement
+        self.nb_emplacements = nb_emplacements
+        self.taille_emplacement = ENTETE_EMPLACEMENT.size + taille_enregistrement
+
+        self.createur = nom is None
+
+        if self.createur:
+            self.memoire = SharedMemory(create=True, size=ENTETE.size + self.taille_emplacement * nb_emplacements)
+            ENTETE.pack_into(self.memoire.buf, 0, 0)
+        else:
+            self.memoire = SharedMemory(nom)
+
+        self.nb_ecrits = ENTETE.unpack_from(self.memoire.buf, 0)[0]
+
+
+    # ------/ Getters \------
+
+    def get_nom(self) -> str:
+        return self.memoire.name
+
+    def get_nb_ecrits(self) -> int:
+        return ENTETE.unpack_from(self.memoire.buf, 0)[0]
+
+
+    # ------/ Méthodes \------
+
+    def ecrire(self, donnees: bytes) -> int:
+        """
+        Cette méthode ajoute un enregistrement dans le tampon (sans jamais attendre le lecteur, les plus anciens
+        enregistrements sont écrasés). Un seul thread doit écrire à la fois.
+
+        Paramètres:
+            - donnees (bytes): Enregistrement à écrire.
+
+        Renvois:
+            - int: Numéro de l'enregistrement (le premier est 1), ou 0 s'il dépasse la taille d'un emplacement (rien
+              n'est alors écrit, à l'appelant de le transmettre autrement).
+        """
+
+        # Vérifié même avec python -O: un enregistrement trop grand déborderait sur l'emplacement suivant
+        if len(donnees) > self.taille_enregistrement:
+            return 0
+
+        numero = self.nb_ecrits + 1
+        debut = ENTETE.size + (numero - 1) % self.nb_emplacements * self.taille_emplacement
+
+        # L'emplacement est marqué en cours d'écriture (0) tant que les données ne sont pas complètes
+        ENTETE_EMPLACEMENT.pack_into(self.memoire.buf, debut, 0, len(donnees))
+        self.memoire.buf[debut + ENTETE_EMPLACEMENT.size:debut + ENTETE_EMPLACEMENT.size + len(donnees)] = donnees
+        ENTETE_EMPLACEMENT.pack_into(self.memoire.buf, debut, numero, len(donnees))
+
+        # Le compteur n'avance qu'une fois l'enregistrement lisible
+        ENTETE.pack_into(self.memoire.buf, 0, numero)
+        self.nb_ecrits = numero
+
+        return numero
+
+
+    def lire(self, numero: int) -> "bytes | None":
+        """
+        Cette méthode lit un enregistrement précis.
+
+        Paramètres:
+            - numero (int): Numéro de l'enregistrement.
+
+        Renvois:
+            - bytes ou None: Données de l'enregistrement, ou None s'il a été écrasé (ou est en train de l'être).
+        """
+
+        debut = ENTETE.size + (numero - 1) % self.nb_emplacements * self.taille_emplacement
+
+        numero_emplacement, taille = ENTETE_EMPLACEMENT.unpack_from(self.memoire.buf, debut)
+        if numero_emplacement != numero:
+            return None
+
+        donnees = bytes(self.memoire.buf[debut + ENTETE_EMPLACEMENT.size:debut + ENTETE_EMPLACEMENT.size + taille])
+
+        # Si l'écrivain est repassé sur l'emplacement pendant la copie, les données sont incohérentes
+        if ENTETE_EMPLACEMENT.unpack_from(self.memoire.buf, debut)[0] != numero:
+            return None
+
+        return donnees
+
+
+    def lire_dernier(self) -> tuple:
+        """
+        Cette méthode lit l'enregistrement le plus récent.
+
+        Renvois:
+            - tuple: Numéro et données de l'enregistrement (0 et None si rien n'a encore été écrit).
+        """
+
+        numero = self.get_nb_ecrits()
+
+        while numero > 0:
+            donnees = self.lire(numero)
+            if donnees is not None:
+                return numero, donnees
+
+            # L'écrivain a fait un tour complet pendant la lecture, on reprend au nouveau dernier
+            numero = self.get_nb_ecrits()
+
+        return 0, None
+
+
+    def lire_recents(self, dernier_lu: int, numero: int) -> "generator":
+        """
+        Cette méthode lit les enregistrements écrits après un numéro donné, du plus récent au plus ancien
+        (le lecteur peut donc s'arrêter dès qu'il a ce qu'il cherche).
+
+        Paramètres:
+            - dernier_lu (int): Numéro du dernier enregistrement déjà lu.
+            - numero (int): Numéro du dernier enregistrement à lire (get_nb_ecrits() au moment de la lecture).
+
+        Renvois:
+            - generator: Données de chaque enregistrement encore lisible (ceux déjà écrasés sont sautés).
+        """
+
+        # Seuls les nb_emplacements derniers enregistrements sont encore dans le tampon
+        for i in range(numero, max(dernier_lu, numero - self.nb_emplacements), -1):
+            donnees = self.lire(i)
+            if donnees is not None:
+                yield donnees
+
+
+    def fermer(self) -> None:
+        """
+        Cette méthode libère le tampon pour ce processus (et le détruit si ce processus l'a créé).
+        """
+
+        self.memoire.close()
+
+        if self.createur:
+            self.memoire.unlink()
@@ -9,7 +9,10 @@ from math import floor
 import time
 from os import sep
 
-from utils import Network, scale_image_by
+from utils import Network, scale_image_by, presenter
+from hud import HUD
+from protocole import requete, GET_ETAT, PRET, TAILLE_JOUEURS, DESACTIVE_SON
+from cache_ressources import charger_image, charger_son
 import json
 
 # ------/ Classes \------
@@ -61,11 +64,11 @@ class Joueur:
         self.dead = False
 
         # Sprite du panneau
-        self.panneau = scale_image_by(pygame.image.load(sep.join(["..", "data", "sprites", "minigames", "archer_ival", "panneau_joueur.png"])), 2)
+        self.panneau = charger_image(sep.join(["..", "data", "sprites", "minigames", "archer_ival", "panneau_joueur.png"]), 2)
 
         # Sprites pour le fusil
-        self.guns = [pygame.image.load(sep.join(["..", "data", "sprites", "minigames", "archer_ival", "gun.png"])),
-                     pygame.image.load(sep.join(["..", "data", "sprites", "minigames", "archer_ival", "gun_shot.png"]))]
+        self.guns = [charger_image(sep.join(["..", "data", "sprites", "minigames", "archer_ival", "gun.png"])),
+                     charger_image(sep.join(["..", "data", "sprites", "minigames", "archer_ival", "gun_shot.png"]))]
         self.gun = self.guns[0]
 
         # Emplacement des sprites du joueur
@@ -74,10 +77,10 @@ class Joueur:
         # Définition des sprites automatiquement (pour les joueurs / ia)
         self.sprites = {
             "panneau": {
-                "left": scale_image_by(pygame.image.load(sep.join([self.sprites_directory, "walk_left2.png"])), 2),
-                "right": scale_image_by(pygame.image.load(sep.join([self.sprites_directory, "walk_right2.png"])), 2)
+                "left": charger_image(sep.join([self.sprites_directory, "walk_left2.png"]), 2),
+                "right": charger_image(sep.join([self.sprites_directory, "walk_right2.png"]), 2)
             },
-            "solo": [scale_image_by(pygame.image.load(sep.join([self.sprites_directory, "archer" + str(i) + ".png"])), 8) for i in range(8)]}
+            "solo": [charger_image(sep.join([self.sprites_directory, "archer" + str(i) + ".png"]), 8) for i in range(8)]}
 
         # Changement du sprite actuel en fonction du type du joueur
         if self.type_joueur == "panneau":
@@ -90,7 +93,7 @@ class Joueur:
 
         # Paramètres de l'ombre pour le joueur solo uniquement
         if self.type_joueur == "solo":
-            self.shadow = scale_image_by(pygame.image.load(sep.join([self.sprites_directory, "shadow.png"])), 8)
+            self.shadow = charger_image(sep.join([self.sprites_directory, "shadow.png"]), 8)
         else:
             self.shadow = None
         self.shadow_pos = list(self.pos)
@@ -99,7 +102,7 @@ class Joueur:
         self.frame = 0.0
 
         # Initialisation des sons
-        self.son_mort = pygame.mixer.Sound(sep.join(["..", "data", "sounds", self.perso, "death.ogg"]))
+        self.son_mort = charger_son(sep.join(["..", "data", "sounds", self.perso, "death.ogg"]))
 
         # Initialisation de la taille du joueur (uniquement fournie au serveur)
         self.taille = [self.sprite.get_rect().w, self.sprite.get_rect().h]
@@ -233,21 +236,18 @@ class Joueur:
         # Tests des types de variables
         assert type(screen) == pygame.Surface, "Erreur: Le paramètre donné (screen) n'est pas une surface pygame."
 
-        # Initialisation des facteurs pour la taille de l'écran
-        screen_factor = ((screen.get_rect().size[0] / 1280), (screen.get_rect().size[1] / 720))
-
         # Affiche le joueur uniquement s'il est vivant
         if not self.dead:
             # L'affichage change en fonction du type du joueur
             if self.type_joueur == "solo":
                 # Affichage des sprites à leur positions respectives
-                screen.blit(scale_image_by(self.shadow, screen_factor), (round(self.shadow_pos[0] * screen_factor[0]), round(self.shadow_pos[1] * screen_factor[1])))
-                screen.blit(scale_image_by(self.gun, screen_factor), (round(self.sprite_pos[0] * screen_factor[0]), round(self.sprite_pos[1] * screen_factor[1])))
-                screen.blit(scale_image_by(self.sprite, screen_factor), (round(self.pos[0] * screen_factor[0]), round(self.pos[1] * screen_factor[1])))
+                screen.blit(self.shadow, (round(self.shadow_pos[0]), round(self.shadow_pos[1])))
+                screen.blit(self.gun, (round(self.sprite_pos[0]), round(self.sprite_pos[1])))
+                screen.blit(self.sprite, (round(self.pos[0]), round(self.pos[1])))
             else:
                 # Affichage des sprites à leur positions respectives
-                screen.blit(scale_image_by(self.panneau, screen_factor), (round(self.pos[0] * screen_factor[0]), round(self.pos[1] * screen_factor[1])))
-                screen.blit(scale_image_by(self.sprite, screen_factor), (round(self.sprite_pos[0] * screen_factor[0]), round(self.sprite_pos[1] * screen_factor[1])))
+                screen.blit(self.panneau, (round(self.pos[0]), round(self.pos[1])))
+                screen.blit(self.sprite, (round(self.sprite_pos[0]), round(self.sprite_pos[1])))
 
 
 
@@ -290,15 +290,15 @@ class Ennemi:
 
         # Définition des sprites de l'ennemi
         self.sprites = {
-            "left": scale_image_by(pygame.image.load(sep.join([self.sprites_directory, "panneau_" + self.perso + "_left.png"])), 2),
-            "right": scale_image_by(pygame.image.load(sep.join([self.sprites_directory, "panneau_" + self.perso + "_right.png"])), 2)
+            "left": charger_image(sep.join([self.sprites_directory, "panneau_" + self.perso + "_left.png"]), 2),
+            "right": charger_image(sep.join([self.sprites_directory, "panneau_" + self.perso + "_right.png"]), 2)
         }
 
         # Initialisation du sprite actuel
         self.sprite = self.sprites["left"]
 
         # Initialisation du son de mort
-        self.son_mort = pygame.mixer.Sound(sep.join(["..", "data", "sounds", "minigames", "archer_ival", self.perso + "_death.ogg"]))
+        self.son_mort = charger_son(sep.join(["..", "data", "sounds", "minigames", "archer_ival", self.perso + "_death.ogg"]))
 
 
     # ------/ Getters \------
@@ -367,12 +367,9 @@ class Ennemi:
         # Tests des types de variables
         assert type(screen) == pygame.Surface, "Erreur: Le paramètre donné (screen) n'est pas une surface pygame."
 
-        # Initialisation des facteurs pour la taille de l'écran
-        screen_factor = ((screen.get_rect().size[0] / 1280), (screen.get_rect().size[1] / 720))
-
         # Affiche l'ennemi uniquement s'il est vivant
         if not self.dead:
-            screen.blit(scale_image_by(self.sprite, screen_factor), (round(self.pos[0] * screen_factor[0]), round(self.pos[1] * screen_factor[1])))
+            screen.blit(self.sprite, (round(self.pos[0]), round(self.pos[1])))
 
 
 
@@ -409,7 +406,7 @@ class Fleche:
         self.id_fleche = id_fleche
 
         # Initialisation du sprite de la flèche
-        self.sprite = scale_image_by(pygame.image.load(sep.join(["..", "data", "sprites", "minigames", "archer_ival", "fleche.png"])), 2)
+        self.sprite = charger_image(sep.join(["..", "data", "sprites", "minigames", "archer_ival", "fleche.png"]), 2)
 
 
     # ------/ Getters \------
@@ -456,11 +453,8 @@ class Fleche:
         # Tests des types de variables
         assert type(screen) == pygame.Surface, "Erreur: Le paramètre donné (screen) n'est pas une surface pygame."
 
-        # Initialisation des facteurs pour la taille de l'écran
-        screen_factor = ((screen.get_rect().size[0] / 1280), (screen.get_rect().size[1] / 720))
-
         # Affichage de la flèche
-        screen.blit(scale_image_by(self.sprite, screen_factor), (round(self.pos[0] * screen_factor[0]), round(self.pos[1] * screen_factor[1])))
+        screen.blit(self.sprite, (round(self.pos[0]), round(self.pos[1])))
 
 
 
@@ -480,10 +474,10 @@ class MiniGame:
 
         Attributs internes:
             - quit (bool): Variable qui permet de détecter si le joueur a manuellement fermé le jeu.
-            - screen_factor: Les multiplicateurs pour la taille de l'écran.
 
             - show_fps (bool): Paramètre de débug permettant d'afficher les fps.
             - show_server_fps (bool): Paramètre de débug permettant d'afficher les fps du serveur.
+            - memoire (GestionnaireMemoire): Suivi de la mémoire du client (usage affiché avec les fps).
 
             - fps_font (pygame.freetype.Font): Police d'écriture pour les fps.
             - game_font (pygame.freetype.Font): Police d'écriture principale du mini-jeu.
@@ -523,7 +517,6 @@ class MiniGame:
         self.fps = fps
 
         self.quit = False
-        self.screen_factor = (0, 0)
 
         # Paramètres de débug
         self.show_fps = True
@@ -541,29 +534,32 @@ class MiniGame:
 
         # Image de fond du timer
         self.timer = 30
-        self.timer_background = pygame.image.load(sep.join(["..", "data", "sprites", "minigames", "general", "timer_back.png"]))
+        self.timer_background = charger_image(sep.join(["..", "data", "sprites", "minigames", "general", "timer_back.png"]))
 
         # Sprites de toad (pour le chargement)
-        self.toad = [pygame.image.load(sep.join(["..", "data", "sprites", "minigames", "general", "toad", "toad.png"])),
-                     pygame.image.load(sep.join(["..", "data", "sprites", "minigames", "general", "toad", "toad_open.png"]))]
-        self.toad_shadow = pygame.image.load(sep.join(["..", "data", "sprites", "minigames", "general", "toad", "shadow.png"]))
-        self.toad_bubble = pygame.image.load(sep.join(["..", "data", "sprites", "minigames", "general", "toad", "bubble.png"]))
+        self.toad = [charger_image(sep.join(["..", "data", "sprites", "minigames", "general", "toad", "toad.png"])),
+                     charger_image(sep.join(["..", "data", "sprites", "minigames", "general", "toad", "toad_open.png"]))]
+        self.toad_shadow = charger_image(sep.join(["..", "data", "sprites", "minigames", "general", "toad", "shadow.png"]))
+        self.toad_bubble = charger_image(sep.join(["..", "data", "sprites", "minigames", "general", "toad", "bubble.png"]))
 
         # Emplacement des sprites du mini-jeu
         minigame_directory = sep.join(["..", "data", "sprites", "minigames", "archer_ival"])
 
         # Sprites utilisés dans la classe
-        self.bg = pygame.image.load(sep.join([minigame_directory, "background.png"]))
-        self.nappe = pygame.image.load(sep.join([minigame_directory, "nappe_jaune.png"]))
-        self.mur_briques = pygame.image.load(sep.join([minigame_directory, "mur_de_briques.png"]))
-        self.buisson = pygame.image.load(sep.join([minigame_directory, "buisson.png"]))
+        self.bg = charger_image(sep.join([minigame_directory, "background.png"]))
+        self.nappe = charger_image(sep.join([minigame_directory, "nappe_jaune.png"]))
+        self.mur_briques = charger_image(sep.join([minigame_directory, "mur_de_briques.png"]))
+        self.buisson = charger_image(sep.join([minigame_directory, "buisson.png"]))
 
         # Son du tir
-        self.son_tir = pygame.mixer.Sound(sep.join(["..", "data", "sounds", "minigames", "archer_ival", "shot.ogg"]))
+        self.son_tir = charger_son(sep.join(["..", "data", "sounds", "minigames", "archer_ival", "shot.ogg"]))
 
         # Initialisation du réseau
         self.net = None
 
+        # Suivi de la mémoire (donné par le jeu)
+        self.memoire = None
+
 
     # ------/ Getters \------
 
@@ -576,6 +572,9 @@ class MiniGame:
     def set_net(self, new_net) -> Network:
         self.net = new_net
 
+    def set_memoire(self, new_memoire) -> None:
+        self.memoire = new_memoire
+
 
     # ------/ Méthodes \------
 
@@ -599,7 +598,7 @@ class MiniGame:
             assert elem >= -1 and elem <= 1, "Erreur: La liste donnée doit uniquement contenir des entiers compris entre -1 et 1"
 
         # Envoie les inputs au serveur et demande des infos sur l'environnement
-        infos_environnement = json.loads(self.net.send(str(input_joueur[0]) + "|" + str(input_joueur[1]) + "|" + str(input_joueur[2])))
+        infos_environnement = self.net.etat_minijeu(str(input_joueur[0]) + "|" + str(input_joueur[1]) + "|" + str(input_joueur[2]))
         infos_joueurs = infos_environnement["joueurs"]
         infos_ennemis = infos_environnement["ennemis"]
         infos_fleches = infos_environnement["fleches"]
@@ -607,15 +606,15 @@ class MiniGame:
         fps = infos_environnement["fps"]
 
         # On affiche les sprites du jeu dans un ordre d'affichage prédéfini
-        self.screen.blit(scale_image_by(self.bg, self.screen_factor), (0, 0))
+        self.screen.blit(self.bg, (0, 0))
 
         # Affichage de buissons de tailles variables
-        self.screen.blit(scale_image_by(self.buisson, (4 * self.screen_factor[0], 4 * self.screen_factor[1])), (round(370 * self.screen_factor[0]), round(380 * self.screen_factor[1])))
-        self.screen.blit(scale_image_by(self.buisson, (5 * self.screen_factor[0], 5 * self.screen_factor[1])), (round(900 * self.screen_factor[0]), round(370 * self.screen_factor[1])))
-        self.screen.blit(scale_image_by(self.buisson, (6 * self.screen_factor[0], 6 * self.screen_factor[1])), (round(80 * self.screen_factor[0]), round(360 * self.screen_factor[1])))
+        self.screen.blit(scale_image_by(self.buisson, 4), (370, 380))
+        self.screen.blit(scale_image_by(self.buisson, 5), (900, 370))
+        self.screen.blit(scale_image_by(self.buisson, 6), (80, 360))
 
-        self.screen.blit(scale_image_by(self.nappe, (5 * self.screen_factor[0], 5 * self.screen_factor[1])), (round(159 * self.screen_factor[0]), round(460 * self.screen_factor[1])))
-        self.screen.blit(scale_image_by(self.mur_briques, (3 * self.screen_factor[0], 3 * self.screen_factor[1])), (round(275 * self.screen_factor[0]), round(340 * self.screen_factor[1])))
+        self.screen.blit(scale_image_by(self.nappe, 5), (159, 460))
+        self.screen.blit(scale_image_by(self.mur_briques, 3), (275, 340))
 
         # On met à jour la position des joueurs et des animations pour le client
         for id_joueur in self.joueurs.keys():
@@ -674,7 +673,7 @@ class MiniGame:
         # On active les sons si le serveur l'a indiqué
         if infos_joueurs[self.net.adresse_client]["lancer_son_tir"]:
             self.son_tir.play()
-            self.net.send("desactive_son_tir")
+            self.net.send(requete(DESACTIVE_SON, "tir"))
 
         # On affiche le joueur solo à la fin pour la priorité d'affichage
         for joueur in self.joueurs.values():
@@ -684,23 +683,20 @@ class MiniGame:
         # Affichage du timer seulement s'il est actuellement en train de compter
         if timer >= 0:
             # Affichage du fond du timer
-            timer_sprite = scale_image_by(self.timer_background, self.screen_factor)
+            timer_sprite = self.timer_background
             timer_background_textRect = timer_sprite.get_rect()
-            timer_background_textRect.center = (self.screen.get_rect().w // 2, round(37 * self.screen_factor[1]))
+            timer_background_textRect.center = (self.screen.get_rect().w // 2, 37)
             self.screen.blit(timer_sprite, timer_background_textRect)
 
             # Positionnement du timer au centre-haut de l'écran
             timer_text = self.game_font.render(str(timer), (255, 255, 255))
-            timer_text_scaled = scale_image_by(timer_text[0], self.screen_factor)
+            timer_text_scaled = timer_text[0]
             timer_textRect = timer_text_scaled.get_rect()
-            timer_textRect.center = (self.screen.get_rect().w // 2, round(37 * self.screen_factor[1]))
+            timer_textRect.center = (self.screen.get_rect().w // 2, 37)
 
             # Affichage du timer
             self.screen.blit(timer_text_scaled, timer_textRect)
 
-        # Initialisation des facteurs pour la taille de l'écran
-        self.screen_factor = ((self.screen.get_rect().size[0] / 1280), (self.screen.get_rect().size[1] / 720))
-
         # Debug pour afficher les fps
         if self.show_fps:
             self.fps_font.render_to(self.screen, (0, 0), "FPS: " + str(round(self.clock.get_fps())), (0, 0, 0))
@@ -709,6 +705,10 @@ class MiniGame:
         if self.show_server_fps:
             self.fps_font.render_to(self.screen, (0, 20), "S-FPS: " + str(round(fps)), (0, 0, 0))
 
+        # Debug pour afficher la mémoire prise par les images et les sons
+        if self.show_fps and self.memoire is not None:
+            self.fps_font.render_to(self.screen, (0, 40), self.memoire.texte_usage(), (0, 0, 0))
+
 
     def load(self) -> None:
         """
@@ -746,64 +746,61 @@ class MiniGame:
 
                 # Changement de taille de la fenêtre
                 elif event.type == pygame.VIDEORESIZE:
-                    self.screen = pygame.display.set_mode(event.size, pygame.HWSURFACE|pygame.DOUBLEBUF|pygame.RESIZABLE)
+                    pygame.display.set_mode(event.size, pygame.HWSURFACE|pygame.DOUBLEBUF|pygame.RESIZABLE)
 
                 # Détection des inputs du joueur
                 elif event.type == pygame.MOUSEBUTTONUP and cooldown - time.time() < 0:
-                    self.net.send("ready_for_next_state")
+                    self.net.send(requete(PRET))
 
             # Envoi d'une requête au serveur pour obtenir le nombre de joueurs et lance la partie si tous les joueurs sont prêts
-            infos_serveur = json.loads(self.net.send("infos_serveur"))
+            infos_serveur = self.net.get_infos_serveur()
             nb_joueurs = infos_serveur["nb_joueurs"]
             nb_joueurs_prets = infos_serveur["nb_joueurs_prets"]
 
-            etat = self.net.send("get_etat")
+            etat = self.net.send(requete(GET_ETAT))
             running = etat == "minigame_load" or etat == "minigame_select"
 
-            # Initialisation des facteurs pour la taille de l'écran
-            self.screen_factor = ((self.screen.get_rect().size[0] / 1280), (self.screen.get_rect().size[1] / 720))
-
             # Affichage de l'écran de chargement et du texte
             self.screen.fill((0, 0, 0))
 
             # Redimension des textes
-            nom_text = scale_image_by(self.game_font.render(nom, (255, 255, 255))[0], self.screen_factor)
+            nom_text = self.game_font.render(nom, (255, 255, 255))[0]
             nom_textRect = nom_text.get_rect()
-            nom_textRect.center = (round(640 * self.screen_factor[0]), round(70 * self.screen_factor[1]))
+            nom_textRect.center = (640, 70)
             if cooldown - time.time() > 0:
                 chargement = "CHARGEMENT..." 
             elif nb_joueurs > 1:
                 chargement = "Cliquez si vous êtes prêt pour le mini-jeu ! (" + str(nb_joueurs_prets) + "/" + str(nb_joueurs) + ")"
             else:
                 chargement = "Cliquez pour lancer le mini-jeu !"
-            chargement_text = scale_image_by(self.game_font.render(chargement, (255, 255, 255))[0], (0.8 * self.screen_factor[0], 0.8 * self.screen_factor[1]))
+            chargement_text = scale_image_by(self.game_font.render(chargement, (255, 255, 255))[0], 0.8)
             chargement_textRect = chargement_text.get_rect()
-            chargement_textRect.center = (round(640 * self.screen_factor[0]), round(680 * self.screen_factor[1]))
+            chargement_textRect.center = (640, 680)
 
             # Création du texte "controles" qui s'affiche au-dessus des touches du jouers
-            controles_text = scale_image_by(self.game_font.render("Contrôles:", (255, 255, 255))[0], self.screen_factor)
+            controles_text = self.game_font.render("Contrôles:", (255, 255, 255))[0]
 
             # Affichage des textes
             self.screen.blit(nom_text, nom_textRect)
             self.screen.blit(chargement_text, chargement_textRect)
-            self.screen.blit(controles_text, (round(960 * self.screen_factor[0]), round(200 * self.screen_factor[1])))
+            self.screen.blit(controles_text, (960, 200))
 
             # Affichage de Toad (pour présenter le mini-jeu)
-            self.screen.blit(scale_image_by(self.toad_shadow, (6 * self.screen_factor[0], 6 * self.screen_factor[1])), (round(114 * self.screen_factor[0]), round(535 * self.screen_factor[1])))
-            self.screen.blit(scale_image_by(self.toad[1], (5 * self.screen_factor[0], 5 * self.screen_factor[1])), (round(100 * self.screen_factor[0]), round(400 * self.screen_factor[1])))
-            self.screen.blit(scale_image_by(self.toad_bubble, (5 * self.screen_factor[0], 5 * self.screen_factor[1])), (round(240 * self.screen_factor[0]), round(150 * self.screen_factor[1])))
+            self.screen.blit(scale_image_by(self.toad_shadow, 6), (114, 535))
+            self.screen.blit(scale_image_by(self.toad[1], 5), (100, 400))
+            self.screen.blit(scale_image_by(self.toad_bubble, 5), (240, 150))
 
             # Affichage de la description
             for line in description:
-                description_text = scale_image_by(self.game_font.render(line, (0, 0, 0))[0], (0.7 * self.screen_factor[0], 0.7 * self.screen_factor[1]))
-                self.screen.blit(description_text, (round(260 * self.screen_factor[0]), round((170 + description.index(line) * 37) * self.screen_factor[1])))
+                description_text = scale_image_by(self.game_font.render(line, (0, 0, 0))[0], 0.7)
+                self.screen.blit(description_text, (260, 170 + description.index(line) * 37))
 
             # Création et affichage des touches du clavier pour le joueur
-            layout_joueur = scale_image_by(pygame.image.load(sep.join(["..", "data", "sprites", "minigames", "general", "layout_joueur.png"])), self.screen_factor)
-            self.screen.blit(layout_joueur, (round(930 * self.screen_factor[0]), round(300 * self.screen_factor[1])))
+            layout_joueur = charger_image(sep.join(["..", "data", "sprites", "minigames", "general", "layout_joueur.png"]))
+            self.screen.blit(layout_joueur, (930, 300))
 
             # Mise à jour de l'écran et limite de fps
-            pygame.display.flip()
+            presenter(self.screen)
             self.clock.tick(self.fps)
 
         # Lancement de l'intro du mini-jeu (si le joueur n'a pas fermé la fenêtre)
@@ -811,22 +808,20 @@ class MiniGame:
             self.start_game()
 
 
-    def start_game(self) -> None:
+    def init_partie(self) -> None:
         """
-        Cette méthode représente la phase de lancement du mini-jeu.
+        Cette méthode permet de créer les entités du mini-jeu à partir des infos envoyées par le serveur.
         """
 
-        # ---------------------------------------
-
         # Envoi d'une requête au serveur pour obtenir les infos de chaque joueur
-        infos_joueurs = json.loads(self.net.send("0|0|0"))["joueurs"]
+        infos_joueurs = self.net.etat_minijeu("0|0|0")["joueurs"]
 
         # Création des joueurs
         for ip in infos_joueurs.keys():
             self.joueurs[ip] = Joueur(infos_joueurs[ip]["perso"], infos_joueurs[ip]["type_joueur"])
 
         # Envoi de la taille du joueur au serveur
-        self.net.send(json.dumps({"taille_joueurs": {joueur: self.joueurs[joueur].get_taille() for joueur in self.joueurs.keys()}}))
+        self.net.send(requete(TAILLE_JOUEURS, json.dumps({joueur: self.joueurs[joueur].get_taille() for joueur in self.joueurs.keys()})))
 
         # Ajout des ennemis dans la liste des entités
         self.entities.append(Ennemi("boo"))
@@ -836,12 +831,23 @@ class MiniGame:
         # Initialisation de la liste des objets
         self.objets = list(self.entities)
 
+
+    def start_game(self) -> None:
+        """
+        Cette méthode représente la phase de lancement du mini-jeu.
+        """
+
+        # ---------------------------------------
+
+        # Création des entités du mini-jeu
+        self.init_partie()
+
         # Initialisation des paramètres par défaut de la phase
         running = True
         prev_time = time.time()
 
         # Initialisation du texte start et de ses coordonnées de départ
-        start_image = pygame.image.load(sep.join(["..", "data", "sprites", "minigames", "general", "start.png"]))
+        start_image = charger_image(sep.join(["..", "data", "sprites", "minigames", "general", "start.png"]))
         start_image_x = -start_image.get_rect().w
         start_image_y = round((640 - start_image.get_rect().h) / 2)
 
@@ -861,10 +867,10 @@ class MiniGame:
 
                 # Changement de taille de la fenêtre
                 elif event.type == pygame.VIDEORESIZE:
-                    self.screen = pygame.display.set_mode(event.size, pygame.HWSURFACE|pygame.DOUBLEBUF|pygame.RESIZABLE)
+                    pygame.display.set_mode(event.size, pygame.HWSURFACE|pygame.DOUBLEBUF|pygame.RESIZABLE)
 
             # Envoie d'une requête au serveur pour obtenir son etat
-            etat = self.net.send("get_etat")
+            etat = self.net.send(requete(GET_ETAT))
             running = etat == "minigame_start"
 
             # Utilisation du moteur de jeu
@@ -875,17 +881,17 @@ class MiniGame:
             prev_time = time.time()
 
             # Affichage du texte start
-            self.screen.blit(scale_image_by(start_image, (4 * self.screen_factor[0], 4 * self.screen_factor[1])), (round(start_image_x * self.screen_factor[0]), round(start_image_y * self.screen_factor[1])))
+            self.screen.blit(scale_image_by(start_image, 4), (round(start_image_x), round(start_image_y)))
 
             # Arrête la phase d'intro si le texte sort de l'écran
             if not sent:
                 if start_image_x > 1280:
-                    sent = self.net.send("ready_for_next_state") == "ok"
+                    sent = self.net.send(requete(PRET)) == "ok"
 
                 # Si le texte se trouve au milieu de l'écran et que le timer n'est pas encore lancé
                 elif (start_image_x + 2000 * delta_time) > (1000 - start_image.get_rect().w) / 2 and cooldown == 0:
                     cooldown = time.time()
-                    pygame.mixer.Sound(sep.join(["..", "data", "sounds", "minigames", "start.ogg"])).play()
+                    charger_son(sep.join(["..", "data", "sounds", "minigames", "start.ogg"])).play()
 
                 # Si le timer a duré 0.5s ou qu'il n'est pas encore lancé
                 elif time.time() - cooldown > 0.5 or cooldown == 0:
@@ -894,14 +900,14 @@ class MiniGame:
                     start_image_x = round(start_image_x)
 
             # Mise à jour de l'écran et limite de fps
-            pygame.display.flip()
+            presenter(self.screen)
             self.clock.tick(self.fps)
 
         # Lancement du mini-jeu en lui même (si le joueur n'a pas fermé la fenêtre)
         if not self.quit:
 
             # Lancement du son de sifflet et la musique chargée
-            pygame.mixer.Sound(sep.join(["..", "data", "sounds", "minigames", "start_sifflet.ogg"])).play()
+            charger_son(sep.join(["..", "data", "sounds", "minigames", "start_sifflet.ogg"])).play()
             pygame.mixer.music.play(loops=-1)
 
             self.during_game()
@@ -926,10 +932,10 @@ class MiniGame:
 
                 # Changement de taille de la fenêtre
                 elif event.type == pygame.VIDEORESIZE:
-                    self.screen = pygame.display.set_mode(event.size, pygame.HWSURFACE|pygame.DOUBLEBUF|pygame.RESIZABLE)
+                    pygame.display.set_mode(event.size, pygame.HWSURFACE|pygame.DOUBLEBUF|pygame.RESIZABLE)
 
             # Envoie d'une requête au serveur pour obtenir son etat
-            etat = self.net.send("get_etat")
+            etat = self.net.send(requete(GET_ETAT))
             running = etat == "minigame_during"
 
             # Détection des inputs et réinitialisation des vecteurs de déplacement des objets
@@ -949,7 +955,7 @@ class MiniGame:
             self.game_engine(input_joueur)
 
             # Mise à jour de l'écran et limite de fps
-            pygame.display.flip()
+            presenter(self.screen)
             self.clock.tick(self.fps)
 
         # Lancement de l'affichage de fin (si le joueur n'a pas fermé la fenêtre)
@@ -968,10 +974,10 @@ class MiniGame:
 
         # Arrêt de la musique et son de fin
         pygame.mixer.music.stop()
-        pygame.mixer.Sound(sep.join(["..", "data", "sounds", "minigames", "finish.ogg"])).play()
+        charger_son(sep.join(["..", "data", "sounds", "minigames", "finish.ogg"])).play()
 
         # Initialisation du texte finish et de ses coordonnées de départ
-        finish_image = pygame.image.load(sep.join(["..", "data", "sprites", "minigames", "general", "finish.png"]))
+        finish_image = charger_image(sep.join(["..", "data", "sprites", "minigames", "general", "finish.png"]))
         finish_image_x = -finish_image.get_rect().w
         finish_image_y = round((640 - finish_image.get_rect().h) / 2)
 
@@ -991,10 +997,10 @@ class MiniGame:
 
                 # Changement de taille de la fenêtre
                 elif event.type == pygame.VIDEORESIZE:
-                    self.screen = pygame.display.set_mode(event.size, pygame.HWSURFACE|pygame.DOUBLEBUF|pygame.RESIZABLE)
+                    pygame.display.set_mode(event.size, pygame.HWSURFACE|pygame.DOUBLEBUF|pygame.RESIZABLE)
 
             # Envoie d'une requête au serveur pour obtenir son etat
-            etat = self.net.send("get_etat")
+            etat = self.net.send(requete(GET_ETAT))
             running = etat == "minigame_end"
 
             # Utilisation du moteur de jeu
@@ -1005,12 +1011,12 @@ class MiniGame:
             prev_time = time.time()
 
             # Affichage du texte finish
-            self.screen.blit(scale_image_by(finish_image, (4 * self.screen_factor[0], 4 * self.screen_factor[1])), (round(finish_image_x * self.screen_factor[0]), round(finish_image_y * self.screen_factor[1])))
+            self.screen.blit(scale_image_by(finish_image, 4), (round(finish_image_x), round(finish_image_y)))
 
             # Arrête la phase de fin au bout de 1.5s si le timer est déjà lancé
             if not sent:
                 if time.time() - cooldown > 1.5 and cooldown > 0:
-                    sent = self.net.send("ready_for_next_state") == "ok"
+                    sent = self.net.send(requete(PRET)) == "ok"
 
                 # Si le texte se trouve au milieu de l'écran et que le timer n'est pas encore lancé
                 elif (finish_image_x + 2000 * delta_time) > (1000 - finish_image.get_rect().w) / 2 and cooldown == 0:
@@ -1022,7 +1028,7 @@ class MiniGame:
                     finish_image_x = round(finish_image_x)
 
             # Mise à jour de l'écran et limite de fps
-            pygame.display.flip()
+            presenter(self.screen)
             self.clock.tick(self.fps)
 
         # Lancement de l'annonce des gagnants (si le joueur n'a pas fermé la fenêtre)
@@ -1040,7 +1046,7 @@ class MiniGame:
         running = True
 
         # Envoie d'une requête au serveur pour obtenir les infos du classement
-        classement = json.loads(self.net.send("0|0"))["classement"]
+        classement = self.net.etat_minijeu("0|0")["classement"]
 
         # On note tous les gagnants de la partie
         gagnants = []
@@ -1053,13 +1059,13 @@ class MiniGame:
 
         # Changement du texte et de la musique jouée selon différents cas
         if len(gagnants) == 0:
-            win_image = pygame.image.load(sep.join(["..", "data", "sprites", "minigames", "general", "tie.png"]))
+            win_image = charger_image(sep.join(["..", "data", "sprites", "minigames", "general", "tie.png"]))
             pygame.mixer.music.load(sep.join(["..", "data", "musics", "minigames", "draw.ogg"]))
         elif len(gagnants) > 1:
-            win_image = pygame.image.load(sep.join(["..", "data", "sprites", "minigames", "general", "wins.png"]))
+            win_image = charger_image(sep.join(["..", "data", "sprites", "minigames", "general", "wins.png"]))
             pygame.mixer.music.load(sep.join(["..", "data", "musics", "minigames", "win.ogg"]))
         else:
-            win_image = pygame.image.load(sep.join(["..", "data", "sprites", "minigames", "general", "win.png"]))
+            win_image = charger_image(sep.join(["..", "data", "sprites", "minigames", "general", "win.png"]))
             pygame.mixer.music.load(sep.join(["..", "data", "musics", "minigames", "win.ogg"]))
 
         # Timer de 5s
@@ -1081,10 +1087,10 @@ class MiniGame:
 
                 # Changement de taille de la fenêtre
                 elif event.type == pygame.VIDEORESIZE:
-                    self.screen = pygame.display.set_mode(event.size, pygame.HWSURFACE|pygame.DOUBLEBUF|pygame.RESIZABLE)
+                    pygame.display.set_mode(event.size, pygame.HWSURFACE|pygame.DOUBLEBUF|pygame.RESIZABLE)
 
             # Envoie d'une requête au serveur pour obtenir son etat
-            etat = self.net.send("get_etat")
+            etat = self.net.send(requete(GET_ETAT))
             running = etat == "minigame_winners"
 
             # Utilisation du moteur de jeu
@@ -1098,7 +1104,7 @@ class MiniGame:
 
             for gagnant in gagnants:
                 # Initialisation et positionnement du texte de chaque gagnant
-                image_gagnant = scale_image_by(pygame.image.load(sep.join(["..", "data", "sprites", "minigames", "general", gagnant + ".png"])), 4)
+                image_gagnant = charger_image(sep.join(["..", "data", "sprites", "minigames", "general", gagnant + ".png"]), 4)
                 image_rect = image_gagnant.get_rect()
                 image_rect.center = (640, 400)
 
@@ -1107,23 +1113,23 @@ class MiniGame:
                     image_rect.x = image_x
 
                 # Affichage du texte de chaque gagnant
-                self.screen.blit(scale_image_by(image_gagnant, self.screen_factor), (round(image_rect.x * self.screen_factor[0]), round(image_rect.y * self.screen_factor[1])))
+                self.screen.blit(image_gagnant, (image_rect.x, image_rect.y))
 
                 # On déplace le prochain texte 50 pixels plus loin
                 image_x += image_rect.w + 50
 
             # Positionnement du texte win
-            scaled_win = scale_image_by(win_image, (4 * self.screen_factor[0], 4 * self.screen_factor[1]))
+            scaled_win = scale_image_by(win_image, 4)
             win_rect = scaled_win.get_rect()
-            win_rect.center = (round(640 * self.screen_factor[0]), round(520 * self.screen_factor[1]))
+            win_rect.center = (640, 520)
 
             # Affichage du texte win
             self.screen.blit(scaled_win, win_rect)
 
             # Arrêt du script au bout du timer
             if cooldown - time.time() <= 0 and not sent:
-                sent = self.net.send("ready_for_next_state") == "ok"
+                sent = self.net.send(requete(PRET)) == "ok"
 
             # Mise à jour de l'écran et limite de fps
-            pygame.display.flip()
+            presenter(self.screen)
             self.clock.tick(self.fps)
\ No newline at end of file
@@ -3,13 +3,18 @@
 
 # ------/ Importations des bibliothèques \------
 
-import pygame
 from math import sqrt
 import time
 import random
 
 import json
 import socket
+from threading import Condition
+
+from profiler import Profiler
+from protocole import TableRequetes, GET_ETAT, INPUTS, TAILLE_JOUEURS, DESACTIVE_SON
+from moteur import Rect, instant_impact
+from registre import Registre
 
 # ------/ Fonctions utiliatires \------
 
@@ -54,7 +59,7 @@ class Joueur:
 
     # ------/ Constructeur \------
 
-    def __init__(self, perso: str, id_minijeu: int, ia: bool, type_joueur: str) -> None:
+    def __init__(self, perso: str, id_minijeu: int, ia: bool, type_joueur: str, horloge=time.time) -> None:
         """
         Constructeur de la classe Joueur.
 
@@ -63,6 +68,7 @@ class Joueur:
             - id_minijeu (int): id du joueur qui sert uniquement lors des mini-jeux.
             - ia (bool): Indique si le joueur est une ia ou un joueur lambda.
             - type_joueur (str): Si le joueur est en solo ou en équipe (solo ou panneau) (exclusif à ce mini-jeu).
+            - horloge (function): Fonction qui renvoie le temps actuel en secondes (time.time par défaut).
 
         Attributs internes:
             - pos (list): Position du joueur.
@@ -71,7 +77,7 @@ class Joueur:
 
             - frame (float): Indice du sprite à choisir.
 
-            - collision (pygame.Rect): Boîte de collision du joueur.
+            - collision (Rect): Boîte de collision du joueur.
 
             - taille (list): Dimensions du sprite du joueur (fournis par le client).
         """
@@ -87,6 +93,7 @@ class Joueur:
         self.id_minijeu = id_minijeu
         self.ia = ia
         self.type_joueur = type_joueur
+        self.horloge = horloge
         self.ready = False
 
         # Caractéristiques principales (stats)
@@ -107,7 +114,7 @@ class Joueur:
         self.frame = 0
 
         # Boîte de collision du personnage
-        self.collision = pygame.Rect(0, 0, 64, 124) if self.type_joueur == "panneau" else None
+        self.collision = Rect(0, 0, 64, 124) if self.type_joueur == "panneau" else None
 
         # Initialisation de la taille du joueur (qui sera définie lors du début de partie)
         self.taille = [0, 0]
@@ -248,7 +255,7 @@ class Joueur:
                     # On ne calcule pas si le joueur est le joueur solo
                     if self.collision != None:
                         # Pas de rect_y parce que le joueur est bloqué sur l'axe x
-                        rect_x = pygame.Rect(round(self.collision.x + self.velocity[0]), self.collision.y, self.collision.w, self.collision.h)
+                        rect_x = Rect(round(self.collision.x + self.velocity[0]), self.collision.y, self.collision.w, self.collision.h)
 
                         # On stoppe la vélocité du joueur si il collisionne avec une boîte de collision
                         for collision in objet.get_collisions():
@@ -278,44 +285,32 @@ class Joueur:
         self.velocity = [0, 0]
 
 
-    def tirer(self, objets: list) -> None:
+    def tirer(self, objets: Registre) -> None:
         """
         Cette méthode permet au joueur solo de tirer.
 
         Paramètres:
-            - objets (list): Liste d'objets avec lesquels le joueur doit calculer les collisions.
-
-        Pré-conditions:
-            - objets doit contenir seulement des objets de type Joueur, Ennemi ou Fleche.
+            - objets (Registre): Registre des objets du mini-jeu, dans lequel la flèche est ajoutée.
         """
 
         # Test du type de objets
-        assert type(objets) == list, "Erreur: Le paramètre donné (objets) n'est pas une liste."
-
-        # Tests des éléments de objets
-        for elem in objets:
-            assert type(elem) == Joueur or type(elem) == Ennemi or type(elem) == Fleche, "Erreur: La liste doit être seulement composée d'objets."
+        assert type(objets) == Registre, "Erreur: Le paramètre donné (objets) n'est pas un registre."
 
         # Ne tire uniquement si le délai est depassé
-        if self.cooldown_tir - time.time() <= 0:
+        if self.cooldown_tir - self.horloge() <= 0:
 
             # Envoie le son au client et change le sprite actuel du pistolet
             self.lancer_son_tir = True
             self.etat_tir = "tir"
 
-            # Initialisation d'une liste de flèches pour simplifier la suite
-            fleches = {objet.get_id_fleche(): objet for objet in objets if type(objet) == Fleche}
+            # Création du nouvel identifiant de la flèche (jamais réutilisé)
+            new_id = objets.nouvel_id()
 
-            # Création du nouvel identifiant de la flèche
-            new_id = 0
-            while new_id in fleches.keys():
-                new_id += 1
-
-            # Création du projectile (à la base censé être une flèche) dans la liste d'objets
-            objets.append(Fleche([round(self.pos[0] + self.taille[0] - 33), round(self.pos[1] + 89)], new_id))
+            # Création du projectile (à la base censé être une flèche) dans le registre d'objets
+            objets.ajouter(Fleche([round(self.pos[0] + self.taille[0] - 33), round(self.pos[1] + 89)], new_id), new_id)
 
             # Applique 2s de délai
-            self.cooldown_tir = 2 + time.time()
+            self.cooldown_tir = 2 + self.horloge()
 
 
 
@@ -337,7 +332,7 @@ class Ennemi:
 
             - move_cooldown (float): Un délai aléatoire pour chaque mouvement de l'ennemi.
 
-            - collision (pygame.Rect ou None): Boîte de collision de l'ennemi.
+            - collision (Rect ou None): Boîte de collision de l'ennemi.
         """
 
         # Caractéristiques principales (stats)
@@ -351,7 +346,7 @@ class Ennemi:
         self.move_cooldown = 0
 
         # Boîte de collision de l'ennemi
-        self.collision = pygame.Rect(0, 0, 64, 124)
+        self.collision = Rect(0, 0, 64, 124)
 
 
     # ------/ Getters \------
@@ -438,7 +433,7 @@ class Ennemi:
             # Pas mal de tests pour éviter de collisionner avec des élément indésirables
             if objet != self and type(objet) != Fleche and not objet.get_dead():
                 # Pas de rect_y parce que l'ennemi est bloqué sur l'axe x
-                rect_x = pygame.Rect(round(self.collision.x + self.velocity[0]), self.collision.y, self.collision.w, self.collision.h)
+                rect_x = Rect(round(self.collision.x + self.velocity[0]), self.collision.y, self.collision.w, self.collision.h)
 
                 # On stoppe la vélocité de l'ennemi si il collisionne avec une boîte de collision
                 for collision in objet.get_collisions():
@@ -481,7 +476,7 @@ class Fleche:
             - velocity (list): Vélocité/Accélération de la flèche.
             - speed (int): Vitesse de la flèche.
 
-            - collision (pygame.Rect ou None): Boîte de collision de la flèche.
+            - collision (Rect ou None): Boîte de collision de la flèche.
         """
 
         # Tests du type des paramètres donnés
@@ -496,7 +491,7 @@ class Fleche:
         self.speed = 5
 
         # Boîte de collision de la flèche
-        self.collision = pygame.Rect(0, 0, 20, 46)
+        self.collision = Rect(0, 0, 20, 46)
 
 
     # ------/ Getters \------
@@ -535,13 +530,16 @@ class Fleche:
         self.velocity[1] = direction[1] * self.speed
 
 
-    def calculer_collisions(self, objets: list) -> None:
+    def calculer_collisions(self, objets: list) -> bool:
         """
         Cette méthode permet de calculer les collisions avec la flèche (méthode similaire avec celles des classes précédentes).
 
         Paramètres:
             - objets (list): Liste d'objets avec lesquels la flèche doit calculer les collisions.
 
+        Renvois:
+            - bool: Indique si la flèche a touché un objet (elle doit alors être supprimée).
+
         Pré-conditions:
             - objets doit contenir seulement des objets de type Joueur, Ennemi ou Fleche.
         """
@@ -557,23 +555,24 @@ class Fleche:
         self.collision.x = round(self.pos[0])
         self.collision.y = round(self.pos[1] + 46)
 
+        touche = False
+
         # Calcul des collisions pour chaque objets
         for objet in objets:
             # Pas mal de tests pour éviter de collisionner avec des élément indésirables
             if objet != self and type(objet) != Fleche and not objet.get_dead():
-                # Pas de rect_x parce que la flèche est bloquée sur l'axe y
-                rect_y = pygame.Rect(self.collision.x, round(self.collision.y + self.velocity[1]), self.collision.w, self.collision.h)
-
-                # On détecte la collision de l'objet
+                # On détecte la collision de l'objet sur tout le trajet de la flèche (bloquée sur l'axe y), pas
+                # seulement à son arrivée: une flèche rapide ne passe pas à travers un ennemi
                 for collision in objet.get_collisions():
                     # Ne collisionne pas avec le joueur solo
-                    if collision != None and rect_y.colliderect(collision):
+                    if collision != None and instant_impact(self.collision, [0, self.velocity[1]], collision) is not None:
                         # On tue l'objet
                         objet.set_dead(True)
 
-                        # On supprime la flèche de la liste d'objets
-                        if self in objets:
-                            objets.remove(self)
+                        # La flèche sera supprimée du registre d'objets
+                        touche = True
+
+        return touche
 
 
     def appliquer_velocite(self) -> None:
@@ -591,7 +590,7 @@ class Fleche:
 
 # Classe du serveur
 class Server:
-    def __init__(self, server_socket: socket.socket) -> None:
+    def __init__(self, server_socket: socket.socket, profiling: bool = False, horloge=time.time, rng=random, silencieux: bool = False) -> None:
         """
         Documentation ici
             - timer (float): Durée du mini-jeu.
@@ -600,7 +599,19 @@ class Server:
         """
 
         self.server_socket = server_socket
-        print("Initialisation du mini-jeu: Archer Ival")
+
+        # Horloge et générateur aléatoire du mini-jeu (remplaçables pour simuler une partie sans réseau)
+        self.horloge = horloge
+        self.rng = rng
+
+        # Les copies du mini-jeu (lockstep, simulation) n'écrivent pas leurs messages dans la console
+        self.silencieux = silencieux
+
+        # Fonction du lobby appelée quand le nombre de joueurs prêts change (None hors du lobby)
+        self.notifier_lobby = None
+
+        if not self.silencieux:
+            print("Initialisation du mini-jeu: Archer Ival")
 
         self.joueurs = {}
         self.inputs_joueurs = {}
@@ -608,11 +619,11 @@ class Server:
 
         # Initialisation d'un ordre aléatoire pour les mini-jeux
         self.ordre_minijeu = [i for i in range(4)]
-        random.shuffle(self.ordre_minijeu)
+        self.rng.shuffle(self.ordre_minijeu)
 
         self.ennemis = []
         self.directions_ennemis = {}
-        self.objets = []
+        self.objets = Registre()
 
         # Initialisation du timer
         self.timer = 30
@@ -622,6 +633,21 @@ class Server:
         self.classement = {}
 
         self.fps = 60
+        self.profiler = Profiler("Archer Ival", self.fps, profiling)
+
+        # Requêtes du mini-jeu, chacune trouvée directement par son opcode
+        self.requetes = TableRequetes("Archer Ival")
+        self.requetes.enregistrer(GET_ETAT, self.requete_get_etat)
+        self.requetes.enregistrer(TAILLE_JOUEURS, self.requete_taille_joueurs)
+        self.requetes.enregistrer(DESACTIVE_SON, self.requete_desactive_son)
+        self.requetes.enregistrer(INPUTS, self.requete_inputs)
+
+        # Dernier état encodé en json (publié une fois par tick et partagé par tous les clients)
+        self.snapshot = None
+
+        # Condition qui protège les joueurs prêts et réveille la boucle du mini-jeu quand un joueur est prêt
+        self.condition = Condition()
+
         self.current_fps = 0
         self.is_running = False
 
@@ -644,61 +670,135 @@ class Server:
         return self.joueurs[address]
 
     def add_player(self, address: str, perso: str, ia: bool):
-        id_minijeu = self.ordre_minijeu[len(self.joueurs)]
-        self.joueurs[address] = Joueur(perso, id_minijeu, ia, "solo" if id_minijeu == 0 else "panneau")
+        with self.condition:
+            id_minijeu = self.ordre_minijeu[len(self.joueurs)]
+            self.joueurs[address] = Joueur(perso, id_minijeu, ia, "solo" if id_minijeu == 0 else "panneau", self.horloge)
+
+            # Les ia sont automatiquement prêtes
+            if ia:
+                self.nb_joueurs_prets += 1
+
+            self.condition.notify_all()
+
+
+    def get_infos(self) -> dict:
+        """
+        Cette méthode permet de récupérer l'état du mini-jeu tel qu'il est envoyé aux clients.
+
+        Renvois:
+            - dict: Informations sur les joueurs et les entités du mini-jeu.
+        """
+
+        infos_joueurs = {joueur: {
+            "perso": self.joueurs[joueur].get_perso(),
+            "type_joueur": self.joueurs[joueur].get_type_joueur(),
+            "pos": self.joueurs[joueur].get_pos(),
+            "frame": self.joueurs[joueur].get_frame(),
+            "rotation": self.joueurs[joueur].get_rotation(),
+            "dead": self.joueurs[joueur].get_dead(),
+            "etat_tir": self.joueurs[joueur].get_etat_tir(),
+            "lancer_son_tir": self.joueurs[joueur].get_lancer_son_tir()
+        } for joueur in self.joueurs.keys()}
+
+        infos_ennemis = [{
+            "pos": ennemi.get_pos(),
+            "rotation": ennemi.get_rotation(),
+            "dead": ennemi.get_dead()
+        } for ennemi in self.ennemis]
+
+        infos_fleches = {objet.get_id_fleche(): objet.get_pos() for objet in self.objets.get_type(Fleche)}
+
+        return {"joueurs": infos_joueurs, "ennemis": infos_ennemis, "fleches": infos_fleches, "timer": round(self.timer - self.horloge()), "classement": self.classement, "fps": self.current_fps}
 
 
     def client_thread(self, address: str, request: str) -> str:
-            if request == "get_etat":
-                reply = self.etat
-
-            elif "taille_joueurs" in request:
-                taille = json.loads(request)["taille_joueurs"]
-                for ip in taille.keys():
-                    self.joueurs[ip].set_taille([taille[ip][0], taille[ip][1]])
-                reply = "ok"
-
-            elif request == "desactive_son_tir":
-                self.joueurs[address].set_lancer_son_tir(False)
-                reply = "ok"
-
-            elif "|" in request:
-                # Si la requête c'est ça: 1|1|0
-                self.inputs_joueurs[address] = [int(coord) for coord in request.split("|")]
-
-                infos_joueurs = {joueur: {
-                    "perso": self.joueurs[joueur].get_perso(),
-                    "type_joueur": self.joueurs[joueur].get_type_joueur(),
-                    "pos": self.joueurs[joueur].get_pos(),
-                    "frame": self.joueurs[joueur].get_frame(),
-                    "rotation": self.joueurs[joueur].get_rotation(),
-                    "dead": self.joueurs[joueur].get_dead(),
-                    "etat_tir": self.joueurs[joueur].get_etat_tir(),
-                    "lancer_son_tir": self.joueurs[joueur].get_lancer_son_tir()
-                } for joueur in self.joueurs.keys()}
-
-                infos_ennemis = [{
-                    "pos": ennemi.get_pos(),
-                    "rotation": ennemi.get_rotation(),
-                    "dead": ennemi.get_dead()
-                } for ennemi in self.ennemis]
-
-                infos_fleches = {objet.get_id_fleche(): objet.get_pos() for objet in self.objets if type(objet) == Fleche}
-
-                reply = json.dumps({"joueurs": infos_joueurs, "ennemis": infos_ennemis, "fleches": infos_fleches, "timer": round(self.timer - time.time()), "classement": self.classement, "fps": self.current_fps})
+        # L'opcode de la requête (son premier octet) donne directement la fonction qui y répond
+        reply = self.requetes.traiter(address, request)
+        return "not_found" if reply is None else reply
+
+
+    def requete_get_etat(self, address: str, donnees: str) -> str:
+        return self.etat
 
-            else:
-                reply = "not_found"
 
-            return reply
+    def requete_taille_joueurs(self, address: str, donnees: str) -> str:
+        taille = json.loads(donnees)
+        for ip in taille.keys():
+            self.joueurs[ip].set_taille([taille[ip][0], taille[ip][1]])
+        return "ok"
+
+
+    def requete_desactive_son(self, address: str, donnees: str) -> str:
+        if donnees == "tir":
+            self.joueurs[address].set_lancer_son_tir(False)
+        return "ok"
+
+
+    def requete_inputs(self, address: str, donnees: str) -> str:
+        # Si les données c'est ça: 1|1|0
+        with self.profiler.mesure("inputs"):
+            self.inputs_joueurs[address] = [int(coord) for coord in donnees.split("|")]
+
+        # Tous les clients reçoivent le même état, encodé une seule fois par tick
+        return self.get_snapshot()
 
 
     def changer_etat(self, new_etat):
-        self.etat = new_etat
-        for ip in self.joueurs.keys():
-            self.joueurs[ip].set_ready(False)
+        with self.condition:
+            self.etat = new_etat
+            for ip in self.joueurs.keys():
+                self.joueurs[ip].set_ready(False)
+
+            # Seules les ia restent prêtes
+            self.nb_joueurs_prets = len([joueur for joueur in self.joueurs.values() if joueur.get_ia()])
+            self.condition.notify_all()
+
+        if not self.silencieux:
+            print("[Archer-Ival] Passé à l'état", self.etat)
+
+        self.notifier_prets()
+
+
+    def marquer_pret(self, address: str) -> None:
+        """
+        Cette méthode indique qu'un joueur est prêt pour l'état suivant (appelée par le thread de son client).
+
+        Paramètres:
+            - address (str): Adresse du joueur.
+        """
+
+        with self.condition:
+            if not self.joueurs[address].get_ready():
+                self.joueurs[address].set_ready(True)
+
+                # Le compteur est mis à jour ici plutôt que recompté à chaque tick
+                if not self.joueurs[address].get_ia():
+                    self.nb_joueurs_prets += 1
+
+                self.condition.notify_all()
+
+        self.notifier_prets()
+
+
+    def notifier_prets(self) -> None:
+        """
+        Cette méthode prévient le lobby que le nombre de joueurs prêts a changé (il fait partie de ses informations).
+        Elle doit être appelée sans self.condition.
+        """
 
-        print("[Archer-Ival] Passé à l'état", self.etat)
+        if self.notifier_lobby is not None:
+            self.notifier_lobby()
+
+
+    def tous_prets(self) -> bool:
+        """
+        Cette méthode indique si tous les joueurs sont prêts pour l'état suivant.
+
+        Renvois:
+            - bool: True si tous les joueurs sont prêts, sinon False.
+        """
+
+        return len(self.joueurs) > 0 and self.nb_joueurs_prets == len(self.joueurs)
 
 
     def load_game(self):
@@ -717,8 +817,10 @@ class Server:
         self.ennemis.append(Ennemi())
         self.ennemis[-1].set_pos([700, 216])
 
-        # On met à jour la liste d'objets
-        self.objets = list(self.joueurs.values()) + self.ennemis
+        # On met à jour le registre d'objets
+        self.objets = Registre()
+        for objet in list(self.joueurs.values()) + self.ennemis:
+            self.objets.ajouter(objet)
 
 
     def during_game(self):
@@ -726,7 +828,7 @@ class Server:
         joueurs_vivants = [joueur for joueur in self.joueurs.values() if not joueur.get_dead() and joueur.get_type_joueur() == "panneau"]
 
         # Le mini-jeu s'arrête si le timer s'arrête ou qu'il ne reste plus de joueurs à part le joueur solo
-        if self.timer - time.time() <= 0 or len(joueurs_vivants) < 1:
+        if self.timer - self.horloge() <= 0 or len(joueurs_vivants) < 1:
             # On passe à l'état suivant
             self.changer_etat(self.etats[self.etats.index(self.etat) + 1])
 
@@ -736,47 +838,48 @@ class Server:
         for joueur in self.joueurs.keys():
             # Comportement des ia (pathfinding assez mid honnêtement)
             if self.joueurs[joueur].get_ia():
-                # On réinitialise leurs inputs
-                self.inputs_joueurs[joueur] = [0, 0, 0]
-
-                # Comportement ia du joueur solo
-                if self.joueurs[joueur].get_type_joueur() == "solo":
-                    # Ne peut pas bouger pendant ce délai
-                    if self.joueurs[joueur].get_cooldown_movement() - time.time() <= 0:
-                        # Vise uniquement le dernier joueur vivant de la liste
-                        joueur_target = joueurs_vivants[-1]
-
-                        # Suit la position du joueur visé (en fonction de la position du pistolet du joueur solo)
-                        if joueur_target.get_pos()[0] - 10 > self.joueurs[joueur].get_pos()[0] + self.joueurs[joueur].get_taille()[0] - 48:
-                            self.inputs_joueurs[joueur][0] += 1
-                        elif joueur_target.get_pos()[0] + 10 < self.joueurs[joueur].get_pos()[0] + self.joueurs[joueur].get_taille()[0] - 48:
-                            self.inputs_joueurs[joueur][0] -= 1
+                with self.profiler.mesure("ia"):
+                    # On réinitialise leurs inputs
+                    self.inputs_joueurs[joueur] = [0, 0, 0]
 
-                        # Sinon tire car il est dans la zone de tir
-                        else:
-                            self.inputs_joueurs[joueur][2] = 1
+                    # Comportement ia du joueur solo
+                    if self.joueurs[joueur].get_type_joueur() == "solo":
+                        # Ne peut pas bouger pendant ce délai (ni s'il n'y a plus aucun joueur à viser)
+                        if self.joueurs[joueur].get_cooldown_movement() - self.horloge() <= 0 and len(joueurs_vivants) > 0:
+                            # Vise uniquement le dernier joueur vivant de la liste
+                            joueur_target = joueurs_vivants[-1]
+
+                            # Suit la position du joueur visé (en fonction de la position du pistolet du joueur solo)
+                            if joueur_target.get_pos()[0] - 10 > self.joueurs[joueur].get_pos()[0] + self.joueurs[joueur].get_taille()[0] - 48:
+                                self.inputs_joueurs[joueur][0] += 1
+                            elif joueur_target.get_pos()[0] + 10 < self.joueurs[joueur].get_pos()[0] + self.joueurs[joueur].get_taille()[0] - 48:
+                                self.inputs_joueurs[joueur][0] -= 1
+
+                            # Sinon tire car il est dans la zone de tir
+                            else:
+                                self.inputs_joueurs[joueur][2] = 1
+
+                                # Nouveau délai entre 0.5s et 1s
+                                nouveau_delai = self.rng.randint(5, 10) / 10
+                                self.joueurs[joueur].set_cooldown_movement(nouveau_delai + self.horloge())
+
+                    # Comportement de l'ia sur les panneaux
+                    else:
+                        # Ne peut pas changer de direction pendant le délai
+                        if self.joueurs[joueur].get_cooldown_movement() - self.horloge() <= 0:
+                            # Choisit une rotation (direction) aléatoire
+                            nouvelle_rotation = self.rng.choice(("left", "right", "immobile"))
+                            self.joueurs[joueur].set_rotation(nouvelle_rotation)
 
                             # Nouveau délai entre 0.5s et 1s
-                            nouveau_delai = random.randint(5, 10) / 10
-                            self.joueurs[joueur].set_cooldown_movement(nouveau_delai + time.time())
-
-                # Comportement de l'ia sur les panneaux
-                else:
-                    # Ne peut pas changer de direction pendant le délai
-                    if self.joueurs[joueur].get_cooldown_movement() - time.time() <= 0:
-                        # Choisit une rotation (direction) aléatoire
-                        nouvelle_rotation = random.choice(("left", "right", "immobile"))
-                        self.joueurs[joueur].set_rotation(nouvelle_rotation)
-
-                        # Nouveau délai entre 0.5s et 1s
-                        nouveau_delai = random.randint(5, 10) / 10
-                        self.joueurs[joueur].set_cooldown_movement(nouveau_delai + time.time())
-
-                    # Change les vecteurs de déplacement en fonction de la rotation
-                    if self.joueurs[joueur].get_rotation() == "left":
-                        self.inputs_joueurs[joueur][0] -= 1
-                    elif self.joueurs[joueur].get_rotation() == "right":
-                        self.inputs_joueurs[joueur][0] += 1
+                            nouveau_delai = self.rng.randint(5, 10) / 10
+                            self.joueurs[joueur].set_cooldown_movement(nouveau_delai + self.horloge())
+
+                        # Change les vecteurs de déplacement en fonction de la rotation
+                        if self.joueurs[joueur].get_rotation() == "left":
+                            self.inputs_joueurs[joueur][0] -= 1
+                        elif self.joueurs[joueur].get_rotation() == "right":
+                            self.inputs_joueurs[joueur][0] += 1
 
             # On tire si le joueur client a envoyé l'input correspondant
             if self.inputs_joueurs[joueur][2] > 0 and self.joueurs[joueur].get_type_joueur() == "solo":
@@ -789,24 +892,26 @@ class Server:
                 self.joueurs[joueur].set_rotation("left")
 
             # Calcul de la physique des joueurs
-            self.joueurs[joueur].calculer_velocite(self.inputs_joueurs[joueur])
-            self.joueurs[joueur].calculer_collisions(self.objets)
-            self.joueurs[joueur].appliquer_velocite()
+            with self.profiler.mesure("physique"):
+                self.joueurs[joueur].calculer_velocite(self.inputs_joueurs[joueur])
+                self.joueurs[joueur].calculer_collisions(self.objets.get_entites())
+                self.joueurs[joueur].appliquer_velocite()
 
             # Réinitialise le sprite du pistolet après un cours délai
-            if self.joueurs[joueur].get_cooldown_tir() - time.time() <= 1.9:
+            if self.joueurs[joueur].get_cooldown_tir() - self.horloge() <= 1.9:
                 self.joueurs[joueur].set_etat_tir("recharge")
 
         # Pour chaque flèche, leur vecteur de déplacement se dirige vers le haut
-        for objet in self.objets: 
+        for objet in self.objets.get_entites():
             if type(objet) == Fleche:
-                objet.calculer_velocite([0, -1])
-                objet.calculer_collisions(self.objets)
-                objet.appliquer_velocite()
+                with self.profiler.mesure("physique"):
+                    objet.calculer_velocite([0, -1])
+                    touche = objet.calculer_collisions(self.objets.get_entites())
+                    objet.appliquer_velocite()
 
-                # On supprime toutes les flèches qui partent trop loin en hauteur
-                if objet.get_pos()[1] < 250:
-                    self.objets.remove(objet)
+                # On supprime les flèches qui ont touché un objet et toutes celles qui partent trop loin en hauteur
+                if touche or objet.get_pos()[1] < 250:
+                    self.objets.retirer(objet)
 
             # Comportement des ennemis (même que celui de l'ia)
             elif type(objet) == Ennemi:
@@ -814,26 +919,28 @@ class Server:
                 self.directions_ennemis[objet] = [0, 0]
 
                 if not objet.get_dead():
-                    # Ne peut pas changer de direction pendant le délai
-                    if objet.get_move_cooldown() - time.time() <= 0:
-                        # Choisit une rotation (direction) aléatoire
-                        nouvelle_rotation = random.choice(("left", "right", "immobile"))
-                        objet.set_rotation(nouvelle_rotation)
-
-                        # Nouveau délai entre 0.5s et 1s
-                        nouveau_delai = random.randint(5, 10) / 10
-                        objet.set_move_cooldown(nouveau_delai + time.time())
-
-                    # Change les vecteurs de déplacement en fonction de la rotation
-                    if objet.get_rotation() == "left":
-                        self.directions_ennemis[objet][0] -= 1
-                    elif objet.get_rotation() == "right":
-                        self.directions_ennemis[objet][0] += 1
+                    with self.profiler.mesure("ia"):
+                        # Ne peut pas changer de direction pendant le délai
+                        if objet.get_move_cooldown() - self.horloge() <= 0:
+                            # Choisit une rotation (direction) aléatoire
+                            nouvelle_rotation = self.rng.choice(("left", "right", "immobile"))
+                            objet.set_rotation(nouvelle_rotation)
+
+                            # Nouveau délai entre 0.5s et 1s
+                            nouveau_delai = self.rng.randint(5, 10) / 10
+                            objet.set_move_cooldown(nouveau_delai + self.horloge())
+
+                        # Change les vecteurs de déplacement en fonction de la rotation
+                        if objet.get_rotation() == "left":
+                            self.directions_ennemis[objet][0] -= 1
+                        elif objet.get_rotation() == "right":
+                            self.directions_ennemis[objet][0] += 1
 
                     # Calcul de la physique des ennemis
-                    objet.calculer_velocite(self.directions_ennemis[objet])
-                    objet.calculer_collisions(self.objets)
-                    objet.appliquer_velocite()
+                    with self.profiler.mesure("physique"):
+                        objet.calculer_velocite(self.directions_ennemis[objet])
+                        objet.calculer_collisions(self.objets.get_entites())
+                        objet.appliquer_velocite()
 
 
     def calculate_score(self) -> None:
@@ -861,56 +968,118 @@ class Server:
         self.changer_etat(self.etats[self.etats.index(self.etat) + 1])
 
 
-    def run(self, clock) -> None:
-        self.is_running = True
+    def maj_etats(self) -> None:
+        """
+        Cette méthode permet de passer à l'état suivant du mini-jeu lorsque tous les joueurs sont prêts.
+        """
 
-        print("Lancement du mini-jeu: Archer Ival")
-        while self.is_running:
-            # On récupère le nombre de joueurs prêts (les ia sont automatiquement prêts)
-            self.nb_joueurs_prets = len([joueur for joueur in self.joueurs.keys() if self.joueurs[joueur].get_ready() or self.joueurs[joueur].get_ia()])
+        # Lorsque tous les joueurs sont prêts (nb_joueurs_prets est tenu à jour par marquer_pret et changer_etat)
+        if self.tous_prets():
+            # On finalise la création des joueurs avant que le jeu commence
+            if self.etat == "minigame_load":
+                self.load_game()
 
-            # Lorsque tous les joueurs sont prêts
-            if len(self.joueurs.keys()) > 0 and self.nb_joueurs_prets == len(self.joueurs.keys()):
-                # On finalise la création des joueurs avant que le jeu commence
-                if self.etat == "minigame_load":
-                    self.load_game()
+            # Calcule le classement final
+            if self.etat == "minigame_end":
+                self.calculate_score()
 
-                # Calcule le classement final
-                if self.etat == "minigame_end":
-                    self.calculate_score()
+            # Si on a fini le mini-jeu, on stoppe ce serveur
+            if self.etat == "minigame_winners":
+                self.is_running = False
 
-                # Si on a fini le mini-jeu, on stoppe ce serveur
-                if self.etat == "minigame_winners":
-                    self.is_running = False
+            # Sinon on passe à l'état suivant
+            else:
+                self.changer_etat(self.etats[self.etats.index(self.etat) + 1])
 
-                # Sinon on passe à l'état suivant
-                else:
-                    self.changer_etat(self.etats[self.etats.index(self.etat) + 1])
+            if self.etat == "minigame_during":
+                # Lancement du timer
+                self.timer = self.horloge() + self.timer
 
-                if self.etat == "minigame_during":
-                    # Lancement du timer
-                    self.timer = time.time() + self.timer
 
-            # Calcul des frames pour la vitesse d'animation des personnages
-            if self.etat != "minigame_load" and self.etat != "minigame_select":
-                for joueur in self.joueurs.keys():
-                    frame = self.joueurs[joueur].get_frame() + 0.2
+    def maj_physique(self) -> None:
+        """
+        Cette méthode permet de calculer les animations et la physique des entités du mini-jeu.
+        """
 
-                    # N'a pas d'animation s'il ne dessine pas
-                    if self.joueurs[joueur].get_type_joueur() == "solo":
-                        # L'animation reste figée si le joueur est immobile
-                        if self.inputs_joueurs[joueur][0] == 0 and self.inputs_joueurs[joueur][1] == 0: frame = 0
-                    else:
-                        frame = 0
+        # Calcul des frames pour la vitesse d'animation des personnages
+        for joueur in self.joueurs.keys():
+            frame = self.joueurs[joueur].get_frame() + 0.2
 
-                    self.joueurs[joueur].set_frame(frame)
+            # N'a pas d'animation s'il ne dessine pas
+            if self.joueurs[joueur].get_type_joueur() == "solo":
+                # L'animation reste figée si le joueur est immobile
+                if self.inputs_joueurs[joueur][0] == 0 and self.inputs_joueurs[joueur][1] == 0: frame = 0
+            else:
+                frame = 0
 
-            # Exécution du code qui gère le mini-jeu
-            if self.etat == "minigame_during":
+            self.joueurs[joueur].set_frame(frame)
+
+
+    def tick(self) -> None:
+        """
+        Cette méthode permet d'exécuter un tick du serveur, chaque phase étant mesurée par le profiler.
+        """
+
+        with self.profiler.mesure("etats"):
+            self.maj_etats()
+
+        if self.etat != "minigame_load" and self.etat != "minigame_select":
+            with self.profiler.mesure("physique"):
+                self.maj_physique()
+
+        # Exécution du code qui gère le mini-jeu (le comportement des ia et la physique qu'il calcule sont
+        # mesurés à part, dans leurs propres phases)
+        if self.etat == "minigame_during":
+            with self.profiler.mesure("logique"):
                 self.during_game()
 
-            if self.etat == "minigame_score":
-                self.calculate_score()
+        if self.etat == "minigame_score":
+            self.calculate_score()
+
+        # L'état du tick est encodé une seule fois, quel que soit le nombre de clients
+        with self.profiler.mesure("serialisation"):
+            self.publier_snapshot()
+
+
+    def publier_snapshot(self) -> None:
+        """
+        Cette méthode encode l'état du mini-jeu et remplace d'un coup celui envoyé aux clients
+        (la chaîne précédente n'est jamais modifiée, les threads des clients peuvent donc l'envoyer sans verrou).
+        """
+
+        self.snapshot = json.dumps(self.get_infos())
+
+
+    def get_snapshot(self) -> str:
+        """
+        Cette méthode permet de récupérer le dernier état encodé du mini-jeu.
+
+        Renvois:
+            - str: État du mini-jeu en json (encodé immédiatement si aucun tick n'a encore été exécuté).
+        """
+
+        snapshot = self.snapshot
+
+        if snapshot is None:
+            snapshot = json.dumps(self.get_infos())
+
+        return snapshot
+
+
+    def run(self, clock) -> None:
+        self.is_running = True
+
+        if not self.silencieux:
+            print("Lancement du mini-jeu: Archer Ival")
+        while self.is_running:
+            # Pendant le choix et le chargement du mini-jeu rien ne bouge, on attend donc que les joueurs soient prêts
+            if self.etat == "minigame_select" or self.etat == "minigame_load":
+                with self.condition:
+                    self.condition.wait_for(self.tous_prets, timeout=1)
+
+            self.profiler.debut_tick()
+            self.tick()
+            self.profiler.fin_tick()
 
             self.current_fps = clock.get_fps()
             clock.tick(self.fps)
\ No newline at end of file
@@ -0,0 +1,241 @@
+#Projet : Mayro Party
+#Auteurs : Hinata Bouaziz, Antoine Desrues, Alexandre Guillaume, Matisse Moreau
+
+# ------/ Importations des bibliothèques \------
+
+import pygame
+import hashlib
+import mmap
+import struct
+import os
+import sys
+from os import sep
+
+from utils import scale_image_by
+from traceur import TRACEUR
+
+# ------/ Constantes \------
+
+# Dossier des images et des sons déjà décodés (rempli au premier lancement, peut être supprimé sans risque)
+DOSSIER_CACHE = sep.join(["..", "data", "cache"])
+
+# Version du format des fichiers du cache (fait partie de la clé: changer le format invalide tout le cache)
+VERSION_CACHE = b"1"
+
+# En-tête d'une image du cache: largeur, hauteur, format des pixels ("P", "RGB" ou "RGBA"), nombre de couleurs de
+# la palette (qui suit l'en-tête, 3 octets par couleur) et indice de la couleur transparente (ou AUCUN_INDICE)
+ENTETE_IMAGE = struct.Struct("<II4sII")
+AUCUN_INDICE = 0xFFFFFFFF
+
+# Empreinte du contenu de chaque fichier source déjà lu par ce processus
+EMPREINTES = {}
+
+# ------/ Fonctions utiliatires \------
+
+def empreinte_source(chemin: str) -> str:
+    """
+    Cette fonction permet de calculer l'empreinte du contenu d'une image ou d'un son (calculée une fois par lancement).
+
+    Paramètres:
+        - chemin (str): Chemin du fichier source.
+    Renvois:
+        - str: Empreinte (sha1) en hexadécimal.
+    """
+
+    if not chemin in EMPREINTES:
+        with open(chemin, "rb") as fichier:
+            EMPREINTES[chemin] = hashlib.sha1(VERSION_CACHE + fichier.read()).hexdigest()
+
+    return EMPREINTES[chemin]
+
+
+def chemin_cache(chemin: str, suffixe: str) -> str:
+    """
+    Cette fonction donne le fichier du cache d'une ressource.
+
+    Paramètres:
+        - chemin (str): Chemin du fichier source.
+        - suffixe (str): Ce qui distingue les versions décodées d'une même source (facteur, format du mixer...).
+    Renvois:
+        - str: Chemin du fichier dans le cache.
+    """
+
+    return sep.join([DOSSIER_CACHE, empreinte_source(chemin) + "_" + suffixe])
+
+
+def ecrire_cache(fichier_cache: str, *morceaux: bytes) -> None:
+    """
+    Cette fonction écrit un fichier du cache d'un seul coup (un fichier à moitié écrit n'est jamais lu).
+
+    Paramètres:
+        - fichier_cache (str): Chemin du fichier dans le cache.
+        - morceaux (bytes): Contenu du fichier.
+    """
+
+    os.makedirs(DOSSIER_CACHE, exist_ok=True)
+
+    temporaire = fichier_cache + "." + str(os.getpid())
+    with open(temporaire, "wb") as sortie:
+        for morceau in morceaux:
+            sortie.write(morceau)
+
+    os.replace(temporaire, fichier_cache)
+
+
+def projeter(fichier_cache: str) -> "mmap.mmap | None":
+    """
+    Cette fonction projette un fichier du cache en mémoire (copie à l'écriture: modifier une image ne change pas le fichier).
+
+    Paramètres:
+        - fichier_cache (str): Chemin du fichier dans le cache.
+    Renvois:
+        - mmap.mmap ou None: Contenu du fichier, ou None s'il n'est pas dans le cache.
+    """
+
+    try:
+        with open(fichier_cache, "rb") as fichier:
+            return mmap.mmap(fichier.fileno(), 0, access=mmap.ACCESS_COPY)
+
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def indice_transparent(image: pygame.Surface) -> int: # type: ignore
+    """
+    Cette fonction permet de retrouver l'indice de la couleur transparente d'une image en palette (get_colorkey ne
+    donne que sa couleur, que d'autres indices peuvent aussi avoir).
+
+    Paramètres:
+        - image (pygame.Surface): Image en palette avec une couleur transparente.
+    Renvois:
+        - int: Indice de la couleur transparente dans la palette.
+    """
+
+    couleur_transparente = tuple(image.get_colorkey())[:3]
+    copie = image.copy()
+
+    # On change une à une les couleurs identiques: celle qui est transparente change aussi la couleur renvoyée par get_colorkey
+    for indice, couleur in enumerate(image.get_palette()):
+        if tuple(couleur)[:3] == couleur_transparente:
+            copie.set_palette_at(indice, (couleur_transparente[0] ^ 1, couleur_transparente[1], couleur_transparente[2]))
+
+            if tuple(copie.get_colorkey())[:3] != couleur_transparente:
+                return indice
+
+            copie.set_palette_at(indice, couleur_transparente)
+
+    return image.map_rgb(couleur_transparente)
+
+
+def charger_image(chemin: str, facteur: "int | float | None" = None) -> pygame.Surface: # type: ignore
+    """
+    Cette fonction charge une image (agrandie par facteur) depuis le cache, ou la décode et l'ajoute au cache.
+
+    Paramètres:
+        - chemin (str): Chemin de l'image.
+        - facteur (int, float ou None): Facteur donné à scale_image_by (None pour garder la taille d'origine).
+    Renvois:
+        - pygame.Surface: L'image, dont les pixels sont ceux du fichier du cache projeté en mémoire.
+    """
+
+    assert facteur is None or type(facteur) in (int, float), "Erreur: Le 2ème paramètre (facteur) est censé être un nombre."
+
+    with TRACEUR.intervalle("charger_image", args={"chemin": chemin} if TRACEUR.get_actif() else None):
+        return lire_image(chemin, facteur)
+
+
+def lire_image(chemin: str, facteur: "int | float | None") -> pygame.Surface: # type: ignore
+    """
+    Cette fonction lit une image du cache, ou la décode et l'ajoute au cache (voir charger_image).
+
+    Paramètres:
+        - chemin (str): Chemin de l'image.
+        - facteur (int, float ou None): Facteur donné à scale_image_by.
+    Renvois:
+        - pygame.Surface: L'image.
+    """
+
+    fichier_cache = chemin_cache(chemin, "x" + str(facteur) + ".image")
+    donnees = projeter(fichier_cache)
+
+    if donnees is not None:
+        largeur, hauteur, format_pixels, nb_couleurs, transparent = ENTETE_IMAGE.unpack_from(donnees, 0)
+        format_pixels = format_pixels.rstrip(b"\0").decode("ascii")
+        debut_pixels = ENTETE_IMAGE.size + nb_couleurs * 3
+
+        if len(donnees) == debut_pixels + largeur * hauteur * {"P": 1, "RGB": 3, "RGBA": 4}.get(format_pixels, 0):
+            image = pygame.image.frombuffer(memoryview(donnees)[debut_pixels:], (largeur, hauteur), format_pixels)
+
+            if format_pixels == "P":
+                palette = [tuple(donnees[ENTETE_IMAGE.size + i * 3:ENTETE_IMAGE.size + i * 3 + 3]) for i in range(nb_couleurs)]
+                image.set_palette(palette)
+
+                if transparent != AUCUN_INDICE:
+                    image.set_colorkey(palette[transparent])
+
+            return image
+
+    image = pygame.image.load(chemin)
+    if facteur is not None:
+        image = scale_image_by(image, facteur)
+
+    palette = []
+    transparent = AUCUN_INDICE
+
+    # Les images en palette restent en palette (deux fois plus rapides à afficher qu'en RGB)
+    if image.get_bitsize() == 8:
+        format_pixels = "P"
+        palette = [tuple(couleur)[:3] for couleur in image.get_palette()]
+
+        if image.get_colorkey() is not None:
+            transparent = indice_transparent(image)
+
+            # La couleur transparente doit être la seule de sa couleur dans la palette (set_colorkey prend une couleur)
+            couleurs = set(palette[:transparent] + palette[transparent + 1:])
+            palette[transparent] = next(couleur for couleur in ((i, j, 77) for i in range(256) for j in range(2)) if not couleur in couleurs)
+
+    else:
+        format_pixels = "RGBA" if image.get_flags() & pygame.SRCALPHA or image.get_colorkey() is not None else "RGB"
+
+    ecrire_cache(fichier_cache, ENTETE_IMAGE.pack(image.get_width(), image.get_height(), format_pixels.encode("ascii"), len(palette), transparent),
+                 bytes([composante for couleur in palette for composante in couleur]),
+                 pygame.image.tobytes(image, format_pixels))
+
+    return image
+
+
+def charger_son(chemin: str) -> pygame.mixer.Sound: # type: ignore
+    """
+    Cette fonction charge un son depuis le cache (échantillons déjà décodés au format du mixer), ou le décode et
+    l'ajoute au cache.
+
+    Paramètres:
+        - chemin (str): Chemin du son.
+    Renvois:
+        - pygame.mixer.Sound: Le son.
+    """
+
+    # Les échantillons dépendent du format du mixer (fréquence, taille et nombre de canaux)
+    frequence, format_son, nb_canaux = pygame.mixer.get_init()
+    fichier_cache = chemin_cache(chemin, str(frequence) + "_" + str(format_son) + "_" + str(nb_canaux) + ".son")
+    donnees = projeter(fichier_cache)
+
+    if donnees is not None:
+        son = pygame.mixer.Sound(buffer=donnees)
+        donnees.close()
+        return son
+
+    son = pygame.mixer.Sound(chemin)
+    ecrire_cache(fichier_cache, son.get_raw())
+
+    return son
+
+
+if '__main__' == __name__:
+    # Utilisation: python cache_ressources.py [--vider] (sans option: affiche la taille du cache)
+    if "--vider" in sys.argv and os.path.isdir(DOSSIER_CACHE):
+        for nom in os.listdir(DOSSIER_CACHE):
+            os.remove(sep.join([DOSSIER_CACHE, nom]))
+
+    fichiers = os.listdir(DOSSIER_CACHE) if os.path.isdir(DOSSIER_CACHE) else []
+    print(str(len(fichiers)) + " fichiers, " + str(round(sum(os.path.getsize(sep.join([DOSSIER_CACHE, nom])) for nom in fichiers) / (1024 * 1024), 1)) + " Mo")
@@ -0,0 +1,100 @@
+#Projet : Mayro Party
+#Auteurs : Hinata Bouaziz, Antoine Desrues, Alexandre Guillaume, Matisse Moreau
+
+# ------/ Importations des bibliothèques \------
+
+import pygame
+
+# ------/ Classes \------
+
+# Classe d'une file d'affichage des scènes en 2.5D (les objets sont dessinés du plus profond au moins profond)
+class FileRendu:
+
+    # ------/ Constructeur \------
+
+    def __init__(self) -> None:
+        """
+        Constructeur de la classe FileRendu. Les objets de la file doivent avoir les méthodes get_priority
+        (la plus grande priorité est affichée en premier) et get_blits (images à afficher et leurs positions).
+
+        Attributs internes:
+            - objets (dict): Objets affichés (les clés), dans l'ordre d'affichage du dernier tri. Un dictionnaire garde
+              l'ordre comme une liste, mais un objet s'y retire sans parcourir la file.
+            - blits (list): Images à afficher et leurs positions (liste réutilisée d'une frame à l'autre).
+        """
+
+        self.objets = {}
+        self.blits = []
+
+
+    # ------/ Getters \------
+
+    def get_objets(self) -> list:
+        return list(self.objets)
+
+    def get_taille(self) -> int:
+        return len(self.objets)
+
+
+    # ------/ Méthodes \------
+
+    def ajouter(self, objet: any) -> None:
+        """
+        Cette méthode ajoute un objet à la file (il prendra sa place au prochain tri).
+
+        Paramètres:
+            - objet (any): Objet à afficher.
+        """
+
+        assert hasattr(objet, "get_priority") and hasattr(objet, "get_blits"), "Erreur: Le 1er paramètre (objet) doit avoir les méthodes get_priority et get_blits."
+
+        self.objets[objet] = None
+
+
+    def retirer(self, objet: any) -> None:
+        """
+        Cette méthode retire un objet qui n'est plus affiché (entité disparue).
+
+        Paramètres:
+            - objet (any): Objet à retirer (rien ne se passe s'il n'est pas dans la file).
+        """
+
+        self.objets.pop(objet, None)
+
+
+    def vider(self) -> None:
+        """
+        Cette méthode retire tous les objets de la file (nouvelle partie).
+        """
+
+        self.objets.clear()
+        self.blits.clear()
+
+
+    def trier(self) -> None:
+        """
+        Cette méthode remet les objets dans l'ordre de leur priorité d'affichage.
+        La liste garde l'ordre de la frame précédente: comme les objets bougent peu d'une frame à l'autre, elle
+        est presque triée et le tri (timsort) ne fait que quelques déplacements au lieu d'un tri complet.
+        À priorité égale, les objets gardent leur ordre précédent.
+        """
+
+        self.objets = dict.fromkeys(sorted(self.objets, key=lambda objet: objet.get_priority(), reverse=True))
+
+
+    def afficher(self, screen: pygame.Surface) -> None: # type: ignore
+        """
+        Cette méthode affiche tous les objets de la file en un seul appel à Surface.blits.
+
+        Paramètres:
+            - screen (pygame.Surface): L'écran de jeu de pygame.
+        """
+
+        # Tests des types de variables
+        assert type(screen) == pygame.Surface, "Erreur: Le paramètre (screen) n'est pas une surface pygame."
+
+        self.blits.clear()
+        for objet in self.objets:
+            self.blits.extend(objet.get_blits())
+
+        screen.blits(self.blits, doreturn=False)
@@ -10,7 +10,11 @@ import random
 import time
 from os import sep
 
-from utils import Network, scale_image_by
+from utils import Network, scale_image_by, presenter
+from hud import HUD
+from protocole import requete, GET_ETAT, PRET, TAILLE_JOUEURS
+from cache_ressources import charger_image, charger_son
+from file_rendu import FileRendu
 import json
 
 # ------/ Classes \------
@@ -68,18 +72,18 @@ class Joueur:
         # Définition des sprites automatiquement (pour les joueurs / ia)
         self.sprites = {
             "walk": {
-                "left": [scale_image_by(pygame.image.load(sep.join([self.sprites_directory, "walk_left" + str(i) + ".png"])), 3) for i in range(8)],
-                "down": [scale_image_by(pygame.image.load(sep.join([self.sprites_directory, "walk_down" + str(i) + ".png"])), 3) for i in range(8)],
-                "up": [scale_image_by(pygame.image.load(sep.join([self.sprites_directory, "walk_up" + str(i) + ".png"])), 3) for i in range(8)],
-                "right": [scale_image_by(pygame.image.load(sep.join([self.sprites_directory, "walk_right" + str(i) + ".png"])), 3) for i in range(8)]
+                "left": [charger_image(sep.join([self.sprites_directory, "walk_left" + str(i) + ".png"]), 3) for i in range(8)],
+                "down": [charger_image(sep.join([self.sprites_directory, "walk_down" + str(i) + ".png"]), 3) for i in range(8)],
+                "up": [charger_image(sep.join([self.sprites_directory, "walk_up" + str(i) + ".png"]), 3) for i in range(8)],
+                "right": [charger_image(sep.join([self.sprites_directory, "walk_right" + str(i) + ".png"]), 3) for i in range(8)]
             },
             "jump": {
-                "left": [scale_image_by(pygame.image.load(sep.join([self.sprites_directory, "jump_left" + str(i) + ".png"])), 3) for i in range(2)],
-                "down": [scale_image_by(pygame.image.load(sep.join([self.sprites_directory, "jump_down" + str(i) + ".png"])), 3) for i in range(2)],
-                "up": [scale_image_by(pygame.image.load(sep.join([self.sprites_directory, "jump_up" + str(i) + ".png"])), 3) for i in range(2)],
-                "right": [scale_image_by(pygame.image.load(sep.join([self.sprites_directory, "jump_right" + str(i) + ".png"])), 3) for i in range(2)]
+                "left": [charger_image(sep.join([self.sprites_directory, "jump_left" + str(i) + ".png"]), 3) for i in range(2)],
+                "down": [charger_image(sep.join([self.sprites_directory, "jump_down" + str(i) + ".png"]), 3) for i in range(2)],
+                "up": [charger_image(sep.join([self.sprites_directory, "jump_up" + str(i) + ".png"]), 3) for i in range(2)],
+                "right": [charger_image(sep.join([self.sprites_directory, "jump_right" + str(i) + ".png"]), 3) for i in range(2)]
             },
-            "death": [scale_image_by(pygame.image.load(sep.join([self.sprites_directory, "death" + str(i) + ".png"])), 3) for i in range(4)]
+            "death": [charger_image(sep.join([self.sprites_directory, "death" + str(i) + ".png"]), 3) for i in range(4)]
         }
 
         # Initialisation et positionnement du sprite actuel
@@ -87,7 +91,7 @@ class Joueur:
         self.sprite_pos = list(self.pos)
 
         # Initialisation et positionnement de l'ombre
-        self.shadow = scale_image_by(pygame.image.load(sep.join([self.sprites_directory, "shadow.png"])), 3)
+        self.shadow = charger_image(sep.join([self.sprites_directory, "shadow.png"]), 3)
         self.shadow_pos = list(self.pos)
 
         # Initialisation de la frame choisie
@@ -99,8 +103,8 @@ class Joueur:
 
         # Sons du joueur
         self.sounds = {
-            "jump": [pygame.mixer.Sound(sep.join(["..", "data", "sounds", self.perso, "jump" + str(i) + ".ogg"])) for i in range(2)],
-            "death": pygame.mixer.Sound(sep.join(["..", "data", "sounds", self.perso, "death.ogg"]))
+            "jump": [charger_son(sep.join(["..", "data", "sounds", self.perso, "jump" + str(i) + ".ogg"])) for i in range(2)],
+            "death": charger_son(sep.join(["..", "data", "sounds", self.perso, "death.ogg"]))
         }
 
         # Initialisation de la taille du joueur (uniquement fournie au serveur)
@@ -240,6 +244,27 @@ class Joueur:
                 self.sprite = self.sprites["jump"][self.rotation][1]
 
 
+    def get_blits(self) -> list:
+        """
+        Cette méthode donne les images du joueur et leurs positions (utilisée par la file d'affichage).
+
+        Renvois:
+            - list: Couples (image, position) à afficher dans l'ordre.
+        """
+
+        blits = []
+
+        # Affichage de l'ombre du personnage (dépend de la hauteur du sol)
+        if not self.dead:
+            blits.append((self.shadow, (round(self.shadow_pos[0]), round(self.shadow_pos[1] + self.ground_height))))
+
+        # Ici, self.invincibility % 5 == 0 permet de créer un effet de clignotement uniquement lors de l'invincibilité
+        if self.invincibility % 5 == 0:
+            blits.append((self.sprite, (round(self.pos[0]), round(self.pos[1] + self.pos[2]))))
+
+        return blits
+
+
     def afficher(self, screen: pygame.Surface) -> None: # type: ignore
         """
         Cette méthode permet de dessiner le joueur sur l'écran.
@@ -251,16 +276,7 @@ class Joueur:
         # Tests des types de variables
         assert type(screen) == pygame.Surface, "Erreur: Le paramètre donné (screen) n'est pas une surface pygame."
 
-        # Initialisation des facteurs pour la taille de l'écran
-        screen_factor = ((screen.get_rect().size[0] / 1280), (screen.get_rect().size[1] / 720))
-
-        # Affichage de l'ombre du personnage (dépend de la hauteur du sol)
-        if not self.dead:
-            screen.blit(scale_image_by(self.shadow, screen_factor), (round(self.shadow_pos[0] * screen_factor[0]), round((self.shadow_pos[1] + self.ground_height) * screen_factor[1])))
-
-        # Ici, self.invincibility % 5 == 0 permet de créer un effet de clignotement uniquement lors de l'invincibilité
-        if self.invincibility % 5 == 0:
-            screen.blit(scale_image_by(self.sprite, screen_factor), (round(self.pos[0] * screen_factor[0]), round((self.pos[1] + self.pos[2]) * screen_factor[1])))
+        screen.blits(self.get_blits(), doreturn=False)
 
 
 
@@ -292,10 +308,10 @@ class Hexagon:
         # Caractéristiques par défaut
         self.pos = pos
         self.color = color
-        self.sprite = scale_image_by(pygame.image.load(sprite), 4)
+        self.sprite = charger_image(sprite, 4)
 
         # Initialisation et positionnement de l'ombre
-        self.shadow = scale_image_by(pygame.image.load(sep.join(["..", "data", "sprites", "minigames", "hexagon_heat", "hexagons", "shadow.png"])), 4)
+        self.shadow = charger_image(sep.join(["..", "data", "sprites", "minigames", "hexagon_heat", "hexagons", "shadow.png"]), 4)
         self.shadow_pos = list(self.pos)
 
         # Initialisation de la variable hidden
@@ -371,6 +387,27 @@ class Hexagon:
         self.shadow_pos[2] = 0
 
 
+    def get_blits(self) -> list:
+        """
+        Cette méthode donne les images de l'hexagone et leurs positions (utilisée par la file d'affichage).
+
+        Renvois:
+            - list: Couples (image, position) à afficher dans l'ordre.
+        """
+
+        blits = []
+
+        # On ne l'affiche pas s'il est caché
+        if not self.hidden:
+            # On n'affiche pas l'ombre si l'hexagone est posé sur le sol
+            if self.pos[2] != 0:
+                blits.append((self.shadow, (round(self.shadow_pos[0]), round(self.shadow_pos[1]))))
+
+            blits.append((self.sprite, (round(self.pos[0]), round(self.pos[1] + self.pos[2]))))
+
+        return blits
+
+
     def afficher(self, screen: pygame.Surface) -> None: # type: ignore
         """
         Cette méthode permet d'afficher l'hexagone sur l'écran.
@@ -382,16 +419,7 @@ class Hexagon:
         # Tests des types de variables
         assert type(screen) == pygame.Surface, "Erreur: Le paramètre (screen) n'est pas une surface pygame."
 
-        # Initialisation des facteurs pour la taille de l'écran
-        screen_factor = ((screen.get_rect().size[0] / 1280), (screen.get_rect().size[1] / 720))
-
-        # On ne l'affiche pas s'il est caché
-        if not self.hidden:
-            # On n'affiche pas l'ombre si l'hexagone est posé sur le sol
-            if self.pos[2] != 0:
-                screen.blit(scale_image_by(self.shadow, screen_factor), (round(self.shadow_pos[0] * screen_factor[0]), round(self.shadow_pos[1] * screen_factor[1])))
-
-            screen.blit(scale_image_by(self.sprite, screen_factor), (round(self.pos[0] * screen_factor[0]), round((self.pos[1] + self.pos[2]) * screen_factor[1])))
+        screen.blits(self.get_blits(), doreturn=False)
 
 
 
@@ -491,17 +519,17 @@ class MiniGame:
 
         Attributs internes:
             - quit (bool): Variable qui permet de détecter si le joueur a manuellement fermé le jeu.
-            - screen_factor: Les multiplicateurs pour la taille de l'écran.
 
             - show_fps (bool): Paramètre de débug permettant d'afficher les fps.
             - show_server_fps (bool): Paramètre de débug permettant d'afficher les fps du serveur.
+            - memoire (GestionnaireMemoire): Suivi de la mémoire du client (usage affiché avec les fps).
 
             - fps_font (pygame.freetype.Font): Police d'écriture pour les fps.
             - game_font (pygame.freetype.Font): Police d'écriture principale du mini-jeu.
 
             - joueurs (list): Liste des joueurs.
             - objets (list): Liste des objets.
-            - priorities (dict): Priorité d'affichage pour chaque objet.
+            - file_rendu (FileRendu): Objets à afficher, triés selon leur priorité d'affichage.
 
             - toad (list): Images du Toad de l'écran de chargement.
             - toad_shadow (pygame.Surface): Image de l'ombre de Toad.
@@ -533,7 +561,6 @@ class MiniGame:
         self.fps = fps
 
         self.quit = False
-        self.screen_factor = (0, 0)
 
         # Paramètres de débug
         self.show_fps = True
@@ -547,32 +574,35 @@ class MiniGame:
         self.joueurs = {}
         self.hexagones = {}
         self.objets = []
-        self.priorities = {}
+        self.file_rendu = FileRendu()
 
         # Sprites de toad (pour le chargement)
-        self.toad = [pygame.image.load(sep.join(["..", "data", "sprites", "minigames", "general", "toad", "toad.png"])),
-                     pygame.image.load(sep.join(["..", "data", "sprites", "minigames", "general", "toad", "toad_open.png"]))]
-        self.toad_shadow = pygame.image.load(sep.join(["..", "data", "sprites", "minigames", "general", "toad", "shadow.png"]))
-        self.toad_bubble = pygame.image.load(sep.join(["..", "data", "sprites", "minigames", "general", "toad", "bubble.png"]))
+        self.toad = [charger_image(sep.join(["..", "data", "sprites", "minigames", "general", "toad", "toad.png"])),
+                     charger_image(sep.join(["..", "data", "sprites", "minigames", "general", "toad", "toad_open.png"]))]
+        self.toad_shadow = charger_image(sep.join(["..", "data", "sprites", "minigames", "general", "toad", "shadow.png"]))
+        self.toad_bubble = charger_image(sep.join(["..", "data", "sprites", "minigames", "general", "toad", "bubble.png"]))
 
         # Emplacement des sprites du mini-jeu
         minigame_directory = sep.join(["..", "data", "sprites", "minigames", "hexagon_heat"])
 
         # Sprites utilisés dans la classe
-        self.bg = pygame.image.load(sep.join([minigame_directory, "lava.png"]))
+        self.bg = charger_image(sep.join([minigame_directory, "lava.png"]))
         self.current_toad = self.toad[0]
-        self.toad_platform = pygame.image.load(sep.join([minigame_directory, "hexagons", "toad.png"]))
+        self.toad_platform = charger_image(sep.join([minigame_directory, "hexagons", "toad.png"]))
 
         # Création des bulles de dialogues où s'affichent les plateformes à partir d'une liste de couleurs
         colors = ["blue", "green", "magenta", "pink", "cyan", "yellow", "red"]
-        self.bubbles = {color: pygame.image.load(sep.join([minigame_directory, "toad", color + "_bubble.png"])) for color in colors}
+        self.bubbles = {color: charger_image(sep.join([minigame_directory, "toad", color + "_bubble.png"])) for color in colors}
 
         # Son de lave
-        self.lava_sound = pygame.mixer.Sound(sep.join(["..", "data", "sounds", "minigames", "hexagon_heat", "lava_ambient.ogg"]))
+        self.lava_sound = charger_son(sep.join(["..", "data", "sounds", "minigames", "hexagon_heat", "lava_ambient.ogg"]))
 
         # Initialisation du réseau
         self.net = None
 
+        # Suivi de la mémoire (donné par le jeu)
+        self.memoire = None
+
 
     # ------/ Getters \------
 
@@ -585,6 +615,9 @@ class MiniGame:
     def set_net(self, new_net) -> Network:
         self.net = new_net
 
+    def set_memoire(self, new_memoire) -> None:
+        self.memoire = new_memoire
+
 
     # ------/ Méthodes \------
 
@@ -608,7 +641,7 @@ class MiniGame:
             assert elem >= -1 and elem <= 1, "Erreur: La liste donnée doit uniquement contenir des entiers compris entre -1 et 1"
 
         # Envoie les inputs au serveur et demande des infos sur l'environnement
-        infos_environnement = json.loads(self.net.send(str(input_joueur[0]) + "|" + str(input_joueur[1]) + "|" + str(input_joueur[2])))
+        infos_environnement = self.net.etat_minijeu(str(input_joueur[0]) + "|" + str(input_joueur[1]) + "|" + str(input_joueur[2]))
         infos_joueurs = infos_environnement["joueurs"]
         infos_hexagones = infos_environnement["hexagones"]
         infos_couleur = infos_environnement["couleur"]
@@ -618,14 +651,14 @@ class MiniGame:
         self.current_toad = self.toad[1] if infos_couleur[1] else self.toad[0]
 
         # On affiche les sprites du jeu dans un ordre d'affichage prédéfini
-        self.screen.blit(scale_image_by(self.bg, self.screen_factor), (0, 0))
-        self.screen.blit(scale_image_by(self.toad_platform, (4 * self.screen_factor[0], 4 * self.screen_factor[1])), (round(1100 * self.screen_factor[0]), round(348 * self.screen_factor[1])))
-        self.screen.blit(scale_image_by(self.toad_shadow, (4 * self.screen_factor[0], 4 * self.screen_factor[1])), (round(1134 * self.screen_factor[0]), round(382 * self.screen_factor[1])))
-        self.screen.blit(scale_image_by(self.current_toad, (3 * self.screen_factor[0], 3 * self.screen_factor[1])), (round(1128 * self.screen_factor[0]), round(300 * self.screen_factor[1])))
+        self.screen.blit(self.bg, (0, 0))
+        self.screen.blit(scale_image_by(self.toad_platform, 4), (1100, 348))
+        self.screen.blit(scale_image_by(self.toad_shadow, 4), (1134, 382))
+        self.screen.blit(scale_image_by(self.current_toad, 3), (1128, 300))
 
         # Affichage de la bulle de Toad correspondante
         if infos_couleur[1]:
-            self.screen.blit(scale_image_by(self.bubbles[infos_couleur[0]], (3 * self.screen_factor[0], 3 * self.screen_factor[1])), (round(1000 * self.screen_factor[0]), round(116 * self.screen_factor[1])))
+            self.screen.blit(scale_image_by(self.bubbles[infos_couleur[0]], 3), (1000, 116))
 
         for id_joueur in self.joueurs.keys():
             # On met à jour la position des joueurs et des animations pour le client
@@ -674,19 +707,15 @@ class MiniGame:
             self.hexagones[couleur].appliquer_positions(infos_hexagones[couleur]["pos"])
             self.hexagones[couleur].set_hidden(infos_hexagones[couleur]["hidden"])
 
+        # Les objets sont affichés selon leur priorité d'affichage (celle calculée à la frame précédente), la file
+        # garde l'ordre d'une frame à l'autre et n'a donc que quelques objets à déplacer
+        self.file_rendu.trier()
+        self.file_rendu.afficher(self.screen)
+
         # On calcule la priorité d'affichage pour tous les objets existants (y compris des joueurs)
         for objet in self.objets:
-            self.priorities[objet] = objet.get_priority()
             objet.update_priorite()
 
-        # sorted permet ici de trier les clés du dictionnaire automatiquement en fonction de la valeur d'affichage
-        # (sorted c'est beaucoup plus simple j'avoue)
-        for priority in sorted(self.priorities, key=self.priorities.get, reverse=True):
-            priority.afficher(self.screen)
-
-        # Initialisation des facteurs pour la taille de l'écran
-        self.screen_factor = ((self.screen.get_rect().size[0] / 1280), (self.screen.get_rect().size[1] / 720))
-
         # Debug pour afficher les fps
         if self.show_fps:
             self.fps_font.render_to(self.screen, (0, 0), "FPS: " + str(round(self.clock.get_fps())), (0, 0, 0))
@@ -695,6 +724,10 @@ class MiniGame:
         if self.show_server_fps:
             self.fps_font.render_to(self.screen, (0, 20), "S-FPS: " + str(round(fps)), (0, 0, 0))
 
+        # Debug pour afficher la mémoire prise par les images et les sons
+        if self.show_fps and self.memoire is not None:
+            self.fps_font.render_to(self.screen, (0, 40), self.memoire.texte_usage(), (0, 0, 0))
+
 
     def load(self) -> None:
         """
@@ -729,64 +762,61 @@ class MiniGame:
 
                 # Changement de taille de la fenêtre
                 elif event.type == pygame.VIDEORESIZE:
-                    self.screen = pygame.display.set_mode(event.size, pygame.HWSURFACE|pygame.DOUBLEBUF|pygame.RESIZABLE)
+                    pygame.display.set_mode(event.size, pygame.HWSURFACE|pygame.DOUBLEBUF|pygame.RESIZABLE)
 
                 # Détection des inputs du joueur
                 elif event.type == pygame.MOUSEBUTTONUP and cooldown - time.time() < 0:
-                    self.net.send("ready_for_next_state")
+                    self.net.send(requete(PRET))
 
             # Envoi d'une requête au serveur pour obtenir le nombre de joueurs et lance la partie si tous les joueurs sont prêts
-            infos_serveur = json.loads(self.net.send("infos_serveur"))
+            infos_serveur = self.net.get_infos_serveur()
             nb_joueurs = infos_serveur["nb_joueurs"]
             nb_joueurs_prets = infos_serveur["nb_joueurs_prets"]
 
-            etat = self.net.send("get_etat")
+            etat = self.net.send(requete(GET_ETAT))
             running = etat == "minigame_load" or etat == "minigame_select"
 
-            # Initialisation des facteurs pour la taille de l'écran
-            self.screen_factor = ((self.screen.get_rect().size[0] / 1280), (self.screen.get_rect().size[1] / 720))
-
             # Affichage de l'écran de chargement et du texte
             self.screen.fill((0, 0, 0))
 
             # Redimension des textes
-            nom_text = scale_image_by(self.game_font.render(nom, (255, 255, 255))[0], self.screen_factor)
+            nom_text = self.game_font.render(nom, (255, 255, 255))[0]
             nom_textRect = nom_text.get_rect()
-            nom_textRect.center = (round(640 * self.screen_factor[0]), round(70 * self.screen_factor[1]))
+            nom_textRect.center = (640, 70)
             if cooldown - time.time() > 0:
                 chargement = "CHARGEMENT..." 
             elif nb_joueurs > 1:
                 chargement = "Cliquez si vous êtes prêt pour le mini-jeu ! (" + str(nb_joueurs_prets) + "/" + str(nb_joueurs) + ")"
             else:
                 chargement = "Cliquez pour lancer le mini-jeu !"
-            chargement_text = scale_image_by(self.game_font.render(chargement, (255, 255, 255))[0], (0.8 * self.screen_factor[0], 0.8 * self.screen_factor[1]))
+            chargement_text = scale_image_by(self.game_font.render(chargement, (255, 255, 255))[0], 0.8)
             chargement_textRect = chargement_text.get_rect()
-            chargement_textRect.center = (round(640 * self.screen_factor[0]), round(680 * self.screen_factor[1]))
+            chargement_textRect.center = (640, 680)
 
             # Création du texte "controles" qui s'affiche au-dessus des touches du jouers
-            controles_text = scale_image_by(self.game_font.render("Contrôles:", (255, 255, 255))[0], self.screen_factor)
+            controles_text = self.game_font.render("Contrôles:", (255, 255, 255))[0]
 
             # Affichage des textes
             self.screen.blit(nom_text, nom_textRect)
             self.screen.blit(chargement_text, chargement_textRect)
-            self.screen.blit(controles_text, (round(960 * self.screen_factor[0]), round(200 * self.screen_factor[1])))
+            self.screen.blit(controles_text, (960, 200))
 
             # Affichage de Toad (pour présenter le mini-jeu)
-            self.screen.blit(scale_image_by(self.toad_shadow, (6 * self.screen_factor[0], 6 * self.screen_factor[1])), (round(114 * self.screen_factor[0]), round(535 * self.screen_factor[1])))
-            self.screen.blit(scale_image_by(self.toad[1], (5 * self.screen_factor[0], 5 * self.screen_factor[1])), (round(100 * self.screen_factor[0]), round(400 * self.screen_factor[1])))
-            self.screen.blit(scale_image_by(self.toad_bubble, (5 * self.screen_factor[0], 5 * self.screen_factor[1])), (round(240 * self.screen_factor[0]), round(150 * self.screen_factor[1])))
+            self.screen.blit(scale_image_by(self.toad_shadow, 6), (114, 535))
+            self.screen.blit(scale_image_by(self.toad[1], 5), (100, 400))
+            self.screen.blit(scale_image_by(self.toad_bubble, 5), (240, 150))
 
             # Affichage de la description
             for line in description:
-                description_text = scale_image_by(self.game_font.render(line, (0, 0, 0))[0], (0.7 * self.screen_factor[0], 0.7 * self.screen_factor[1]))
-                self.screen.blit(description_text, (round(260 * self.screen_factor[0]), round((170 + description.index(line) * 37) * self.screen_factor[1])))
+                description_text = scale_image_by(self.game_font.render(line, (0, 0, 0))[0], 0.7)
+                self.screen.blit(description_text, (260, 170 + description.index(line) * 37))
 
             # Création et affichage des touches du clavier pour le joueur
-            layout_joueur = scale_image_by(pygame.image.load(sep.join(["..", "data", "sprites", "minigames", "general", "layout_joueur.png"])), self.screen_factor)
-            self.screen.blit(layout_joueur, (round(930 * self.screen_factor[0]), round(300 * self.screen_factor[1])))
+            layout_joueur = charger_image(sep.join(["..", "data", "sprites", "minigames", "general", "layout_joueur.png"]))
+            self.screen.blit(layout_joueur, (930, 300))
 
             # Mise à jour de l'écran et limite de fps
-            pygame.display.flip()
+            presenter(self.screen)
             self.clock.tick(self.fps)
 
         # Lancement de l'intro du mini-jeu (si le joueur n'a pas fermé la fenêtre)
@@ -794,16 +824,13 @@ class MiniGame:
             self.start_game()
 
 
-    def start_game(self) -> None:
+    def init_partie(self) -> None:
         """
-        Cette méthode représente la phase de lancement du mini-jeu.
+        Cette méthode permet de créer les entités du mini-jeu à partir des infos envoyées par le serveur.
         """
 
-        # Activation du son de lave
-        self.lava_sound.play()
-
         # Envoi d'une requête au serveur pour obtenir les infos de chaque joueur
-        infos_environnement = json.loads(self.net.send("0|0|0"))
+        infos_environnement = self.net.etat_minijeu("0|0|0")
         infos_joueurs = infos_environnement["joueurs"]
         infos_hexagones = infos_environnement["hexagones"]
 
@@ -816,17 +843,33 @@ class MiniGame:
             self.hexagones[color] = Hexagon(infos_hexagones[color]["pos"], color, sep.join(["..", "data", "sprites", "minigames", "hexagon_heat", "hexagons", color + ".png"]))
 
         # Envoi de la taille du joueur au serveur
-        self.net.send(json.dumps({"taille_joueurs": {joueur: self.joueurs[joueur].get_taille() for joueur in self.joueurs.keys()}}))
+        self.net.send(requete(TAILLE_JOUEURS, json.dumps({joueur: self.joueurs[joueur].get_taille() for joueur in self.joueurs.keys()})))
 
-        # Initialisation de la liste des objets
+        # Initialisation de la liste des objets et de la file d'affichage
         self.objets = list(self.joueurs.values()) + list(self.hexagones.values())
 
+        self.file_rendu.vider()
+        for objet in self.objets:
+            self.file_rendu.ajouter(objet)
+
+
+    def start_game(self) -> None:
+        """
+        Cette méthode représente la phase de lancement du mini-jeu.
+        """
+
+        # Activation du son de lave
+        self.lava_sound.play()
+
+        # Création des entités du mini-jeu
+        self.init_partie()
+
         # Initialisation des paramètres par défaut de la phase
         running = True
         prev_time = time.time()
 
         # Initialisation du texte start et de ses coordonnées de départ
-        start_image = pygame.image.load(sep.join(["..", "data", "sprites", "minigames", "general", "start.png"]))
+        start_image = charger_image(sep.join(["..", "data", "sprites", "minigames", "general", "start.png"]))
         start_image_x = -start_image.get_rect().w
         start_image_y = round((640 - start_image.get_rect().h) / 2)
 
@@ -846,10 +889,10 @@ class MiniGame:
 
                 # Changement de taille de la fenêtre
                 elif event.type == pygame.VIDEORESIZE:
-                    self.screen = pygame.display.set_mode(event.size, pygame.HWSURFACE|pygame.DOUBLEBUF|pygame.RESIZABLE)
+                    pygame.display.set_mode(event.size, pygame.HWSURFACE|pygame.DOUBLEBUF|pygame.RESIZABLE)
 
             # Envoie d'une requête au serveur pour obtenir son etat
-            etat = self.net.send("get_etat")
+            etat = self.net.send(requete(GET_ETAT))
             running = etat == "minigame_start"
 
             # Utilisation du moteur de jeu
@@ -860,17 +903,17 @@ class MiniGame:
             prev_time = time.time()
 
             # Affichage du texte start
-            self.screen.blit(scale_image_by(start_image, (4 * self.screen_factor[0], 4 * self.screen_factor[1])), (round(start_image_x * self.screen_factor[0]), round(start_image_y * self.screen_factor[1])))
+            self.screen.blit(scale_image_by(start_image, 4), (round(start_image_x), round(start_image_y)))
 
             # Arrête la phase d'intro si le texte sort de l'écran
             if not sent:
                 if start_image_x > 1280:
-                    sent = self.net.send("ready_for_next_state") == "ok"
+                    sent = self.net.send(requete(PRET)) == "ok"
 
                 # Si le texte se trouve au milieu de l'écran et que le timer n'est pas encore lancé
                 elif (start_image_x + 2000 * delta_time) > (1000 - start_image.get_rect().w) / 2 and cooldown == 0:
                     cooldown = time.time()
-                    pygame.mixer.Sound(sep.join(["..", "data", "sounds", "minigames", "start.ogg"])).play()
+                    charger_son(sep.join(["..", "data", "sounds", "minigames", "start.ogg"])).play()
 
                 # Si le timer a duré 0.5s ou qu'il n'est pas encore lancé
                 elif time.time() - cooldown > 0.5 or cooldown == 0:
@@ -879,14 +922,14 @@ class MiniGame:
                     start_image_x = round(start_image_x)
 
             # Mise à jour de l'écran et limite de fps
-            pygame.display.flip()
+            presenter(self.screen)
             self.clock.tick(self.fps)
 
         # Lancement du mini-jeu en lui même (si le joueur n'a pas fermé la fenêtre)
         if not self.quit:
 
             # Lancement du son de sifflet et la musique chargée
-            pygame.mixer.Sound(sep.join(["..", "data", "sounds", "minigames", "start_sifflet.ogg"])).play()
+            charger_son(sep.join(["..", "data", "sounds", "minigames", "start_sifflet.ogg"])).play()
             pygame.mixer.music.play(loops=-1)
 
             self.during_game()
@@ -910,10 +953,10 @@ class MiniGame:
 
                 # Changement de taille de la fenêtre
                 elif event.type == pygame.VIDEORESIZE:
-                    self.screen = pygame.display.set_mode(event.size, pygame.HWSURFACE|pygame.DOUBLEBUF|pygame.RESIZABLE)
+                    pygame.display.set_mode(event.size, pygame.HWSURFACE|pygame.DOUBLEBUF|pygame.RESIZABLE)
 
             # Envoie d'une requête au serveur pour obtenir son etat
-            etat = self.net.send("get_etat")
+            etat = self.net.send(requete(GET_ETAT))
             running = etat == "minigame_during"
 
             # Détection des inputs et réinitialisation des vecteurs de déplacement des joueurs
@@ -937,7 +980,7 @@ class MiniGame:
             self.game_engine(input_joueur)
 
             # Mise à jour de l'écran et limite de fps
-            pygame.display.flip()
+            presenter(self.screen)
             self.clock.tick(self.fps)
 
         # Lancement de l'affichage de fin (si le joueur n'a pas fermé la fenêtre)
@@ -956,10 +999,10 @@ class MiniGame:
 
         # Arrêt de la musique et son de fin
         pygame.mixer.music.stop()
-        pygame.mixer.Sound(sep.join(["..", "data", "sounds", "minigames", "finish.ogg"])).play()
+        charger_son(sep.join(["..", "data", "sounds", "minigames", "finish.ogg"])).play()
 
         # Initialisation du texte finish et de ses coordonnées de départ
-        finish_image = pygame.image.load(sep.join(["..", "data", "sprites", "minigames", "general", "finish.png"]))
+        finish_image = charger_image(sep.join(["..", "data", "sprites", "minigames", "general", "finish.png"]))
         finish_image_x = -finish_image.get_rect().w
         finish_image_y = round((640 - finish_image.get_rect().h) / 2)
 
@@ -979,10 +1022,10 @@ class MiniGame:
 
                 # Changement de taille de la fenêtre
                 elif event.type == pygame.VIDEORESIZE:
-                    self.screen = pygame.display.set_mode(event.size, pygame.HWSURFACE|pygame.DOUBLEBUF|pygame.RESIZABLE)
+                    pygame.display.set_mode(event.size, pygame.HWSURFACE|pygame.DOUBLEBUF|pygame.RESIZABLE)
 
             # Envoie d'une requête au serveur pour obtenir son etat
-            etat = self.net.send("get_etat")
+            etat = self.net.send(requete(GET_ETAT))
             running = etat == "minigame_end"
 
             # Utilisation du moteur de jeu
@@ -993,12 +1036,12 @@ class MiniGame:
             prev_time = time.time()
 
             # Affichage du texte finish
-            self.screen.blit(scale_image_by(finish_image, (4 * self.screen_factor[0], 4 * self.screen_factor[1])), (round(finish_image_x * self.screen_factor[0]), round(finish_image_y * self.screen_factor[1])))
+            self.screen.blit(scale_image_by(finish_image, 4), (round(finish_image_x), round(finish_image_y)))
 
             # Arrête la phase de fin au bout de 1.5s si le timer est déjà lancé
             if not sent:
                 if time.time() - cooldown > 1.5 and cooldown > 0:
-                    sent = self.net.send("ready_for_next_state") == "ok"
+                    sent = self.net.send(requete(PRET)) == "ok"
 
                 # Si le texte se trouve au milieu de l'écran et que le timer n'est pas encore lancé
                 elif (finish_image_x + 2000 * delta_time) > (1000 - finish_image.get_rect().w) / 2 and cooldown == 0:
@@ -1010,7 +1053,7 @@ class MiniGame:
                     finish_image_x = round(finish_image_x)
 
             # Mise à jour de l'écran et limite de fps
-            pygame.display.flip()
+            presenter(self.screen)
             self.clock.tick(self.fps)
 
         # Lancement de l'annonce des gagnants (si le joueur n'a pas fermé la fenêtre)
@@ -1031,7 +1074,7 @@ class MiniGame:
         running = True
 
         # Envoie d'une requête au serveur pour obtenir les infos du classement
-        classement = json.loads(self.net.send("0|0"))["classement"]
+        classement = self.net.etat_minijeu("0|0")["classement"]
 
         # On note tous les gagnants de la partie
         gagnants = []
@@ -1044,13 +1087,13 @@ class MiniGame:
 
         # Changement du texte et de la musique jouée selon différents cas
         if len(gagnants) == 0:
-            win_image = pygame.image.load(sep.join(["..", "data", "sprites", "minigames", "general", "tie.png"]))
+            win_image = charger_image(sep.join(["..", "data", "sprites", "minigames", "general", "tie.png"]))
             pygame.mixer.music.load(sep.join(["..", "data", "musics", "minigames", "draw.ogg"]))
         elif len(gagnants) > 1:
-            win_image = pygame.image.load(sep.join(["..", "data", "sprites", "minigames", "general", "wins.png"]))
+            win_image = charger_image(sep.join(["..", "data", "sprites", "minigames", "general", "wins.png"]))
             pygame.mixer.music.load(sep.join(["..", "data", "musics", "minigames", "win.ogg"]))
         else:
-            win_image = pygame.image.load(sep.join(["..", "data", "sprites", "minigames", "general", "win.png"]))
+            win_image = charger_image(sep.join(["..", "data", "sprites", "minigames", "general", "win.png"]))
             pygame.mixer.music.load(sep.join(["..", "data", "musics", "minigames", "win.ogg"]))
 
         # Timer de 5s
@@ -1072,10 +1115,10 @@ class MiniGame:
 
                 # Changement de taille de la fenêtre
                 elif event.type == pygame.VIDEORESIZE:
-                    self.screen = pygame.display.set_mode(event.size, pygame.HWSURFACE|pygame.DOUBLEBUF|pygame.RESIZABLE)
+                    pygame.display.set_mode(event.size, pygame.HWSURFACE|pygame.DOUBLEBUF|pygame.RESIZABLE)
 
             # Envoie d'une requête au serveur pour obtenir son etat
-            etat = self.net.send("get_etat")
+            etat = self.net.send(requete(GET_ETAT))
             running = etat == "minigame_winners"
 
             # Utilisation du moteur de jeu
@@ -1089,7 +1132,7 @@ class MiniGame:
 
             for gagnant in gagnants:
                 # Initialisation et positionnement du texte de chaque gagnant
-                image_gagnant = scale_image_by(pygame.image.load(sep.join(["..", "data", "sprites", "minigames", "general", gagnant + ".png"])), 4)
+                image_gagnant = charger_image(sep.join(["..", "data", "sprites", "minigames", "general", gagnant + ".png"]), 4)
                 image_rect = image_gagnant.get_rect()
                 image_rect.center = (640, 400)
 
@@ -1098,23 +1141,23 @@ class MiniGame:
                     image_rect.x = image_x
 
                 # Affichage du texte de chaque gagnant
-                self.screen.blit(scale_image_by(image_gagnant, self.screen_factor), (round(image_rect.x * self.screen_factor[0]), round(image_rect.y * self.screen_factor[1])))
+                self.screen.blit(image_gagnant, (image_rect.x, image_rect.y))
 
                 # On déplace le prochain texte 50 pixels plus loin
                 image_x += image_rect.w + 50
 
             # Positionnement du texte win
-            scaled_win = scale_image_by(win_image, (4 * self.screen_factor[0], 4 * self.screen_factor[1]))
+            scaled_win = scale_image_by(win_image, 4)
             win_rect = scaled_win.get_rect()
-            win_rect.center = (round(640 * self.screen_factor[0]), round(520 * self.screen_factor[1]))
+            win_rect.center = (640, 520)
 
             # Affichage du texte win
             self.screen.blit(scaled_win, win_rect)
 
             # Arrêt du script au bout du timer
             if cooldown - time.time() <= 0 and not sent:
-                sent = self.net.send("ready_for_next_state") == "ok"
+                sent = self.net.send(requete(PRET)) == "ok"
 
             # Mise à jour de l'écran et limite de fps
-            pygame.display.flip()
+            presenter(self.screen)
             self.clock.tick(self.fps)
\ No newline at end of file
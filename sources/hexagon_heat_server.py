@@ -5,10 +5,14 @@
 
 import json
 import socket
-import pygame
 from math import sqrt
 import time
 import random
+from threading import Condition
+
+from profiler import Profiler
+from protocole import TableRequetes, GET_ETAT, INPUTS, TAILLE_JOUEURS
+from moteur import Rect
 
 # ------/ Fonctions utiliatires \------
 
@@ -56,7 +60,7 @@ class Joueur:
 
     # ------/ Constructeur \------
 
-    def __init__(self, perso: str, id_minijeu: int, ia: bool) -> None:
+    def __init__(self, perso: str, id_minijeu: int, ia: bool, rng=random) -> None:
         """
         Constructeur de la classe Joueur.
 
@@ -64,6 +68,7 @@ class Joueur:
             - perso (str): Personnage choisit par le joueur.
             - id_minijeu (int): id du joueur qui sert uniquement lors des mini-jeux.
             - ia (bool): Indique si le joueur est une ia ou un joueur lambda.
+            - rng (random.Random): Générateur aléatoire utilisé pour les décalages des ias (module random par défaut).
 
         Attributs internes:
             - pos (list): Position du joueur.
@@ -79,7 +84,7 @@ class Joueur:
 
             - frame (float): Indice du sprite à choisir.
 
-            - collision (pygame.Rect): Boîte de collision du joueur.
+            - collision (Rect): Boîte de collision du joueur.
 
             - taille (list): Dimensions du sprite du joueur (fournis par le client).
 
@@ -109,20 +114,20 @@ class Joueur:
         self.dead = False
 
         # Uniquement pour l'ia (utilisé pour que les ia ne se retrouvent pas toutes exactement à la même position)
-        self.target_offsets = [random.randint(-10, 110), random.randint(-10, 110)]
+        self.target_offsets = [rng.randint(-10, 110), rng.randint(-10, 110)]
 
         # Le premier offset doit être plus petit que le second, on utilise donc sort
         self.target_offsets.sort()
 
         # On ajoute un délai aléatoire qui correspond au temps que l'ordi va mettre pour sauter
         # (Les randints sont en millisecondes pour avoir plus de précision, on divise par 1000 pour avoir les secondes)
-        self.target_offsets.append(random.randint(-1000, 1000) / 1000)
+        self.target_offsets.append(rng.randint(-1000, 1000) / 1000)
 
         # Initialisation de la frame choisie
         self.frame = 0
 
         # Boîte de collision du personnage
-        self.collision = pygame.Rect(0, 0, 42, 20)
+        self.collision = Rect(0, 0, 42, 20)
 
         # Initialisation de la taille du joueur (qui sera définie lors du début de partie)
         self.taille = [0, 0]
@@ -269,7 +274,7 @@ class Joueur:
         assert type(objet) == Joueur or type(objet) == Hexagon, "Erreur: Le 3ème paramètre (objet) n'est pas un objet de type Joueur ou Hexagon."
 
         # Création d'une boîte de collision avec les coordonnées x et y
-        rect = pygame.Rect(round(x), round(y), self.collision.w, self.collision.h)
+        rect = Rect(round(x), round(y), self.collision.w, self.collision.h)
 
         # Initialisation de l'état de la collision
         collided = False
@@ -442,9 +447,9 @@ class Hexagon:
         self.hidden = False
 
         # Boîtes de collision de l'hexagone
-        self.collisions =  [pygame.Rect(0, 0, 15*4, 26*4),
-                            pygame.Rect(0, 0, 12*4, 40*4),
-                            pygame.Rect(0, 0, 15*4, 26*4)]
+        self.collisions =  [Rect(0, 0, 15*4, 26*4),
+                            Rect(0, 0, 12*4, 40*4),
+                            Rect(0, 0, 15*4, 26*4)]
 
         # La position Z correspond au point le plus haut du bloc (en comptant seulement la plus haute collision, ici la 2ème)
         self.height = self.collisions[1].h - 212
@@ -609,14 +614,26 @@ class Pile:
 
 # Classe du serveur
 class Server:
-    def __init__(self, server_socket: socket.socket) -> None:
+    def __init__(self, server_socket: socket.socket, profiling: bool = False, horloge=time.time, rng=random, silencieux: bool = False) -> None:
         """
         Documentation ici
             - score (list): Stockage du score de la partie.
         """
 
         self.server_socket = server_socket
-        print("Initialisation du mini-jeu: Hexagon Heat")
+
+        # Horloge et générateur aléatoire du mini-jeu (remplaçables pour simuler une partie sans réseau)
+        self.horloge = horloge
+        self.rng = rng
+
+        # Les copies du mini-jeu (lockstep, simulation) n'écrivent pas leurs messages dans la console
+        self.silencieux = silencieux
+
+        # Fonction du lobby appelée quand le nombre de joueurs prêts change (None hors du lobby)
+        self.notifier_lobby = None
+
+        if not self.silencieux:
+            print("Initialisation du mini-jeu: Hexagon Heat")
 
         self.joueurs = {}
         self.inputs_joueurs = {}
@@ -624,11 +641,11 @@ class Server:
 
         # Initialisation d'un ordre aléatoire pour les mini-jeux
         self.ordre_minijeu = [i for i in range(4)]
-        random.shuffle(self.ordre_minijeu)
+        self.rng.shuffle(self.ordre_minijeu)
 
         # Liste des couleurs des plateformes et couleur actuel du tour
         self.colors = ["blue", "green", "magenta", "pink", "cyan", "yellow", "red"]
-        self.couleur_actuelle = random.choice(self.colors)
+        self.couleur_actuelle = self.rng.choice(self.colors)
 
         # Initialisation d'une variable indiquant l'affichage de toad au client
         self.toad_actif = False
@@ -654,6 +671,20 @@ class Server:
         self.classement = Pile()
 
         self.fps = 60
+        self.profiler = Profiler("Hexagon Heat", self.fps, profiling)
+
+        # Requêtes du mini-jeu, chacune trouvée directement par son opcode
+        self.requetes = TableRequetes("Hexagon Heat")
+        self.requetes.enregistrer(GET_ETAT, self.requete_get_etat)
+        self.requetes.enregistrer(TAILLE_JOUEURS, self.requete_taille_joueurs)
+        self.requetes.enregistrer(INPUTS, self.requete_inputs)
+
+        # Dernier état encodé en json (publié une fois par tick et partagé par tous les clients)
+        self.snapshot = None
+
+        # Condition qui protège les joueurs prêts et réveille la boucle du mini-jeu quand un joueur est prêt
+        self.condition = Condition()
+
         self.current_fps = 0
         self.is_running = False
 
@@ -676,54 +707,126 @@ class Server:
         return self.joueurs[address]
 
     def add_player(self, address: str, perso: str, ia: bool):
-        id_minijeu = self.ordre_minijeu[len(self.joueurs)]
-        self.joueurs[address] = Joueur(perso, id_minijeu, ia)
+        with self.condition:
+            id_minijeu = self.ordre_minijeu[len(self.joueurs)]
+            self.joueurs[address] = Joueur(perso, id_minijeu, ia, self.rng)
+
+            # Les ia sont automatiquement prêtes
+            if ia:
+                self.nb_joueurs_prets += 1
+
+            self.condition.notify_all()
+
+
+    def get_infos(self) -> dict:
+        """
+        Cette méthode permet de récupérer l'état du mini-jeu tel qu'il est envoyé aux clients.
+
+        Renvois:
+            - dict: Informations sur les joueurs et les entités du mini-jeu.
+        """
+
+        infos_joueurs = {joueur: {
+            "perso": self.joueurs[joueur].get_perso(),
+            "pos": self.joueurs[joueur].get_pos(),
+            "velocity": self.joueurs[joueur].get_velocity(),
+            "frame": self.joueurs[joueur].get_frame(),
+            "rotation": self.joueurs[joueur].get_rotation(),
+            "invincibility": self.joueurs[joueur].get_invincibility(),
+            "dead": self.joueurs[joueur].get_dead(),
+            "ground_height": self.joueurs[joueur].get_ground_height()
+        } for joueur in self.joueurs.keys()}
+
+        infos_hexagones = {hexagone.get_color(): {
+            "pos": hexagone.get_pos(),
+            "hidden": hexagone.get_hidden()
+        } for hexagone in self.hexagones}
+
+        return {"joueurs": infos_joueurs, "hexagones": infos_hexagones, "couleur": (self.couleur_actuelle, self.toad_actif), "classement": {} if type(self.classement) == Pile else self.classement, "fps": self.current_fps}
 
 
     def client_thread(self, address: str, request: str) -> str:
-            if request == "get_etat":
-                reply = self.etat
-
-            elif "taille_joueurs" in request:
-                taille = json.loads(request)["taille_joueurs"]
-                for ip in taille.keys():
-                    self.joueurs[ip].set_taille([taille[ip][0], taille[ip][1]])
-                reply = "ok"
-
-            elif "|" in request:
-                # Si la requête c'est ça: 1|1|0
-                self.inputs_joueurs[address] = [int(coord) for coord in request.split("|")]
-
-                infos_joueurs = {joueur: {
-                    "perso": self.joueurs[joueur].get_perso(),
-                    "pos": self.joueurs[joueur].get_pos(),
-                    "velocity": self.joueurs[joueur].get_velocity(),
-                    "frame": self.joueurs[joueur].get_frame(),
-                    "rotation": self.joueurs[joueur].get_rotation(),
-                    "invincibility": self.joueurs[joueur].get_invincibility(),
-                    "dead": self.joueurs[joueur].get_dead(),
-                    "ground_height": self.joueurs[joueur].get_ground_height()
-                } for joueur in self.joueurs.keys()}
-
-                infos_hexagones = {hexagone.get_color(): {
-                    "pos": hexagone.get_pos(),
-                    "hidden": hexagone.get_hidden()
-                } for hexagone in self.hexagones}
-
-                reply = json.dumps({"joueurs": infos_joueurs, "hexagones": infos_hexagones, "couleur": (self.couleur_actuelle, self.toad_actif), "classement": {} if type(self.classement) == Pile else self.classement, "fps": self.current_fps})
+        # L'opcode de la requête (son premier octet) donne directement la fonction qui y répond
+        reply = self.requetes.traiter(address, request)
+        return "not_found" if reply is None else reply
+
+
+    def requete_get_etat(self, address: str, donnees: str) -> str:
+        return self.etat
+
+
+    def requete_taille_joueurs(self, address: str, donnees: str) -> str:
+        taille = json.loads(donnees)
+        for ip in taille.keys():
+            self.joueurs[ip].set_taille([taille[ip][0], taille[ip][1]])
+        return "ok"
 
-            else:
-                reply = "not_found"
 
-            return reply
+    def requete_inputs(self, address: str, donnees: str) -> str:
+        # Si les données c'est ça: 1|1|0
+        with self.profiler.mesure("inputs"):
+            self.inputs_joueurs[address] = [int(coord) for coord in donnees.split("|")]
+
+        # Tous les clients reçoivent le même état, encodé une seule fois par tick
+        return self.get_snapshot()
 
 
     def changer_etat(self, new_etat):
-        self.etat = new_etat
-        for ip in self.joueurs.keys():
-            self.joueurs[ip].set_ready(False)
+        with self.condition:
+            self.etat = new_etat
+            for ip in self.joueurs.keys():
+                self.joueurs[ip].set_ready(False)
+
+            # Seules les ia restent prêtes
+            self.nb_joueurs_prets = len([joueur for joueur in self.joueurs.values() if joueur.get_ia()])
+            self.condition.notify_all()
+
+        if not self.silencieux:
+            print("[Hexagon Heat] Passé à l'état", self.etat)
+
+        self.notifier_prets()
+
+
+    def marquer_pret(self, address: str) -> None:
+        """
+        Cette méthode indique qu'un joueur est prêt pour l'état suivant (appelée par le thread de son client).
+
+        Paramètres:
+            - address (str): Adresse du joueur.
+        """
+
+        with self.condition:
+            if not self.joueurs[address].get_ready():
+                self.joueurs[address].set_ready(True)
+
+                # Le compteur est mis à jour ici plutôt que recompté à chaque tick
+                if not self.joueurs[address].get_ia():
+                    self.nb_joueurs_prets += 1
+
+                self.condition.notify_all()
 
-        print("[Hexagon Heat] Passé à l'état", self.etat)
+        self.notifier_prets()
+
+
+    def notifier_prets(self) -> None:
+        """
+        Cette méthode prévient le lobby que le nombre de joueurs prêts a changé (il fait partie de ses informations).
+        Elle doit être appelée sans self.condition.
+        """
+
+        if self.notifier_lobby is not None:
+            self.notifier_lobby()
+
+
+    def tous_prets(self) -> bool:
+        """
+        Cette méthode indique si tous les joueurs sont prêts pour l'état suivant.
+
+        Renvois:
+            - bool: True si tous les joueurs sont prêts, sinon False.
+        """
+
+        return len(self.joueurs) > 0 and self.nb_joueurs_prets == len(self.joueurs)
 
 
     def load_game(self):
@@ -746,7 +849,7 @@ class Server:
         # Le mini-jeu s'arrête s'il ne reste plus de joueurs à part le joueur solo
         if len(joueurs_vivants) <= 1:
             # On stocke le dernier survivant s'il n'est pas déjà mort
-            if self.classement.taille() < 4 and len(joueurs_vivants) == 1:
+            if type(self.classement) == Pile and self.classement.taille() < 4 and len(joueurs_vivants) == 1:
                 self.classement.empile(joueurs_vivants[0])
 
             # On fait remonter les hexagones s'ils ne le sont pas déjà
@@ -760,49 +863,50 @@ class Server:
         for joueur in self.joueurs.keys():
             # Comportement des ia
             if self.joueurs[joueur].get_ia():
-                # On réinitialise leurs inputs
-                self.inputs_joueurs[joueur] = [0, 0, 0]
-
-                # Initialisation de l'hexagone visé
-                current_hexagon = None
-                for hexagon in self.hexagones:
-                    # On choisit l'hexagone seulement s'il est complètement sortit du sol
-                    if hexagon.get_color() == self.couleur_actuelle and hexagon.get_pos()[2] <= -60:
-                        current_hexagon = hexagon
-
-                # Pathfinding de l'ia
-                if current_hexagon != None:
-
-                    # Les targets offsets servent à mettre de l'aléatoire un peu partout dans les mouvements
-                    # de l'ia pour qu'elle soit moins parfaite
-                    x_offset_min = current_hexagon.get_pos()[0] + self.joueurs[joueur].get_target_offsets()[0]
-                    x_offset_max = current_hexagon.get_pos()[0] + self.joueurs[joueur].get_target_offsets()[1]
-                    y_offset_min = current_hexagon.get_pos()[1] + self.joueurs[joueur].get_target_offsets()[0]
-                    y_offset_max = current_hexagon.get_pos()[1] + self.joueurs[joueur].get_target_offsets()[1]
-
-                    # L'ia se déplace en fonction des coordonnées trouvées
-                    if self.joueurs[joueur].get_pos()[0] < x_offset_min and self.joueurs[joueur].get_pos()[0] < x_offset_max:
-                        self.inputs_joueurs[joueur][0] += 1
-                        self.joueurs[joueur].set_rotation("right")
-
-                    elif self.joueurs[joueur].get_pos()[0] > x_offset_min and self.joueurs[joueur].get_pos()[0] > x_offset_max:
-                        self.inputs_joueurs[joueur][0] -= 1
-                        self.joueurs[joueur].set_rotation("left")
-
-                    if self.joueurs[joueur].get_pos()[1] < y_offset_min and self.joueurs[joueur].get_pos()[1] < y_offset_max:
-                        self.inputs_joueurs[joueur][1] += 1
-                        self.joueurs[joueur].set_rotation("down")
-
-                    elif self.joueurs[joueur].get_pos()[1] > y_offset_min and self.joueurs[joueur].get_pos()[1] > y_offset_max:
-                        self.inputs_joueurs[joueur][1] -= 1
-                        self.joueurs[joueur].set_rotation("up")
-
-                    # Délai aléatoire du saut
-                    time_offset = 3 + self.joueurs[joueur].get_target_offsets()[2]
-
-                    # L'ia saute un peu avant (dans un durée aléatoire) le moment où les hexagones s'enfoncent dans la lave
-                    if time.time() - self.timer_tour > self.temps_total - time_offset and time.time() - self.timer_tour < self.temps_total - time_offset + 1:
-                        self.joueurs[joueur].sauter()
+                with self.profiler.mesure("ia"):
+                    # On réinitialise leurs inputs
+                    self.inputs_joueurs[joueur] = [0, 0, 0]
+
+                    # Initialisation de l'hexagone visé
+                    current_hexagon = None
+                    for hexagon in self.hexagones:
+                        # On choisit l'hexagone seulement s'il est complètement sortit du sol
+                        if hexagon.get_color() == self.couleur_actuelle and hexagon.get_pos()[2] <= -60:
+                            current_hexagon = hexagon
+
+                    # Pathfinding de l'ia
+                    if current_hexagon != None:
+
+                        # Les targets offsets servent à mettre de l'aléatoire un peu partout dans les mouvements
+                        # de l'ia pour qu'elle soit moins parfaite
+                        x_offset_min = current_hexagon.get_pos()[0] + self.joueurs[joueur].get_target_offsets()[0]
+                        x_offset_max = current_hexagon.get_pos()[0] + self.joueurs[joueur].get_target_offsets()[1]
+                        y_offset_min = current_hexagon.get_pos()[1] + self.joueurs[joueur].get_target_offsets()[0]
+                        y_offset_max = current_hexagon.get_pos()[1] + self.joueurs[joueur].get_target_offsets()[1]
+
+                        # L'ia se déplace en fonction des coordonnées trouvées
+                        if self.joueurs[joueur].get_pos()[0] < x_offset_min and self.joueurs[joueur].get_pos()[0] < x_offset_max:
+                            self.inputs_joueurs[joueur][0] += 1
+                            self.joueurs[joueur].set_rotation("right")
+
+                        elif self.joueurs[joueur].get_pos()[0] > x_offset_min and self.joueurs[joueur].get_pos()[0] > x_offset_max:
+                            self.inputs_joueurs[joueur][0] -= 1
+                            self.joueurs[joueur].set_rotation("left")
+
+                        if self.joueurs[joueur].get_pos()[1] < y_offset_min and self.joueurs[joueur].get_pos()[1] < y_offset_max:
+                            self.inputs_joueurs[joueur][1] += 1
+                            self.joueurs[joueur].set_rotation("down")
+
+                        elif self.joueurs[joueur].get_pos()[1] > y_offset_min and self.joueurs[joueur].get_pos()[1] > y_offset_max:
+                            self.inputs_joueurs[joueur][1] -= 1
+                            self.joueurs[joueur].set_rotation("up")
+
+                        # Délai aléatoire du saut
+                        time_offset = 3 + self.joueurs[joueur].get_target_offsets()[2]
+
+                        # L'ia saute un peu avant (dans un durée aléatoire) le moment où les hexagones s'enfoncent dans la lave
+                        if self.horloge() - self.timer_tour > self.temps_total - time_offset and self.horloge() - self.timer_tour < self.temps_total - time_offset + 1:
+                            self.joueurs[joueur].sauter()
 
             # On tire si le joueur client a envoyé l'input correspondant
             if self.inputs_joueurs[joueur][2] > 0:
@@ -819,23 +923,23 @@ class Server:
                 self.joueurs[joueur].set_rotation("up")
 
         # Logique du mini-jeu en elle même
-        if time.time() - self.timer_tour > self.temps_total:
+        if self.horloge() - self.timer_tour > self.temps_total:
             # Choix d'une nouvelle couleur aléatoire
-            self.couleur_actuelle = random.choice(self.colors)
+            self.couleur_actuelle = self.rng.choice(self.colors)
 
             # Réinitialisation du timer
-            self.timer_tour = time.time()
+            self.timer_tour = self.horloge()
 
             for joueur in self.joueurs.values():
                 if joueur.get_ia():
                     # Définition de nouveau décalages pour les ias
-                    new_target_offsets = [random.randint(-10, 110), random.randint(-10, 110)]
+                    new_target_offsets = [self.rng.randint(-10, 110), self.rng.randint(-10, 110)]
                     new_target_offsets.sort()
-                    new_target_offsets.append(random.randint(-1000, 1000) / 1000)
+                    new_target_offsets.append(self.rng.randint(-1000, 1000) / 1000)
                     joueur.set_target_offsets(new_target_offsets)
 
         # Affichage de la bulle de dialogue pendant une petite durée
-        elif time.time() - self.timer_tour < self.temps_total - 2:
+        elif self.horloge() - self.timer_tour < self.temps_total - 2:
             self.toad_actif = True
 
         # Fin du temps imparti
@@ -853,7 +957,7 @@ class Server:
                         hexagon.set_hidden(True)
 
         # Dès que le timer se relance
-        if time.time() - self.timer_tour < self.temps_total - 2:
+        if self.horloge() - self.timer_tour < self.temps_total - 2:
             # Tous les hexagones remontent (et on les re-affiche accessoirement)
             for hexagon in self.hexagones:
                 if hexagon.get_pos()[2] > -60:
@@ -890,92 +994,154 @@ class Server:
         self.changer_etat(self.etats[self.etats.index(self.etat) + 1])
 
 
-    def run(self, clock) -> None:
-        self.is_running = True
+    def maj_etats(self) -> None:
+        """
+        Cette méthode permet de passer à l'état suivant du mini-jeu lorsque tous les joueurs sont prêts.
+        """
 
-        print("Lancement du mini-jeu: Hexagon Heat")
-        while self.is_running:
-            # On récupère le nombre de joueurs prêts (les ia sont automatiquement prêts)
-            self.nb_joueurs_prets = len([joueur for joueur in self.joueurs.keys() if self.joueurs[joueur].get_ready() or self.joueurs[joueur].get_ia()])
+        # Lorsque tous les joueurs sont prêts (nb_joueurs_prets est tenu à jour par marquer_pret et changer_etat)
+        if self.tous_prets():
+            # On finalise la création des joueurs avant que le jeu commence
+            if self.etat == "minigame_load":
+                self.load_game()
 
-            # Lorsque tous les joueurs sont prêts
-            if len(self.joueurs.keys()) > 0 and self.nb_joueurs_prets == len(self.joueurs.keys()):
-                # On finalise la création des joueurs avant que le jeu commence
-                if self.etat == "minigame_load":
-                    self.load_game()
+            # Calcule le classement final
+            elif self.etat == "minigame_end":
+                self.calculate_score()
 
-                # Calcule le classement final
-                elif self.etat == "minigame_end":
-                    self.calculate_score()
+            # Si on a fini le mini-jeu, on stoppe ce serveur
+            if self.etat == "minigame_winners":
+                self.is_running = False
 
-                # Si on a fini le mini-jeu, on stoppe ce serveur
-                if self.etat == "minigame_winners":
-                    self.is_running = False
+            # Sinon on passe à l'état suivant
+            else:
+                self.changer_etat(self.etats[self.etats.index(self.etat) + 1])
 
-                # Sinon on passe à l'état suivant
-                else:
-                    self.changer_etat(self.etats[self.etats.index(self.etat) + 1])
 
-            # Calcul des frames pour la vitesse d'animation des personnages
-            if self.etat != "minigame_load" and self.etat != "minigame_select":
-                for joueur in self.joueurs.keys():
-                    frame = self.joueurs[joueur].get_frame() + 0.24
+    def maj_physique(self) -> None:
+        """
+        Cette méthode permet de calculer les animations et la physique des entités du mini-jeu.
+        """
+
+        # Calcul des frames pour la vitesse d'animation des personnages
+        for joueur in self.joueurs.keys():
+            frame = self.joueurs[joueur].get_frame() + 0.24
+
+            # L'animation reste figée si le joueur est immobile
+            if self.inputs_joueurs[joueur][0] == 0 and self.inputs_joueurs[joueur][1] == 0:
+                frame = 0
+            elif self.joueurs[joueur].get_velocity()[2] != 0:
+                frame = 0
+
+            self.joueurs[joueur].set_frame(frame)
+
+            # On réinitialise les inputs des ia (pour éviter qu'ils de déplacent pendant le start ou le finish)
+            if self.joueurs[joueur].get_ia() and self.etat != "minigame_during":
+                self.inputs_joueurs[joueur] = [0, 0, 0]
+
+            # Calcul de la physique des joueurs
+            self.joueurs[joueur].calculer_velocite(self.inputs_joueurs[joueur])
 
-                    # L'animation reste figée si le joueur est immobile
-                    if self.inputs_joueurs[joueur][0] == 0 and self.inputs_joueurs[joueur][1] == 0:
-                        frame = 0
-                    elif self.joueurs[joueur].get_velocity()[2] != 0:
-                        frame = 0
+            # On peut utiliser calculate_collisions() pour récupérer l'entité avec laquelle le joueur collisionne
+            collision = self.joueurs[joueur].calculer_collisions(self.objets)
 
-                    self.joueurs[joueur].set_frame(frame)
+            # Par exemple, ce petit bout de code permet au joueur de ralentir un autre joueur en sautant sur sa tête
+            if type(collision) == Joueur and self.joueurs[joueur].get_pos()[2] < collision.get_height() and self.joueurs[joueur].get_velocity()[2] == 0:
+                self.joueurs[joueur].sauter()
 
-                    # On réinitialise les inputs des ia (pour éviter qu'ils de déplacent pendant le start ou le finish)
-                    if self.joueurs[joueur].get_ia() and self.etat != "minigame_during":
-                        self.inputs_joueurs[joueur] = [0, 0, 0]
+                # S'il n'est pas déjà invulnérable
+                if collision.get_invincibility() == 0:
+                    # Ici, 200 frames d'invulnérabilité
+                    collision.set_invincibility(200)
 
-                    # Calcul de la physique des joueurs
-                    self.joueurs[joueur].calculer_velocite(self.inputs_joueurs[joueur])
+            # On réduit petit à petit l'invincibilité
+            if self.joueurs[joueur].get_invincibility() > -1:
+                self.joueurs[joueur].invicible_mode()
 
-                    # On peut utiliser calculate_collisions() pour récupérer l'entité avec laquelle le joueur collisionne
-                    collision = self.joueurs[joueur].calculer_collisions(self.objets)
+            # On applique le mouvement au joueur
+            self.joueurs[joueur].appliquer_velocite()
 
-                    # Par exemple, ce petit bout de code permet au joueur de ralentir un autre joueur en sautant sur sa tête
-                    if type(collision) == Joueur and self.joueurs[joueur].get_pos()[2] < collision.get_height() and self.joueurs[joueur].get_velocity()[2] == 0:
-                        self.joueurs[joueur].sauter()
+            # Détection de la mort
+            if self.joueurs[joueur].get_pos()[2] > -45 and not self.joueurs[joueur].get_dead():
+                self.joueurs[joueur].set_dead(True)
+                self.joueurs[joueur].sauter()
 
-                        # S'il n'est pas déjà invulnérable
-                        if collision.get_invincibility() == 0:
-                            # Ici, 200 frames d'invulnérabilité
-                            collision.set_invincibility(200)
+                # On le stocke dans le classement sous forme de pile
+                if type(self.classement) == Pile and self.classement.taille() < 4:
+                    self.classement.empile(joueur)
 
-                    # On réduit petit à petit l'invincibilité
-                    if self.joueurs[joueur].get_invincibility() > -1:
-                        self.joueurs[joueur].invicible_mode()
+        # On calcule la physique de chaque hexagone
+        for hexagone in self.hexagones: 
+            hexagone.calculer_velocite()
+            hexagone.calculer_collisions()
+            hexagone.appliquer_velocite()
 
-                    # On applique le mouvement au joueur
-                    self.joueurs[joueur].appliquer_velocite()
 
-                    # Détection de la mort
-                    if self.joueurs[joueur].get_pos()[2] > -45 and not self.joueurs[joueur].get_dead():
-                        self.joueurs[joueur].set_dead(True)
-                        self.joueurs[joueur].sauter()
+    def tick(self) -> None:
+        """
+        Cette méthode permet d'exécuter un tick du serveur, chaque phase étant mesurée par le profiler.
+        """
 
-                        # On le stocke dans le classement sous forme de pile
-                        if self.classement.taille() < 4:
-                            self.classement.empile(joueur)
+        with self.profiler.mesure("etats"):
+            self.maj_etats()
 
-                # On calcule la physique de chaque hexagone
-                for hexagone in self.hexagones: 
-                    hexagone.calculer_velocite()
-                    hexagone.calculer_collisions()
-                    hexagone.appliquer_velocite()
+        if self.etat != "minigame_load" and self.etat != "minigame_select":
+            with self.profiler.mesure("physique"):
+                self.maj_physique()
 
-            # Exécution du code qui gère le mini-jeu
-            if self.etat == "minigame_during":
+        # Exécution du code qui gère le mini-jeu (le comportement des ia et la physique qu'il calcule sont
+        # mesurés à part, dans leurs propres phases)
+        if self.etat == "minigame_during":
+            with self.profiler.mesure("logique"):
                 self.during_game()
 
-            if self.etat == "minigame_score":
-                self.calculate_score()
+        if self.etat == "minigame_score":
+            self.calculate_score()
+
+        # L'état du tick est encodé une seule fois, quel que soit le nombre de clients
+        with self.profiler.mesure("serialisation"):
+            self.publier_snapshot()
+
+
+    def publier_snapshot(self) -> None:
+        """
+        Cette méthode encode l'état du mini-jeu et remplace d'un coup celui envoyé aux clients
+        (la chaîne précédente n'est jamais modifiée, les threads des clients peuvent donc l'envoyer sans verrou).
+        """
+
+        self.snapshot = json.dumps(self.get_infos())
+
+
+    def get_snapshot(self) -> str:
+        """
+        Cette méthode permet de récupérer le dernier état encodé du mini-jeu.
+
+        Renvois:
+            - str: État du mini-jeu en json (encodé immédiatement si aucun tick n'a encore été exécuté).
+        """
+
+        snapshot = self.snapshot
+
+        if snapshot is None:
+            snapshot = json.dumps(self.get_infos())
+
+        return snapshot
+
+
+    def run(self, clock) -> None:
+        self.is_running = True
+
+        if not self.silencieux:
+            print("Lancement du mini-jeu: Hexagon Heat")
+        while self.is_running:
+            # Pendant le choix et le chargement du mini-jeu rien ne bouge, on attend donc que les joueurs soient prêts
+            if self.etat == "minigame_select" or self.etat == "minigame_load":
+                with self.condition:
+                    self.condition.wait_for(self.tous_prets, timeout=1)
+
+            self.profiler.debut_tick()
+            self.tick()
+            self.profiler.fin_tick()
 
             self.current_fps = clock.get_fps()
             clock.tick(self.fps)
\ No newline at end of file
@@ -0,0 +1,343 @@
+#Projet : Mayro Party
+#Auteurs : Hinata Bouaziz, Antoine Desrues, Alexandre Guillaume, Matisse Moreau
+
+# ------/ Importations des bibliothèques \------
+
+import pygame
+import pygame.freetype
+import json
+import time
+from collections import deque
+from os import sep
+
+from profiler import percentile, creer_mesure
+from traceur import TRACEUR
+from protocole import requete, STATS
+
+# ------/ Constantes \------
+
+# Touche qui affiche / cache le HUD
+TOUCHE_HUD = pygame.K_F3
+
+# Nombre de frames affichées dans le graphe
+NB_FRAMES_GRAPHE = 180
+
+# Hauteur du graphe (en pixels) et nombre de pixels par milliseconde
+HAUTEUR_GRAPHE = 100
+PIXELS_PAR_MS = 3
+
+# Délai (en secondes) entre deux demandes des stats du serveur et deux calculs du débit
+INTERVALLE_STATS = 1.0
+
+# Délai (en secondes) entre deux mises à jour des textes du HUD
+INTERVALLE_TEXTES = 0.25
+
+# Phases d'une frame dans l'ordre du graphe (de bas en haut) et leur couleur (le dessin est ce qui reste)
+COULEURS_PHASES = {
+    "reseau": (230, 80, 80),
+    "decodage": (230, 190, 60),
+    "dessin": (90, 170, 240),
+    "flip": (120, 220, 120),
+    "attente": (110, 110, 110)
+}
+
+# ------/ Classes \------
+
+# Classe du HUD de performances (F3): temps de chaque frame, réseau et ticks du serveur
+class HudPerformances:
+
+    # ------/ Constructeur \------
+
+    def __init__(self) -> None:
+        """
+        Constructeur de la classe HudPerformances.
+
+        Attributs internes:
+            - nom (str): Catégorie des mesures du client dans la trace (--trace).
+            - actif (bool): Indique si le HUD est affiché (les mesures ne coûtent rien tant qu'il est caché).
+            - frames (deque): Durée totale et durée de chaque phase des dernières frames (en secondes).
+            - phases_frame (dict): Durées mesurées pendant la frame en cours.
+            - fin_derniere_frame (float): Moment de la fin de la dernière frame.
+            - net (Network ou None): Réseau du client (temps d'attente, RTT, octets et stats du serveur).
+            - clock (Clock ou None): Horloge du client (temps d'attente de clock.tick).
+            - attente_reseau (float): Attente totale du réseau à la fin de la frame précédente.
+            - octets (tuple): Octets envoyés et reçus au dernier calcul du débit.
+            - debit (tuple): Octets envoyés et reçus par seconde.
+            - stats_serveur (dict ou None): Stats du tick du serveur (lobby ou mini-jeu en cours).
+            - derniere_stats (float): Moment de la dernière demande des stats.
+            - touche_enfoncee (bool): État de la touche du HUD à la frame précédente.
+            - police (pygame.freetype.Font): Police du HUD (chargée au premier affichage).
+            - fond (pygame.Surface): Fond transparent du HUD avec la légende (créé au premier affichage).
+            - graphe (pygame.Surface): Graphe des dernières frames, décalé d'une barre à chaque frame.
+            - image_textes (pygame.Surface): Textes du HUD (mis à jour toutes les INTERVALLE_TEXTES secondes).
+            - derniers_textes (float): Moment de la dernière mise à jour des textes.
+        """
+
+        self.nom = "client"
+        self.actif = False
+        self.frames = deque(maxlen=NB_FRAMES_GRAPHE)
+        self.phases_frame = {}
+        self.fin_derniere_frame = time.perf_counter()
+
+        self.net = None
+        self.clock = None
+
+        self.attente_reseau = 0.0
+        self.octets = (0, 0)
+        self.debit = (0, 0)
+        self.stats_serveur = None
+        self.derniere_stats = 0.0
+
+        self.touche_enfoncee = False
+        self.police = None
+        self.fond = None
+        self.graphe = None
+        self.image_textes = None
+        self.derniers_textes = 0.0
+
+
+    # ------/ Getters \------
+
+    def get_actif(self) -> bool:
+        return self.actif
+
+    def get_frames(self) -> deque:
+        return self.frames
+
+
+    # ------/ Setters \------
+
+    def set_actif(self, new_actif: bool) -> None:
+        self.actif = new_actif
+        self.frames.clear()
+
+        # Le prochain affichage demande tout de suite les stats du serveur et met à jour les textes
+        self.derniere_stats = 0.0
+        self.derniers_textes = 0.0
+
+        if self.actif:
+            self.preparer()
+
+    def set_net(self, new_net) -> None:
+        if new_net is not self.net:
+            self.net = new_net
+            self.attente_reseau = 0.0 if new_net is None else new_net.get_attente()
+            self.octets = (0, 0) if new_net is None else new_net.get_octets()
+            self.stats_serveur = None
+
+    def set_clock(self, new_clock) -> None:
+        self.clock = new_clock
+
+
+    # ------/ Méthodes \------
+
+    def preparer(self) -> None:
+        """
+        Cette méthode charge la police et crée les images du HUD (une seule fois, au premier affichage).
+        """
+
+        if self.police is not None:
+            self.graphe.fill((0, 0, 0, 0))
+            return
+
+        self.police = pygame.freetype.Font(sep.join(["..", "data", "fonts", "ComicSansMS3.ttf"]), 14)
+        self.graphe = pygame.Surface((NB_FRAMES_GRAPHE * 2, HAUTEUR_GRAPHE), pygame.SRCALPHA)
+
+        self.fond = pygame.Surface((NB_FRAMES_GRAPHE * 2 + 20, HAUTEUR_GRAPHE + 150), pygame.SRCALPHA)
+        self.fond.fill((0, 0, 0, 170))
+
+        # Nom des repères à 60 et 120 fps
+        for fps in (60, 120):
+            self.police.render_to(self.fond, (12, HAUTEUR_GRAPHE + 10 - round(1000 / fps * PIXELS_PAR_MS) - 12), str(fps) + " fps", (255, 255, 255))
+
+        # Légende
+        legende_x = 10
+        for phase, couleur in COULEURS_PHASES.items():
+            self.fond.fill(couleur, (legende_x, HAUTEUR_GRAPHE + 18, 10, 10))
+            legende_x += 24 + self.police.render_to(self.fond, (legende_x + 14, HAUTEUR_GRAPHE + 16), phase, (255, 255, 255)).w
+
+
+    def mesure(self, phase: str) -> "Mesure | MesureVide":
+        """
+        Cette méthode permet de mesurer la durée d'une phase de la frame en cours avec un bloc with.
+
+        Paramètres:
+            - phase (str): Nom de la phase (decodage...).
+
+        Renvois:
+            - Mesure ou MesureVide: Objet à utiliser avec with (vide si le HUD est caché et la trace désactivée).
+        """
+
+        return creer_mesure(self, phase)
+
+
+    def enregistrer(self, phase: str, duree: float) -> None:
+        """
+        Cette méthode ajoute une durée à une phase de la frame en cours.
+
+        Paramètres:
+            - phase (str): Nom de la phase.
+            - duree (float): Durée mesurée en secondes.
+        """
+
+        self.phases_frame[phase] = self.phases_frame.get(phase, 0.0) + duree
+
+
+    def fin_frame(self, duree_flip: float) -> None:
+        """
+        Cette méthode termine la frame en cours (appelée par presenter après chaque flip): elle détecte la touche
+        du HUD et, s'il est affiché, découpe la durée de la frame en phases.
+
+        Paramètres:
+            - duree_flip (float): Durée de l'agrandissement et du flip de la frame.
+        """
+
+        maintenant = time.perf_counter()
+        duree = maintenant - self.fin_derniere_frame
+        self.fin_derniere_frame = maintenant
+
+        # La touche est lue ici pour que le HUD marche dans toutes les boucles (menus et mini-jeux)
+        touche_enfoncee = pygame.key.get_pressed()[TOUCHE_HUD]
+        if touche_enfoncee and not self.touche_enfoncee:
+            self.set_actif(not self.actif)
+        self.touche_enfoncee = touche_enfoncee
+
+        phases = self.phases_frame
+        self.phases_frame = {}
+
+        # Dans la trace, la frame commence par l'attente de clock.tick (juste après la frame précédente), puis le
+        # dessin (avec les requêtes et le décodage) jusqu'au flip
+        if TRACEUR.get_actif():
+            debut_frame = maintenant - duree
+            attente = 0.0 if self.clock is None else max(0, self.clock.get_time() - self.clock.get_rawtime()) / 1000
+
+            TRACEUR.ajouter("frame", self.nom, debut_frame, maintenant)
+            TRACEUR.ajouter("attente", self.nom, debut_frame, debut_frame + attente)
+            TRACEUR.ajouter("dessin", self.nom, debut_frame + attente, maintenant - duree_flip)
+            TRACEUR.ajouter("flip", self.nom, maintenant - duree_flip, maintenant)
+
+        if not self.actif:
+            return
+
+        # Le réseau compte le temps passé à attendre ses réponses
+        if self.net is not None:
+            attente_reseau = self.net.get_attente()
+            phases["reseau"] = attente_reseau - self.attente_reseau
+            self.attente_reseau = attente_reseau
+
+        # Temps passé à dormir dans le dernier clock.tick (get_rawtime ne compte pas l'attente)
+        if self.clock is not None:
+            phases["attente"] = max(0, self.clock.get_time() - self.clock.get_rawtime()) / 1000
+
+        phases["flip"] = duree_flip
+        phases["dessin"] = max(0.0, duree - sum(phases.values()))
+
+        self.frames.append((duree, phases))
+
+        # Le graphe est décalé d'une barre vers la gauche, seule la barre de cette frame est dessinée
+        x = self.graphe.get_width() - 2
+        self.graphe.scroll(-2, 0)
+        self.graphe.fill((0, 0, 0, 0), (x, 0, 2, HAUTEUR_GRAPHE))
+
+        y = HAUTEUR_GRAPHE
+        for phase, couleur in COULEURS_PHASES.items():
+            hauteur = min(round(phases.get(phase, 0.0) * 1000 * PIXELS_PAR_MS), y)
+            if hauteur > 0:
+                y -= hauteur
+                self.graphe.fill(couleur, (x, y, 2, hauteur))
+
+        if maintenant - self.derniere_stats > INTERVALLE_STATS:
+            self.actualiser_stats(maintenant)
+
+
+    def actualiser_stats(self, maintenant: float) -> None:
+        """
+        Cette méthode calcule le débit du réseau et demande les stats du tick au serveur (une fois par seconde).
+
+        Paramètres:
+            - maintenant (float): Moment actuel (time.perf_counter).
+        """
+
+        duree = maintenant - self.derniere_stats
+        self.derniere_stats = maintenant
+
+        if self.net is None:
+            return
+
+        octets = self.net.get_octets()
+        if duree < 2 * INTERVALLE_STATS:
+            self.debit = (round((octets[0] - self.octets[0]) / duree), round((octets[1] - self.octets[1]) / duree))
+        self.octets = octets
+
+        try:
+            stats = json.loads(self.net.send(requete(STATS)))
+        except ValueError:
+            stats = None
+
+        # Stats du mini-jeu en cours, sinon celles du lobby
+        if type(stats) == dict:
+            stats = stats["minijeu"] if stats.get("minijeu") is not None else stats.get("lobby")
+        self.stats_serveur = stats if type(stats) == dict else None
+
+
+    def textes(self) -> list:
+        """
+        Cette méthode prépare les lignes de texte du HUD.
+
+        Renvois:
+            - list: Lignes à afficher.
+        """
+
+        durees = sorted(frame[0] for frame in self.frames)
+        textes = ["FRAME: p50 " + str(round(percentile(durees, 50) * 1000, 1)) + " ms, p99 " + str(round(percentile(durees, 99) * 1000, 1)) + " ms, max " + str(round(percentile(durees, 100) * 1000, 1)) + " ms"]
+
+        if self.net is None:
+            textes.append("RÉSEAU: pas de serveur")
+            return textes
+
+        rtts = sorted(self.net.get_rtts())
+        textes.append("RTT: p50 " + str(round(percentile(rtts, 50) * 1000, 2)) + " ms, p99 " + str(round(percentile(rtts, 99) * 1000, 2)) + " ms")
+        textes.append("DÉBIT: " + str(round(self.debit[0] / 1024, 1)) + " Ko/s envoyés, " + str(round(self.debit[1] / 1024, 1)) + " Ko/s reçus")
+
+        if self.stats_serveur is None or not "tick" in self.stats_serveur["phases"]:
+            textes.append("S-TICK: pas de mesures (serveur lancé sans --profile)")
+        else:
+            tick = self.stats_serveur["phases"]["tick"]
+            textes.append("S-TICK (" + self.stats_serveur["nom"] + "): p50 " + str(tick["p50"]) + " ms, p99 " + str(tick["p99"]) + " ms, max " + str(tick["max"]) + " ms")
+            textes.append("S-BUDGET: " + str(self.stats_serveur["budget_ms"]) + " ms, " + str(self.stats_serveur["depassements"]) + " dépassements / " + str(self.stats_serveur["nb_ticks"]) + " ticks")
+
+        return textes
+
+
+    def afficher(self, screen: pygame.Surface) -> None: # type: ignore
+        """
+        Cette méthode dessine le HUD en haut à droite de l'image de rendu (s'il est affiché).
+
+        Paramètres:
+            - screen (pygame.Surface): Image de rendu.
+        """
+
+        if not self.actif:
+            return
+
+        # Les textes sont rendus quelques fois par seconde seulement
+        if time.perf_counter() - self.derniers_textes > INTERVALLE_TEXTES:
+            self.derniers_textes = time.perf_counter()
+
+            self.image_textes = pygame.Surface((self.fond.get_width(), 120), pygame.SRCALPHA)
+            for i, texte in enumerate(self.textes()):
+                self.police.render_to(self.image_textes, (10, i * 20), texte, (255, 255, 255))
+
+        x = screen.get_width() - self.fond.get_width()
+        screen.blit(self.fond, (x, 0))
+        screen.blit(self.graphe, (x + 10, 10))
+
+        # Repères à 60 et 120 fps
+        for fps in (60, 120):
+            screen.fill((255, 255, 255), (x + 10, HAUTEUR_GRAPHE + 10 - round(1000 / fps * PIXELS_PAR_MS), NB_FRAMES_GRAPHE * 2, 1))
+
+        screen.blit(self.image_textes, (x, HAUTEUR_GRAPHE + 40))
+
+
+# HUD partagé par les menus et tous les mini-jeux
+HUD = HudPerformances()
@@ -0,0 +1,451 @@
+#Projet : Mayro Party
+#Auteurs : Hinata Bouaziz, Antoine Desrues, Alexandre Guillaume, Matisse Moreau
+
+# ------/ Importations des bibliothèques \------
+
+import json
+import random
+import hashlib
+import importlib
+from threading import Condition
+
+from protocole import TableRequetes, requete, GET_ETAT, INPUTS, TAILLE_JOUEURS, DESACTIVE_SON, POURCENTAGES, GET_IDS_MINIJEU, EMPREINTE
+
+# ------/ Constantes \------
+
+# Nombre de ticks entre deux empreintes de l'état (comparées par le serveur pour détecter les désynchronisations)
+INTERVALLE_EMPREINTE = 60
+
+# Nombre de ticks par seconde des mini-jeux (le temps simulé en dépend, il est donc le même partout)
+FPS = 60
+
+# Nombre d'empreintes gardées par le serveur (celles des clients en retard de plus de 2 minutes ne sont plus vérifiées)
+NB_EMPREINTES = 120
+
+# ------/ Fonctions utiliatires \------
+
+def creer_serveur(minijeu: str, graine: int, horloge: "function", profiling: bool = False, silencieux: bool = False):
+    """
+    Cette fonction crée le serveur d'un mini-jeu déterministe: son temps est celui de la simulation (et non celui
+    de la machine) et son aléatoire ne dépend que de la graine, deux serveurs créés de la même façon avec les mêmes
+    événements restent donc identiques.
+
+    Paramètres:
+        - minijeu (str): Nom du mini-jeu ("archer_ival", "hexagon_heat"...).
+        - graine (int): Graine partagée par le serveur et tous les clients.
+        - horloge (function): Fonction qui renvoie le temps simulé.
+        - profiling (bool): Active le profiler du mini-jeu.
+        - silencieux (bool): Masque les messages du mini-jeu (copie d'un client, qui répéterait ceux du serveur).
+    Renvois:
+        - Server: Serveur du mini-jeu (sans socket).
+    """
+
+    # Tests du type des paramètres
+    assert type(minijeu) == str, "Erreur: Le 1er paramètre (minijeu) est censé être une chaîne de caractères."
+    assert type(graine) == int, "Erreur: Le 2ème paramètre (graine) est censé être un entier."
+
+    serveur = importlib.import_module(minijeu + "_server").Server(None, profiling, horloge=horloge, rng=random.Random(graine), silencieux=silencieux)
+    serveur.fps = FPS
+
+    # Personne ne lit l'état encodé en json: seuls les inputs sont envoyés aux clients
+    serveur.publier_snapshot = lambda: None
+
+    return serveur
+
+
+def appliquer_evenement(serveur, evenement: list) -> None:
+    """
+    Cette fonction applique un événement d'un joueur au serveur d'un mini-jeu, au début d'un tick.
+
+    Paramètres:
+        - serveur (Server): Serveur du mini-jeu.
+        - evenement (list): ["p", joueur] (joueur prêt), ["i", joueur, inputs] (nouveaux inputs) ou
+        ["r", joueur, requete] (autre requête qui modifie le mini-jeu: taille des joueurs, sons, classement...).
+    """
+
+    if evenement[0] == "p":
+        serveur.marquer_pret(evenement[1])
+
+    elif evenement[0] == "i":
+        serveur.inputs_joueurs[evenement[1]] = list(evenement[2])
+
+    elif evenement[0] == "r":
+        serveur.client_thread(evenement[1], evenement[2])
+
+
+def empreinte(serveur) -> str:
+    """
+    Cette fonction calcule l'empreinte de l'état d'un mini-jeu (sans les fps du serveur, qui ne sont pas simulés).
+
+    Paramètres:
+        - serveur (Server): Serveur du mini-jeu.
+    Renvois:
+        - str: Empreinte (sha1) en hexadécimal.
+    """
+
+    infos = serveur.get_infos()
+    infos.pop("fps", None)
+
+    return hashlib.sha1(json.dumps({"etat": serveur.get_etat(), "infos": infos}, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+# ------/ Classes \------
+
+# Classe d'un mini-jeu en lockstep (vu par le lobby comme un serveur de mini-jeu): le serveur simule la partie
+# comme d'habitude, mais n'envoie aux clients que les événements de chaque tick (inputs, joueurs prêts...), que
+# chaque client rejoue sur sa propre copie du mini-jeu
+class MinijeuLockstep:
+
+    # ------/ Constructeur \------
+
+    def __init__(self, minijeu: str, profiling: bool = False, graine: "int | None" = None) -> None:
+        """
+        Constructeur de la classe MinijeuLockstep.
+
+        Attributs à définir:
+            - minijeu (str): Nom du mini-jeu ("archer_ival", "hexagon_heat"...).
+            - profiling (bool): Active le profiler du mini-jeu.
+            - graine (int ou None): Graine partagée avec les clients (tirée au hasard si elle n'est pas donnée).
+
+        Attributs internes:
+            - serveur (Server): Serveur du mini-jeu, qui ne reçoit les événements qu'au début des ticks.
+            - joueurs (list): Adresse, personnage et ia de chaque joueur (dans l'ordre où ils ont été ajoutés).
+            - nb_ticks (int): Nombre de ticks exécutés.
+            - en_attente (list): Événements reçus depuis le dernier tick.
+            - journal (list): Tick et événement des événements appliqués pas encore envoyés à tous les joueurs.
+            - curseurs (dict): Nombre d'événements du journal déjà envoyés à chaque joueur.
+            - derniers_inputs (dict): Derniers inputs reçus de chaque joueur (seuls les changements sont envoyés).
+            - empreintes (dict): Empreinte de l'état après les derniers multiples de INTERVALLE_EMPREINTE ticks.
+            - desynchronisations (int): Nombre d'empreintes de clients différentes de celle du serveur.
+            - condition (Condition): Verrou des événements et du journal, qui réveille aussi le serveur pendant le chargement.
+        """
+
+        self.minijeu = minijeu
+        self.graine = random.randrange(2 ** 31) if graine is None else graine
+        self.nb_ticks = 0
+
+        self.serveur = creer_serveur(minijeu, self.graine, self.horloge, profiling)
+        self.profiler = self.serveur.profiler
+
+        self.joueurs = []
+        self.en_attente = []
+        self.journal = []
+        self.curseurs = {}
+        self.derniers_inputs = {}
+        self.empreintes = {}
+        self.desynchronisations = 0
+        self.condition = Condition()
+
+        self.requetes = TableRequetes(minijeu + " (lockstep)")
+        self.requetes.enregistrer(GET_ETAT, self.requete_get_etat)
+        self.requetes.enregistrer(INPUTS, self.requete_inputs)
+        self.requetes.enregistrer(TAILLE_JOUEURS, self.requete_evenement(TAILLE_JOUEURS))
+        self.requetes.enregistrer(DESACTIVE_SON, self.requete_evenement(DESACTIVE_SON))
+        self.requetes.enregistrer(POURCENTAGES, self.requete_evenement(POURCENTAGES))
+        self.requetes.enregistrer(GET_IDS_MINIJEU, self.requete_get_ids_minijeu)
+        self.requetes.enregistrer(EMPREINTE, self.requete_empreinte)
+
+
+    # ------/ Getters \------
+
+    def get_minijeu(self) -> str:
+        return self.minijeu
+
+    def get_graine(self) -> int:
+        return self.graine
+
+    def get_nb_ticks(self) -> int:
+        return self.nb_ticks
+
+    def get_desynchronisations(self) -> int:
+        return self.desynchronisations
+
+    def get_classement(self):
+        return self.serveur.get_classement()
+
+    def get_etat(self):
+        return self.serveur.get_etat()
+
+    def get_nb_joueurs_prets(self):
+        return self.serveur.get_nb_joueurs_prets()
+
+    # Le mini-jeu tourne tant que son serveur tourne (le lobby l'arrête comme un serveur de mini-jeu)
+    @property
+    def is_running(self) -> bool:
+        return self.serveur.is_running
+
+    @is_running.setter
+    def is_running(self, new_is_running: bool) -> None:
+        self.serveur.is_running = new_is_running
+
+    # Le nombre de joueurs prêts change dans le serveur du mini-jeu, c'est donc lui qui prévient le lobby
+    @property
+    def notifier_lobby(self) -> "function":
+        return self.serveur.notifier_lobby
+
+    @notifier_lobby.setter
+    def notifier_lobby(self, new_notifier_lobby: "function") -> None:
+        self.serveur.notifier_lobby = new_notifier_lobby
+
+
+    # ------/ Méthodes \------
+
+    def horloge(self) -> float:
+        """
+        Cette méthode sert d'horloge au mini-jeu (le temps avance d'un tick à la fois, comme chez les clients).
+
+        Renvois:
+            - float: Temps simulé en secondes.
+        """
+
+        return self.nb_ticks / FPS
+
+
+    def add_player(self, address: str, perso: str, ia: bool):
+        self.joueurs.append((address, perso, ia))
+        self.serveur.add_player(address, perso, ia)
+
+
+    def ajouter_evenement(self, evenement: list) -> None:
+        """
+        Cette méthode garde un événement d'un joueur jusqu'au prochain tick (les clients l'appliquent au même tick).
+
+        Paramètres:
+            - evenement (list): Événement (voir appliquer_evenement).
+        """
+
+        with self.condition:
+            self.en_attente.append(evenement)
+            self.condition.notify_all()
+
+
+    def marquer_pret(self, address: str) -> None:
+        self.ajouter_evenement(["p", address])
+
+
+    def client_thread(self, address: str, request: str) -> str:
+        reply = self.requetes.traiter(address, request)
+        return "not_found" if reply is None else reply
+
+
+    def requete_get_etat(self, address: str, donnees: str) -> str:
+        return self.serveur.get_etat()
+
+
+    def requete_inputs(self, address: str, donnees: str) -> str:
+        # Les inputs ne changent pas à chaque frame: seuls leurs changements deviennent des événements
+        if self.derniers_inputs.get(address) != donnees:
+            self.derniers_inputs[address] = donnees
+            self.ajouter_evenement(["i", address, [int(coord) for coord in donnees.split("|")]])
+
+        # Le client reçoit les événements qu'il n'a pas encore et le nombre de ticks à simuler
+        with self.condition:
+            curseur = self.curseurs.get(address)
+            reponse = {"t": self.nb_ticks, "e": self.journal[0 if curseur is None else curseur:]}
+
+            # La première réponse donne de quoi créer la copie du mini-jeu
+            if curseur is None:
+                reponse["init"] = {"minijeu": self.minijeu, "graine": self.graine, "joueurs": self.joueurs}
+
+            self.curseurs[address] = len(self.journal)
+            self.elaguer_journal()
+
+        return json.dumps(reponse)
+
+
+    def elaguer_journal(self) -> None:
+        """
+        Cette méthode retire le début du journal déjà envoyé à tous les joueurs, et décale leurs curseurs d'autant
+        (à appeler avec la condition).
+        """
+
+        adresses = [address for address, perso, ia in self.joueurs if not ia]
+
+        # Un joueur qui n'a encore rien reçu a besoin du journal depuis le début
+        if any(address not in self.curseurs for address in adresses):
+            return
+
+        debut = min(self.curseurs[address] for address in adresses)
+
+        if debut > 0:
+            del self.journal[:debut]
+
+            for address in adresses:
+                self.curseurs[address] -= debut
+
+
+    def requete_evenement(self, opcode: int) -> "function":
+        """
+        Cette méthode crée la fonction qui répond aux requêtes d'un opcode qui modifie le mini-jeu: la requête est
+        rejouée par le serveur et par les clients au début du prochain tick.
+
+        Paramètres:
+            - opcode (int): Opcode de la requête.
+        Renvois:
+            - function: Fonction à enregistrer dans la table des requêtes.
+        """
+
+        def traiter(address: str, donnees: str) -> str:
+            self.ajouter_evenement(["r", address, requete(opcode, donnees)])
+            return "ok"
+
+        return traiter
+
+
+    def requete_get_ids_minijeu(self, address: str, donnees: str) -> str:
+        return self.serveur.client_thread(address, requete(GET_IDS_MINIJEU))
+
+
+    def requete_empreinte(self, address: str, donnees: str) -> str:
+        # Si les données c'est ça: 120|<empreinte>
+        tick, valeur = donnees.split("|")
+        attendue = self.empreintes.get(int(tick))
+
+        if attendue is None or attendue == valeur:
+            return "ok"
+
+        self.desynchronisations += 1
+        print("[" + self.minijeu + "] Désynchronisation du joueur " + address + " au tick " + tick)
+
+        return "desynchronise"
+
+
+    def tick(self) -> None:
+        """
+        Cette méthode exécute un tick du mini-jeu avec les événements reçus depuis le tick précédent.
+        """
+
+        with self.condition:
+            evenements = self.en_attente
+            self.en_attente = []
+
+        for evenement in evenements:
+            appliquer_evenement(self.serveur, evenement)
+
+        self.serveur.tick()
+
+        # Les événements ne sont envoyés qu'une fois le tick terminé (un client ne simule jamais un tick incomplet)
+        with self.condition:
+            self.journal.extend([self.nb_ticks, evenement] for evenement in evenements)
+            self.nb_ticks += 1
+
+        if self.nb_ticks % INTERVALLE_EMPREINTE == 0:
+            self.empreintes[self.nb_ticks] = empreinte(self.serveur)
+            self.empreintes.pop(self.nb_ticks - NB_EMPREINTES * INTERVALLE_EMPREINTE, None)
+
+
+    def run(self, clock) -> None:
+        self.serveur.is_running = True
+
+        print("Lancement du mini-jeu en lockstep: " + self.minijeu + " (graine " + str(self.graine) + ")")
+        while self.serveur.is_running:
+            # Pendant le choix et le chargement du mini-jeu rien ne bouge, on attend donc un événement
+            if self.serveur.get_etat() == "minigame_select" or self.serveur.get_etat() == "minigame_load":
+                with self.condition:
+                    self.condition.wait_for(lambda: len(self.en_attente) > 0, timeout=1)
+
+            self.profiler.debut_tick()
+            self.tick()
+            self.profiler.fin_tick()
+
+            self.serveur.current_fps = clock.get_fps()
+            clock.tick(self.serveur.fps)
+
+
+# Classe de la copie d'un mini-jeu en lockstep qui tourne chez un client
+class PairLockstep:
+
+    # ------/ Constructeur \------
+
+    def __init__(self, init: dict) -> None:
+        """
+        Constructeur de la classe PairLockstep.
+
+        Attributs à définir:
+            - init (dict): Mini-jeu, graine et joueurs envoyés par le serveur dans sa première réponse.
+
+        Attributs internes:
+            - serveur (Server): Copie du mini-jeu, créée comme celle du serveur.
+            - nb_ticks (int): Nombre de ticks simulés.
+            - empreintes (list): Tick et empreinte des états pas encore envoyés au serveur.
+            - desynchronise (bool): Indique si le serveur a signalé une désynchronisation.
+        """
+
+        self.minijeu = init["minijeu"]
+        self.nb_ticks = 0
+        self.empreintes = []
+        self.desynchronise = False
+
+        # Les messages du mini-jeu (changements d'état...) sont ceux du serveur, on ne les répète pas
+        self.serveur = creer_serveur(self.minijeu, init["graine"], self.horloge, silencieux=True)
+
+        for address, perso, ia in init["joueurs"]:
+            self.serveur.add_player(address, perso, ia)
+
+        self.serveur.is_running = True
+
+
+    # ------/ Getters \------
+
+    def get_minijeu(self) -> str:
+        return self.minijeu
+
+    def get_nb_ticks(self) -> int:
+        return self.nb_ticks
+
+    def get_desynchronise(self) -> bool:
+        return self.desynchronise
+
+
+    # ------/ Setters \------
+
+    def set_desynchronise(self, new_desynchronise: bool) -> None:
+        self.desynchronise = new_desynchronise
+
+
+    # ------/ Méthodes \------
+
+    def horloge(self) -> float:
+        return self.nb_ticks / FPS
+
+
+    def avancer(self, nb_ticks: int, evenements: list) -> dict:
+        """
+        Cette méthode rejoue les ticks que le serveur a déjà exécutés, avec leurs événements.
+
+        Paramètres:
+            - nb_ticks (int): Nombre de ticks exécutés par le serveur.
+            - evenements (list): Tick et événement des nouveaux événements (dans l'ordre).
+        Renvois:
+            - dict: État du mini-jeu, comme celui envoyé par le serveur hors lockstep.
+        """
+
+        i = 0
+
+        while self.nb_ticks < nb_ticks:
+            while i < len(evenements) and evenements[i][0] == self.nb_ticks:
+                appliquer_evenement(self.serveur, evenements[i][1])
+                i += 1
+
+            self.serveur.tick()
+            self.nb_ticks += 1
+
+            if self.nb_ticks % INTERVALLE_EMPREINTE == 0:
+                self.empreintes.append((self.nb_ticks, empreinte(self.serveur)))
+
+        # Passage par json pour donner exactement ce que le client recevrait hors lockstep (clés en chaînes, listes...)
+        return json.loads(json.dumps(self.serveur.get_infos()))
+
+
+    def prendre_empreintes(self) -> list:
+        """
+        Cette méthode donne les empreintes à envoyer au serveur (elles ne sont données qu'une fois).
+
+        Renvois:
+            - list: Tick et empreinte de chaque état.
+        """
+
+        empreintes = self.empreintes
+        self.empreintes = []
+
+        return empreintes
\ No newline at end of file
@@ -9,20 +9,19 @@ import pygame.ftfont
 from pygame import mixer
 
 import time
+import sys
+import importlib
 from os import sep
 
 from _thread import start_new_thread
-from utils import Network, scale_image_by
+from utils import Network, scale_image_by, creer_rendu, presenter, position_souris, TAILLE_RENDU
+from hud import HUD
+from traceur import TRACEUR
+from protocole import requete, GET_ETAT, SET_PERSO, PRET, CLOSE
+from cache_ressources import charger_image, charger_son
 import json
-from server import Server
-
-# ------/ Importations des mini-jeux clients \------
-
-import archer_ival_client
-import hexagon_heat_client
-import pushy_penguins_client
-import speed_hockey_client
-import trace_race_client
+from server import Server, servir_processus, MINIJEUX
+from memoire import GestionnaireMemoire, BUDGET_DEFAUT
 
 
 # ------/ Fonctions utiliatires \------
@@ -130,6 +129,16 @@ class Button():
         #Initialisation de la police pour le bouton
         self.font = font
 
+        #Image du bouton à sa taille (l'image donnée redimensionnée, ou sinon une surface remplie de la couleur donnée)
+        if self.image:
+            self.surface = pygame.transform.scale(self.image, (self.width, self.height))
+        else:
+            self.surface = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
+            self.surface.fill(self.color)
+
+        #Dernier texte rendu et son image
+        self.text_surface = None
+
     # Getters
 
     def get_width(self):
@@ -158,35 +167,24 @@ class Button():
         # Test du type de screen
         assert type(screen) == pygame.Surface, "Erreur: Le paramètre screen donné n'est pas un écran de pygame."
 
-        # Initialisation des facteurs pour la taille de l'écran
-        screen_factor = ((screen.get_rect().size[0] / 1280), (screen.get_rect().size[1] / 720))
-
-        #Si une image est donnée, elle est redimensionnée, puis affichée comme un bouton
-        if self.image:
-            scaled_image = pygame.transform.scale(self.image, (round(self.width * screen_factor[0]), round(self.height * screen_factor[1])))
-            screen.blit(scaled_image, (round(self.x * screen_factor[0]), round(self.y * screen_factor[1])))
-
-        #Sinon une surface est créée, puis remplie d'une couleur donné, puis affichée comme bouton
-        else:
-            surface = pygame.Surface((round(self.width * screen_factor[0]), round(self.height * screen_factor[1])), pygame.SRCALPHA)
-            surface.fill(self.color)
-            screen.blit(surface, (round(self.x * screen_factor[0]), round(self.y * screen_factor[1])))
+        # Le bouton est dessiné dans l'image de rendu (TAILLE_RENDU), ses coordonnées sont donc utilisées telles quelles
+        screen.blit(self.surface, (self.x, self.y))
 
         #Si un texte et une police d'écriture sont donnés, le texte a l'intéreur du bouton sera centré, puis affiché
         if self.text and self.font:
-            text_surface = self.font.render(self.text, True, (255, 255, 255))
-            text_surface = pygame.transform.scale(text_surface, (round(text_surface.get_rect().w * screen_factor[0]), round(text_surface.get_rect().h * screen_factor[1])))
-            text_rect = text_surface.get_rect(center=(round((self.x + self.width // 2) * screen_factor[0]), round((self.y + self.height // 2) * screen_factor[1])))
-            screen.blit(text_surface, text_rect)
+            # Le texte n'est rendu de nouveau que s'il a changé
+            if self.text_surface is None or self.text_surface[0] != self.text:
+                self.text_surface = (self.text, self.font.render(self.text, True, (255, 255, 255)))
+
+            screen.blit(self.text_surface[1], self.text_surface[1].get_rect(center=(self.x + self.width // 2, self.y + self.height // 2)))
 
 
-    def is_clicked(self, pos: tuple, screen: pygame.Surface) -> bool: # type: ignore
+    def is_clicked(self, pos: tuple) -> bool:
         """
         Vérifie si la position de la souris se situe à l'intérieur du rectangle du bouton.
 
         Paramètres:
-            - pos (tuple): Position de la souris.
-            - screen (pygame.Surface): écran de pygame.
+            - pos (tuple): Position de la souris dans l'image de rendu (voir position_souris).
         Return:
             - bool: Indique si le bouton a été touché ou non.
         Post-conditions:
@@ -197,10 +195,7 @@ class Button():
         # Test du type de pos
         assert type(pos) == tuple, "Erreur: Le paramètre pos fournit n'est pas un tuple."
 
-        # Initialisation des facteurs pour la taille de l'écran
-        screen_factor = ((screen.get_rect().size[0] / 1280), (screen.get_rect().size[1] / 720))
-
-        return pygame.Rect(round(self.x * screen_factor[0]), round(self.y * screen_factor[1]), round(self.width * screen_factor[0]), round(self.height * screen_factor[1])).collidepoint(pos)
+        return pygame.Rect(self.x, self.y, self.width, self.height).collidepoint(pos)
 
 
 
@@ -320,18 +315,10 @@ class InputField():
         # Test du type de screen
         assert type(screen) == pygame.Surface, "Erreur: Le paramètre screen donné n'est pas un écran de pygame."
 
-        # Initialisation des facteurs pour la taille de l'écran
-        screen_factor = ((screen.get_rect().size[0] / 1280), (screen.get_rect().size[1] / 720))
-
-        #Une surface est créée, puis remplie d'une couleur
-        surface = pygame.Surface((round(self.width * screen_factor[0]), round(self.height * screen_factor[1])), pygame.SRCALPHA)
-        surface.fill((21, 34, 74))
-        screen.blit(surface, (round(self.x * screen_factor[0]), round(self.y * screen_factor[1])))
-
-        #Une autre surface est créée, puis remplie d'une deuxième couleur
-        surface2 = pygame.Surface((round((self.width - 20) * screen_factor[0]), round((self.height - 20) * screen_factor[1])), pygame.SRCALPHA)
-        surface2.fill((13, 24, 65))
-        screen.blit(surface2, (round((self.x + 10) * screen_factor[0]), round((self.y + 10) * screen_factor[1])))
+        # Le champ est dessiné dans l'image de rendu (TAILLE_RENDU), ses coordonnées sont donc utilisées telles quelles
+        #Un rectangle est rempli d'une couleur, puis un autre plus petit d'une deuxième couleur
+        screen.fill((21, 34, 74), (self.x, self.y, self.width, self.height))
+        screen.fill((13, 24, 65), (self.x + 10, self.y + 10, self.width - 20, self.height - 20))
 
         #Si un texte et une police d'écriture sont donnés, le texte a l'intéreur du bouton sera centré, puis affiché
         if self.font:
@@ -339,27 +326,22 @@ class InputField():
                 default_text_color = (100, 100, 100) if self.active else (150, 150, 150)
 
                 default_text_surface = self.font.render(self.default_text, True, default_text_color)
-                default_text_surface = pygame.transform.scale(default_text_surface, (round(default_text_surface.get_rect().w * screen_factor[0]), round(default_text_surface.get_rect().h * screen_factor[1])))
-                default_text_rect = default_text_surface.get_rect(center=(round((self.x + self.width // 2) * screen_factor[0]), round((self.y + self.height // 2) * screen_factor[1])))
-                screen.blit(default_text_surface, default_text_rect)
+                screen.blit(default_text_surface, default_text_surface.get_rect(center=(self.x + self.width // 2, self.y + self.height // 2)))
 
             else:
                 text_color = (230, 230, 230) if self.active else (255, 255, 255)
 
                 text_surface = self.font.render(self.text, True, text_color)
-                text_surface = pygame.transform.scale(text_surface, (round(text_surface.get_rect().w * screen_factor[0]), round(text_surface.get_rect().h * screen_factor[1])))
-                text_rect = text_surface.get_rect(center=(round((self.x + self.width // 2) * screen_factor[0]), round((self.y + self.height // 2) * screen_factor[1])))
-                screen.blit(text_surface, text_rect)
+                screen.blit(text_surface, text_surface.get_rect(center=(self.x + self.width // 2, self.y + self.height // 2)))
 
 
 
-    def is_clicked(self, pos: tuple, screen: pygame.Surface) -> bool: # type: ignore
+    def is_clicked(self, pos: tuple) -> bool:
         """
         Vérifie si la position de la souris se situe à l'intérieur du rectangle du bouton.
 
         Paramètres:
-            - pos (tuple): Position de la souris.
-            - screen (pygame.Surface): écran de pygame.
+            - pos (tuple): Position de la souris dans l'image de rendu (voir position_souris).
         Return:
             - bool: Indique si le bouton a été touché ou non.
         Post-conditions:
@@ -370,21 +352,23 @@ class InputField():
         # Test du type de pos
         assert type(pos) == tuple, "Erreur: Le paramètre pos fournit n'est pas un tuple."
 
-        # Initialisation des facteurs pour la taille de l'écran
-        screen_factor = ((screen.get_rect().size[0] / 1280), (screen.get_rect().size[1] / 720))
-
-        return pygame.Rect(round(self.x * screen_factor[0]), round(self.y * screen_factor[1]), round(self.width * screen_factor[0]), round(self.height * screen_factor[1])).collidepoint(pos)
+        return pygame.Rect(self.x, self.y, self.width, self.height).collidepoint(pos)
 
 
 
 # Classe du jeu
 class Game():
-    def __init__(self) -> None:
+    def __init__(self, solo_processus: bool = False, budget_memoire: int = BUDGET_DEFAUT) -> None:
         """
         Constructeur de la classe Game.
 
+        Attributs à définir:
+            - solo_processus (bool): En solo, fait tourner le serveur dans un processus à part (option --solo-processus).
+            - budget_memoire (int): Taille maximale (en octets) des images et des sons gardés (option --budget-memoire=Mo).
+
         Attributs internes:
-            - screen (pygame.Surface): L'écran de jeu de pygame.
+            - screen (pygame.Surface): Image de rendu (TAILLE_RENDU) dans laquelle tout le jeu dessine, agrandie à la taille
+            de la fenêtre par presenter.
             - clock: L'horloge de pygame (permet de placer une limite de fps au jeu).
             - fps (int): Le nombre de fps maximal du jeu.
 
@@ -392,7 +376,10 @@ class Game():
             - run (bool): Indique si le jeu est actif ou non.
 
             - joueurs (dict): Dictionnaire des joueurs en fonction de leur nom.
-            - mini_jeux (dict): Dictionnaire des mini-jeux en fonction de leur nom.
+            - minijeux (dict): Clients des mini-jeux déjà créés en fonction de leur nom (chacun est créé quand le serveur
+            le choisit, puis libéré une fois joué).
+            - minijeux_options (list): Mini-jeux qui restent à jouer.
+            - memoire (GestionnaireMemoire): Suivi des images et des sons des menus et des mini-jeux (affiché avec les fps).
             - classement (dict): Classement des joueurs à la fin du jeu.
 
             - current_screen (str): Indique l'écran actuel que voit le joueur.
@@ -411,11 +398,15 @@ class Game():
         pygame.mixer.init()
         pygame.init()
         pygame.display.set_caption("MAYRO PARTY")
-        pygame.display.set_icon(pygame.image.load(sep.join(["..", "data", "sprites", "icone.png"])))
+        pygame.display.set_icon(charger_image(sep.join(["..", "data", "sprites", "icone.png"])))
 
         # Paramètres du jeu
-        self.screen = pygame.display.set_mode((1280, 720), pygame.RESIZABLE|pygame.HWSURFACE|pygame.DOUBLEBUF)
+        pygame.display.set_mode(TAILLE_RENDU, pygame.RESIZABLE|pygame.HWSURFACE|pygame.DOUBLEBUF)
+        self.screen = creer_rendu()
         self.clock = pygame.time.Clock()
+
+        # Le HUD de performances (F3) mesure l'attente de clock.tick
+        HUD.set_clock(self.clock)
         self.fps = 120
 
         # Police d'écriture
@@ -424,21 +415,17 @@ class Game():
         # État du jeu
         self.run = True
 
-        # Liste des mini_jeux
-        self.minijeux = {
-            "archer_ival": archer_ival_client.MiniGame(self.screen, self.clock, self.fps),
-            "hexagon_heat": hexagon_heat_client.MiniGame(self.screen, self.clock, self.fps),
-            "pushy_penguins": pushy_penguins_client.MiniGame(self.screen, self.clock, self.fps),
-            "speed_hockey": speed_hockey_client.MiniGame(self.screen, self.clock, self.fps),
-            "trace_race": trace_race_client.MiniGame(self.screen, self.clock, self.fps)
-        }
-        self.minijeux_options = list(self.minijeux.keys())
+        # Liste des mini_jeux (leurs images et sons ne sont chargés qu'une fois le mini-jeu choisi)
+        self.minijeux = {}
+        self.minijeux_options = list(MINIJEUX)
+        self.memoire = GestionnaireMemoire(budget_memoire)
 
         # Écran actuel / sélectionné
         self.current_screen = "title_screen"
 
         # Mode de jeu actuel
         self.mode = "solo"
+        self.solo_processus = solo_processus
 
         # Écrans du menu principal
         self.title_screen = Title_screen(self.font)
@@ -453,11 +440,12 @@ class Game():
                                   self.select_character.get_wayro_button(),
                                   self.select_character.get_walugi_button()]
 
-        # Sprites pour le menu principal
-        self.background_title_screen = pygame.image.load(sep.join(["..", "data", "sprites", "main_menu", "wwmapflou.png"]))
+        # Sprites pour le menu principal (redimensionnés une seule fois, ici)
+        self.background_title_screen = pygame.transform.scale(charger_image(sep.join(["..", "data", "sprites", "main_menu", "wwmapflou.png"])), TAILLE_RENDU)
+        self.end_demo = pygame.transform.scale(charger_image(sep.join(["..", "data", "sprites", "main_menu", "end_demo.png"])), TAILLE_RENDU)
 
         # Initialisation d'un son pour les choix incorrects
-        self.son_incorrect = mixer.Sound(sep.join(["..", "data", "sounds", "main_menu", "incorrect.ogg"]))
+        self.son_incorrect = charger_son(sep.join(["..", "data", "sounds", "main_menu", "incorrect.ogg"]))
 
         # Personnage choisit par le joueur
         self.perso = ""
@@ -465,6 +453,46 @@ class Game():
         # Initialisation du réseau
         self.net = None
 
+        # Les menus restent chargés pendant toute la partie (ils sont seulement comptés)
+        self.memoire.enregistrer("menus", [self.title_screen, self.select_mode, self.select_character, self.select_ip, self.select_mini_jeux,
+                                           self.background_title_screen, self.end_demo, self.son_incorrect])
+        self.memoire.activer(["menus"])
+
+    def charger_minijeu(self, minijeu: str):
+        """
+        Cette méthode crée le client d'un mini-jeu (et charge ses images et ses sons) s'il n'existe pas encore.
+
+        Paramètres:
+            - minijeu (str): Nom du mini-jeu (élément de MINIJEUX).
+
+        Renvois:
+            - MiniGame: Client du mini-jeu.
+        """
+
+        if not minijeu in self.minijeux:
+            with TRACEUR.intervalle("creer_minijeu", args={"minijeu": minijeu} if TRACEUR.get_actif() else None):
+                self.minijeux[minijeu] = importlib.import_module(minijeu + "_client").MiniGame(self.screen, self.clock, self.fps)
+            self.minijeux[minijeu].set_memoire(self.memoire)
+
+            # Si le budget est dépassé, le client peut être oublié (il sera recréé s'il est de nouveau demandé)
+            self.memoire.enregistrer(minijeu, self.minijeux[minijeu], lambda: self.minijeux.pop(minijeu, None))
+
+        return self.minijeux[minijeu]
+
+
+    def liberer_minijeu(self, minijeu: str) -> None:
+        """
+        Cette méthode retire un mini-jeu joué des choix et libère son client (ses images et ses sons avec).
+
+        Paramètres:
+            - minijeu (str): Nom du mini-jeu.
+        """
+
+        self.minijeux_options.remove(minijeu)
+        self.minijeux.pop(minijeu, None)
+        self.memoire.liberer(minijeu)
+
+
     def main(self):
         # On lance la musique du menu principal
         self.title_screen.play_music_title_screen()
@@ -477,12 +505,15 @@ class Game():
 
         while self.run:
             # Affichage du fond
-            self.screen.blit(pygame.transform.scale(self.background_title_screen, self.screen.get_rect().size), (0, 0))
+            self.screen.blit(self.background_title_screen, (0, 0))
+
+            # Le HUD de performances suit la connexion actuelle (aucune en dehors d'une partie)
+            HUD.set_net(self.net)
 
             # Si le serveur est actif
             if self.net != None:
                 if len(self.minijeux_options) > 0:
-                    infos_serveur = json.loads(self.net.send("infos_serveur"))
+                    infos_serveur = self.net.get_infos_serveur()
                     joueurs_persos = {joueur["perso"]: joueur["pseudo"] for joueur in infos_serveur["infos_joueurs"].values()}
 
             # Différents affichages selon le menu choisit
@@ -493,7 +524,7 @@ class Game():
             elif self.current_screen == "select_character":
                 self.select_character.select_character_affichage(self.screen, joueurs_persos, self.mode, (infos_serveur["nb_joueurs_prets"], infos_serveur["nb_joueurs"]))
 
-                etat = self.net.send("get_etat")
+                etat = self.net.send(requete(GET_ETAT))
                 if etat == "minigame_select":
                     # On passe sur l'écran des mini-jeux
                     self.current_screen = "select_mini_jeux"
@@ -515,22 +546,27 @@ class Game():
                     self.title_screen.stop_music()
 
                     # Initialisation et lancement du mini-jeu
-                    self.net.send("ready_for_next_state")
-                    mini_jeu = self.minijeux[infos_serveur["minijeu_actuel"]]
+                    self.net.send(requete(PRET))
+                    mini_jeu = self.charger_minijeu(infos_serveur["minijeu_actuel"])
                     mini_jeu.set_net(self.net)
-                    mini_jeu.load()
+                    self.memoire.activer([infos_serveur["minijeu_actuel"]])
+                    # load enchaîne toutes les phases du mini-jeu: dans la trace, ses frames sont regroupées sous cet intervalle
+                    with TRACEUR.intervalle("minijeu", args={"minijeu": infos_serveur["minijeu_actuel"]} if TRACEUR.get_actif() else None):
+                        mini_jeu.load()
 
                     # On relance la musique d'attente
                     self.title_screen.play_music_attente()
 
                     # On détecte si le joueur a quitté la fenêtre dans le mini-jeu
                     if mini_jeu.get_quit():
-                        self.net.send("close")
+                        self.net.send(requete(CLOSE))
                         pygame.quit()
                         quit()
 
-                    # On supprime le mini-jeu des choix
-                    self.minijeux_options.remove(infos_serveur["minijeu_actuel"])
+                    # On supprime le mini-jeu des choix (et on libère ses images et ses sons)
+                    mini_jeu = None
+                    self.liberer_minijeu(infos_serveur["minijeu_actuel"])
+                    self.memoire.activer(["menus"])
 
                     # On relance l'animation de la roulette
                     self.select_mini_jeux.set_roll(True)
@@ -541,12 +577,12 @@ class Game():
                 # Sinon s'il n'y a plus de mini-jeux, fin du jeu
                 elif len(self.minijeux_options) == 0:
                     # On coupe la connexion avec le serveur
-                    self.net.send("close")
+                    self.net.send(requete(CLOSE))
                     self.net = None
 
                     # Affichage du sublime écran de fin de la démo
-                    self.screen.blit(pygame.transform.scale(pygame.image.load(sep.join(["..", "data", "sprites", "main_menu", "end_demo.png"])), self.screen.get_rect().size), (0, 0))
-                    pygame.display.flip()
+                    self.screen.blit(self.end_demo, (0, 0))
+                    presenter(self.screen)
                     pygame.time.wait(10000)
 
                     # Arrêt du programme
@@ -559,13 +595,17 @@ class Game():
                     son_roulette.stop()
 
                     # On joue le son de sélection du mini-jeu
-                    son_fin = mixer.Sound(sep.join(["..", "data", "sounds", "main_menu", "mini_jeu_selected.ogg"]))
+                    son_fin = charger_son(sep.join(["..", "data", "sounds", "main_menu", "mini_jeu_selected.ogg"]))
                     son_fin.play()
 
                     # On arrête l'animation de la roulette
                     self.select_mini_jeux.set_roll(False)
                     self.select_mini_jeux.set_minijeu_affiche(infos_serveur["minijeu_actuel"])
 
+                    # Le mini-jeu choisi est chargé pendant les 2s qui restent (les autres ne sont jamais chargés d'avance)
+                    self.charger_minijeu(infos_serveur["minijeu_actuel"])
+                    self.memoire.activer(["menus", infos_serveur["minijeu_actuel"]])
+
                 # Sinon on active l'animation de la roulette
                 elif self.select_mini_jeux.get_roll() == True:
                     self.select_mini_jeux.minijeu_rouler(self.minijeux_options)
@@ -578,56 +618,62 @@ class Game():
 
                 # Changement de taille de la fenêtre
                 elif event.type == pygame.VIDEORESIZE:
-                    self.screen = pygame.display.set_mode(event.size, pygame.HWSURFACE|pygame.DOUBLEBUF|pygame.RESIZABLE)
+                    pygame.display.set_mode(event.size, pygame.HWSURFACE|pygame.DOUBLEBUF|pygame.RESIZABLE)
 
                 # Détection des inputs du joueur
                 elif event.type == pygame.MOUSEBUTTONUP:
                     # On note la position de la souris
-                    pos = pygame.mouse.get_pos()
+                    pos = position_souris()
 
                     # On détecte les clicks avec le bouton de l'écran titre
-                    if self.current_screen == "title_screen" and self.title_screen.get_text_button().is_clicked(pos, self.screen):
+                    if self.current_screen == "title_screen" and self.title_screen.get_text_button().is_clicked(pos):
                         self.title_screen.play_music_attente()
                         self.current_screen = "select_mode"
 
                     # On détecte les clicks avec le bouton du mode de jeu
                     elif self.current_screen == "select_mode":
-                        if self.select_mode.get_solo_button().is_clicked(pos, self.screen):
+                        if self.select_mode.get_solo_button().is_clicked(pos):
                             self.mode = "solo"
-                            self.server = Server("localhost")
-                            start_new_thread(self.server.run, ())
-                            self.net = Network("localhost", "Joueur local")
+                            # Le serveur peut tourner dans un processus à part pour ne pas partager le GIL avec l'affichage
+                            if self.solo_processus:
+                                self.net = Network("localhost", "Joueur local", processus=servir_processus)
+
+                            # Sinon il tourne dans ce processus et le client l'appelle directement (sans socket)
+                            else:
+                                self.server = Server(None)
+                                start_new_thread(self.server.run, ())
+                                self.net = Network("localhost", "Joueur local", self.server)
                             self.current_screen = "select_character"
 
-                        elif self.select_mode.get_multi_button().is_clicked(pos, self.screen):
+                        elif self.select_mode.get_multi_button().is_clicked(pos):
                             self.mode = "multi"
                             self.current_screen = "select_ip"
 
-                        elif self.select_mode.get_cancel_button().is_clicked(pos, self.screen):
+                        elif self.select_mode.get_cancel_button().is_clicked(pos):
                             self.title_screen.play_music_title_screen()
                             self.current_screen = "title_screen"
 
                     # On détecte les clicks avec le bouton du choix de personnage
                     elif self.current_screen == "select_character":
-                        if self.select_character.get_start_button().is_clicked(pos, self.screen):
+                        if self.select_character.get_start_button().is_clicked(pos):
                             if self.perso == "":
                                 # On joue un son pour indiquer au joueur que son choix n'est pas valide
                                 self.son_incorrect.play()
                             else:
-                                self.net.send("ready_for_next_state")
+                                self.net.send(requete(PRET))
 
                         # On détecte pour chaque bouton de joueur s'il est en collision avec le curseur
                         for j in range(len(self.character_buttons)):
-                            if self.character_buttons[j].is_clicked(pos, self.screen):
+                            if self.character_buttons[j].is_clicked(pos):
                                 # Si le personnage est déjà choisit
                                 if self.perso == liste_perso[j]:
                                     self.perso = ""
-                                    self.net.send(json.dumps({"set_perso": ""}))
+                                    self.net.send(requete(SET_PERSO, ""))
 
                                 # L'indice j est le même pour le bouton que pour le nom du personnage
                                 elif not liste_perso[j] in joueurs_persos.keys():
                                     self.perso = liste_perso[j]
-                                    self.net.send(json.dumps({"set_perso": liste_perso[j]}))
+                                    self.net.send(requete(SET_PERSO, liste_perso[j]))
 
                                 # Ce joueur est déjà sélectionné
                                 else:
@@ -636,17 +682,22 @@ class Game():
 
                     # On détecte les clicks avec le bouton du choix de l'ip
                     elif self.current_screen == "select_ip":
-                        if self.select_ip.get_cancel_button().is_clicked(pos, self.screen):
+                        if self.select_ip.get_cancel_button().is_clicked(pos):
                             self.current_screen = "select_mode"
-                        elif self.select_ip.get_join_button().is_clicked(pos, self.screen):
+                        elif self.select_ip.get_join_button().is_clicked(pos):
                             if len(self.select_ip.get_ip_field().get_text()) > 0 and len(self.select_ip.get_pseudo_field().get_text()) > 0:
                                 adresse_serveur = self.select_ip.get_ip_field().get_text()
                                 pseudo = self.select_ip.get_pseudo_field().get_text()
                             self.net = Network(adresse_serveur, pseudo)
-                            self.current_screen = "select_character"
 
-                        self.select_ip.get_ip_field().set_active(self.select_ip.get_ip_field().is_clicked(pos, self.screen))
-                        self.select_ip.get_pseudo_field().set_active(self.select_ip.get_pseudo_field().is_clicked(pos, self.screen))
+                            # Le serveur est plein ou la partie a déjà commencé
+                            if self.net.adresse_client == "refuse":
+                                self.son_incorrect.play()
+                            else:
+                                self.current_screen = "select_character"
+
+                        self.select_ip.get_ip_field().set_active(self.select_ip.get_ip_field().is_clicked(pos))
+                        self.select_ip.get_pseudo_field().set_active(self.select_ip.get_pseudo_field().is_clicked(pos))
 
                 # Détection des touches pour les champs d'écriture
                 elif event.type == pygame.KEYDOWN:
@@ -662,7 +713,7 @@ class Game():
                         self.select_ip.get_pseudo_field().add_character(event.unicode)
 
             # Mise à jour de l'écran
-            pygame.display.flip()
+            presenter(self.screen)
 
             # Limite des fps
             self.clock.tick(120)
@@ -699,13 +750,13 @@ class Title_screen():
         self.font = font
 
         # Initialisation du logo (en chargeant l'image mayroparty.png), redimensionnement de l'image
-        self.logo = pygame.image.load(sep.join(["..", "data", "sprites", "main_menu", "mayroparty.png"]))
+        self.logo = pygame.transform.scale(charger_image(sep.join(["..", "data", "sprites", "main_menu", "mayroparty.png"])), (800, 150))
 
         #Initialisation du bouton text_button
         self.text_button = Button(color=(13, 24, 65), x=205, y=500, width=850, height=120, text="CLIQUER ICI POUR COMMENCER", font=self.font)
 
         #Initialisation de la musique d'attente
-        self.son_attente = mixer.Sound(sep.join(["..", "data", "musics", "main_menu", "waiting_music.ogg"]))
+        self.son_attente = charger_son(sep.join(["..", "data", "musics", "main_menu", "waiting_music.ogg"]))
 
 
     # Getters
@@ -764,13 +815,9 @@ class Title_screen():
         # Test du type de screen
         assert type(screen) == pygame.Surface, "Erreur: Le paramètre screen donné n'est pas un écran de pygame."
 
-        # Initialisation des facteurs pour la taille de l'écran
-        screen_factor = ((screen.get_rect().size[0] / 1280), (screen.get_rect().size[1] / 720))
-
         # Positionnement du logo
         logo_Rect = self.logo.get_rect()
-        logo_Rect.center = (round(640 * screen_factor[0]), round(250 * screen_factor[1]))
-        self.logo = pygame.transform.scale(self.logo, (round(800 * screen_factor[0]), round(150 * screen_factor[1])))
+        logo_Rect.center = (640, 250)
 
         # Affichage sur la fenêtre du texte et du logo
         screen.blit(self.logo, logo_Rect)
@@ -806,15 +853,15 @@ class Select_mode():
         self.font = font
 
         #Initialisation et positionnement de l'image pour le mode solo
-        mode_solo_sprite = pygame.image.load(sep.join(["..", "data", "sprites", "main_menu", "solo.png"]))
+        mode_solo_sprite = charger_image(sep.join(["..", "data", "sprites", "main_menu", "solo.png"]))
         mode_solo_rect = mode_solo_sprite.get_rect()
 
         #Initialisation et positionnement de l'image pour le mode multijoueur
-        mode_multi_sprite = pygame.image.load(sep.join(["..", "data", "sprites", "main_menu", "multijoueur.png"]))
+        mode_multi_sprite = charger_image(sep.join(["..", "data", "sprites", "main_menu", "multijoueur.png"]))
         mode_multi_rect = mode_multi_sprite.get_rect()
 
         #Initialisation et positionnement de l'image pour le bouton annuler
-        cancel_button_sprite = scale_image_by(pygame.image.load(sep.join(["..", "data", "sprites", "main_menu", "cancel_button.png"])), 2)
+        cancel_button_sprite = charger_image(sep.join(["..", "data", "sprites", "main_menu", "cancel_button.png"]), 2)
         cancel_button_rect = cancel_button_sprite.get_rect()
 
         #Création des boutons
@@ -848,9 +895,6 @@ class Select_mode():
         # Test du type de screen
         assert type(screen) == pygame.Surface, "Erreur: Le paramètre screen donné n'est pas un écran de pygame."
 
-        # Initialisation des facteurs pour la taille de l'écran
-        screen_factor = ((screen.get_rect().size[0] / 1280), (screen.get_rect().size[1] / 720))
-
         #Affiche le bouton du joueur1 et du joueur2
         self.solo_button.draw(screen)
         self.multi_button.draw(screen)
@@ -859,18 +903,15 @@ class Select_mode():
         # Création de textes centrés à afficher
         solo_text = center_text('Solo',
                                    self.font,
-                                   [round((200 + self.solo_button.get_width() // 2) * screen_factor[0]), round(580 * screen_factor[1])],
-                                   [screen_factor[0], screen_factor[1]])
+                                   [200 + self.solo_button.get_width() // 2, 580])
 
         multi_text = center_text('Multijoueur', 
                                    self.font,
-                                   [round((800 + self.multi_button.get_width() // 2) * screen_factor[0]), round(580 * screen_factor[1])],
-                                   [screen_factor[0], screen_factor[1]])
+                                   [800 + self.multi_button.get_width() // 2, 580])
 
         text_mode = center_text('CHOISIR / CLIQUER SUR UN MODE DE JEU',
                                 self.font,
-                                [round(640 * screen_factor[0]), round(100 * screen_factor[1])],
-                                [screen_factor[0], screen_factor[1]])
+                                [640, 100])
 
         #Affiche les différents textes (solo, multijoueur et selection du mode)
         screen.blit(solo_text[0], solo_text[1])
@@ -909,10 +950,10 @@ class Select_character():
         self.font = font
 
         #Initialisation et chargement des images des personnages
-        mayro_image = pygame.image.load(sep.join(["..", "data", "sprites", "main_menu", "mayro_box.png"]))
-        lugi_image = pygame.image.load(sep.join(["..", "data", "sprites", "main_menu", "lugi_box.png"]))
-        wayro_image = pygame.image.load(sep.join(["..", "data", "sprites", "main_menu", "wayro_box.png"]))
-        walugi_image = pygame.image.load(sep.join(["..", "data", "sprites", "main_menu", "walugi_box.png"]))
+        mayro_image = charger_image(sep.join(["..", "data", "sprites", "main_menu", "mayro_box.png"]))
+        lugi_image = charger_image(sep.join(["..", "data", "sprites", "main_menu", "lugi_box.png"]))
+        wayro_image = charger_image(sep.join(["..", "data", "sprites", "main_menu", "wayro_box.png"]))
+        walugi_image = charger_image(sep.join(["..", "data", "sprites", "main_menu", "walugi_box.png"]))
 
         #Initialisation et création du bouton des personnages
         self.mayro_button = Button(color=(0, 0, 0, 0), x=200, y=200, width=mayro_image.get_rect().w * 4, height=mayro_image.get_rect().h * 4, image=mayro_image)
@@ -961,9 +1002,6 @@ class Select_character():
         assert type(mode) == str, "Erreur: Le paramètre mode n'est pas une chaîne de caractères."
         assert type(nb_joueurs) == tuple, "Erreur: Le paramètre nb_joueurs n'est pas un tuple."
 
-        # Initialisation des facteurs pour la taille de l'écran
-        screen_factor = ((screen.get_rect().size[0] / 1280), (screen.get_rect().size[1] / 720))
-
         #Affiche les boutons
         self.mayro_button.draw(screen)
         self.lugi_button.draw(screen)
@@ -979,29 +1017,25 @@ class Select_character():
         mayro_text = center_text(
             "Mayro",
             self.font,
-            [round((200 + self.mayro_button.get_width() // 2) * screen_factor[0]), round(450 * screen_factor[1])],
-            [screen_factor[0], screen_factor[1]]
+            [200 + self.mayro_button.get_width() // 2, 450]
         )
 
         lugi_text = center_text(
             "Lugi",
             self.font,
-            [round((450 + self.lugi_button.get_width() // 2) * screen_factor[0]), round(450 * screen_factor[1])],
-            [screen_factor[0], screen_factor[1]]
+            [450 + self.lugi_button.get_width() // 2, 450]
         )
 
         wayro_text = center_text(
             "Wayro",
             self.font,
-            [round((700 + self.wayro_button.get_width() // 2) * screen_factor[0]), round(450 * screen_factor[1])],
-            [screen_factor[0], screen_factor[1]]
+            [700 + self.wayro_button.get_width() // 2, 450]
         )
 
         walugi_text = center_text(
             "Walugi",
             self.font,
-            [round((950 + self.walugi_button.get_width() // 2) * screen_factor[0]), round(450 * screen_factor[1])],
-            [screen_factor[0], screen_factor[1]]
+            [950 + self.walugi_button.get_width() // 2, 450]
         )
 
         #Initialisation d'un dictionnaire contenant les boutons des personnages
@@ -1015,16 +1049,15 @@ class Select_character():
         #Centre le texte de sélection de personnages
         text_char = center_text('CHOISIR / CLIQUER SUR UN PERSONNAGE',
                                 self.font,
-                                [round(640 * screen_factor[0]), round(100 * screen_factor[1])],
-                                [screen_factor[0], screen_factor[1]])
+                                [640, 100])
 
         for perso in joueurs.keys():
             if perso != "":
                 text = center_text(
                     joueurs[perso],
                     self.font,
-                    [round(poses[perso] * screen_factor[0]), round(180 * screen_factor[1])],
-                    [0.5 * screen_factor[0], 0.5 * screen_factor[1]],
+                    [poses[perso], 180],
+                    [0.5, 0.5],
                     (0, 255, 0)
                 )
                 screen.blit(text[0], text[1])
@@ -1065,7 +1098,7 @@ class Select_ip():
         self.font = font
 
         #Initialisation et positionnement de l'image pour le bouton annuler
-        cancel_button_sprite = scale_image_by(pygame.image.load(sep.join(["..", "data", "sprites", "main_menu", "cancel_button.png"])), 2)
+        cancel_button_sprite = charger_image(sep.join(["..", "data", "sprites", "main_menu", "cancel_button.png"]), 2)
         cancel_button_rect = cancel_button_sprite.get_rect()
 
         # Création des boutons et des champs d'écriture
@@ -1127,6 +1160,7 @@ class Select_mini_jeux():
             - position (tuple): Position de l'image du mini-jeu.
             - roll (bool): Indique si la roulette des mini-jeux est active ou non.
             - minijeu_actuel (str): Mini-jeu sélectionné.
+            - images_minijeux (dict): Image (réduite de moitié) de chaque mini-jeu.
 
             - sound (mixer.Sound): Son de la roulette. 
             - cooldown (float): délai entre chaque son.
@@ -1146,11 +1180,17 @@ class Select_mini_jeux():
         # Mini-jeu à afficher (archer_ival car c'est le premier)
         self.minijeu_affiche = "archer_ival"
 
+        # Images des mini-jeux, réduites une seule fois (la roulette en change plusieurs fois par seconde)
+        self.images_minijeux = {}
+        for minijeu in MINIJEUX:
+            image = charger_image(sep.join(["..", "data", "sprites", "main_menu", minijeu + ".png"]))
+            self.images_minijeux[minijeu] = pygame.transform.scale(image, (image.get_rect().w // 2, image.get_rect().h // 2))
+
         # État de la roulette
         self.roll = False
 
         # Paramètres du son
-        self.sound = mixer.Sound(sep.join(["..", "data", "sounds", "main_menu", "mini_jeu_roll.ogg"]))
+        self.sound = charger_son(sep.join(["..", "data", "sounds", "main_menu", "mini_jeu_roll.ogg"]))
         self.cooldown = 0.0
 
 
@@ -1190,31 +1230,25 @@ class Select_mini_jeux():
         assert type(joueurs) == dict, "Erreur: Le paramètre joueurs donné n'est pas un dictionnaire."
         assert type(classement) == dict, "Erreur: Le paramètre classement donné n'est pas un dictionnaire."
 
-        # Initialisation des facteurs pour la taille de l'écran
-        screen_factor = ((screen.get_rect().size[0] / 1280), (screen.get_rect().size[1] / 720))
-
         # Affiche du mini-jeu en fonction de la valeur de minijeu_actuel
-        minijeux = pygame.image.load(sep.join(["..", "data", "sprites", "main_menu", self.minijeu_affiche + ".png"]))
-        minijeux = pygame.transform.scale(minijeux, (round(minijeux.get_rect().w // 2 * screen_factor[0]), round(minijeux.get_rect().h // 2 * screen_factor[1])))
-        minijeux_position = (round(60 * screen_factor[0]), round(200 * screen_factor[1]))
-        screen.blit(minijeux, minijeux_position)
+        minijeux_position = (60, 200)
+        screen.blit(self.images_minijeux[self.minijeu_affiche], minijeux_position)
 
         # Textes et images à afficher
         text_classement = center_text("Classement",
                                       self.font,
-                                      [round(640 * screen_factor[0]), round(50 * screen_factor[0])],
-                                      [screen_factor[0], screen_factor[1]])
+                                      [640, 50])
 
-        piece = scale_image_by(pygame.image.load(sep.join(["..", "data", "sprites", "main_menu", "piece.png"])), (4 * screen_factor[0], 4 * screen_factor[1]))
+        piece = scale_image_by(charger_image(sep.join(["..", "data", "sprites", "main_menu", "piece.png"])), 4)
 
         # Affichage du texte du classmenet
         screen.blit(text_classement[0], text_classement[1])
 
         # Affichage des images de pièces
-        screen.blit(piece, (round(1050 * screen_factor[0]), round(150 * screen_factor[1])))
-        screen.blit(piece, (round(1050 * screen_factor[0]), round(300 * screen_factor[1])))
-        screen.blit(piece, (round(1050 * screen_factor[0]), round(450 * screen_factor[1])))
-        screen.blit(piece, (round(1050 * screen_factor[0]), round(600 * screen_factor[1])))
+        screen.blit(piece, (1050, 150))
+        screen.blit(piece, (1050, 300))
+        screen.blit(piece, (1050, 450))
+        screen.blit(piece, (1050, 600))
     
         # Position y du texte du 1er joueur
         sprite_y = 100
@@ -1222,14 +1256,13 @@ class Select_mini_jeux():
         for joueur in joueurs.keys():
             # Initialisation du compteur de pièces
             piece_text = self.font.render("x" + str(joueurs[joueur]["pieces"]), True, (255, 255, 255))
-            piece_text = pygame.transform.scale(piece_text, (round(piece_text.get_rect().w * screen_factor[0]), round(piece_text.get_rect().h * screen_factor[1])))
 
             # Affichage des personnages et de leur position dans le classement
-            screen.blit(scale_image_by(pygame.image.load(sep.join(["..", "data", "sprites", "main_menu", joueurs[joueur]["perso"] + "_box.png"])), (3 * screen_factor[0], 3 * screen_factor[1])), (round(800 * screen_factor[0]), round(sprite_y * screen_factor[1])))
-            screen.blit(scale_image_by(pygame.image.load(sep.join(["..", "data", "sprites", "main_menu", "place_" + str(classement[joueur]) + ".png"])), (3 * screen_factor[0], 3 * screen_factor[1])), (round(1150 * screen_factor[0]), round((sprite_y + 50) * screen_factor[1])))
+            screen.blit(scale_image_by(charger_image(sep.join(["..", "data", "sprites", "main_menu", joueurs[joueur]["perso"] + "_box.png"])), 3), (800, sprite_y))
+            screen.blit(scale_image_by(charger_image(sep.join(["..", "data", "sprites", "main_menu", "place_" + str(classement[joueur]) + ".png"])), 3), (1150, sprite_y + 50))
 
             # Affichage du compteur de pièces
-            screen.blit(piece_text, (round(930 * screen_factor[0]), round((sprite_y + 50) * screen_factor[1])))
+            screen.blit(piece_text, (930, sprite_y + 50))
 
             # On déplace le prochain texte 150 pixels plus loin
             sprite_y += 150
@@ -1258,9 +1291,15 @@ class Select_mini_jeux():
             self.cooldown = 0.1 + time.time()
 
 
-# Initialisation et lancement du mini-jeu
-game = Game()
-game.main()
+if '__main__' == __name__:
+    # Utilisation: python main.py [--solo-processus] [--budget-memoire=<Mo>] [--trace=<fichier.json>]
+    TRACEUR.set_nom_processus("client")
+
+    # Initialisation et lancement du mini-jeu
+    budget_memoire = [int(arg.split("=")[1]) * 1024 * 1024 for arg in sys.argv if arg.startswith("--budget-memoire=")]
+
+    game = Game("--solo-processus" in sys.argv, budget_memoire[0] if len(budget_memoire) > 0 else BUDGET_DEFAUT)
+    game.main()
 
-# Fin du programme
-pygame.quit()
\ No newline at end of file
+    # Fin du programme
+    pygame.quit()
\ No newline at end of file
@@ -0,0 +1,227 @@
+#Projet : Mayro Party
+#Auteurs : Hinata Bouaziz, Antoine Desrues, Alexandre Guillaume, Matisse Moreau
+
+# ------/ Importations des bibliothèques \------
+
+import pygame
+import time
+
+# ------/ Constantes \------
+
+# Budget par défaut des images et des sons gardés par le client (en octets)
+BUDGET_DEFAUT = 256 * 1024 * 1024
+
+# Attributs qui ne sont pas des ressources du propriétaire (écran partagé, horloge, réseau et donc serveur en solo)
+ATTRIBUTS_IGNORES = {"screen", "clock", "net"}
+
+# Délai minimum (en secondes) entre deux mesures des propriétaires actifs (leur taille change pendant le jeu)
+INTERVALLE_MESURE = 2.0
+
+# ------/ Fonctions utiliatires \------
+
+def taille_son(son: pygame.mixer.Sound) -> int: # type: ignore
+    """
+    Cette fonction permet de calculer la taille d'un son décodé.
+
+    Paramètres:
+        - son (pygame.mixer.Sound): Son chargé avec pygame.
+    Renvois:
+        - int: Taille du son en mémoire (en octets).
+    """
+
+    init = pygame.mixer.get_init()
+    if init is None:
+        return 0
+
+    frequence, format_son, nb_canaux = init
+
+    return round(son.get_length() * frequence) * nb_canaux * abs(format_son) // 8
+
+
+def taille_objet(objet: any) -> int:
+    """
+    Cette fonction permet de calculer la place prise par les images, les masques et les sons d'un objet (et de tout
+    ce qu'il contient: attributs, listes, dictionnaires, groupes de sprites...). Une ressource partagée n'est comptée
+    qu'une fois.
+
+    Paramètres:
+        - objet (any): Objet à mesurer.
+    Renvois:
+        - int: Taille en octets.
+    """
+
+    taille = 0
+    vus = set()
+    ecran = pygame.display.get_surface()
+    a_parcourir = [objet]
+
+    # Parcours en profondeur sans récursion (les tracés de Trace Race contiennent des milliers de points)
+    while len(a_parcourir) > 0:
+        element = a_parcourir.pop()
+
+        if id(element) in vus or element is None or type(element) in (int, float, bool, str, bytes):
+            continue
+        vus.add(id(element))
+
+        if type(element) == pygame.Surface:
+            # L'écran est partagé et une sous-surface n'a pas de pixels à elle
+            if element is not ecran and element.get_parent() is None:
+                taille += element.get_pitch() * element.get_height()
+
+        elif type(element) == pygame.mask.Mask:
+            taille += (element.get_size()[0] + 7) // 8 * element.get_size()[1]
+
+        elif type(element) == pygame.mixer.Sound:
+            taille += taille_son(element)
+
+        elif type(element) == dict:
+            a_parcourir.extend(element.values())
+
+        elif type(element) in (list, tuple, set):
+            a_parcourir.extend(element)
+
+        elif isinstance(element, pygame.sprite.AbstractGroup):
+            # Seule l'image des sprites compte (les points de Trace Race partagent tous les mêmes images)
+            a_parcourir.extend({id(sprite.image): sprite.image for sprite in element.sprites()}.values())
+
+        elif hasattr(element, "__dict__") and not isinstance(element, type):
+            a_parcourir.extend(valeur for nom, valeur in vars(element).items() if not nom in ATTRIBUTS_IGNORES)
+
+    return taille
+
+
+# ------/ Classes \------
+
+# Classe qui suit la mémoire des images et des sons du client par propriétaire (menus, mini-jeux...)
+class GestionnaireMemoire:
+
+    # ------/ Constructeur \------
+
+    def __init__(self, budget: int = BUDGET_DEFAUT) -> None:
+        """
+        Constructeur de la classe GestionnaireMemoire.
+
+        Attributs à définir:
+            - budget (int): Taille maximale (en octets) des ressources gardées par le client.
+
+        Attributs internes:
+            - proprietaires (dict): Objet, taille, fonction de libération et dernière utilisation de chaque propriétaire.
+            - actifs (set): Propriétaires affichés en ce moment (jamais libérés, et mesurés régulièrement).
+            - derniere_mesure (float): Moment de la dernière mesure des propriétaires actifs.
+        """
+
+        # Tests du type des paramètres donnés
+        assert type(budget) == int and budget > 0, "Erreur: Le 1er paramètre (budget) est censé être un entier positif."
+
+        self.budget = budget
+        self.proprietaires = {}
+        self.actifs = set()
+        self.derniere_mesure = 0.0
+
+
+    # ------/ Getters \------
+
+    def get_budget(self) -> int:
+        return self.budget
+
+    def get_usage(self) -> int:
+        return sum(proprietaire["taille"] for proprietaire in self.proprietaires.values())
+
+    def get_usages(self) -> dict:
+        return {nom: proprietaire["taille"] for nom, proprietaire in self.proprietaires.items()}
+
+
+    # ------/ Méthodes \------
+
+    def enregistrer(self, nom: str, objet: any, liberer: "function | None" = None) -> None:
+        """
+        Cette méthode ajoute (ou remplace) un propriétaire de ressources et le mesure.
+
+        Paramètres:
+            - nom (str): Nom du propriétaire.
+            - objet (any): Objet qui garde les ressources (écran, client de mini-jeu...).
+            - liberer (function ou None): Fonction qui oublie l'objet pour le libérer (None s'il ne doit jamais l'être).
+        """
+
+        assert type(nom) == str, "Erreur: Le 1er paramètre (nom) est censé être une chaîne de caractères."
+
+        self.proprietaires[nom] = {"objet": objet, "taille": taille_objet(objet), "liberer": liberer, "utilisation": time.time()}
+
+
+    def liberer(self, nom: str) -> None:
+        """
+        Cette méthode oublie un propriétaire (sans appeler sa fonction de libération, il a déjà été libéré).
+
+        Paramètres:
+            - nom (str): Nom du propriétaire.
+        """
+
+        self.proprietaires.pop(nom, None)
+        self.actifs.discard(nom)
+
+
+    def activer(self, noms: list) -> None:
+        """
+        Cette méthode indique les propriétaires affichés en ce moment, puis fait respecter le budget.
+
+        Paramètres:
+            - noms (list): Noms des propriétaires actifs.
+        """
+
+        self.actifs = set(noms)
+
+        for nom in self.actifs:
+            if nom in self.proprietaires:
+                self.proprietaires[nom]["utilisation"] = time.time()
+
+        self.mesurer()
+        self.appliquer_budget()
+
+
+    def mesurer(self) -> None:
+        """
+        Cette méthode mesure de nouveau les propriétaires actifs (les autres ne changent pas).
+        """
+
+        for nom in self.actifs:
+            if nom in self.proprietaires:
+                self.proprietaires[nom]["taille"] = taille_objet(self.proprietaires[nom]["objet"])
+
+        self.derniere_mesure = time.time()
+
+
+    def appliquer_budget(self) -> list:
+        """
+        Cette méthode libère les propriétaires inactifs (les moins récemment utilisés d'abord) tant que le budget
+        est dépassé.
+
+        Renvois:
+            - list: Noms des propriétaires libérés.
+        """
+
+        liberes = []
+        candidats = sorted([nom for nom, proprietaire in self.proprietaires.items() if not nom in self.actifs and proprietaire["liberer"] is not None],
+                           key=lambda nom: self.proprietaires[nom]["utilisation"])
+
+        while self.get_usage() > self.budget and len(candidats) > 0:
+            nom = candidats.pop(0)
+            self.proprietaires[nom]["liberer"]()
+            self.liberer(nom)
+            liberes.append(nom)
+
+        return liberes
+
+
+    def texte_usage(self) -> str:
+        """
+        Cette méthode donne l'usage mémoire pour l'affichage de débug (les propriétaires actifs sont mesurés de
+        nouveau de temps en temps).
+
+        Renvois:
+            - str: Usage et budget en Mo.
+        """
+
+        if time.time() - self.derniere_mesure > INTERVALLE_MESURE:
+            self.mesurer()
+
+        return "MEM: " + str(round(self.get_usage() / (1024 * 1024), 1)) + "/" + str(round(self.budget / (1024 * 1024))) + " Mo"
@@ -0,0 +1,395 @@
+#Projet : Mayro Party
+#Auteurs : Hinata Bouaziz, Antoine Desrues, Alexandre Guillaume, Matisse Moreau
+
+# ------/ Importations des bibliothèques \------
+
+import json
+import struct
+import marshal
+import importlib
+from _thread import start_new_thread
+from multiprocessing import get_context
+from threading import Lock
+
+from anneau import AnneauPartage
+from moteur import Clock
+from profiler import Profiler
+from traceur import TRACEUR
+from protocole import TableRequetes, GET_ETAT, INPUTS
+
+# ------/ Constantes \------
+
+# Enregistrement d'un input: numéro du joueur, nombre de valeurs puis les valeurs (x|y ou x|y|action)
+INPUT = struct.Struct("<Bb3h")
+
+# Taille maximale d'un enregistrement d'état: un état plus grand (beaucoup de pingouins...) est publié sans ses
+# infos, que le processus du lobby demande alors par le pipe des commandes
+TAILLE_ETAT = 16384
+
+# Nombre d'enregistrements gardés dans chaque tampon (plusieurs inputs par joueur et par tick, un seul état utile)
+NB_INPUTS = 64
+NB_ETATS = 4
+
+# ------/ Fonctions utiliatires \------
+
+def executer_simulation(minijeu: str, joueurs: list, nom_inputs: str, nom_etats: str, commandes, fin, profiling: bool = False) -> None:
+    """
+    Cette fonction fait tourner un mini-jeu dans le processus de simulation: elle lit les inputs des joueurs
+    dans un tampon partagé avant chaque tick et y écrit l'état du mini-jeu après chaque tick. Les sockets et
+    l'encodage json restent dans le processus du lobby.
+
+    Paramètres:
+        - minijeu (str): Nom du mini-jeu (son serveur est le script minijeu + "_server").
+        - joueurs (list): Adresse, personnage et ia de chaque joueur, dans l'ordre des numéros des inputs.
+        - nom_inputs (str): Nom du tampon des inputs.
+        - nom_etats (str): Nom du tampon des états.
+        - commandes (Connection): Pipe des requêtes peu fréquentes (joueur prêt, taille des joueurs, stats...).
+        - fin (Connection): Pipe par lequel le classement est renvoyé à la fin du mini-jeu.
+        - profiling (bool): Active le profiler du mini-jeu.
+    """
+
+    TRACEUR.set_nom_processus("simulation " + minijeu)
+    serveur = importlib.import_module(minijeu + "_server").Server(None, profiling)
+
+    for adresse, perso, ia in joueurs:
+        serveur.add_player(adresse, perso, ia)
+
+    inputs = AnneauPartage(INPUT.size, NB_INPUTS, nom_inputs)
+    etats = AnneauPartage(TAILLE_ETAT, NB_ETATS, nom_etats)
+    verrou_etats = Lock()
+    dernier_input = [0]
+    nb_humains = len([joueur for joueur in joueurs if not joueur[2]])
+
+    def publier() -> None:
+        # L'état est copié tel quel (marshal), l'encodage json est fait par le processus du lobby
+        with verrou_etats:
+            if etats.ecrire(marshal.dumps((serveur.get_etat(), serveur.get_nb_joueurs_prets(), serveur.current_fps, serveur.get_infos()))) == 0:
+                # Trop grand pour un emplacement: les infos (None) seront demandées par le pipe des commandes
+                etats.ecrire(marshal.dumps((serveur.get_etat(), serveur.get_nb_joueurs_prets(), serveur.current_fps, None)))
+
+    tick_minijeu = serveur.tick
+
+    def tick() -> None:
+        # Comme avant, seul le dernier input de chaque joueur compte: on lit depuis le plus récent et on s'arrête
+        # dès que tous les joueurs ont été vus
+        with serveur.profiler.mesure("inputs"):
+            numero = inputs.get_nb_ecrits()
+            vus = set()
+
+            for enregistrement in inputs.lire_recents(dernier_input[0], numero):
+                joueur, nb_valeurs, *valeurs = INPUT.unpack(enregistrement)
+
+                if not joueur in vus:
+                    vus.add(joueur)
+                    serveur.inputs_joueurs[joueurs[joueur][0]] = valeurs[:nb_valeurs]
+
+                    if len(vus) == nb_humains:
+                        break
+
+            dernier_input[0] = numero
+
+        tick_minijeu()
+
+    # Le tick du mini-jeu reste le même, seuls la lecture des inputs et la publication de l'état changent
+    serveur.tick = tick
+    serveur.publier_snapshot = publier
+
+    def repondre_commandes() -> None:
+        while True:
+            try:
+                message = commandes.recv()
+            except EOFError:
+                break
+
+            reply = None
+
+            if message[0] == "pret":
+                serveur.marquer_pret(message[1])
+
+                # Le nombre de joueurs prêts est visible tout de suite (pas seulement au prochain tick)
+                publier()
+
+            elif message[0] == "requete":
+                reply = serveur.client_thread(message[1], message[2])
+
+            elif message[0] == "stats":
+                reply = serveur.profiler.rapport()
+
+            elif message[0] == "infos":
+                reply = serveur.get_infos()
+
+            commandes.send(reply)
+
+    start_new_thread(repondre_commandes, ())
+
+    publier()
+    serveur.run(Clock())
+    publier()
+
+    fin.send(serveur.get_classement())
+
+    inputs.fermer()
+    etats.fermer()
+
+    # Un processus enfant ne passe pas par atexit, la trace est donc écrite ici
+    TRACEUR.exporter()
+
+
+# ------/ Classes \------
+
+# Classe qui donne accès au profiler d'un mini-jeu distant (le lobby appelle minijeu.profiler.rapport())
+class ProfilerDistant:
+    def __init__(self, minijeu: "MinijeuDistant") -> None:
+        self.minijeu = minijeu
+
+    def rapport(self) -> dict:
+        # Sans simulation en cours, le rapport est vide
+        return self.minijeu.envoyer("stats", defaut=Profiler(self.minijeu.get_minijeu()).rapport())
+
+
+# Classe d'un mini-jeu dont la simulation tourne dans un autre processus (vu par le lobby comme un serveur de mini-jeu)
+class MinijeuDistant:
+
+    # ------/ Constructeur \------
+
+    def __init__(self, minijeu: str, profiling: bool = False) -> None:
+        """
+        Constructeur de la classe MinijeuDistant.
+
+        Attributs à définir:
+            - minijeu (str): Nom du mini-jeu ("archer_ival", "hexagon_heat"...).
+            - profiling (bool): Active le profiler du mini-jeu.
+
+        Attributs internes:
+            - joueurs (list): Adresse, personnage et ia de chaque joueur (l'indice sert de numéro dans les inputs).
+            - numeros (dict): Numéro de chaque joueur dans les inputs.
+            - inputs (AnneauPartage): Tampon des inputs (écrit par les threads des clients).
+            - etats (AnneauPartage): Tampon des états (écrit par la simulation).
+            - commandes (Connection): Pipe des requêtes peu fréquentes vers la simulation.
+            - dernier_etat (int): Numéro du dernier état lu.
+            - snapshot (str): Dernier état encodé en json, partagé par tous les clients.
+            - prets_en_attente (list): Joueurs prêts avant le lancement de la simulation.
+            - notifier_lobby (function): Fonction du lobby appelée quand le nombre de joueurs prêts change (ou None).
+            - requetes (TableRequetes): Requêtes traitées dans ce processus (les autres sont envoyées à la simulation).
+        """
+
+        self.minijeu = minijeu
+        self.profiling = profiling
+        self.profiler = ProfilerDistant(self)
+
+        self.requetes = TableRequetes(minijeu)
+        self.requetes.enregistrer(GET_ETAT, self.requete_get_etat)
+        self.requetes.enregistrer(INPUTS, self.requete_inputs)
+
+        self.joueurs = []
+        self.numeros = {}
+        self.nb_joueurs_prets = 0
+        self.classement = {}
+
+        self.processus = None
+        self.inputs = None
+        self.etats = None
+        self.commandes = None
+        self.prets_en_attente = []
+        self.notifier_lobby = None
+
+        # Les threads des clients écrivent les inputs, envoient les commandes et encodent l'état chacun leur tour
+        self.verrou_inputs = Lock()
+        self.verrou_commandes = Lock()
+        self.verrou_etats = Lock()
+
+        self.dernier_etat = 0
+        self.etat = "minigame_select"
+        self.infos = {}
+        self.snapshot = None
+
+        self.current_fps = 0
+        self.is_running = False
+
+
+    # ------/ Getters \------
+
+    def get_minijeu(self) -> str:
+        return self.minijeu
+
+    def get_classement(self):
+        return self.classement
+
+    def get_etat(self):
+        self.lire_etat()
+        return self.etat
+
+    def get_nb_joueurs_prets(self):
+        self.lire_etat()
+        return self.nb_joueurs_prets
+
+
+    # ------/ Méthodes \------
+
+    def add_player(self, address: str, perso: str, ia: bool):
+        self.numeros[address] = len(self.joueurs)
+        self.joueurs.append((address, perso, ia))
+
+        # Les ia sont automatiquement prêtes
+        if ia:
+            self.nb_joueurs_prets += 1
+
+
+    def envoyer(self, *message, defaut: any = None) -> any:
+        """
+        Cette méthode envoie une commande à la simulation et attend sa réponse.
+
+        Paramètres:
+            - message: Commande ("pret", "requete", "stats" ou "infos") suivie de ses paramètres.
+            - defaut (any): Réponse si la simulation ne tourne pas.
+
+        Renvois:
+            - any: Réponse de la simulation.
+        """
+
+        with self.verrou_commandes:
+            if self.commandes is None:
+                return defaut
+
+            try:
+                self.commandes.send(message)
+                return self.commandes.recv()
+
+            # La simulation vient de se terminer
+            except (EOFError, OSError):
+                return defaut
+
+
+    def lire_etat(self) -> None:
+        """
+        Cette méthode récupère le dernier état publié par la simulation et l'encode en json
+        (une seule fois par état, quel que soit le nombre de clients).
+        """
+
+        with self.verrou_etats:
+            if self.etats is None or self.etats.get_nb_ecrits() == self.dernier_etat:
+                return
+
+            nb_joueurs_prets = self.nb_joueurs_prets
+            self.dernier_etat, donnees = self.etats.lire_dernier()
+            self.etat, self.nb_joueurs_prets, self.current_fps, infos = marshal.loads(donnees)
+
+            # État trop grand pour le tampon: ses infos sont demandées à la simulation (les dernières connues si
+            # elle vient de se terminer)
+            self.infos = self.envoyer("infos", defaut=self.infos) if infos is None else infos
+            self.snapshot = json.dumps(self.infos)
+
+        # Le lobby est prévenu hors du verrou (il peut lire l'état en tenant son propre verrou)
+        if self.notifier_lobby is not None and self.nb_joueurs_prets != nb_joueurs_prets:
+            self.notifier_lobby()
+
+
+    def get_snapshot(self) -> str:
+        """
+        Cette méthode permet de récupérer le dernier état encodé du mini-jeu.
+
+        Renvois:
+            - str: État du mini-jeu en json.
+        """
+
+        self.lire_etat()
+
+        return json.dumps(self.infos) if self.snapshot is None else self.snapshot
+
+
+    def marquer_pret(self, address: str) -> None:
+        """
+        Cette méthode indique qu'un joueur est prêt pour l'état suivant.
+
+        Paramètres:
+            - address (str): Adresse du joueur.
+        """
+
+        with self.verrou_commandes:
+            # La simulation n'est pas encore lancée, elle sera prévenue à son lancement
+            if self.commandes is None:
+                self.prets_en_attente.append(address)
+                return
+
+        self.envoyer("pret", address)
+
+
+    def client_thread(self, address: str, request: str) -> str:
+        reply = self.requetes.traiter(address, request)
+
+        # Les autres requêtes (taille des joueurs, sons...) sont traitées par la simulation
+        if reply is None:
+            reply = self.envoyer("requete", address, request, defaut="not_found")
+
+        return reply
+
+
+    def requete_get_etat(self, address: str, donnees: str) -> str:
+        return self.get_etat()
+
+
+    def requete_inputs(self, address: str, donnees: str) -> str:
+        # Si les données c'est ça: 1|1|0
+        valeurs = [int(coord) for coord in donnees.split("|")]
+
+        with self.verrou_inputs:
+            if self.inputs is not None:
+                self.inputs.ecrire(INPUT.pack(self.numeros[address], len(valeurs), *(valeurs + [0] * (3 - len(valeurs)))))
+
+        # Tous les clients reçoivent le même état, encodé une seule fois par tick
+        return self.get_snapshot()
+
+
+    def run(self, clock) -> None:
+        self.is_running = True
+
+        self.inputs = AnneauPartage(INPUT.size, NB_INPUTS)
+        self.etats = AnneauPartage(TAILLE_ETAT, NB_ETATS)
+
+        # spawn: la simulation démarre avec un interpréteur neuf (et donc son propre GIL)
+        contexte = get_context("spawn")
+        commandes, commandes_simulation = contexte.Pipe()
+        fin, fin_simulation = contexte.Pipe(duplex=False)
+
+        self.processus = contexte.Process(target=executer_simulation, args=(self.minijeu, self.joueurs, self.inputs.get_nom(), self.etats.get_nom(), commandes_simulation, fin_simulation, self.profiling), daemon=True)
+        self.processus.start()
+
+        # Les extrémités de la simulation sont fermées ici, sinon les pipes ne signalent jamais la fin du processus
+        commandes_simulation.close()
+        fin_simulation.close()
+
+        with self.verrou_commandes:
+            self.commandes = commandes
+
+        for address in self.prets_en_attente:
+            self.envoyer("pret", address)
+        self.prets_en_attente = []
+
+        # Le lobby attend la fin du mini-jeu, comme avec un mini-jeu dans le même processus (is_running passe à False
+        # si le lobby est fermé avant)
+        while self.is_running and not fin.poll(0.5):
+            pass
+
+        if not self.is_running:
+            self.processus.terminate()
+
+        try:
+            self.classement = fin.recv()
+        except EOFError:
+            print("[" + self.minijeu + "] La simulation s'est arrêtée avant la fin du mini-jeu")
+            self.classement = {address: 1 for address, perso, ia in self.joueurs}
+
+        self.processus.join()
+        self.lire_etat()
+
+        with self.verrou_commandes:
+            self.commandes.close()
+            self.commandes = None
+
+        with self.verrou_inputs, self.verrou_etats:
+            self.inputs.fermer()
+            self.etats.fermer()
+            self.inputs = None
+            self.etats = None
+
+        self.is_running = False
@@ -0,0 +1,436 @@
+#Projet : Mayro Party
+#Auteurs : Hinata Bouaziz, Antoine Desrues, Alexandre Guillaume, Matisse Moreau
+
+# ------/ Importations des bibliothèques \------
+
+import sys
+import time
+import zlib
+import struct
+from collections import deque
+from os import sep
+
+# ------/ Constantes \------
+
+# Mode serveur dédié: les serveurs n'importent pas pygame (ni affichage, ni images, ni polices)
+SANS_PYGAME = "--sans-pygame" in sys.argv
+
+if not SANS_PYGAME:
+    try:
+        import pygame
+    except ImportError:
+        SANS_PYGAME = True
+
+# Conversions des pixels d'un masque (octets 0 ou 1) en chiffres binaires ("0" ou "1"), et inversement
+CHIFFRES_BINAIRES = bytes.maketrans(b"\x00\x01", b"01")
+PIXELS_BINAIRES = bytes.maketrans(b"01", b"\x00\x01")
+
+# En-tête d'un fichier de masque: largeur et hauteur (les lignes suivent, compressées avec zlib)
+ENTETE_MASQUE = struct.Struct("<II")
+
+# Masques utilisés par les serveurs: image, facteur d'agrandissement et fichier précalculé
+MASQUES = {
+    "traces": (sep.join(["..", "data", "sprites", "minigames", "trace_race", "traces.png"]), 1, sep.join(["..", "data", "masques", "trace_race", "traces.masque"])),
+    "crayon": (sep.join(["..", "data", "sprites", "minigames", "trace_race", "blue_pen.png"]), 3, sep.join(["..", "data", "masques", "trace_race", "blue_pen.masque"]))
+}
+
+# ------/ Classes \------
+
+# Classe d'un rectangle de collision (mêmes règles d'arrondi et de collision que pygame.Rect)
+class RectLeger:
+
+    __slots__ = ("x", "y", "w", "h")
+
+    # ------/ Constructeur \------
+
+    def __init__(self, x: "int | float", y: "int | float", w: "int | float", h: "int | float") -> None:
+        """
+        Constructeur de la classe RectLeger.
+
+        Attributs à définir:
+            - x, y (int ou float): Position du coin haut gauche (tronquée comme avec pygame.Rect).
+            - w, h (int ou float): Largeur et hauteur (tronquées).
+        """
+
+        # Les attributs sont lus bien plus souvent qu'ils ne sont modifiés: ce sont donc de simples attributs,
+        # seule leur modification passe par __setattr__
+        object.__setattr__(self, "x", int(x))
+        object.__setattr__(self, "y", int(y))
+        object.__setattr__(self, "w", int(w))
+        object.__setattr__(self, "h", int(h))
+
+
+    # ------/ Getters et setters \------
+
+    def __setattr__(self, nom: str, valeur: "int | float") -> None:
+        # pygame arrondit les nombres à virgule donnés aux attributs (0.5 est arrondi à 1, -0.5 à -1)
+        if type(valeur) != int:
+            valeur = int(valeur + 0.5) if valeur >= 0 else -int(-valeur + 0.5)
+
+        object.__setattr__(self, nom, valeur)
+
+    @property
+    def bottom(self) -> int:
+        return self.y + self.h
+
+
+    # ------/ Méthodes \------
+
+    def colliderect(self, autre: "RectLeger") -> bool:
+        """
+        Cette méthode indique si deux rectangles se chevauchent (un rectangle vide ne touche rien, les tailles
+        négatives sont acceptées comme avec pygame).
+
+        Paramètres:
+            - autre (RectLeger): Autre rectangle.
+
+        Renvois:
+            - bool: True si les rectangles se chevauchent, sinon False.
+        """
+
+        x, y, w, h = self.x, self.y, self.w, self.h
+        autre_x, autre_y, autre_w, autre_h = autre.x, autre.y, autre.w, autre.h
+
+        # Cas habituel: les deux rectangles ont une taille positive
+        if w > 0 and h > 0 and autre_w > 0 and autre_h > 0:
+            return x < autre_x + autre_w and autre_x < x + w and y < autre_y + autre_h and autre_y < y + h
+
+        if w == 0 or h == 0 or autre_w == 0 or autre_h == 0:
+            return False
+
+        return (min(x, x + w) < max(autre_x, autre_x + autre_w) and
+                min(y, y + h) < max(autre_y, autre_y + autre_h) and
+                max(x, x + w) > min(autre_x, autre_x + autre_w) and
+                max(y, y + h) > min(autre_y, autre_y + autre_h))
+
+
+    def __repr__(self) -> str:
+        return "<rect(" + str(self.x) + ", " + str(self.y) + ", " + str(self.w) + ", " + str(self.h) + ")>"
+
+
+# Classe d'un masque de collision au pixel près (chaque ligne est un entier dont le bit x est le pixel x)
+class MasqueLeger:
+
+    # ------/ Constructeur \------
+
+    def __init__(self, largeur: int, hauteur: int, lignes: list) -> None:
+        """
+        Constructeur de la classe MasqueLeger.
+
+        Attributs à définir:
+            - largeur (int): Largeur du masque.
+            - hauteur (int): Hauteur du masque.
+            - lignes (list): Une ligne (int) par rangée de pixels.
+        """
+
+        # Tests du type des paramètres donnés
+        assert len(lignes) == hauteur, "Erreur: Le 3ème paramètre (lignes) doit contenir une ligne par rangée."
+
+        self.largeur = largeur
+        self.hauteur = hauteur
+        self.lignes = lignes
+
+
+    # ------/ Getters \------
+
+    def get_size(self) -> tuple:
+        return (self.largeur, self.hauteur)
+
+    def get_lignes(self) -> list:
+        return self.lignes
+
+
+    # ------/ Méthodes \------
+
+    def convolve(self, autre: "MasqueLeger") -> "MasqueLeger":
+        """
+        Cette méthode calcule d'un coup le résultat de overlap pour toutes les positions de l'autre masque (comme
+        pygame.mask.Mask.convolve): le pixel (x, y) est allumé si l'autre masque, son coin bas droit placé en (x, y),
+        touche celui-ci.
+
+        Paramètres:
+            - autre (MasqueLeger): Masque déplacé sur celui-ci.
+
+        Renvois:
+            - MasqueLeger: Masque de toutes les positions qui se touchent (plus large et plus haut que celui-ci de la
+            taille de l'autre masque moins un pixel).
+        """
+
+        # Chaque ligne de ce masque, élargie par une ligne de l'autre masque (les lignes identiques sont fréquentes)
+        elargies = {}
+
+        lignes = []
+        for y in range(self.hauteur + autre.hauteur - 1):
+            decalage_y = y - autre.hauteur + 1
+            ligne = 0
+
+            for y_autre in range(max(0, -decalage_y), min(autre.hauteur, self.hauteur - decalage_y)):
+                cle = (decalage_y + y_autre, autre.lignes[y_autre])
+
+                if not cle in elargies:
+                    decalee = self.lignes[cle[0]] << (autre.largeur - 1)
+                    elargie = 0
+
+                    # Un pixel x de l'autre ligne touche ce masque quand le coin bas droit est x pixels plus à gauche
+                    bits = cle[1]
+                    while bits and decalee:
+                        elargie |= decalee >> ((bits & -bits).bit_length() - 1)
+                        bits &= bits - 1
+
+                    elargies[cle] = elargie
+
+                ligne |= elargies[cle]
+
+            lignes.append(ligne)
+
+        return MasqueLeger(self.largeur + autre.largeur - 1, self.hauteur + autre.hauteur - 1, lignes)
+
+
+    def overlap(self, autre: "MasqueLeger", offset: tuple) -> "tuple | None":
+        """
+        Cette méthode cherche un pixel commun aux deux masques (comme pygame.mask.Mask.overlap).
+
+        Paramètres:
+            - autre (MasqueLeger): Masque placé sur celui-ci.
+            - offset (tuple): Position de l'autre masque par rapport à celui-ci.
+
+        Renvois:
+            - tuple ou None: Position (dans ce masque) du premier pixel commun trouvé ligne par ligne, sinon None.
+        """
+
+        decalage_x, decalage_y = offset
+
+        # Bits de cette ligne qui sont sous l'autre masque
+        fenetre = (1 << autre.largeur) - 1
+
+        for y in range(max(0, decalage_y), min(self.hauteur, decalage_y + autre.hauteur)):
+            if decalage_x >= 0:
+                commun = (self.lignes[y] >> decalage_x) & fenetre & autre.lignes[y - decalage_y]
+            else:
+                commun = (self.lignes[y] << -decalage_x) & fenetre & autre.lignes[y - decalage_y]
+
+            if commun:
+                return ((commun & -commun).bit_length() - 1 + decalage_x, y)
+
+        return None
+
+
+# Classe d'une horloge qui limite le nombre de ticks par seconde (remplace pygame.time.Clock)
+class HorlogeLegere:
+
+    # ------/ Constructeur \------
+
+    def __init__(self) -> None:
+        """
+        Constructeur de la classe HorlogeLegere.
+
+        Attributs internes:
+            - dernier_tick (float): Moment du dernier tick.
+            - durees (deque): Durée des 10 derniers ticks (pour calculer les fps, comme pygame).
+        """
+
+        self.dernier_tick = time.perf_counter()
+        self.durees = deque(maxlen=10)
+
+
+    # ------/ Méthodes \------
+
+    def tick(self, fps: int = 0) -> int:
+        """
+        Cette méthode attend le temps nécessaire pour ne pas dépasser fps ticks par seconde.
+
+        Paramètres:
+            - fps (int): Nombre maximum de ticks par seconde (0 pour ne pas attendre).
+
+        Renvois:
+            - int: Temps écoulé depuis le tick précédent en millisecondes.
+        """
+
+        maintenant = time.perf_counter()
+
+        if fps > 0 and maintenant - self.dernier_tick < 1 / fps:
+            time.sleep(1 / fps - (maintenant - self.dernier_tick))
+            maintenant = time.perf_counter()
+
+        duree = maintenant - self.dernier_tick
+        self.dernier_tick = maintenant
+        self.durees.append(duree)
+
+        return round(duree * 1000)
+
+
+    def get_fps(self) -> float:
+        # Comme pygame, les fps ne sont connus qu'après 10 ticks
+        if len(self.durees) < 10:
+            return 0.0
+
+        return len(self.durees) / sum(self.durees)
+
+
+# Classes utilisées par les serveurs (celles de pygame sauf en mode serveur dédié)
+if SANS_PYGAME:
+    Rect = RectLeger
+    Clock = HorlogeLegere
+else:
+    Rect = pygame.Rect
+    Clock = pygame.time.Clock
+
+
+# ------/ Fonctions utiliatires \------
+
+def instant_impact(rect: "RectLeger | pygame.Rect", deplacement: list, obstacle: "RectLeger | pygame.Rect") -> "tuple | None":
+    """
+    Cette fonction calcule le moment où un rectangle qui se déplace touche un obstacle immobile (collision continue:
+    contrairement à un test à la position d'arrivée, un déplacement plus grand que l'obstacle ne le traverse pas).
+
+    Paramètres:
+        - rect (RectLeger ou pygame.Rect): Rectangle au début du déplacement.
+        - deplacement (list): Déplacement du rectangle pendant le tick (en pixels).
+        - obstacle (RectLeger ou pygame.Rect): Rectangle de l'obstacle.
+    Renvois:
+        - tuple ou None: Moment du premier contact (entre 0 et 1, 0 si les rectangles se chevauchent déjà) et axe
+        par lequel le rectangle arrive (0 pour x, 1 pour y, -1 s'il ne bouge pas), ou None s'il ne touche pas l'obstacle.
+    """
+
+    # Intervalle du déplacement pendant lequel les rectangles se chevauchent sur les deux axes à la fois
+    entree = float("-inf")
+    sortie = 1.0
+    axe = -1
+
+    for i, (position, taille, position_obstacle, taille_obstacle) in enumerate(((rect.x, rect.w, obstacle.x, obstacle.w), (rect.y, rect.h, obstacle.y, obstacle.h))):
+        # Comme avec colliderect, un rectangle vide ne touche rien
+        if taille <= 0 or taille_obstacle <= 0:
+            return None
+
+        if deplacement[i] == 0:
+            # Sans déplacement sur cet axe, les rectangles doivent déjà s'y chevaucher
+            if not (position < position_obstacle + taille_obstacle and position_obstacle < position + taille):
+                return None
+            continue
+
+        debut_axe = (position_obstacle - position - taille) / deplacement[i]
+        fin_axe = (position_obstacle + taille_obstacle - position) / deplacement[i]
+        if deplacement[i] < 0:
+            debut_axe, fin_axe = fin_axe, debut_axe
+
+        if debut_axe > entree:
+            entree = debut_axe
+            axe = i
+        sortie = min(sortie, fin_axe)
+
+    # Les bords qui se touchent ne se chevauchent pas (comme avec colliderect), et un obstacle déjà dépassé n'est plus touché
+    if entree >= sortie or sortie <= 0:
+        return None
+
+    return (max(entree, 0.0), axe)
+
+
+def lire_masque(chemin: str) -> MasqueLeger:
+    """
+    Cette fonction charge un masque précalculé.
+
+    Paramètres:
+        - chemin (str): Chemin du fichier .masque.
+    Renvois:
+        - MasqueLeger: Masque du fichier.
+    """
+
+    with open(chemin, "rb") as fichier:
+        largeur, hauteur = ENTETE_MASQUE.unpack(fichier.read(ENTETE_MASQUE.size))
+        donnees = zlib.decompress(fichier.read())
+
+    taille_ligne = (largeur + 7) // 8
+
+    return MasqueLeger(largeur, hauteur, [int.from_bytes(donnees[y * taille_ligne:(y + 1) * taille_ligne], "little") for y in range(hauteur)])
+
+
+def charger_masque(nom: str) -> "pygame.mask.Mask | MasqueLeger":
+    """
+    Cette fonction charge un masque de collision utilisé par un serveur.
+
+    Paramètres:
+        - nom (str): Nom du masque (clé de MASQUES).
+    Renvois:
+        - pygame.mask.Mask ou MasqueLeger: Masque créé depuis l'image (avec pygame) ou lu dans le fichier précalculé
+        (mode serveur dédié).
+    """
+
+    assert nom in MASQUES, "Erreur: Le 1er paramètre (nom) n'est pas un masque connu."
+
+    image, facteur, fichier = MASQUES[nom]
+
+    if SANS_PYGAME:
+        return lire_masque(fichier)
+
+    surface = pygame.image.load(image)
+    if facteur != 1:
+        surface = pygame.transform.scale(surface, (surface.get_width() * facteur, surface.get_height() * facteur))
+
+    return pygame.mask.from_surface(surface)
+
+
+def masque_leger(masque: "pygame.mask.Mask | MasqueLeger") -> MasqueLeger:
+    """
+    Cette fonction convertit un masque de pygame en MasqueLeger (pour les calculs faits ligne par ligne).
+
+    Paramètres:
+        - masque (pygame.mask.Mask ou MasqueLeger): Masque à convertir (renvoyé tel quel si c'est déjà un MasqueLeger).
+    Renvois:
+        - MasqueLeger: Masque avec les mêmes pixels.
+    """
+
+    if type(masque) == MasqueLeger:
+        return masque
+
+    largeur, hauteur = masque.get_size()
+
+    # Un octet par pixel (0 ou 1), puis une ligne de chiffres binaires lue à l'envers (le pixel x est le bit x)
+    pixels = pygame.image.tobytes(masque.to_surface(setcolor=(1, 1, 1, 1), unsetcolor=(0, 0, 0, 0)), "RGBA")[::4]
+
+    return MasqueLeger(largeur, hauteur, [int(pixels[y * largeur:(y + 1) * largeur].translate(CHIFFRES_BINAIRES)[::-1], 2) for y in range(hauteur)])
+
+
+def octets_ligne(ligne: int, largeur: int) -> int:
+    """
+    Cette fonction étale une ligne d'un masque sur un octet par pixel (pour combiner plusieurs lignes pixel par pixel
+    avec des décalages, sans boucle sur les pixels).
+
+    Paramètres:
+        - ligne (int): Ligne du masque (le bit x est le pixel x).
+        - largeur (int): Nombre de pixels de la ligne.
+    Renvois:
+        - int: Entier dont l'octet x (en petit-boutiste) vaut le pixel x.
+    """
+
+    return int.from_bytes(bin(ligne)[2:].zfill(largeur)[::-1].encode("ascii").translate(PIXELS_BINAIRES), "little")
+
+
+def generer_masques() -> None:
+    """
+    Cette fonction précalcule les fichiers des masques (avec pygame) pour le mode serveur dédié.
+    À relancer quand une des images de MASQUES change.
+    """
+
+    for nom, (image, facteur, fichier) in MASQUES.items():
+        masque = charger_masque(nom)
+        largeur, hauteur = masque.get_size()
+
+        lignes = bytearray()
+        for y in range(hauteur):
+            ligne = 0
+            for x in range(largeur):
+                if masque.get_at((x, y)):
+                    ligne |= 1 << x
+            lignes += ligne.to_bytes((largeur + 7) // 8, "little")
+
+        with open(fichier, "wb") as sortie:
+            sortie.write(ENTETE_MASQUE.pack(largeur, hauteur))
+            sortie.write(zlib.compress(bytes(lignes), 9))
+
+        print(nom + ": " + str(largeur) + "x" + str(hauteur) + " -> " + fichier)
+
+
+if '__main__' == __name__:
+    # Utilisation: python moteur.py (régénère les masques précalculés, nécessite pygame)
+    assert not SANS_PYGAME, "Erreur: pygame est nécessaire pour générer les masques."
+    generer_masques()
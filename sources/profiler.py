@@ -0,0 +1,311 @@
+#Projet : Mayro Party
+#Auteurs : Hinata Bouaziz, Antoine Desrues, Alexandre Guillaume, Matisse Moreau
+
+# ------/ Importations des bibliothèques \------
+
+import time
+from collections import deque
+from threading import Lock, local, get_ident
+
+from traceur import TRACEUR
+
+# ------/ Fonctions utiliatires \------
+
+def percentile(valeurs: list, pourcentage: "int | float") -> float:
+    """
+    Cette fonction permet de calculer un percentile (méthode du rang le plus proche) d'une liste de valeurs.
+
+    Paramètres:
+        - valeurs (list): une liste de nombres déjà triée dans l'ordre croissant.
+        - pourcentage (int ou float): le percentile voulu (entre 0 et 100).
+    Renvois:
+        - float: la valeur du percentile, ou 0 si la liste est vide.
+    """
+
+    # Tests du type des paramètres
+    assert type(valeurs) == list, "Erreur: Le 1er paramètre (valeurs) n'est pas une liste."
+    assert 0 <= pourcentage <= 100, "Erreur: Le 2ème paramètre (pourcentage) doit être compris entre 0 et 100."
+
+    if len(valeurs) == 0:
+        return 0.0
+
+    # Rang de la valeur à renvoyer (on reste dans les bornes de la liste)
+    rang = max(0, min(len(valeurs) - 1, round(pourcentage / 100 * len(valeurs) + 0.5) - 1))
+
+    return valeurs[rang]
+
+
+def creer_mesure(enregistreur, phase: str) -> "Mesure | MesureVide":
+    """
+    Cette fonction permet de créer la mesure d'une phase (utilisée par le profiler des serveurs et par le HUD des clients).
+
+    Paramètres:
+        - enregistreur (Profiler ou HudPerformances): Objet qui reçoit la durée (attributs nom et actif, méthode enregistrer).
+        - phase (str): Nom de la phase mesurée.
+    Renvois:
+        - Mesure ou MesureVide: Objet à utiliser avec with (vide si l'enregistreur et la trace sont désactivés).
+    """
+
+    if not enregistreur.actif and not TRACEUR.get_actif():
+        return MESURE_VIDE
+
+    return Mesure(enregistreur, phase)
+
+
+# ------/ Classes \------
+
+# Classe d'une mesure vide (utilisée quand le profiler est désactivé, pour ne rien coûter)
+class MesureVide:
+    def __enter__(self) -> None:
+        return None
+
+    def __exit__(self, *args) -> bool:
+        return False
+
+
+# Instance unique partagée par tous les profilers désactivés
+MESURE_VIDE = MesureVide()
+
+# Mesure en cours de chaque thread (une phase mesurée dans une autre est retirée de la durée de celle-ci)
+_MESURES_EN_COURS = local()
+
+
+# Classe d'une mesure en cours (utilisable avec with), ajoutée au profiler (ou au HUD) s'il est actif et à la trace (--trace)
+class Mesure:
+    def __init__(self, profiler: "Profiler | HudPerformances", phase: str) -> None:
+        self.profiler = profiler
+        self.phase = phase
+        self.debut = 0.0
+        self.parente = None
+        self.sous_phases = 0.0
+
+    def __enter__(self) -> None:
+        self.parente = getattr(_MESURES_EN_COURS, "mesure", None)
+        _MESURES_EN_COURS.mesure = self
+        self.debut = time.perf_counter()
+
+    def __exit__(self, *args) -> bool:
+        fin = time.perf_counter()
+        _MESURES_EN_COURS.mesure = self.parente
+
+        if self.parente is not None:
+            self.parente.sous_phases += fin - self.debut
+
+        # Le profiler ne compte que le temps propre à la phase, la trace garde les phases imbriquées
+        if self.profiler.actif:
+            self.profiler.enregistrer(self.phase, fin - self.debut - self.sous_phases)
+        TRACEUR.ajouter(self.phase, self.profiler.nom, self.debut, fin)
+
+        return False
+
+
+# Classe du profiler des serveurs
+class Profiler:
+
+    # ------/ Constructeur \------
+
+    def __init__(self, nom: str, fps: int = 60, actif: bool = False, taille_fenetre: int = 600, intervalle_log: "int | float" = 10) -> None:
+        """
+        Constructeur de la classe Profiler.
+
+        Attributs à définir:
+            - nom (str): Nom du serveur mesuré (affiché dans les logs).
+            - fps (int): Nombre de ticks par seconde visé, sert à calculer le budget d'un tick.
+            - actif (bool): Indique si les mesures sont activées.
+            - taille_fenetre (int): Nombre de mesures gardées pour chaque phase (fenêtre glissante).
+            - intervalle_log (int ou float): Délai en secondes entre chaque rapport écrit dans la console.
+
+        Attributs internes:
+            - phases (dict): Durées (en secondes) des dernières mesures de chaque phase.
+            - depassements (int): Nombre de ticks qui ont dépassé le budget.
+            - nb_ticks (int): Nombre de ticks mesurés.
+            - debut_tick_actuel (float): Début du tick en cours.
+            - thread_tick (int ou None): Thread qui exécute le tick en cours.
+            - phases_tick (dict): Durées mesurées pendant le tick en cours par son thread (une phase mesurée plusieurs
+              fois dans un tick, comme la physique de chaque joueur, donne une seule mesure: leur somme).
+            - dernier_log (float): Moment du dernier rapport écrit dans la console.
+            - verrou (Lock): Verrou qui protège les mesures (les threads des clients mesurent aussi).
+        """
+
+        # Tests du type des paramètres donnés
+        assert type(nom) == str, "Erreur: Le 1er paramètre (nom) est censé être une chaîne de caractères."
+        assert type(fps) == int and fps > 0, "Erreur: Le 2ème paramètre (fps) est censé être un entier positif."
+        assert type(actif) == bool, "Erreur: Le 3ème paramètre (actif) est censé être un booléen."
+        assert type(taille_fenetre) == int and taille_fenetre > 0, "Erreur: Le 4ème paramètre (taille_fenetre) est censé être un entier positif."
+
+        self.nom = nom
+        self.fps = fps
+        self.actif = actif
+        self.taille_fenetre = taille_fenetre
+        self.intervalle_log = intervalle_log
+
+        # Stockage des mesures
+        self.phases = {}
+        self.depassements = 0
+        self.nb_ticks = 0
+
+        # Timers internes
+        self.debut_tick_actuel = 0.0
+        self.thread_tick = None
+        self.phases_tick = {}
+        self.dernier_log = time.time()
+
+        self.verrou = Lock()
+
+
+    # ------/ Getters \------
+
+    def get_actif(self) -> bool:
+        return self.actif
+
+    def get_depassements(self) -> int:
+        return self.depassements
+
+
+    # ------/ Setters \------
+
+    def set_actif(self, new_actif: bool) -> None:
+        self.actif = new_actif
+
+    def set_fps(self, new_fps: int) -> None:
+        self.fps = new_fps
+
+
+    # ------/ Méthodes \------
+
+    def mesure(self, phase: str) -> "Mesure | MesureVide":
+        """
+        Cette méthode permet de mesurer la durée d'une phase avec un bloc with.
+
+        Paramètres:
+            - phase (str): Nom de la phase mesurée (inputs, ia, physique, logique, etats, serialisation...). Une
+              phase mesurée dans une autre est comptée à part (elle est retirée de la durée de l'autre).
+
+        Renvois:
+            - Mesure ou MesureVide: Objet à utiliser avec with (vide si le profiler et la trace sont désactivés).
+        """
+
+        return creer_mesure(self, phase)
+
+
+    def enregistrer(self, phase: str, duree: float) -> None:
+        """
+        Cette méthode permet d'ajouter une mesure à une phase.
+
+        Paramètres:
+            - phase (str): Nom de la phase.
+            - duree (float): Durée mesurée en secondes.
+        """
+
+        # Pendant un tick, les durées du thread du tick sont additionnées jusqu'à fin_tick
+        if self.thread_tick == get_ident():
+            self.phases_tick[phase] = self.phases_tick.get(phase, 0.0) + duree
+            return
+
+        with self.verrou:
+            if not phase in self.phases:
+                self.phases[phase] = deque(maxlen=self.taille_fenetre)
+            self.phases[phase].append(duree)
+
+
+    def debut_tick(self) -> None:
+        """
+        Cette méthode marque le début d'un tick du serveur. Sans profiler ni trace, rien n'est mesuré (les ticks
+        ne paient alors aucun coût).
+        """
+
+        if not self.actif and not TRACEUR.get_actif():
+            return
+
+        self.debut_tick_actuel = time.perf_counter()
+        self.thread_tick = get_ident()
+
+
+    def fin_tick(self) -> None:
+        """
+        Cette méthode marque la fin d'un tick du serveur, compte les dépassements de budget et
+        écrit régulièrement un rapport dans la console (uniquement si le profiler est actif).
+        """
+
+        if not self.actif and not TRACEUR.get_actif():
+            return
+
+        fin = time.perf_counter()
+        duree = fin - self.debut_tick_actuel
+        self.thread_tick = None
+        TRACEUR.ajouter("tick", self.nom, self.debut_tick_actuel, fin)
+
+        # Avec la trace seule, le tick n'est ni enregistré ni compté (pas de verrou à prendre)
+        if not self.actif:
+            self.phases_tick = {}
+            return
+
+        # Chaque phase du tick devient une seule mesure
+        for phase, duree_phase in self.phases_tick.items():
+            self.enregistrer(phase, duree_phase)
+        self.phases_tick = {}
+
+        self.enregistrer("tick", duree)
+        self.nb_ticks += 1
+
+        # Le tick a pris plus de temps que ce qu'il y a entre deux ticks
+        if duree > 1 / self.fps:
+            self.depassements += 1
+
+        # Écriture régulière du rapport dans la console
+        if time.time() - self.dernier_log > self.intervalle_log:
+            self.dernier_log = time.time()
+            self.log()
+
+
+    def rapport(self) -> dict:
+        """
+        Cette méthode permet de récupérer le rapport des mesures.
+
+        Renvois:
+            - dict: Pour chaque phase, la médiane (p50), le p99 et le maximum en millisecondes ainsi que le
+            nombre de mesures, avec le budget d'un tick et le nombre de dépassements.
+        """
+
+        with self.verrou:
+            mesures = {phase: sorted(durees) for phase, durees in self.phases.items()}
+
+        return {
+            "nom": self.nom,
+            "actif": self.actif,
+            "budget_ms": round(1000 / self.fps, 3),
+            "nb_ticks": self.nb_ticks,
+            "depassements": self.depassements,
+            "phases": {phase: {
+                "p50": round(percentile(durees, 50) * 1000, 3),
+                "p99": round(percentile(durees, 99) * 1000, 3),
+                "max": round(durees[-1] * 1000, 3) if len(durees) > 0 else 0.0,
+                "n": len(durees)
+            } for phase, durees in mesures.items()}
+        }
+
+
+    def log(self) -> None:
+        """
+        Cette méthode écrit le rapport des mesures dans la console.
+        """
+
+        rapport = self.rapport()
+
+        print("[Profiler " + self.nom + "] " + str(rapport["nb_ticks"]) + " ticks, " + str(rapport["depassements"]) + " dépassements du budget (" + str(rapport["budget_ms"]) + "ms)")
+        for phase, stats in rapport["phases"].items():
+            print("    " + phase + ": p50=" + str(stats["p50"]) + "ms p99=" + str(stats["p99"]) + "ms max=" + str(stats["max"]) + "ms")
+
+
+    def reset(self) -> None:
+        """
+        Cette méthode réinitialise toutes les mesures.
+        """
+
+        with self.verrou:
+            self.phases = {}
+            self.depassements = 0
+            self.nb_ticks = 0
+
+            # Les phases déjà mesurées pendant le tick en cours ne doivent pas compter dans les nouvelles mesures
+            self.phases_tick = {}
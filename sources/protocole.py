@@ -0,0 +1,265 @@
+#Projet : Mayro Party
+#Auteurs : Hinata Bouaziz, Antoine Desrues, Alexandre Guillaume, Matisse Moreau
+
+# ------/ Importations des bibliothèques \------
+
+import time
+from collections import deque
+
+from profiler import percentile
+
+# ------/ Constantes \------
+
+# Opcodes des requêtes: chaque requête commence par un octet (son opcode), suivi de ses données
+GET_ETAT = 1
+INFOS_SERVEUR = 2           # données: version des informations connue par le client (vide pour tout recevoir)
+SET_PERSO = 3               # données: nom du personnage (vide pour le désélectionner)
+PRET = 4
+STATS = 5
+CLOSE = 6
+SANTE_WORKERS = 7
+INPUTS = 16                 # données: inputs séparés par des "|" (exemple: 1|0|1)
+TAILLE_JOUEURS = 17         # données: taille de chaque joueur en json
+DESACTIVE_SON = 18          # données: nom du son (tir, hit ou but)
+POURCENTAGES = 19           # données: joueurs triés par pourcentage en json
+GET_IDS_MINIJEU = 20
+EMPREINTE = 21              # données: tick et empreinte de l'état simulé par le client en lockstep (exemple: 120|<sha1>)
+
+# Noms des opcodes (statistiques, trace et messages d'erreur)
+NOMS_OPCODES = {
+    GET_ETAT: "get_etat",
+    INFOS_SERVEUR: "infos_serveur",
+    SET_PERSO: "set_perso",
+    PRET: "ready_for_next_state",
+    STATS: "stats",
+    CLOSE: "close",
+    SANTE_WORKERS: "sante_workers",
+    INPUTS: "inputs",
+    TAILLE_JOUEURS: "taille_joueurs",
+    DESACTIVE_SON: "desactive_son",
+    POURCENTAGES: "pourcentages",
+    GET_IDS_MINIJEU: "get_ids_minijeu",
+    EMPREINTE: "empreinte"
+}
+
+# Nombre de durées gardées par opcode pour les percentiles
+NB_DUREES = 600
+
+# Chaque message envoyé par socket est précédé de sa longueur en octets (entier de 4 octets, big-endian), une
+# réponse trop grande pour un seul recv (comme celle de Pushy Penguins) est ainsi lue en plusieurs fois
+TAILLE_ENTETE = 4
+TAILLE_LECTURE = 8192
+
+# ------/ Fonctions utiliatires \------
+
+def requete(opcode: int, donnees: str = "") -> str:
+    """
+    Cette fonction construit une requête à envoyer au serveur.
+
+    Paramètres:
+        - opcode (int): Opcode de la requête (entre 0 et 127, pour tenir dans un seul octet une fois encodé).
+        - donnees (str): Données de la requête.
+    Renvois:
+        - str: La requête.
+    """
+
+    # Tests du type des paramètres
+    assert type(opcode) == int and 0 <= opcode < 128, "Erreur: Le 1er paramètre (opcode) doit être un entier entre 0 et 127."
+    assert type(donnees) == str, "Erreur: Le 2ème paramètre (donnees) est censé être une chaîne de caractères."
+
+    return chr(opcode) + donnees
+
+
+def opcode_requete(request: str) -> int:
+    """
+    Cette fonction donne l'opcode d'une requête.
+
+    Paramètres:
+        - request (str): Requête reçue.
+    Renvois:
+        - int: Opcode de la requête (-1 si la requête est vide).
+    """
+
+    return ord(request[0]) if len(request) > 0 else -1
+
+
+def nom_requete(request: str) -> str:
+    """
+    Cette fonction donne le nom de l'opcode d'une requête.
+
+    Paramètres:
+        - request (str): Requête reçue.
+    Renvois:
+        - str: Nom de l'opcode ("inconnu" s'il n'existe pas).
+    """
+
+    return NOMS_OPCODES.get(opcode_requete(request), "inconnu")
+
+
+def envoyer_message(connexion, message: str) -> None:
+    """
+    Cette fonction envoie un message par socket, précédé de sa longueur.
+
+    Paramètres:
+        - connexion (socket): Socket connecté.
+        - message (str): Message à envoyer.
+    """
+
+    donnees = message.encode("utf-8")
+    connexion.sendall(len(donnees).to_bytes(TAILLE_ENTETE, "big") + donnees)
+
+
+def recevoir_octets(connexion, taille: int) -> "bytes | None":
+    """
+    Cette fonction lit exactement un nombre d'octets sur un socket, en appelant recv autant de fois que nécessaire.
+
+    Paramètres:
+        - connexion (socket): Socket connecté.
+        - taille (int): Nombre d'octets à lire.
+    Renvois:
+        - bytes ou None: Les octets lus (None si la connexion a été coupée avant la fin).
+    """
+
+    morceaux = []
+    restant = taille
+
+    while restant > 0:
+        morceau = connexion.recv(min(restant, TAILLE_LECTURE))
+
+        # Connexion coupée
+        if not morceau:
+            return None
+
+        morceaux.append(morceau)
+        restant -= len(morceau)
+
+    return b"".join(morceaux)
+
+
+def recevoir_message(connexion) -> "str | None":
+    """
+    Cette fonction reçoit un message entier envoyé par envoyer_message.
+
+    Paramètres:
+        - connexion (socket): Socket connecté.
+    Renvois:
+        - str ou None: Le message (None si la connexion a été coupée).
+    """
+
+    entete = recevoir_octets(connexion, TAILLE_ENTETE)
+
+    if entete is None:
+        return None
+
+    donnees = recevoir_octets(connexion, int.from_bytes(entete, "big"))
+
+    if donnees is None:
+        return None
+
+    return donnees.decode("utf-8")
+
+
+# ------/ Classes \------
+
+# Classe d'une table qui associe chaque opcode à la fonction qui répond à ses requêtes
+class TableRequetes:
+
+    # ------/ Constructeur \------
+
+    def __init__(self, nom: str) -> None:
+        """
+        Constructeur de la classe TableRequetes.
+
+        Attributs à définir:
+            - nom (str): Nom du serveur (affiché dans les statistiques).
+
+        Attributs internes:
+            - fonctions (list): Fonction de chaque opcode (None s'il n'est pas enregistré), indexée par l'opcode.
+            - nb_appels (list): Nombre de requêtes traitées pour chaque opcode.
+            - durees (dict): Dernières durées de traitement (en secondes) de chaque opcode enregistré.
+        """
+
+        self.nom = nom
+
+        self.fonctions = [None] * 128
+        self.nb_appels = [0] * 128
+        self.durees = {}
+
+
+    # ------/ Getters \------
+
+    def get_nom(self) -> str:
+        return self.nom
+
+    def get_nb_appels(self, opcode: int) -> int:
+        return self.nb_appels[opcode]
+
+
+    # ------/ Méthodes \------
+
+    def enregistrer(self, opcode: int, fonction: "function") -> None:
+        """
+        Cette méthode associe un opcode à la fonction qui répond à ses requêtes.
+
+        Paramètres:
+            - opcode (int): Opcode de la requête.
+            - fonction (function): Fonction appelée avec l'adresse du joueur et les données de la requête, qui renvoie
+            la réponse.
+        """
+
+        assert type(opcode) == int and 0 <= opcode < 128, "Erreur: Le 1er paramètre (opcode) doit être un entier entre 0 et 127."
+        assert self.fonctions[opcode] is None, "Erreur: L'opcode " + NOMS_OPCODES.get(opcode, str(opcode)) + " est déjà enregistré dans " + self.nom + "."
+
+        self.fonctions[opcode] = fonction
+        self.durees[opcode] = deque(maxlen=NB_DUREES)
+
+
+    def traiter(self, address: str, request: str) -> "str | None":
+        """
+        Cette méthode répond à une requête avec la fonction de son opcode.
+
+        Paramètres:
+            - address (str): Adresse du joueur qui envoie la requête.
+            - request (str): Requête reçue (opcode puis données).
+        Renvois:
+            - str ou None: Réponse à envoyer, ou None si l'opcode n'est pas dans la table.
+        """
+
+        opcode = opcode_requete(request)
+        if not 0 <= opcode < 128 or self.fonctions[opcode] is None:
+            return None
+
+        debut = time.perf_counter()
+        reply = self.fonctions[opcode](address, request[1:])
+
+        # Les threads des clients comptent sans verrou (un appel oublié de temps en temps ne change pas les statistiques)
+        self.nb_appels[opcode] += 1
+        self.durees[opcode].append(time.perf_counter() - debut)
+
+        return reply
+
+
+    def rapport(self) -> dict:
+        """
+        Cette méthode permet de récupérer les statistiques de chaque opcode.
+
+        Renvois:
+            - dict: Pour chaque opcode utilisé, le nombre de requêtes, et la médiane (p50), le p99 et le maximum du temps
+            de traitement en microsecondes (sur les dernières requêtes).
+        """
+
+        rapport = {}
+
+        for opcode, durees in list(self.durees.items()):
+            durees = sorted(durees)
+            if len(durees) == 0:
+                continue
+
+            rapport[NOMS_OPCODES.get(opcode, str(opcode))] = {
+                "n": self.nb_appels[opcode],
+                "p50": round(percentile(durees, 50) * 1e6, 1),
+                "p99": round(percentile(durees, 99) * 1e6, 1),
+                "max": round(durees[-1] * 1e6, 1)
+            }
+
+        return rapport
@@ -0,0 +1,418 @@
+#Projet : Mayro Party
+#Auteurs : Hinata Bouaziz, Antoine Desrues, Alexandre Guillaume, Matisse Moreau
+
+# ------/ Importations des bibliothèques \------
+
+import sys
+import time
+import random
+import socket
+from _thread import start_new_thread
+from collections import deque
+from queue import Queue
+from threading import Lock
+
+from profiler import percentile
+from protocole import recevoir_octets, TAILLE_ENTETE
+
+# ------/ Constantes \------
+
+# Conditions prédéfinies (--profil=...): latence et gigue en ms, débit en Ko/s (0 = illimité), perte et désordre
+PROFILS = {
+    "lan": {"latence": 1, "gigue": 0, "debit": 0, "perte": 0.0, "desordre": 0.0},
+    "wifi": {"latence": 15, "gigue": 10, "debit": 2000, "perte": 0.01, "desordre": 0.005},
+    "wifi_charge": {"latence": 40, "gigue": 25, "debit": 500, "perte": 0.03, "desordre": 0.01},
+    "4g": {"latence": 30, "gigue": 15, "debit": 1000, "perte": 0.005, "desordre": 0.002}
+}
+
+# Délai minimum avant qu'un segment TCP perdu soit renvoyé (RTO minimum de Linux), en secondes
+RTO_MIN = 0.2
+
+# Nombre de messages (et de RTT) gardés pour les percentiles et le journal csv (les totaux comptent tous les messages)
+NB_MESSAGES_JOURNAL = 20000
+
+# Délai (en secondes) entre deux résumés écrits dans la console
+INTERVALLE_RESUME = 10
+
+# ------/ Fonctions utiliatires \------
+
+def lire_option(nom: str, defaut: any) -> any:
+    """
+    Cette fonction lit une option de la ligne de commande (--nom=valeur).
+
+    Paramètres:
+        - nom (str): Nom de l'option.
+        - defaut (any): Valeur si l'option n'est pas donnée (son type est aussi celui de l'option).
+    Renvois:
+        - any: Valeur de l'option.
+    """
+
+    for argument in sys.argv:
+        if argument.startswith("--" + nom + "="):
+            return type(defaut)(argument.split("=", 1)[1])
+
+    return defaut
+
+
+# ------/ Classes \------
+
+# Classe des conditions du réseau simulé (latence, gigue, débit, perte et désordre)
+class ConditionsReseau:
+
+    # ------/ Constructeur \------
+
+    def __init__(self, latence: "int | float" = 0, gigue: "int | float" = 0, debit: "int | float" = 0, perte: float = 0.0, desordre: float = 0.0, graine: "int | None" = None) -> None:
+        """
+        Constructeur de la classe ConditionsReseau.
+
+        Attributs à définir:
+            - latence (int ou float): Délai ajouté dans chaque sens (en ms), la moitié du RTT ajouté.
+            - gigue (int ou float): Variation aléatoire de la latence (écart type en ms).
+            - debit (int ou float): Débit maximum de chaque sens en Ko/s (0 pour ne pas le limiter).
+            - perte (float): Probabilité qu'un message soit perdu (puis renvoyé, comme avec TCP).
+            - desordre (float): Probabilité qu'un message soit doublé par les suivants.
+            - graine (int ou None): Graine de l'aléatoire (pour rejouer les mêmes conditions).
+
+        Attributs internes:
+            - aleatoire (random.Random): Générateur propre au proxy.
+            - verrou (Lock): Verrou de l'aléatoire (chaque sens de chaque connexion a son thread).
+        """
+
+        # Tests du type des paramètres donnés
+        assert latence >= 0 and gigue >= 0 and debit >= 0, "Erreur: La latence, la gigue et le débit doivent être positifs."
+        assert 0 <= perte < 1 and 0 <= desordre < 1, "Erreur: La perte et le désordre sont des probabilités (entre 0 et 1)."
+
+        self.latence = latence / 1000
+        self.gigue = gigue / 1000
+        self.debit = debit * 1024
+        self.perte = perte
+        self.desordre = desordre
+
+        self.aleatoire = random.Random(graine)
+        self.verrou = Lock()
+
+
+    # ------/ Méthodes \------
+
+    def moment_livraison(self, taille: int, recu: float, derniere_livraison: float) -> float:
+        """
+        Cette méthode calcule quand un message reçu par le proxy doit être transmis.
+        Comme avec TCP, les messages d'un même sens arrivent toujours dans l'ordre: une perte (renvoi après le RTO)
+        ou un message doublé retarde donc aussi ceux qui le suivent.
+
+        Paramètres:
+            - taille (int): Taille du message en octets.
+            - recu (float): Moment où le proxy l'a reçu (time.perf_counter).
+            - derniere_livraison (float): Moment de livraison du message précédent dans ce sens.
+        Renvois:
+            - float: Moment de livraison.
+        """
+
+        with self.verrou:
+            delai = max(0.0, self.aleatoire.gauss(self.latence, self.gigue)) if self.gigue > 0 else self.latence
+
+            # Segment perdu: il n'est renvoyé qu'après le RTO
+            if self.aleatoire.random() < self.perte:
+                delai += max(RTO_MIN, 2 * self.latence)
+
+            # Segment doublé par les suivants: il attend jusqu'à une latence de plus
+            if self.aleatoire.random() < self.desordre:
+                delai += self.aleatoire.uniform(0, self.latence + self.gigue)
+
+        livraison = recu + delai
+
+        # Le débit limite la vitesse à laquelle les octets sortent (ils attendent la fin du message précédent)
+        if self.debit > 0:
+            livraison = max(livraison, derniere_livraison) + taille / self.debit
+
+        return max(livraison, derniere_livraison)
+
+
+# Classe d'un sens d'une connexion (client vers serveur ou serveur vers client)
+class Liaison:
+
+    # ------/ Constructeur \------
+
+    def __init__(self, proxy: "ProxyReseau", id_connexion: int, sens: str, source: socket.socket, destination: socket.socket) -> None:
+        """
+        Constructeur de la classe Liaison.
+
+        Attributs à définir:
+            - proxy (ProxyReseau): Proxy (conditions du réseau et journal).
+            - id_connexion (int): Numéro de la connexion.
+            - sens (str): "requete" (client vers serveur) ou "reponse" (serveur vers client).
+            - source (socket.socket): Socket d'où viennent les messages.
+            - destination (socket.socket): Socket où ils sont transmis.
+
+        Attributs internes:
+            - file (Queue): Messages en attente de livraison (dans l'ordre) avec leur moment de réception et de livraison.
+            - derniere_livraison (float): Moment de livraison du dernier message.
+        """
+
+        self.proxy = proxy
+        self.id_connexion = id_connexion
+        self.sens = sens
+        self.source = source
+        self.destination = destination
+
+        self.file = Queue()
+        self.derniere_livraison = 0.0
+
+
+    # ------/ Méthodes \------
+
+    def lancer(self) -> None:
+        """
+        Cette méthode lance les deux threads de la liaison (lecture et livraison).
+        """
+
+        start_new_thread(self.lire, ())
+        start_new_thread(self.livrer, ())
+
+
+    def lire(self) -> None:
+        """
+        Cette méthode lit les messages de la source et planifie leur livraison. Chaque message du jeu est lu en
+        entier grâce à sa longueur (voir envoyer_message), même s'il arrive en plusieurs segments TCP.
+        """
+
+        while True:
+            try:
+                entete = recevoir_octets(self.source, TAILLE_ENTETE)
+                corps = None if entete is None else recevoir_octets(self.source, int.from_bytes(entete, "big"))
+            except OSError:
+                corps = None
+
+            recu = time.perf_counter()
+
+            # Connexion fermée: la fermeture est transmise après les messages en attente
+            if corps is None:
+                self.file.put(None)
+                break
+
+            donnees = entete + corps
+
+            self.derniere_livraison = self.proxy.conditions.moment_livraison(len(donnees), recu, self.derniere_livraison)
+            self.file.put((donnees, recu, self.derniere_livraison))
+
+
+    def livrer(self) -> None:
+        """
+        Cette méthode transmet chaque message à la destination au moment prévu.
+        """
+
+        while True:
+            message = self.file.get()
+
+            if message is None:
+                break
+
+            donnees, recu, livraison = message
+
+            attente = livraison - time.perf_counter()
+            if attente > 0:
+                time.sleep(attente)
+
+            try:
+                self.destination.sendall(donnees)
+            except OSError:
+                break
+
+            self.proxy.enregistrer(self.id_connexion, self.sens, len(donnees), recu, time.perf_counter())
+
+        # Le côté destination voit la connexion se fermer
+        try:
+            self.destination.shutdown(socket.SHUT_WR)
+        except OSError:
+            pass
+
+
+# Classe du proxy qui simule un réseau entre les clients et le serveur
+class ProxyReseau:
+
+    # ------/ Constructeur \------
+
+    def __init__(self, ecoute: tuple, serveur: tuple, conditions: ConditionsReseau) -> None:
+        """
+        Constructeur de la classe ProxyReseau.
+
+        Attributs à définir:
+            - ecoute (tuple): Adresse et port où les clients se connectent.
+            - serveur (tuple): Adresse et port du vrai serveur.
+            - conditions (ConditionsReseau): Conditions du réseau simulé.
+
+        Attributs internes:
+            - journal (deque): Connexion, sens, taille, moment de réception et de livraison des derniers messages.
+            - requetes_en_cours (dict): Moment de réception de la dernière requête de chaque connexion.
+            - rtts (deque): Derniers temps entre la réception d'une requête et la livraison de sa réponse (vu par le client).
+            - nb_messages (int): Nombre de messages transmis depuis le lancement.
+            - nb_octets (int): Nombre d'octets transmis depuis le lancement.
+            - verrou (Lock): Verrou du journal.
+            - nb_connexions (int): Nombre de connexions reçues (sert de numéro à chaque connexion).
+            - is_running (bool): Indique si le proxy accepte des connexions.
+        """
+
+        self.ecoute = ecoute
+        self.serveur = serveur
+        self.conditions = conditions
+
+        self.journal = deque(maxlen=NB_MESSAGES_JOURNAL)
+        self.requetes_en_cours = {}
+        self.rtts = deque(maxlen=NB_MESSAGES_JOURNAL)
+        self.nb_messages = 0
+        self.nb_octets = 0
+        self.verrou = Lock()
+
+        self.nb_connexions = 0
+        self.is_running = False
+
+
+    # ------/ Getters \------
+
+    def get_journal(self) -> deque:
+        return self.journal
+
+    def get_rtts(self) -> deque:
+        return self.rtts
+
+
+    # ------/ Méthodes \------
+
+    def enregistrer(self, id_connexion: int, sens: str, taille: int, recu: float, livre: float) -> None:
+        """
+        Cette méthode ajoute un message transmis au journal. Le jeu attend la réponse de chaque requête avant
+        d'envoyer la suivante: une réponse livrée termine donc la dernière requête de la connexion.
+
+        Paramètres:
+            - id_connexion (int): Numéro de la connexion.
+            - sens (str): "requete" ou "reponse".
+            - taille (int): Taille du message.
+            - recu (float): Moment où le proxy l'a reçu.
+            - livre (float): Moment où il a été transmis.
+        """
+
+        with self.verrou:
+            self.journal.append((id_connexion, sens, taille, recu, livre))
+            self.nb_messages += 1
+            self.nb_octets += taille
+
+            if sens == "requete":
+                self.requetes_en_cours[id_connexion] = recu
+            elif id_connexion in self.requetes_en_cours:
+                self.rtts.append(livre - self.requetes_en_cours.pop(id_connexion))
+
+
+    def connecter(self, client: socket.socket) -> None:
+        """
+        Cette méthode relie un nouveau client au vrai serveur.
+
+        Paramètres:
+            - client (socket.socket): Socket du client.
+        """
+
+        serveur = socket.create_connection(self.serveur)
+
+        # Les messages ne doivent pas attendre d'être regroupés (ils ont déjà leur propre délai)
+        for connexion in (client, serveur):
+            connexion.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+        self.nb_connexions += 1
+        Liaison(self, self.nb_connexions, "requete", client, serveur).lancer()
+        Liaison(self, self.nb_connexions, "reponse", serveur, client).lancer()
+
+
+    def resume(self) -> str:
+        """
+        Cette méthode résume les mesures du journal.
+
+        Renvois:
+            - str: Nombre de messages, délai ajouté et RTT vu par les clients (p50 / p99 des derniers messages).
+        """
+
+        with self.verrou:
+            delais = sorted(livre - recu for id_connexion, sens, taille, recu, livre in self.journal)
+            rtts = sorted(self.rtts)
+            nb_messages, octets = self.nb_messages, self.nb_octets
+
+        return (str(nb_messages) + " messages (" + str(round(octets / 1024, 1)) + " Ko), délai ajouté p50 " + str(round(percentile(delais, 50) * 1000, 1)) +
+                " ms / p99 " + str(round(percentile(delais, 99) * 1000, 1)) + " ms, RTT p50 " + str(round(percentile(rtts, 50) * 1000, 1)) +
+                " ms / p99 " + str(round(percentile(rtts, 99) * 1000, 1)) + " ms")
+
+
+    def ecrire_journal(self, fichier: str) -> None:
+        """
+        Cette méthode écrit le journal des derniers messages au format csv (temps en ms depuis le premier écrit).
+
+        Paramètres:
+            - fichier (str): Chemin du fichier.
+        """
+
+        with self.verrou:
+            journal = list(self.journal)
+
+        debut = journal[0][3] if len(journal) > 0 else 0.0
+
+        with open(fichier, "w") as sortie:
+            sortie.write("connexion;sens;octets;recu_ms;livre_ms;delai_ms\n")
+            for id_connexion, sens, taille, recu, livre in journal:
+                sortie.write(";".join([str(id_connexion), sens, str(taille), str(round((recu - debut) * 1000, 3)), str(round((livre - debut) * 1000, 3)), str(round((livre - recu) * 1000, 3))]) + "\n")
+
+
+    def run(self) -> None:
+        """
+        Cette méthode accepte les clients et écrit régulièrement un résumé des mesures.
+        """
+
+        ecoute = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        ecoute.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        ecoute.bind(self.ecoute)
+        ecoute.listen()
+
+        self.is_running = True
+        print("Proxy " + self.ecoute[0] + ":" + str(self.ecoute[1]) + " -> " + self.serveur[0] + ":" + str(self.serveur[1]))
+
+        def accepter() -> None:
+            while self.is_running:
+                try:
+                    client, adresse = ecoute.accept()
+                except OSError:
+                    break
+
+                try:
+                    self.connecter(client)
+                except OSError as e:
+                    print("Serveur injoignable:", e)
+                    client.close()
+
+        start_new_thread(accepter, ())
+
+        try:
+            while self.is_running:
+                time.sleep(INTERVALLE_RESUME)
+                print("[Proxy] " + self.resume())
+        except KeyboardInterrupt:
+            self.is_running = False
+
+        ecoute.close()
+
+
+if '__main__' == __name__:
+    # Utilisation: python proxy_reseau.py --serveur=<ip:port> [--port=5556] [--profil=wifi] [--latence=ms] [--gigue=ms]
+    #              [--debit=Ko/s] [--perte=0.01] [--desordre=0.01] [--graine=0] [--journal=mesures.csv]
+    # Les clients se connectent ensuite à <ip du proxy>:<port> (champ adresse du jeu)
+    profil = PROFILS[lire_option("profil", "lan")]
+    hote, port = lire_option("serveur", "127.0.0.1:5555").rsplit(":", 1)
+
+    conditions = ConditionsReseau(lire_option("latence", float(profil["latence"])), lire_option("gigue", float(profil["gigue"])),
+                                  lire_option("debit", float(profil["debit"])), lire_option("perte", profil["perte"]),
+                                  lire_option("desordre", profil["desordre"]), lire_option("graine", 0))
+
+    proxy = ProxyReseau(("0.0.0.0", lire_option("port", 5556)), (hote, int(port)), conditions)
+    proxy.run()
+
+    print("[Proxy] " + proxy.resume())
+
+    fichier_journal = lire_option("journal", "")
+    if fichier_journal != "":
+        proxy.ecrire_journal(fichier_journal)
+        print("Journal écrit dans " + fichier_journal)
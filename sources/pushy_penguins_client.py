@@ -9,7 +9,11 @@ from math import floor
 import time
 from os import sep
 
-from utils import Network, scale_image_by
+from utils import Network, scale_image_by, presenter
+from hud import HUD
+from protocole import requete, GET_ETAT, PRET, TAILLE_JOUEURS
+from cache_ressources import charger_image, charger_son
+from file_rendu import FileRendu
 import json
 
 # ------/ Classes \------
@@ -65,18 +69,18 @@ class Joueur:
         # Définition des sprites automatiquement (pour les joueurs / ia)
         self.sprites = {
             "walk": {
-                "left": [scale_image_by(pygame.image.load(sep.join([self.sprites_directory, "walk_left" + str(i) + ".png"])), 3) for i in range(8)],
-                "down": [scale_image_by(pygame.image.load(sep.join([self.sprites_directory, "walk_down" + str(i) + ".png"])), 3) for i in range(8)],
-                "up": [scale_image_by(pygame.image.load(sep.join([self.sprites_directory, "walk_up" + str(i) + ".png"])), 3) for i in range(8)],
-                "right": [scale_image_by(pygame.image.load(sep.join([self.sprites_directory, "walk_right" + str(i) + ".png"])), 3) for i in range(8)]
+                "left": [charger_image(sep.join([self.sprites_directory, "walk_left" + str(i) + ".png"]), 3) for i in range(8)],
+                "down": [charger_image(sep.join([self.sprites_directory, "walk_down" + str(i) + ".png"]), 3) for i in range(8)],
+                "up": [charger_image(sep.join([self.sprites_directory, "walk_up" + str(i) + ".png"]), 3) for i in range(8)],
+                "right": [charger_image(sep.join([self.sprites_directory, "walk_right" + str(i) + ".png"]), 3) for i in range(8)]
             },
             "jump": {
-                "left": [scale_image_by(pygame.image.load(sep.join([self.sprites_directory, "jump_left" + str(i) + ".png"])), 3) for i in range(2)],
-                "down": [scale_image_by(pygame.image.load(sep.join([self.sprites_directory, "jump_down" + str(i) + ".png"])), 3) for i in range(2)],
-                "up": [scale_image_by(pygame.image.load(sep.join([self.sprites_directory, "jump_up" + str(i) + ".png"])), 3) for i in range(2)],
-                "right": [scale_image_by(pygame.image.load(sep.join([self.sprites_directory, "jump_right" + str(i) + ".png"])), 3) for i in range(2)]
+                "left": [charger_image(sep.join([self.sprites_directory, "jump_left" + str(i) + ".png"]), 3) for i in range(2)],
+                "down": [charger_image(sep.join([self.sprites_directory, "jump_down" + str(i) + ".png"]), 3) for i in range(2)],
+                "up": [charger_image(sep.join([self.sprites_directory, "jump_up" + str(i) + ".png"]), 3) for i in range(2)],
+                "right": [charger_image(sep.join([self.sprites_directory, "jump_right" + str(i) + ".png"]), 3) for i in range(2)]
             },
-            "death": [scale_image_by(pygame.image.load(sep.join([self.sprites_directory, "death" + str(i) + ".png"])), 3) for i in range(4)]
+            "death": [charger_image(sep.join([self.sprites_directory, "death" + str(i) + ".png"]), 3) for i in range(4)]
         }
 
         # Initialisation et positionnement du sprite actuel
@@ -84,7 +88,7 @@ class Joueur:
         self.sprite_pos = list(self.pos)
 
         # Initialisation et positionnement de l'ombre
-        self.shadow = scale_image_by(pygame.image.load(sep.join([self.sprites_directory, "shadow.png"])), 3)
+        self.shadow = charger_image(sep.join([self.sprites_directory, "shadow.png"]), 3)
         self.shadow_pos = list(self.pos)
 
         # Initialisation de la frame choisie
@@ -95,7 +99,7 @@ class Joueur:
         self.update_priorite()
 
         # Son de mort du joueur
-        self.son_mort = pygame.mixer.Sound(sep.join(["..", "data", "sounds", self.perso, "death.ogg"]))
+        self.son_mort = charger_son(sep.join(["..", "data", "sounds", self.perso, "death.ogg"]))
 
         # Initialisation de la taille du joueur (uniquement fournie au serveur)
         self.taille = [self.sprite.get_rect().w, self.sprite.get_rect().h]
@@ -217,6 +221,25 @@ class Joueur:
                 self.sprite = self.sprites["jump"][self.rotation][1]
 
 
+    def get_blits(self) -> list:
+        """
+        Cette méthode donne les images du joueur et leurs positions (utilisée par la file d'affichage).
+
+        Renvois:
+            - list: Couples (image, position) à afficher dans l'ordre.
+        """
+
+        blits = []
+
+        # Affichage de l'ombre du personnage (dépend de la hauteur du sol)
+        if not self.dead:
+            blits.append((self.shadow, (round(self.shadow_pos[0]), round(self.shadow_pos[1] + self.ground_height))))
+
+        blits.append((self.sprite, (round(self.pos[0]), round(self.pos[1] + self.pos[2]))))
+
+        return blits
+
+
     def afficher(self, screen: pygame.Surface) -> None: # type: ignore
         """
         Cette méthode permet de dessiner le joueur sur l'écran.
@@ -228,14 +251,7 @@ class Joueur:
         # Tests des types de variables
         assert type(screen) == pygame.Surface, "Erreur: Le paramètre donné (screen) n'est pas une surface pygame."
 
-        # Initialisation des facteurs pour la taille de l'écran
-        screen_factor = ((screen.get_rect().size[0] / 1280), (screen.get_rect().size[1] / 720))
-
-        # Affichage de l'ombre du personnage (dépend de la hauteur du sol)
-        if not self.dead:
-            screen.blit(scale_image_by(self.shadow, screen_factor), (round(self.shadow_pos[0] * screen_factor[0]), round((self.shadow_pos[1] + self.ground_height) * screen_factor[1])))
-
-        screen.blit(scale_image_by(self.sprite, screen_factor), (round(self.pos[0] * screen_factor[0]), round((self.pos[1] + self.pos[2]) * screen_factor[1])))
+        screen.blits(self.get_blits(), doreturn=False)
 
 
 
@@ -259,7 +275,7 @@ class Banquise:
         self.pos = [184.0, 74.0, 0.0]
 
         # Sprite de la banquise
-        self.sprite = pygame.image.load(sep.join(["..", "data", "sprites", "minigames", "pushy_penguins", "banquise.png"]))
+        self.sprite = charger_image(sep.join(["..", "data", "sprites", "minigames", "pushy_penguins", "banquise.png"]))
 
         # Initialisation et mise à jour de la priorité d'affichage (dernier élément à être affiché)
         self.priority = 10000
@@ -276,6 +292,17 @@ class Banquise:
 
     # ------/ Méthodes \------
 
+    def get_blits(self) -> list:
+        """
+        Cette méthode donne les images de la banquise et leurs positions (utilisée par la file d'affichage).
+
+        Renvois:
+            - list: Couples (image, position) à afficher dans l'ordre.
+        """
+
+        return [(self.sprite, (round(self.pos[0]), round(self.pos[1] + self.pos[2])))]
+
+
     def afficher(self, screen: pygame.Surface) -> None: # type: ignore
         """
         Cette méthode permet de dessiner l'hexagone sur l'écran.
@@ -287,10 +314,7 @@ class Banquise:
         # Tests des types de variables
         assert type(screen) == pygame.Surface, "Erreur: Le paramètre (screen) n'est pas une surface pygame."
 
-        # Initialisation des facteurs pour la taille de l'écran
-        screen_factor = ((screen.get_rect().size[0] / 1280), (screen.get_rect().size[1] / 720))
-
-        screen.blit(scale_image_by(self.sprite, screen_factor), (round(self.pos[0] * screen_factor[0]), round((self.pos[1] + self.pos[2]) * screen_factor[1])))
+        screen.blits(self.get_blits(), doreturn=False)
 
 
 
@@ -342,14 +366,14 @@ class Pingouin:
         sprites_directory = sep.join(["..", "data", "sprites", "minigames", "pushy_penguins", "pingouin"])
 
         # Définition des sprites automatiquement (pour les joueurs / ia)
-        self.sprites = {"walk": [scale_image_by(pygame.image.load(sep.join([sprites_directory, "pingouin" + str(i) + ".png"])), self.size) for i in range(2)],
-                        "splash": scale_image_by(pygame.image.load(sep.join([sprites_directory, "pingouin_splash.png"])), self.size * 2)}
+        self.sprites = {"walk": [scale_image_by(charger_image(sep.join([sprites_directory, "pingouin" + str(i) + ".png"])), self.size) for i in range(2)],
+                        "splash": scale_image_by(charger_image(sep.join([sprites_directory, "pingouin_splash.png"])), self.size * 2)}
 
         # Initialisation du sprite actuel
         self.sprite = self.sprites["walk"][0]
 
         # Initialisation et positionnement de l'ombre
-        self.shadow = scale_image_by(pygame.image.load(sep.join([sprites_directory, "shadow.png"])), 3.75 * size)
+        self.shadow = scale_image_by(charger_image(sep.join([sprites_directory, "shadow.png"])), 3.75 * size)
         self.shadow_pos = list(self.pos)
 
         # Initialisation et mise à jour de la priorité d'affichage
@@ -357,7 +381,7 @@ class Pingouin:
         self.update_priorite()
 
         # Son du pingouin
-        self.splash_sound = pygame.mixer.Sound(sep.join(["..", "data", "sounds", "minigames", "pushy_penguins", "pingouin_splash.ogg"]))
+        self.splash_sound = charger_son(sep.join(["..", "data", "sounds", "minigames", "pushy_penguins", "pingouin_splash.ogg"]))
 
         # Éléments importants pour la 3D
         self.ground_height = 0          # (variable car environnement 3D)
@@ -446,6 +470,22 @@ class Pingouin:
             self.sprite = self.sprites["splash"]
 
 
+    def get_blits(self) -> list:
+        """
+        Cette méthode donne les images du pingouin et leurs positions (utilisée par la file d'affichage).
+
+        Renvois:
+            - list: Couples (image, position) à afficher dans l'ordre.
+        """
+
+        # Affichage des sprites du pingouin
+        if self.hidden:
+            return []
+
+        return [(self.shadow, (round(self.shadow_pos[0]), round(self.shadow_pos[1] + self.ground_height))),
+                (self.sprite, (round(self.pos[0]), round(self.pos[1] + self.pos[2])))]
+
+
     def afficher(self, screen: pygame.Surface) -> None: # type: ignore
         """
         Cette méthode permet de dessiner le joueur sur l'écran.
@@ -457,13 +497,7 @@ class Pingouin:
         # Tests des types de variables
         assert type(screen) == pygame.Surface, "Erreur: Le paramètre (screen) n'est pas une surface pygame."
 
-        # Initialisation des facteurs pour la taille de l'écran avec le parent
-        screen_factor = ((screen.get_rect().size[0] / 1280), (screen.get_rect().size[1] / 720))
-
-        # Affichage des sprites du pingouin
-        if not self.hidden:
-            screen.blit(scale_image_by(self.shadow, screen_factor), (round(self.shadow_pos[0] * screen_factor[0]), round((self.shadow_pos[1] + self.ground_height) * screen_factor[1])))
-            screen.blit(scale_image_by(self.sprite, screen_factor), (round(self.pos[0] * screen_factor[0]), round((self.pos[1] + self.pos[2]) * screen_factor[1])))
+        screen.blits(self.get_blits(), doreturn=False)
 
 
 
@@ -563,17 +597,19 @@ class MiniGame:
 
         Attributs internes:
             - quit (bool): Variable qui permet de détecter si le joueur a manuellement fermé le jeu.
-            - screen_factor: Les multiplicateurs pour la taille de l'écran.
 
             - show_fps (bool): Paramètre de débug permettant d'afficher les fps.
             - show_server_fps (bool): Paramètre de débug permettant d'afficher les fps du serveur.
+            - memoire (GestionnaireMemoire): Suivi de la mémoire du client (usage affiché avec les fps).
 
             - fps_font (pygame.freetype.Font): Police d'écriture pour les fps.
             - game_font (pygame.freetype.Font): Police d'écriture principale du mini-jeu.
 
             - joueurs (list): Liste des joueurs.
-            - objets (list): Liste des objets.
-            - priorities (dict): Priorité d'affichage pour chaque objet.
+            - objets (list): Liste des objets (joueurs et banquise).
+            - pingouins (dict): Pingouins affichés selon leur identifiant.
+            - dernier_evenement (int): Numéro du dernier événement (apparition / disparition) appliqué.
+            - file_rendu (FileRendu): Objets à afficher, triés selon leur priorité d'affichage.
 
             - timer_background (pygame.Surface): Image de fond du timer.
 
@@ -603,7 +639,6 @@ class MiniGame:
         self.fps = fps
 
         self.quit = False
-        self.screen_factor = (0, 0)
 
         # Paramètres de débug
         self.show_fps = True
@@ -616,23 +651,28 @@ class MiniGame:
         # Initialisation des paramètres pour la partie gameplay
         self.joueurs = {}
         self.objets = []
-        self.priorities = {}
+        self.pingouins = {}
+        self.dernier_evenement = 0
+        self.file_rendu = FileRendu()
 
         # Image de fond du timer
-        self.timer_background = pygame.image.load(sep.join(["..", "data", "sprites", "minigames", "general", "timer_back.png"]))
+        self.timer_background = charger_image(sep.join(["..", "data", "sprites", "minigames", "general", "timer_back.png"]))
 
         # Sprites de toad (pour le chargement)
-        self.toad = [pygame.image.load(sep.join(["..", "data", "sprites", "minigames", "general", "toad", "toad.png"])),
-                     pygame.image.load(sep.join(["..", "data", "sprites", "minigames", "general", "toad", "toad_open.png"]))]
-        self.toad_shadow = pygame.image.load(sep.join(["..", "data", "sprites", "minigames", "general", "toad", "shadow.png"]))
-        self.toad_bubble = pygame.image.load(sep.join(["..", "data", "sprites", "minigames", "general", "toad", "bubble.png"]))
+        self.toad = [charger_image(sep.join(["..", "data", "sprites", "minigames", "general", "toad", "toad.png"])),
+                     charger_image(sep.join(["..", "data", "sprites", "minigames", "general", "toad", "toad_open.png"]))]
+        self.toad_shadow = charger_image(sep.join(["..", "data", "sprites", "minigames", "general", "toad", "shadow.png"]))
+        self.toad_bubble = charger_image(sep.join(["..", "data", "sprites", "minigames", "general", "toad", "bubble.png"]))
 
         # Sprites utilisés dans la classe
-        self.bg = pygame.image.load(sep.join(["..", "data", "sprites", "minigames", "pushy_penguins", "water.png"]))
+        self.bg = charger_image(sep.join(["..", "data", "sprites", "minigames", "pushy_penguins", "water.png"]))
 
         # Initialisation du réseau
         self.net = None
 
+        # Suivi de la mémoire (donné par le jeu)
+        self.memoire = None
+
 
     # ------/ Getters \------
 
@@ -645,6 +685,9 @@ class MiniGame:
     def set_net(self, new_net) -> Network:
         self.net = new_net
 
+    def set_memoire(self, new_memoire) -> None:
+        self.memoire = new_memoire
+
 
     # ------/ Méthodes \------
 
@@ -668,13 +711,13 @@ class MiniGame:
             assert elem >= -1 and elem <= 1, "Erreur: La liste donnée doit uniquement contenir des entiers compris entre -1 et 1"
 
         # Envoie les inputs au serveur et demande des infos sur l'environnement
-        infos_environnement = json.loads(self.net.send(str(input_joueur[0]) + "|" + str(input_joueur[1])))
+        infos_environnement = self.net.etat_minijeu(str(input_joueur[0]) + "|" + str(input_joueur[1]))
         infos_joueurs = infos_environnement["joueurs"]
         timer = infos_environnement["timer"]
         fps = infos_environnement["fps"]
 
         # On affiche les sprites du jeu dans un ordre d'affichage prédéfini
-        self.screen.blit(scale_image_by(self.bg, self.screen_factor), (0, 0))
+        self.screen.blit(self.bg, (0, 0))
 
         for id_joueur in self.joueurs.keys():
             # On met à jour la position des joueurs et des animations pour le client
@@ -692,63 +735,62 @@ class MiniGame:
 
             self.joueurs[id_joueur].animer(infos_joueurs[id_joueur]["frame"], infos_joueurs[id_joueur]["velocity"])
 
-        # On envoie une requête spéciale uniquement pour les pingouins (car c'est une grosse requête)
-        infos_pingouins = json.loads(self.net.send("get_pingouins"))
-
-        # Initialisation d'une liste de pingouins pour simplifier la suite
-        pingouins = {str(objet.get_id_pingouin()): objet for objet in self.objets if type(objet) == Pingouin}
-
-        # On détecte si des pingouins ont despawn côté serveur
-        for id_pingouin in pingouins.keys():
-            if not id_pingouin in infos_pingouins.keys():
-                if pingouins[id_pingouin] in self.objets:
-                    pingouins[id_pingouin].set_hidden(True)
-                    pingouins[id_pingouin].get_splash_sound().play()
-
-                    self.objets.remove(pingouins[id_pingouin])
-
-        # On détecte si des flèches ont été crée côté serveur
-        for id_pingouin in infos_pingouins.keys():
-            if not id_pingouin in pingouins:
-                self.objets.append(Pingouin(infos_pingouins[id_pingouin][0], infos_pingouins[id_pingouin][1], int(id_pingouin)))
+        # Les pingouins et leurs apparitions / disparitions arrivent dans la même réponse que les joueurs
+        infos_pingouins = infos_environnement["pingouins"]
+        evenements = infos_environnement["evenements"]
+
+        # Des événements ont été perdus (journal trop court), on se resynchronise avec l'état complet
+        if len(evenements) > 0 and evenements[0][0] > self.dernier_evenement + 1:
+            self.synchroniser_pingouins(infos_pingouins)
+            self.dernier_evenement = evenements[-1][0]
+
+        # Sinon on applique uniquement les nouveaux événements
+        for numero, type_evenement, id_pingouin in evenements:
+            if numero > self.dernier_evenement:
+                if type_evenement == "spawn":
+                    self.ajouter_pingouin(str(id_pingouin), infos_pingouins)
+                else:
+                    self.retirer_pingouin(str(id_pingouin))
+
+                self.dernier_evenement = numero
+
+        # On met à jour et on anime les pingouins
+        for id_pingouin, pingouin in self.pingouins.items():
+            if id_pingouin in infos_pingouins:
+                pingouin.appliquer_positions(infos_pingouins[id_pingouin][0])
+                pingouin.set_ground_height(infos_pingouins[id_pingouin][3])
+                pingouin.animer(infos_pingouins[id_pingouin][2])
+
+        # Les objets sont affichés selon leur priorité d'affichage (celle calculée à la frame précédente), la file
+        # garde l'ordre d'une frame à l'autre et n'a donc que quelques objets à déplacer
+        self.file_rendu.trier()
+        self.file_rendu.afficher(self.screen)
+
+        # On calcule la priorité d'affichage des pingouins et des joueurs (celle de la banquise ne change pas)
+        for pingouin in self.pingouins.values():
+            pingouin.update_priorite()
 
         for objet in self.objets:
-            # On met à jour et on anime les pingouins
-            if type(objet) == Pingouin:
-                objet.appliquer_positions(infos_pingouins[str(objet.get_id_pingouin())][0])
-                objet.set_ground_height(infos_pingouins[str(objet.get_id_pingouin())][3])
-                objet.animer(infos_pingouins[str(objet.get_id_pingouin())][2])
-
-            # On calcule la priorité d'affichage pour tous les objets existants (y compris des joueurs)
-            self.priorities[objet] = objet.get_priority()
             if type(objet) != Banquise:
                 objet.update_priorite()
 
-        # sorted permet ici de trier les clés du dictionnaire automatiquement en fonction de la valeur d'affichage
-        # (sorted c'est beaucoup plus simple j'avoue)
-        for priority in sorted(self.priorities, key=self.priorities.get, reverse=True):
-            priority.afficher(self.screen)
-
         # Affichage du timer seulement s'il est actuellement en train de compter
         if timer >= 0:
             # Affichage du fond du timer
-            timer_sprite = scale_image_by(self.timer_background, self.screen_factor)
+            timer_sprite = self.timer_background
             timer_background_textRect = timer_sprite.get_rect()
-            timer_background_textRect.center = (self.screen.get_rect().w // 2, round(37 * self.screen_factor[1]))
+            timer_background_textRect.center = (self.screen.get_rect().w // 2, 37)
             self.screen.blit(timer_sprite, timer_background_textRect)
 
             # Positionnement du timer au centre-haut de l'écran
             timer_text = self.game_font.render(str(timer), (255, 255, 255))
-            timer_text_scaled = scale_image_by(timer_text[0], self.screen_factor)
+            timer_text_scaled = timer_text[0]
             timer_textRect = timer_text_scaled.get_rect()
-            timer_textRect.center = (self.screen.get_rect().w // 2, round(37 * self.screen_factor[1]))
+            timer_textRect.center = (self.screen.get_rect().w // 2, 37)
 
             # Affichage du timer
             self.screen.blit(timer_text_scaled, timer_textRect)
 
-        # Initialisation des facteurs pour la taille de l'écran
-        self.screen_factor = ((self.screen.get_rect().size[0] / 1280), (self.screen.get_rect().size[1] / 720))
-
         # Debug pour afficher les fps
         if self.show_fps:
             self.fps_font.render_to(self.screen, (0, 0), "FPS: " + str(round(self.clock.get_fps())), (0, 0, 0))
@@ -757,6 +799,10 @@ class MiniGame:
         if self.show_server_fps:
             self.fps_font.render_to(self.screen, (0, 20), "S-FPS: " + str(round(fps)), (0, 0, 0))
 
+        # Debug pour afficher la mémoire prise par les images et les sons
+        if self.show_fps and self.memoire is not None:
+            self.fps_font.render_to(self.screen, (0, 40), self.memoire.texte_usage(), (0, 0, 0))
+
 
     def load(self) -> None:
         """
@@ -791,64 +837,61 @@ class MiniGame:
 
                 # Changement de taille de la fenêtre
                 elif event.type == pygame.VIDEORESIZE:
-                    self.screen = pygame.display.set_mode(event.size, pygame.HWSURFACE|pygame.DOUBLEBUF|pygame.RESIZABLE)
+                    pygame.display.set_mode(event.size, pygame.HWSURFACE|pygame.DOUBLEBUF|pygame.RESIZABLE)
 
                 # Détection des inputs du joueur
                 elif event.type == pygame.MOUSEBUTTONUP and cooldown - time.time() < 0:
-                    self.net.send("ready_for_next_state")
+                    self.net.send(requete(PRET))
 
             # Envoi d'une requête au serveur pour obtenir le nombre de joueurs et lance la partie si tous les joueurs sont prêts
-            infos_serveur = json.loads(self.net.send("infos_serveur"))
+            infos_serveur = self.net.get_infos_serveur()
             nb_joueurs = infos_serveur["nb_joueurs"]
             nb_joueurs_prets = infos_serveur["nb_joueurs_prets"]
 
-            etat = self.net.send("get_etat")
+            etat = self.net.send(requete(GET_ETAT))
             running = etat == "minigame_load" or etat == "minigame_select"
 
-            # Initialisation des facteurs pour la taille de l'écran
-            self.screen_factor = ((self.screen.get_rect().size[0] / 1280), (self.screen.get_rect().size[1] / 720))
-
             # Affichage de l'écran de chargement et du texte
             self.screen.fill((0, 0, 0))
 
             # Redimension des textes
-            nom_text = scale_image_by(self.game_font.render(nom, (255, 255, 255))[0], self.screen_factor)
+            nom_text = self.game_font.render(nom, (255, 255, 255))[0]
             nom_textRect = nom_text.get_rect()
-            nom_textRect.center = (round(640 * self.screen_factor[0]), round(70 * self.screen_factor[1]))
+            nom_textRect.center = (640, 70)
             if cooldown - time.time() > 0:
                 chargement = "CHARGEMENT..." 
             elif nb_joueurs > 1:
                 chargement = "Cliquez si vous êtes prêt pour le mini-jeu ! (" + str(nb_joueurs_prets) + "/" + str(nb_joueurs) + ")"
             else:
                 chargement = "Cliquez pour lancer le mini-jeu !"
-            chargement_text = scale_image_by(self.game_font.render(chargement, (255, 255, 255))[0], (0.8 * self.screen_factor[0], 0.8 * self.screen_factor[1]))
+            chargement_text = scale_image_by(self.game_font.render(chargement, (255, 255, 255))[0], 0.8)
             chargement_textRect = chargement_text.get_rect()
-            chargement_textRect.center = (round(640 * self.screen_factor[0]), round(680 * self.screen_factor[1]))
+            chargement_textRect.center = (640, 680)
 
             # Création du texte "controles" qui s'affiche au-dessus des touches du jouers
-            controles_text = scale_image_by(self.game_font.render("Contrôles:", (255, 255, 255))[0], self.screen_factor)
+            controles_text = self.game_font.render("Contrôles:", (255, 255, 255))[0]
 
             # Affichage des textes
             self.screen.blit(nom_text, nom_textRect)
             self.screen.blit(chargement_text, chargement_textRect)
-            self.screen.blit(controles_text, (round(960 * self.screen_factor[0]), round(200 * self.screen_factor[1])))
+            self.screen.blit(controles_text, (960, 200))
 
             # Affichage de Toad (pour présenter le mini-jeu)
-            self.screen.blit(scale_image_by(self.toad_shadow, (6 * self.screen_factor[0], 6 * self.screen_factor[1])), (round(114 * self.screen_factor[0]), round(535 * self.screen_factor[1])))
-            self.screen.blit(scale_image_by(self.toad[1], (5 * self.screen_factor[0], 5 * self.screen_factor[1])), (round(100 * self.screen_factor[0]), round(400 * self.screen_factor[1])))
-            self.screen.blit(scale_image_by(self.toad_bubble, (5 * self.screen_factor[0], 5 * self.screen_factor[1])), (round(240 * self.screen_factor[0]), round(150 * self.screen_factor[1])))
+            self.screen.blit(scale_image_by(self.toad_shadow, 6), (114, 535))
+            self.screen.blit(scale_image_by(self.toad[1], 5), (100, 400))
+            self.screen.blit(scale_image_by(self.toad_bubble, 5), (240, 150))
 
             # Affichage de la description
             for line in description:
-                description_text = scale_image_by(self.game_font.render(line, (0, 0, 0))[0], (0.7 * self.screen_factor[0], 0.7 * self.screen_factor[1]))
-                self.screen.blit(description_text, (round(260 * self.screen_factor[0]), round((170 + description.index(line) * 37) * self.screen_factor[1])))
+                description_text = scale_image_by(self.game_font.render(line, (0, 0, 0))[0], 0.7)
+                self.screen.blit(description_text, (260, 170 + description.index(line) * 37))
 
             # Création et affichage des touches du clavier pour le joueur
-            layout_joueur = scale_image_by(pygame.image.load(sep.join(["..", "data", "sprites", "minigames", "general", "layout_joueur.png"])), self.screen_factor)
-            self.screen.blit(layout_joueur, (round(930 * self.screen_factor[0]), round(300 * self.screen_factor[1])))
+            layout_joueur = charger_image(sep.join(["..", "data", "sprites", "minigames", "general", "layout_joueur.png"]))
+            self.screen.blit(layout_joueur, (930, 300))
 
             # Mise à jour de l'écran et limite de fps
-            pygame.display.flip()
+            presenter(self.screen)
             self.clock.tick(self.fps)
 
         # Lancement de l'intro du mini-jeu (si le joueur n'a pas fermé la fenêtre)
@@ -856,30 +899,95 @@ class MiniGame:
             self.start_game()
 
 
-    def start_game(self) -> None:
+    def init_partie(self) -> None:
         """
-        Cette méthode représente la phase de lancement du mini-jeu.
+        Cette méthode permet de créer les entités du mini-jeu à partir des infos envoyées par le serveur.
         """
 
         # Envoi d'une requête au serveur pour obtenir les infos de chaque joueur
-        infos_joueurs = json.loads(self.net.send("0|0"))["joueurs"]
+        infos_joueurs = self.net.etat_minijeu("0|0")["joueurs"]
 
         # Création des joueurs
         for ip in infos_joueurs.keys():
             self.joueurs[ip] = Joueur(infos_joueurs[ip]["perso"])
 
         # Envoi de la taille du joueur au serveur
-        self.net.send(json.dumps({"taille_joueurs": {joueur: self.joueurs[joueur].get_taille() for joueur in self.joueurs.keys()}}))
+        self.net.send(requete(TAILLE_JOUEURS, json.dumps({joueur: self.joueurs[joueur].get_taille() for joueur in self.joueurs.keys()})))
 
         # Initialisation de la liste des objets
         self.objets = list(self.joueurs.values()) + [Banquise()]
+        self.pingouins = {}
+        self.dernier_evenement = 0
+
+        # Initialisation de la file d'affichage (les pingouins y sont ajoutés à leur apparition)
+        self.file_rendu.vider()
+        for objet in self.objets:
+            self.file_rendu.ajouter(objet)
+
+
+    def ajouter_pingouin(self, id_pingouin: str, infos_pingouins: dict) -> None:
+        """
+        Cette méthode permet de créer un pingouin apparu côté serveur.
+
+        Paramètres:
+            - id_pingouin (str): Identifiant du pingouin.
+            - infos_pingouins (dict): État des pingouins envoyé par le serveur.
+        """
+
+        # Le pingouin a pu disparaître avant que le client ne reçoive son apparition
+        if not id_pingouin in self.pingouins and id_pingouin in infos_pingouins:
+            self.pingouins[id_pingouin] = Pingouin(infos_pingouins[id_pingouin][0], infos_pingouins[id_pingouin][1], int(id_pingouin))
+            self.file_rendu.ajouter(self.pingouins[id_pingouin])
+
+
+    def retirer_pingouin(self, id_pingouin: str) -> None:
+        """
+        Cette méthode permet de faire disparaître un pingouin tombé à l'eau côté serveur.
+
+        Paramètres:
+            - id_pingouin (str): Identifiant du pingouin.
+        """
+
+        if id_pingouin in self.pingouins:
+            pingouin = self.pingouins.pop(id_pingouin)
+            pingouin.set_hidden(True)
+            pingouin.get_splash_sound().play()
+
+            # Le pingouin n'est plus affiché
+            self.file_rendu.retirer(pingouin)
+
+
+    def synchroniser_pingouins(self, infos_pingouins: dict) -> None:
+        """
+        Cette méthode permet de retrouver les pingouins du serveur à partir de son état complet
+        (utilisée seulement quand des événements ont été manqués).
+
+        Paramètres:
+            - infos_pingouins (dict): État des pingouins envoyé par le serveur.
+        """
+
+        for id_pingouin in list(self.pingouins.keys()):
+            if not id_pingouin in infos_pingouins:
+                self.retirer_pingouin(id_pingouin)
+
+        for id_pingouin in infos_pingouins.keys():
+            self.ajouter_pingouin(id_pingouin, infos_pingouins)
+
+
+    def start_game(self) -> None:
+        """
+        Cette méthode représente la phase de lancement du mini-jeu.
+        """
+
+        # Création des entités du mini-jeu
+        self.init_partie()
 
         # Initialisation des paramètres par défaut de la phase
         running = True
         prev_time = time.time()
 
         # Initialisation du texte start et de ses coordonnées de départ
-        start_image = pygame.image.load(sep.join(["..", "data", "sprites", "minigames", "general", "start.png"]))
+        start_image = charger_image(sep.join(["..", "data", "sprites", "minigames", "general", "start.png"]))
         start_image_x = -start_image.get_rect().w
         start_image_y = round((640 - start_image.get_rect().h) / 2)
 
@@ -899,10 +1007,10 @@ class MiniGame:
 
                 # Changement de taille de la fenêtre
                 elif event.type == pygame.VIDEORESIZE:
-                    self.screen = pygame.display.set_mode(event.size, pygame.HWSURFACE|pygame.DOUBLEBUF|pygame.RESIZABLE)
+                    pygame.display.set_mode(event.size, pygame.HWSURFACE|pygame.DOUBLEBUF|pygame.RESIZABLE)
 
             # Envoie d'une requête au serveur pour obtenir son etat
-            etat = self.net.send("get_etat")
+            etat = self.net.send(requete(GET_ETAT))
             running = etat == "minigame_start"
 
             # Utilisation du moteur de jeu
@@ -913,17 +1021,17 @@ class MiniGame:
             prev_time = time.time()
 
             # Affichage du texte start
-            self.screen.blit(scale_image_by(start_image, (4 * self.screen_factor[0], 4 * self.screen_factor[1])), (round(start_image_x * self.screen_factor[0]), round(start_image_y * self.screen_factor[1])))
+            self.screen.blit(scale_image_by(start_image, 4), (round(start_image_x), round(start_image_y)))
 
             # Arrête la phase d'intro si le texte sort de l'écran
             if not sent:
                 if start_image_x > 1280:
-                    sent = self.net.send("ready_for_next_state") == "ok"
+                    sent = self.net.send(requete(PRET)) == "ok"
 
                 # Si le texte se trouve au milieu de l'écran et que le timer n'est pas encore lancé
                 elif (start_image_x + 2000 * delta_time) > (1000 - start_image.get_rect().w) / 2 and cooldown == 0:
                     cooldown = time.time()
-                    pygame.mixer.Sound(sep.join(["..", "data", "sounds", "minigames", "start.ogg"])).play()
+                    charger_son(sep.join(["..", "data", "sounds", "minigames", "start.ogg"])).play()
 
                 # Si le timer a duré 0.5s ou qu'il n'est pas encore lancé
                 elif time.time() - cooldown > 0.5 or cooldown == 0:
@@ -932,14 +1040,14 @@ class MiniGame:
                     start_image_x = round(start_image_x)
 
             # Mise à jour de l'écran et limite de fps
-            pygame.display.flip()
+            presenter(self.screen)
             self.clock.tick(self.fps)
 
         # Lancement du mini-jeu en lui même (si le joueur n'a pas fermé la fenêtre)
         if not self.quit:
 
             # Lancement du son de sifflet et la musique chargée
-            pygame.mixer.Sound(sep.join(["..", "data", "sounds", "minigames", "start_sifflet.ogg"])).play()
+            charger_son(sep.join(["..", "data", "sounds", "minigames", "start_sifflet.ogg"])).play()
             pygame.mixer.music.play(loops=-1)
 
             self.during_game()
@@ -964,10 +1072,10 @@ class MiniGame:
 
                 # Changement de taille de la fenêtre
                 elif event.type == pygame.VIDEORESIZE:
-                    self.screen = pygame.display.set_mode(event.size, pygame.HWSURFACE|pygame.DOUBLEBUF|pygame.RESIZABLE)
+                    pygame.display.set_mode(event.size, pygame.HWSURFACE|pygame.DOUBLEBUF|pygame.RESIZABLE)
 
             # Envoie d'une requête au serveur pour obtenir son etat
-            etat = self.net.send("get_etat")
+            etat = self.net.send(requete(GET_ETAT))
             running = etat == "minigame_during"
 
             # Détection des inputs et réinitialisation des vecteurs de déplacement des joueurs
@@ -989,7 +1097,7 @@ class MiniGame:
             self.game_engine(input_joueur)
 
             # Mise à jour de l'écran et limite de fps
-            pygame.display.flip()
+            presenter(self.screen)
             self.clock.tick(self.fps)
 
         # Lancement de l'affichage de fin (si le joueur n'a pas fermé la fenêtre)
@@ -1009,10 +1117,10 @@ class MiniGame:
 
         # Arrêt de la musique et son de fin
         pygame.mixer.music.stop()
-        pygame.mixer.Sound(sep.join(["..", "data", "sounds", "minigames", "finish.ogg"])).play()
+        charger_son(sep.join(["..", "data", "sounds", "minigames", "finish.ogg"])).play()
 
         # Initialisation du texte finish et de ses coordonnées de départ
-        finish_image = pygame.image.load(sep.join(["..", "data", "sprites", "minigames", "general", "finish.png"]))
+        finish_image = charger_image(sep.join(["..", "data", "sprites", "minigames", "general", "finish.png"]))
         finish_image_x = -finish_image.get_rect().w
         finish_image_y = round((640 - finish_image.get_rect().h) / 2)
 
@@ -1032,10 +1140,10 @@ class MiniGame:
 
                 # Changement de taille de la fenêtre
                 elif event.type == pygame.VIDEORESIZE:
-                    self.screen = pygame.display.set_mode(event.size, pygame.HWSURFACE|pygame.DOUBLEBUF|pygame.RESIZABLE)
+                    pygame.display.set_mode(event.size, pygame.HWSURFACE|pygame.DOUBLEBUF|pygame.RESIZABLE)
 
             # Envoie d'une requête au serveur pour obtenir son etat
-            etat = self.net.send("get_etat")
+            etat = self.net.send(requete(GET_ETAT))
             running = etat == "minigame_end"
 
             # Utilisation du moteur de jeu
@@ -1046,12 +1154,12 @@ class MiniGame:
             prev_time = time.time()
 
             # Affichage du texte finish
-            self.screen.blit(scale_image_by(finish_image, (4 * self.screen_factor[0], 4 * self.screen_factor[1])), (round(finish_image_x * self.screen_factor[0]), round(finish_image_y * self.screen_factor[1])))
+            self.screen.blit(scale_image_by(finish_image, 4), (round(finish_image_x), round(finish_image_y)))
 
             # Arrête la phase de fin au bout de 1.5s si le timer est déjà lancé
             if not sent:
                 if time.time() - cooldown > 1.5 and cooldown > 0:
-                    sent = self.net.send("ready_for_next_state") == "ok"
+                    sent = self.net.send(requete(PRET)) == "ok"
 
                 # Si le texte se trouve au milieu de l'écran et que le timer n'est pas encore lancé
                 elif (finish_image_x + 2000 * delta_time) > (1000 - finish_image.get_rect().w) / 2 and cooldown == 0:
@@ -1063,7 +1171,7 @@ class MiniGame:
                     finish_image_x = round(finish_image_x)
 
             # Mise à jour de l'écran et limite de fps
-            pygame.display.flip()
+            presenter(self.screen)
             self.clock.tick(self.fps)
 
         # Lancement de l'annonce des gagnants (si le joueur n'a pas fermé la fenêtre)
@@ -1081,7 +1189,7 @@ class MiniGame:
         running = True
 
         # Envoie d'une requête au serveur pour obtenir les infos du classement
-        classement = json.loads(self.net.send("0|0"))["classement"]
+        classement = self.net.etat_minijeu("0|0")["classement"]
 
         # On note tous les gagnants de la partie
         gagnants = []
@@ -1094,13 +1202,13 @@ class MiniGame:
 
         # Changement du texte et de la musique jouée selon différents cas
         if len(gagnants) == 0:
-            win_image = pygame.image.load(sep.join(["..", "data", "sprites", "minigames", "general", "tie.png"]))
+            win_image = charger_image(sep.join(["..", "data", "sprites", "minigames", "general", "tie.png"]))
             pygame.mixer.music.load(sep.join(["..", "data", "musics", "minigames", "draw.ogg"]))
         elif len(gagnants) > 1:
-            win_image = pygame.image.load(sep.join(["..", "data", "sprites", "minigames", "general", "wins.png"]))
+            win_image = charger_image(sep.join(["..", "data", "sprites", "minigames", "general", "wins.png"]))
             pygame.mixer.music.load(sep.join(["..", "data", "musics", "minigames", "win.ogg"]))
         else:
-            win_image = pygame.image.load(sep.join(["..", "data", "sprites", "minigames", "general", "win.png"]))
+            win_image = charger_image(sep.join(["..", "data", "sprites", "minigames", "general", "win.png"]))
             pygame.mixer.music.load(sep.join(["..", "data", "musics", "minigames", "win.ogg"]))
 
         # Timer de 5s
@@ -1122,10 +1230,10 @@ class MiniGame:
 
                 # Changement de taille de la fenêtre
                 elif event.type == pygame.VIDEORESIZE:
-                    self.screen = pygame.display.set_mode(event.size, pygame.HWSURFACE|pygame.DOUBLEBUF|pygame.RESIZABLE)
+                    pygame.display.set_mode(event.size, pygame.HWSURFACE|pygame.DOUBLEBUF|pygame.RESIZABLE)
 
             # Envoie d'une requête au serveur pour obtenir son etat
-            etat = self.net.send("get_etat")
+            etat = self.net.send(requete(GET_ETAT))
             running = etat == "minigame_winners"
 
             # Utilisation du moteur de jeu
@@ -1139,7 +1247,7 @@ class MiniGame:
 
             for gagnant in gagnants:
                 # Initialisation et positionnement du texte de chaque gagnant
-                image_gagnant = scale_image_by(pygame.image.load(sep.join(["..", "data", "sprites", "minigames", "general", gagnant + ".png"])), 4)
+                image_gagnant = charger_image(sep.join(["..", "data", "sprites", "minigames", "general", gagnant + ".png"]), 4)
                 image_rect = image_gagnant.get_rect()
                 image_rect.center = (640, 400)
 
@@ -1148,23 +1256,23 @@ class MiniGame:
                     image_rect.x = image_x
 
                 # Affichage du texte de chaque gagnant
-                self.screen.blit(scale_image_by(image_gagnant, self.screen_factor), (round(image_rect.x * self.screen_factor[0]), round(image_rect.y * self.screen_factor[1])))
+                self.screen.blit(image_gagnant, (image_rect.x, image_rect.y))
 
                 # On déplace le prochain texte 50 pixels plus loin
                 image_x += image_rect.w + 50
 
             # Positionnement du texte win
-            scaled_win = scale_image_by(win_image, (4 * self.screen_factor[0], 4 * self.screen_factor[1]))
+            scaled_win = scale_image_by(win_image, 4)
             win_rect = scaled_win.get_rect()
-            win_rect.center = (round(640 * self.screen_factor[0]), round(520 * self.screen_factor[1]))
+            win_rect.center = (640, 520)
 
             # Affichage du texte win
             self.screen.blit(scaled_win, win_rect)
 
             # Arrêt du script au bout du timer
             if cooldown - time.time() <= 0 and not sent:
-                sent = self.net.send("ready_for_next_state") == "ok"
+                sent = self.net.send(requete(PRET)) == "ok"
 
             # Mise à jour de l'écran et limite de fps
-            pygame.display.flip()
+            presenter(self.screen)
             self.clock.tick(self.fps)
\ No newline at end of file
@@ -5,10 +5,16 @@
 
 import json
 import socket
-import pygame
 from math import sqrt
 import time
 import random
+from collections import deque
+from threading import Condition
+
+from profiler import Profiler
+from protocole import TableRequetes, GET_ETAT, INPUTS, TAILLE_JOUEURS
+from moteur import Rect
+from registre import Registre
 
 # ------/ Fonctions utiliatires \------
 
@@ -79,7 +85,7 @@ class Joueur:
 
             - frame (float): Indice du sprite à choisir.
 
-            - collision (pygame.Rect): Boîte de collision du joueur.
+            - collision (Rect): Boîte de collision du joueur.
 
             - taille (list): Dimensions du sprite du joueur (fournis par le client).
 
@@ -115,7 +121,7 @@ class Joueur:
         self.frame = 0
 
         # Boîte de collision du personnage
-        self.collision = pygame.Rect(0, 0, 42, 20)
+        self.collision = Rect(0, 0, 42, 20)
 
         # Initialisation de la taille du joueur (qui sera définie lors du début de partie)
         self.taille = [0, 0]
@@ -262,7 +268,7 @@ class Joueur:
         assert type(objet) == Joueur or type(objet) == Banquise or type(objet) == Pingouin, "Erreur: Le 3ème paramètre (objet) n'est pas un objet de type Joueur ou Hexagon."
 
         # Création d'une boîte de collision avec les coordonnées x et y
-        rect = pygame.Rect(round(x), round(y), self.collision.w, self.collision.h)
+        rect = Rect(round(x), round(y), self.collision.w, self.collision.h)
 
         # Initialisation de l'état de la collision
         collided = False
@@ -386,7 +392,7 @@ class Banquise:
         self.pos = [184, 74, 0]
 
         # Boîte de collision de la banquise
-        self.collision =  pygame.Rect(round(self.pos[0]), round(self.pos[1] + 120), 1096, 526)   # Hauteur de la collision (646 - 120 = 526)
+        self.collision =  Rect(round(self.pos[0]), round(self.pos[1] + 120), 1096, 526)   # Hauteur de la collision (646 - 120 = 526)
 
         # La hauteur correspond au point le plus haut de la banquise
         self.height = self.collision.h - 646
@@ -431,7 +437,7 @@ class Pingouin:
 
             - shadow_pos (list): Position de l'ombre.
 
-            - collision (pygame.Rect): Boîte de collision du pingouin.
+            - collision (Rect): Boîte de collision du pingouin.
 
             - priority (float): Valeur représentant la priorité d'affichage du sprite.
 
@@ -460,7 +466,7 @@ class Pingouin:
         self.frame = 0
 
         # Boîte de collision du pingouin
-        self.collision = pygame.Rect(0, 0, 38 * size, 20)
+        self.collision = Rect(0, 0, 38 * size, 20)
 
         # Éléments importants pour la 3D
         self.height = -100 + self.collision.h
@@ -558,7 +564,7 @@ class Pingouin:
         assert type(objet) == Joueur or type(objet) == Banquise or type(objet) == Pingouin, "Erreur: Le 3ème paramètre (objet) n'est pas un objet de type Joueur ou Hexagon."
 
         # Création d'une boîte de collision avec les coordonnées x et y
-        rect = pygame.Rect(round(x), round(y), self.collision.w, self.collision.h)
+        rect = Rect(round(x), round(y), self.collision.w, self.collision.h)
 
         # Initialisation de l'état de la collision
         collided = False
@@ -740,14 +746,26 @@ class File:
 
 # Classe du serveur
 class Server:
-    def __init__(self, server_socket: socket.socket) -> None:
+    def __init__(self, server_socket: socket.socket, profiling: bool = False, horloge=time.time, rng=random, silencieux: bool = False) -> None:
         """
         Documentation ici
             - score (list): Stockage du score de la partie.
         """
 
         self.server_socket = server_socket
-        print("Initialisation du mini-jeu: Pushy Penguins")
+
+        # Horloge et générateur aléatoire du mini-jeu (remplaçables pour simuler une partie sans réseau)
+        self.horloge = horloge
+        self.rng = rng
+
+        # Les copies du mini-jeu (lockstep, simulation) n'écrivent pas leurs messages dans la console
+        self.silencieux = silencieux
+
+        # Fonction du lobby appelée quand le nombre de joueurs prêts change (None hors du lobby)
+        self.notifier_lobby = None
+
+        if not self.silencieux:
+            print("Initialisation du mini-jeu: Pushy Penguins")
 
         self.joueurs = {}
         self.inputs_joueurs = {}
@@ -755,7 +773,7 @@ class Server:
 
         # Initialisation d'un ordre aléatoire pour les mini-jeux
         self.ordre_minijeu = [i for i in range(4)]
-        random.shuffle(self.ordre_minijeu)
+        self.rng.shuffle(self.ordre_minijeu)
 
         # Initialisation de la liste aléatoire de la taille possible des pingouins (il y a 1/16 chances de tomber sur une taille 3)
         self.pingouin_sizes = [1 for _ in range(15)] + [3]
@@ -764,7 +782,11 @@ class Server:
         self.temps_total = 0.155
         self.timer_pingouin = 0
 
-        self.objets = []
+        self.objets = Registre()
+
+        # Journal des apparitions / disparitions de pingouins (numérotées), envoyé avec chaque réponse
+        self.evenements = deque(maxlen=16)
+        self.nb_evenements = 0
 
         # Initialisation du timer
         self.timer = 30
@@ -774,6 +796,20 @@ class Server:
         self.classement = File()
 
         self.fps = 60
+        self.profiler = Profiler("Pushy Penguins", self.fps, profiling)
+
+        # Requêtes du mini-jeu, chacune trouvée directement par son opcode
+        self.requetes = TableRequetes("Pushy Penguins")
+        self.requetes.enregistrer(GET_ETAT, self.requete_get_etat)
+        self.requetes.enregistrer(TAILLE_JOUEURS, self.requete_taille_joueurs)
+        self.requetes.enregistrer(INPUTS, self.requete_inputs)
+
+        # Dernier état encodé en json (publié une fois par tick et partagé par tous les clients)
+        self.snapshot = None
+
+        # Condition qui protège les joueurs prêts et réveille la boucle du mini-jeu quand un joueur est prêt
+        self.condition = Condition()
+
         self.current_fps = 0
         self.is_running = False
 
@@ -796,55 +832,150 @@ class Server:
         return self.joueurs[address]
 
     def add_player(self, address: str, perso: str, ia: bool):
-        id_minijeu = self.ordre_minijeu[len(self.joueurs)]
-        self.joueurs[address] = Joueur(perso, id_minijeu, ia)
+        with self.condition:
+            id_minijeu = self.ordre_minijeu[len(self.joueurs)]
+            self.joueurs[address] = Joueur(perso, id_minijeu, ia)
+
+            # Les ia sont automatiquement prêtes
+            if ia:
+                self.nb_joueurs_prets += 1
+
+            self.condition.notify_all()
+
+
+    def get_infos(self) -> dict:
+        """
+        Cette méthode permet de récupérer l'état du mini-jeu tel qu'il est envoyé aux clients.
+
+        Renvois:
+            - dict: Informations sur les joueurs et les entités du mini-jeu.
+        """
+
+        infos_joueurs = {joueur: {
+            "perso": self.joueurs[joueur].get_perso(),
+            "pos": self.joueurs[joueur].get_pos(),
+            "velocity": self.joueurs[joueur].get_velocity(),
+            "frame": self.joueurs[joueur].get_frame(),
+            "rotation": self.joueurs[joueur].get_rotation(),
+            "dead": self.joueurs[joueur].get_dead(),
+            "ground_height": self.joueurs[joueur].get_ground_height()
+        } for joueur in self.joueurs.keys()}
+
+        return {"joueurs": infos_joueurs, "pingouins": self.get_infos_pingouins(), "evenements": list(self.evenements), "timer": round(self.timer - self.horloge()), "classement": {} if type(self.classement) == File else self.classement, "fps": self.current_fps}
+
+
+    def get_infos_pingouins(self) -> dict:
+        """
+        Cette méthode permet de récupérer l'état des pingouins tel qu'il est envoyé aux clients.
+
+        Renvois:
+            - dict: Position, taille, frame et hauteur du sol de chaque pingouin (selon son identifiant).
+        """
+
+        return {objet.get_id_pingouin(): [
+            objet.get_pos(), objet.get_size(), round(objet.get_frame(), 5), objet.get_ground_height()
+        ] for objet in self.objets.get_type(Pingouin)}
 
 
     def client_thread(self, address: str, request: str) -> str:
-            if request == "get_etat":
-                reply = self.etat
-
-            elif "taille_joueurs" in request:
-                taille = json.loads(request)["taille_joueurs"]
-                for ip in taille.keys():
-                    self.joueurs[ip].set_taille([taille[ip][0], taille[ip][1]])
-                reply = "ok"
-
-            elif request == "get_pingouins":
-                infos_pingouins = {objet.get_id_pingouin(): [
-                    objet.get_pos(), objet.get_size(), round(objet.get_frame(), 5), objet.get_ground_height()
-                ] for objet in self.objets if type(objet) == Pingouin}
-
-                reply = json.dumps(infos_pingouins)
-
-            elif "|" in request:
-                # Si la requête c'est ça: 1|1|0
-                self.inputs_joueurs[address] = [int(coord) for coord in request.split("|")]
-
-                infos_joueurs = {joueur: {
-                    "perso": self.joueurs[joueur].get_perso(),
-                    "pos": self.joueurs[joueur].get_pos(),
-                    "velocity": self.joueurs[joueur].get_velocity(),
-                    "frame": self.joueurs[joueur].get_frame(),
-                    "rotation": self.joueurs[joueur].get_rotation(),
-                    "dead": self.joueurs[joueur].get_dead(),
-                    "ground_height": self.joueurs[joueur].get_ground_height()
-                } for joueur in self.joueurs.keys()}
-
-                reply = json.dumps({"joueurs": infos_joueurs, "timer": round(self.timer - time.time()), "classement": {} if type(self.classement) == File else self.classement, "fps": self.current_fps})
+        # L'opcode de la requête (son premier octet) donne directement la fonction qui y répond
+        reply = self.requetes.traiter(address, request)
+        return "not_found" if reply is None else reply
+
+
+    def requete_get_etat(self, address: str, donnees: str) -> str:
+        return self.etat
 
-            else:
-                reply = "not_found"
 
-            return reply
+    def requete_taille_joueurs(self, address: str, donnees: str) -> str:
+        taille = json.loads(donnees)
+        for ip in taille.keys():
+            self.joueurs[ip].set_taille([taille[ip][0], taille[ip][1]])
+        return "ok"
+
+
+    def requete_inputs(self, address: str, donnees: str) -> str:
+        # Si les données c'est ça: 1|1|0
+        with self.profiler.mesure("inputs"):
+            self.inputs_joueurs[address] = [int(coord) for coord in donnees.split("|")]
+
+        # Tous les clients reçoivent le même état, encodé une seule fois par tick
+        return self.get_snapshot()
 
 
     def changer_etat(self, new_etat):
-        self.etat = new_etat
-        for ip in self.joueurs.keys():
-            self.joueurs[ip].set_ready(False)
+        with self.condition:
+            self.etat = new_etat
+            for ip in self.joueurs.keys():
+                self.joueurs[ip].set_ready(False)
+
+            # Seules les ia restent prêtes
+            self.nb_joueurs_prets = len([joueur for joueur in self.joueurs.values() if joueur.get_ia()])
+            self.condition.notify_all()
+
+        if not self.silencieux:
+            print("[Pushy Penguins] Passé à l'état", self.etat)
+
+        self.notifier_prets()
+
+
+    def marquer_pret(self, address: str) -> None:
+        """
+        Cette méthode indique qu'un joueur est prêt pour l'état suivant (appelée par le thread de son client).
+
+        Paramètres:
+            - address (str): Adresse du joueur.
+        """
+
+        with self.condition:
+            if not self.joueurs[address].get_ready():
+                self.joueurs[address].set_ready(True)
+
+                # Le compteur est mis à jour ici plutôt que recompté à chaque tick
+                if not self.joueurs[address].get_ia():
+                    self.nb_joueurs_prets += 1
+
+                self.condition.notify_all()
+
+        self.notifier_prets()
+
+
+    def notifier_prets(self) -> None:
+        """
+        Cette méthode prévient le lobby que le nombre de joueurs prêts a changé (il fait partie de ses informations).
+        Elle doit être appelée sans self.condition.
+        """
+
+        if self.notifier_lobby is not None:
+            self.notifier_lobby()
+
+
+    def tous_prets(self) -> bool:
+        """
+        Cette méthode indique si tous les joueurs sont prêts pour l'état suivant.
+
+        Renvois:
+            - bool: True si tous les joueurs sont prêts, sinon False.
+        """
+
+        return len(self.joueurs) > 0 and self.nb_joueurs_prets == len(self.joueurs)
+
+
+    def ajouter_evenement(self, type_evenement: str, id_pingouin: int) -> None:
+        """
+        Cette méthode permet d'ajouter une apparition ou une disparition de pingouin dans le journal envoyé aux clients.
 
-        print("[Pushy Penguins] Passé à l'état", self.etat)
+        Paramètres:
+            - type_evenement (str): "spawn" ou "despawn".
+            - id_pingouin (int): Identifiant du pingouin concerné.
+        """
+
+        # Test du type de l'événement
+        assert type_evenement == "spawn" or type_evenement == "despawn", "Erreur: Le 1er paramètre (type_evenement) n'est pas un événement valide."
+
+        # Les événements sont numérotés pour que les clients n'appliquent que ceux qu'ils n'ont pas encore vus
+        self.nb_evenements += 1
+        self.evenements.append([self.nb_evenements, type_evenement, id_pingouin])
 
 
     def load_game(self):
@@ -856,8 +987,11 @@ class Server:
             self.inputs_joueurs[ids_to_ips[i]] = [0, 0, 0]
             self.joueurs[ids_to_ips[i]].set_pos(pos_joueurs[i])
 
-        # On met à jour la liste d'objets
-        self.objets = list(self.joueurs.values()) + [Banquise()]
+        # On met à jour le registre d'objets
+        self.objets = Registre()
+        for joueur in self.joueurs.values():
+            self.objets.ajouter(joueur)
+        self.objets.ajouter(Banquise())
 
 
     def during_game(self):
@@ -865,7 +999,7 @@ class Server:
         joueurs_vivants = list(filter(lambda x: not self.joueurs[x].get_dead(), self.joueurs.keys()))
 
         # Le mini-jeu s'arrête s'il ne reste plus de joueurs à part le joueur solo
-        if self.timer - time.time() <= 0 or len(joueurs_vivants) <= 1:
+        if self.timer - self.horloge() <= 0 or len(joueurs_vivants) <= 1:
             # On passe à l'état suivant
             self.changer_etat(self.etats[self.etats.index(self.etat) + 1])
 
@@ -875,30 +1009,31 @@ class Server:
         for joueur in self.joueurs.keys():
             # Comportement des ia
             if self.joueurs[joueur].get_ia():
-                # On réinitialise leurs inputs
-                self.inputs_joueurs[joueur] = [0, 0, 0]
+                with self.profiler.mesure("ia"):
+                    # On réinitialise leurs inputs
+                    self.inputs_joueurs[joueur] = [0, 0, 0]
 
-                # Initialisation d'une position aléatoire choisie
-                if self.joueurs[joueur].get_delai_ia() - time.time() < 0:
-                    self.joueurs[joueur].set_ia_target_pos([random.randint(800, 1100), random.randint(300, 500)])
-                    self.joueurs[joueur].set_delai_ia(1 + time.time())
+                    # Initialisation d'une position aléatoire choisie
+                    if self.joueurs[joueur].get_delai_ia() - self.horloge() < 0:
+                        self.joueurs[joueur].set_ia_target_pos([self.rng.randint(800, 1100), self.rng.randint(300, 500)])
+                        self.joueurs[joueur].set_delai_ia(1 + self.horloge())
 
-                # Pathfinding de l'ia
-                if self.joueurs[joueur].get_pos()[0] < self.joueurs[joueur].get_ia_target_pos()[0] - 10:
-                    self.inputs_joueurs[joueur][0] += 1
-                    self.joueurs[joueur].set_rotation("right")
+                    # Pathfinding de l'ia
+                    if self.joueurs[joueur].get_pos()[0] < self.joueurs[joueur].get_ia_target_pos()[0] - 10:
+                        self.inputs_joueurs[joueur][0] += 1
+                        self.joueurs[joueur].set_rotation("right")
 
-                elif self.joueurs[joueur].get_pos()[0] > self.joueurs[joueur].get_ia_target_pos()[0] + 10:
-                    self.inputs_joueurs[joueur][0] -= 1
-                    self.joueurs[joueur].set_rotation("left")
+                    elif self.joueurs[joueur].get_pos()[0] > self.joueurs[joueur].get_ia_target_pos()[0] + 10:
+                        self.inputs_joueurs[joueur][0] -= 1
+                        self.joueurs[joueur].set_rotation("left")
 
-                if self.joueurs[joueur].get_pos()[1] < self.joueurs[joueur].get_ia_target_pos()[1] - 10:
-                    self.inputs_joueurs[joueur][1] += 1
-                    self.joueurs[joueur].set_rotation("down")
+                    if self.joueurs[joueur].get_pos()[1] < self.joueurs[joueur].get_ia_target_pos()[1] - 10:
+                        self.inputs_joueurs[joueur][1] += 1
+                        self.joueurs[joueur].set_rotation("down")
 
-                elif self.joueurs[joueur].get_pos()[1] > self.joueurs[joueur].get_ia_target_pos()[1] + 10:
-                    self.inputs_joueurs[joueur][1] -= 1
-                    self.joueurs[joueur].set_rotation("up")
+                    elif self.joueurs[joueur].get_pos()[1] > self.joueurs[joueur].get_ia_target_pos()[1] + 10:
+                        self.inputs_joueurs[joueur][1] -= 1
+                        self.joueurs[joueur].set_rotation("up")
 
             # Mise à jour de la rotation des joueurs
             if self.inputs_joueurs[joueur][0] > 0:
@@ -911,31 +1046,27 @@ class Server:
                 self.joueurs[joueur].set_rotation("up")
 
         # Logique du mini-jeu en elle même
-        if time.time() - self.timer_pingouin > self.temps_total and self.timer - time.time() > 5:
+        if self.horloge() - self.timer_pingouin > self.temps_total and self.timer - self.horloge() > 5:
             # Caractéristiques aléatoires du pingouin
             current_x = 1250
-            current_y = random.randint(150, 650)
-            current_speed = random.randint(4, 8)
-            current_size = random.choice(self.pingouin_sizes)
+            current_y = self.rng.randint(150, 650)
+            current_speed = self.rng.randint(4, 8)
+            current_size = self.rng.choice(self.pingouin_sizes)
 
             # On décale le gros pingouin pour pas qu'il tombe instantanément de la plateforme
             if current_size > 1:
                 current_x -= 25 * current_size
                 current_y -= 25 * current_size
 
-            # Initialisation d'une liste de pingouins pour simplifier la suite
-            pingouins = {objet.get_id_pingouin(): objet for objet in self.objets if type(objet) == Pingouin}
-
-            # Création du nouvel identifiant du pingouin
-            new_id = 0
-            while new_id in pingouins.keys():
-                new_id += 1
+            # Création du nouvel identifiant du pingouin (jamais réutilisé)
+            new_id = self.objets.nouvel_id()
 
             # On crée le pingouin
-            self.objets.append(Pingouin([current_x, current_y, -120], current_speed, current_size, new_id))
+            self.objets.ajouter(Pingouin([current_x, current_y, -120], current_speed, current_size, new_id), new_id)
+            self.ajouter_evenement("spawn", new_id)
 
             # Réinitialisation du timer
-            self.timer_pingouin = time.time()
+            self.timer_pingouin = self.horloge()
 
             # Le temps que met chaque pingouin pour spawn se réduit
             self.temps_total -= 0.00028
@@ -974,86 +1105,148 @@ class Server:
         self.changer_etat(self.etats[self.etats.index(self.etat) + 1])
 
 
-    def run(self, clock) -> None:
-        self.is_running = True
+    def maj_etats(self) -> None:
+        """
+        Cette méthode permet de passer à l'état suivant du mini-jeu lorsque tous les joueurs sont prêts.
+        """
+
+        # Lorsque tous les joueurs sont prêts (nb_joueurs_prets est tenu à jour par marquer_pret et changer_etat)
+        if self.tous_prets():
+            # On finalise la création des joueurs avant que le jeu commence
+            if self.etat == "minigame_load":
+                self.load_game()
+
+            # Calcule le classement final
+            elif self.etat == "minigame_end":
+                self.calculate_score()
+
+            # Si on a fini le mini-jeu, on stoppe ce serveur
+            if self.etat == "minigame_winners":
+                self.is_running = False
+
+            # Sinon on passe à l'état suivant
+            else:
+                self.changer_etat(self.etats[self.etats.index(self.etat) + 1])
 
-        print("Lancement du mini-jeu: Pushy Penguins")
-        while self.is_running:
-            # On récupère le nombre de joueurs prêts (les ia sont automatiquement prêts)
-            self.nb_joueurs_prets = len([joueur for joueur in self.joueurs.keys() if self.joueurs[joueur].get_ready() or self.joueurs[joueur].get_ia()])
-
-            # Lorsque tous les joueurs sont prêts
-            if len(self.joueurs.keys()) > 0 and self.nb_joueurs_prets == len(self.joueurs.keys()):
-                # On finalise la création des joueurs avant que le jeu commence
-                if self.etat == "minigame_load":
-                    self.load_game()
-
-                # Calcule le classement final
-                elif self.etat == "minigame_end":
-                    self.calculate_score()
-
-                # Si on a fini le mini-jeu, on stoppe ce serveur
-                if self.etat == "minigame_winners":
-                    self.is_running = False
-
-                # Sinon on passe à l'état suivant
-                else:
-                    self.changer_etat(self.etats[self.etats.index(self.etat) + 1])
-
-                if self.etat == "minigame_during":
-                    # Lancement du timer
-                    self.timer = time.time() + self.timer
-
-            # Calcul des frames pour la vitesse d'animation des personnages
-            if self.etat != "minigame_load" and self.etat != "minigame_select":
-                for joueur in self.joueurs.keys():
-                    frame = self.joueurs[joueur].get_frame() + 0.24
-
-                    # L'animation reste figée si le joueur est immobile
-                    if self.inputs_joueurs[joueur][0] == 0 and self.inputs_joueurs[joueur][1] == 0:
-                        frame = 0
-                    elif self.joueurs[joueur].get_velocity()[2] != 0:
-                        frame = 0
-
-                    self.joueurs[joueur].set_frame(frame)
-
-                    # On réinitialise les inputs des ia (pour éviter qu'ils de déplacent pendant le start ou le finish)
-                    if self.joueurs[joueur].get_ia() and self.etat != "minigame_during":
-                        self.inputs_joueurs[joueur] = [0, 0, 0]
-
-                    # Calcul de la physique des joueurs
-                    self.joueurs[joueur].calculer_velocite(self.inputs_joueurs[joueur])
-                    self.joueurs[joueur].calculer_collisions(self.objets)
-                    self.joueurs[joueur].appliquer_velocite()
-
-                    # Détection de la mort
-                    if self.joueurs[joueur].get_pos()[2] > -45 and not self.joueurs[joueur].get_dead():
-                        self.joueurs[joueur].set_dead(True)
-
-                        # On le stocke dans le classement sous forme de file
-                        if type(self.classement) == File and self.classement.taille() < 4:
-                            self.classement.enfile(joueur)
-
-                for objet in self.objets:
-                    if type(objet) == Pingouin:
-                        # On met à jour la frame du pingouin
-                        objet.set_frame(objet.get_frame() + 0.24)
-
-                        # Calcul de la physique des pingouins
-                        objet.calculer_velocite([-1, 0, 0])
-                        objet.calculer_collisions(self.objets)
-                        objet.appliquer_velocite()
-
-                        # Détection de la mort
-                        if objet.get_pos()[2] > -45:
-                            self.objets.remove(objet)
-
-            # Exécution du code qui gère le mini-jeu
             if self.etat == "minigame_during":
+                # Lancement du timer
+                self.timer = self.horloge() + self.timer
+
+
+    def maj_physique(self) -> None:
+        """
+        Cette méthode permet de calculer les animations et la physique des entités du mini-jeu.
+        """
+
+        # Calcul des frames pour la vitesse d'animation des personnages
+        for joueur in self.joueurs.keys():
+            frame = self.joueurs[joueur].get_frame() + 0.24
+
+            # L'animation reste figée si le joueur est immobile
+            if self.inputs_joueurs[joueur][0] == 0 and self.inputs_joueurs[joueur][1] == 0:
+                frame = 0
+            elif self.joueurs[joueur].get_velocity()[2] != 0:
+                frame = 0
+
+            self.joueurs[joueur].set_frame(frame)
+
+            # On réinitialise les inputs des ia (pour éviter qu'ils de déplacent pendant le start ou le finish)
+            if self.joueurs[joueur].get_ia() and self.etat != "minigame_during":
+                self.inputs_joueurs[joueur] = [0, 0, 0]
+
+            # Calcul de la physique des joueurs
+            self.joueurs[joueur].calculer_velocite(self.inputs_joueurs[joueur])
+            self.joueurs[joueur].calculer_collisions(self.objets.get_entites())
+            self.joueurs[joueur].appliquer_velocite()
+
+            # Détection de la mort
+            if self.joueurs[joueur].get_pos()[2] > -45 and not self.joueurs[joueur].get_dead():
+                self.joueurs[joueur].set_dead(True)
+
+                # On le stocke dans le classement sous forme de file
+                if type(self.classement) == File and self.classement.taille() < 4:
+                    self.classement.enfile(joueur)
+
+        for objet in self.objets.get_type(Pingouin):
+            # On met à jour la frame du pingouin
+            objet.set_frame(objet.get_frame() + 0.24)
+
+            # Calcul de la physique des pingouins
+            objet.calculer_velocite([-1, 0, 0])
+            objet.calculer_collisions(self.objets.get_entites())
+            objet.appliquer_velocite()
+
+            # Détection de la mort
+            if objet.get_pos()[2] > -45:
+                self.objets.retirer(objet)
+                self.ajouter_evenement("despawn", objet.get_id_pingouin())
+
+
+    def tick(self) -> None:
+        """
+        Cette méthode permet d'exécuter un tick du serveur, chaque phase étant mesurée par le profiler.
+        """
+
+        with self.profiler.mesure("etats"):
+            self.maj_etats()
+
+        if self.etat != "minigame_load" and self.etat != "minigame_select":
+            with self.profiler.mesure("physique"):
+                self.maj_physique()
+
+        # Exécution du code qui gère le mini-jeu (le comportement des ia et la physique qu'il calcule sont
+        # mesurés à part, dans leurs propres phases)
+        if self.etat == "minigame_during":
+            with self.profiler.mesure("logique"):
                 self.during_game()
 
-            if self.etat == "minigame_score":
-                self.calculate_score()
+        if self.etat == "minigame_score":
+            self.calculate_score()
+
+        # L'état du tick est encodé une seule fois, quel que soit le nombre de clients
+        with self.profiler.mesure("serialisation"):
+            self.publier_snapshot()
+
+
+    def publier_snapshot(self) -> None:
+        """
+        Cette méthode encode l'état du mini-jeu et remplace d'un coup celui envoyé aux clients
+        (la chaîne précédente n'est jamais modifiée, les threads des clients peuvent donc l'envoyer sans verrou).
+        """
+
+        self.snapshot = json.dumps(self.get_infos())
+
+
+    def get_snapshot(self) -> str:
+        """
+        Cette méthode permet de récupérer le dernier état encodé du mini-jeu.
+
+        Renvois:
+            - str: État du mini-jeu en json (encodé immédiatement si aucun tick n'a encore été exécuté).
+        """
+
+        snapshot = self.snapshot
+
+        if snapshot is None:
+            snapshot = json.dumps(self.get_infos())
+
+        return snapshot
+
+
+    def run(self, clock) -> None:
+        self.is_running = True
+
+        if not self.silencieux:
+            print("Lancement du mini-jeu: Pushy Penguins")
+        while self.is_running:
+            # Pendant le choix et le chargement du mini-jeu rien ne bouge, on attend donc que les joueurs soient prêts
+            if self.etat == "minigame_select" or self.etat == "minigame_load":
+                with self.condition:
+                    self.condition.wait_for(self.tous_prets, timeout=1)
+
+            self.profiler.debut_tick()
+            self.tick()
+            self.profiler.fin_tick()
 
             self.current_fps = clock.get_fps()
             clock.tick(self.fps)
\ No newline at end of file
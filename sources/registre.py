@@ -0,0 +1,162 @@
+#Projet : Mayro Party
+#Auteurs : Hinata Bouaziz, Antoine Desrues, Alexandre Guillaume, Matisse Moreau
+
+# ------/ Classes \------
+
+# Classe d'un registre d'entités (remplace les listes d'objets des serveurs des mini-jeux)
+class Registre:
+
+    # ------/ Constructeur \------
+
+    def __init__(self) -> None:
+        """
+        Constructeur de la classe Registre.
+
+        Attributs internes:
+            - entites (dict): Entités du registre selon leur identifiant (dans l'ordre d'ajout).
+            - identifiants (dict): Identifiant de chaque entité, pour la retrouver sans parcourir le registre.
+            - index (dict): Entités de chaque type (classe) selon leur identifiant.
+            - prochain_id (int): Prochain identifiant à attribuer (les identifiants ne sont jamais réutilisés).
+            - liste (list): Liste des entités gardée en cache tant que le registre ne change pas.
+        """
+
+        self.entites = {}
+        self.identifiants = {}
+        self.index = {}
+        self.prochain_id = 0
+        self.liste = None
+
+
+    # ------/ Getters \------
+
+    def get_entite(self, identifiant: int) -> any:
+        return self.entites.get(identifiant)
+
+    def get_identifiant(self, entite: any) -> "int | None":
+        return self.identifiants.get(entite)
+
+
+    # ------/ Méthodes \------
+
+    def nouvel_id(self) -> int:
+        """
+        Cette méthode permet de réserver un nouvel identifiant (utile quand l'entité a besoin de son identifiant
+        pour être créée).
+
+        Renvois:
+            - int: Identifiant réservé, toujours plus grand que tous ceux déjà attribués.
+        """
+
+        identifiant = self.prochain_id
+        self.prochain_id += 1
+
+        return identifiant
+
+
+    def ajouter(self, entite: any, identifiant: int = None) -> int:
+        """
+        Cette méthode permet d'ajouter une entité dans le registre.
+
+        Paramètres:
+            - entite (any): N'importe quelle entité (Joueur, Pingouin, Fleche...).
+            - identifiant (int): Identifiant réservé avec nouvel_id, un nouveau est attribué à défaut.
+
+        Renvois:
+            - int: Identifiant de l'entité.
+        """
+
+        # Tests du type des paramètres donnés
+        assert not entite in self.identifiants, "Erreur: L'entité donnée est déjà dans le registre."
+        assert identifiant is None or (type(identifiant) == int and not identifiant in self.entites), "Erreur: Le 2ème paramètre (identifiant) est déjà utilisé."
+
+        if identifiant is None:
+            identifiant = self.nouvel_id()
+
+        self.entites[identifiant] = entite
+        self.identifiants[entite] = identifiant
+
+        # Ajout dans l'index du type de l'entité
+        if not type(entite) in self.index:
+            self.index[type(entite)] = {}
+        self.index[type(entite)][identifiant] = entite
+
+        self.liste = None
+
+        return identifiant
+
+
+    def retirer(self, entite: any) -> bool:
+        """
+        Cette méthode permet de retirer une entité du registre (sans parcourir les autres entités).
+
+        Paramètres:
+            - entite (any): Entité à retirer.
+
+        Renvois:
+            - bool: Indique si l'entité était dans le registre.
+        """
+
+        identifiant = self.identifiants.pop(entite, None)
+
+        if identifiant is None:
+            return False
+
+        del self.entites[identifiant]
+        del self.index[type(entite)][identifiant]
+
+        self.liste = None
+
+        return True
+
+
+    def contient(self, entite: any) -> bool:
+        """
+        Cette méthode indique si une entité est dans le registre.
+
+        Renvois:
+            - bool: True si l'entité est dans le registre, sinon False.
+        """
+
+        return entite in self.identifiants
+
+
+    def get_entites(self) -> list:
+        """
+        Cette méthode permet de récupérer toutes les entités du registre, dans l'ordre d'ajout.
+
+        Renvois:
+            - list: Liste des entités (à ne pas modifier, elle est partagée jusqu'au prochain changement du registre).
+
+        Post-conditions:
+            - Il est possible de retirer des entités du registre en parcourant cette liste, elle n'est pas modifiée.
+        """
+
+        if self.liste is None:
+            self.liste = list(self.entites.values())
+
+        return self.liste
+
+
+    def get_type(self, classe: type) -> list:
+        """
+        Cette méthode permet de récupérer toutes les entités d'un type, dans l'ordre d'ajout.
+
+        Paramètres:
+            - classe (type): Type des entités voulues (Pingouin, Fleche...).
+
+        Renvois:
+            - list: Liste des entités de ce type.
+        """
+
+        return list(self.index.get(classe, {}).values())
+
+
+    def taille(self) -> int:
+        """
+        Cette méthode indique le nombre d'entités dans le registre.
+
+        Renvois:
+            - int: Nombre d'entités.
+        """
+
+        return len(self.entites)
@@ -6,17 +6,26 @@
 import json
 import random
 import socket
+import importlib
 from _thread import start_new_thread
-import pygame
+from threading import Condition
 import time
+import sys
 
-# ------/ Importations des mini-jeux serveurs \------
+from moteur import Clock
+from profiler import Profiler
+from traceur import TRACEUR
+from minijeu_distant import MinijeuDistant
+from lockstep import MinijeuLockstep
+from protocole import TableRequetes, nom_requete, envoyer_message, recevoir_message, GET_ETAT, INFOS_SERVEUR, SET_PERSO, PRET, STATS, CLOSE
 
-import archer_ival_server
-import hexagon_heat_server
-import pushy_penguins_server
-import speed_hockey_server
-import trace_race_server
+# ------/ Constantes \------
+
+# Mini-jeux de la partie (le script minijeu + "_server" n'est importé que lorsque le mini-jeu est choisi)
+MINIJEUX = ["archer_ival", "hexagon_heat", "pushy_penguins", "speed_hockey", "trace_race"]
+
+# Durée (en secondes) sans aucun joueur connecté avant la fermeture automatique du lobby
+DELAI_INACTIVITE = 120
 
 
 # ------/ Classes \------
@@ -86,165 +95,441 @@ class Joueur():
 
 # Classe du serveur
 class Server:
-    def __init__(self, adresse_serveur) -> None:
+    def __init__(self, adresse_serveur, profiling: bool = False, processus_simulation: bool = False, lockstep: bool = False) -> None:
         """
         Documentation ici
 
         """
 
-        self.server_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        # Sans adresse, le serveur est local (mode solo): le client l'appelle directement, sans socket
+        self.server_socket = None
 
-        server = adresse_serveur
-        port = 5555
+        if adresse_serveur is not None:
+            self.server_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
 
-        try:
-            self.server_socket.bind((server, port))
+            server = adresse_serveur
+            port = 5555
 
-        except socket.error as e:
-            print(str(e))
+            try:
+                self.server_socket.bind((server, port))
 
-        self.server_socket.listen(4)
-        print("Serveur lancé ! En attente de connexions...")
+            except socket.error as e:
+                print(str(e))
+
+            self.server_socket.listen(4)
+            print("Serveur lancé ! En attente de connexions...")
+
+        else:
+            print("Serveur local lancé !")
 
 
         self.joueurs = {}
         self.nb_joueurs_prets = 0
         self.classement = {}
 
+        # Contrôle d'admission (les places restantes sont prises par des ia)
+        self.nb_joueurs_max = 4
+        self.places_reservees = 0
+        self.nb_connexions = 0
+
+        # Condition qui réveille la boucle du lobby à chaque événement (connexion, déconnexion, joueur prêt, changement d'état)
+        self.condition = Condition()
+
         self.fps = 60
         self.current_fps = 0
         self.is_running = True
-        self.clock = pygame.time.Clock()
+        self.clock = Clock()
+
+        # Mesure du temps passé dans chaque tick (activée avec --profile)
+        self.profiler = Profiler("Lobby", self.fps, profiling)
 
         # Paramètres d'auto-fermeture du serveur
         self.timeout_timer = time.time()
         self.timeout = True
+        self.delai_inactivite = DELAI_INACTIVITE
 
-        # Initialisation du mini-jeu actuel
+        # Initialisation du mini-jeu actuel (les mini-jeux sont créés un par un, lorsqu'ils sont choisis)
         self.minijeu_actuel = ""
-        self.minijeux = {"archer_ival": archer_ival_server.Server(self.server_socket),
-                         "hexagon_heat": hexagon_heat_server.Server(self.server_socket),
-                         "pushy_penguins": pushy_penguins_server.Server(self.server_socket),
-                         "speed_hockey": speed_hockey_server.Server(self.server_socket),
-                         "trace_race": trace_race_server.Server(self.server_socket)}
-        self.minijeux_options = list(self.minijeux.keys())
+        self.minijeux = {}
+        self.minijeux_options = list(MINIJEUX)
+        self.profiling = profiling
+        self.processus_simulation = processus_simulation
+        self.lockstep = lockstep
 
         # Initialisation des états du serveur
         self.etats = ["character_select", "minigame_select"]
         self.etat = self.etats[0]
 
+        # Version des informations du lobby (augmente à chaque changement), les clients qui ont déjà la dernière
+        # version reçoivent "inchange" au lieu de toutes les informations
+        self.version_infos = 0
+        self.infos_serveur = ""
+        self.version_encodee = None
+
+        # Requêtes du lobby (celles qui n'y sont pas sont données au mini-jeu actuel)
+        self.requetes = TableRequetes("Lobby")
+        self.requetes.enregistrer(GET_ETAT, self.requete_get_etat)
+        self.requetes.enregistrer(INFOS_SERVEUR, self.requete_infos_serveur)
+        self.requetes.enregistrer(SET_PERSO, self.requete_set_perso)
+        self.requetes.enregistrer(PRET, self.requete_pret)
+        self.requetes.enregistrer(STATS, self.requete_stats)
+        self.requetes.enregistrer(CLOSE, self.requete_close)
+
 
     def client_thread(self, connection: socket.socket, address: str) -> None:
-        connection.send(str.encode(address))
-        pseudo = connection.recv(2048).decode("utf-8")
+        envoyer_message(connection, address)
+        pseudo = recevoir_message(connection) or ""
 
         is_connected = True
 
-        self.joueurs[address] = Joueur("", False, pseudo)
-        print(address + " (" + pseudo + ")" + " s'est connecté")
-
-        # On désactive le timeout
-        self.timeout = False
+        self.connecter(address, pseudo)
 
         while is_connected:
-                # Attend une requête du client
-                data = connection.recv(2048)
-
-                # Une fois reçue, la décode
-                request = data.decode("utf-8")
+                # Attend une requête entière du client
+                request = recevoir_message(connection)
 
                 # S'il n'a pas envoyé de requête, on coupe la connexion
-                if not data:
+                if request is None:
                     print("Connexion perdu avec", address)
                     is_connected = False
 
                 # Sinon, on envoie une réponse au client
                 else:
-                    if request == "get_etat":
-                        reply = self.etat if self.minijeu_actuel == "" else self.minijeux[self.minijeu_actuel].get_etat()
-
-                    elif request == "infos_serveur":
-                        infos_joueurs = {joueur: {
-                            "perso": self.joueurs[joueur].get_perso(),
-                            "pseudo": self.joueurs[joueur].get_pseudo(),
-                            "pieces": self.joueurs[joueur].get_pieces()
-                        } for joueur in self.joueurs.keys()}
-
-                        reply = json.dumps({
-                            "nb_joueurs": len([joueur for joueur in self.joueurs.values() if not joueur.get_ia()]),
-                            "nb_joueurs_prets": self.nb_joueurs_prets if self.minijeu_actuel == "" else self.minijeux[self.minijeu_actuel].get_nb_joueurs_prets() - len([joueur for joueur in self.joueurs.values() if joueur.get_ia()]),
-                            "infos_joueurs": infos_joueurs,
-                            "minijeu_actuel": self.minijeu_actuel,
-                            "classement": self.classement
-                        })
-
-                    elif "set_perso" in request:
-                        perso = json.loads(request)["set_perso"]
-                        self.joueurs[address].set_perso(perso)
-
-                        reply = "ok"
-
-                    elif request == "ready_for_next_state":
-                        self.joueurs[address].set_ready(True)
-                        if self.minijeu_actuel != "":
-                            self.minijeux[self.minijeu_actuel].get_player(address).set_ready(True)
-
-                        reply = "ok"
-
-                    elif request == "close":
-                        reply = "closing"
+                    reply = self.traiter_requete(address, request)
+
+                    if reply == "closing":
                         is_connected = False
 
-                    # Si on ne trouve pas la requête, on va la chercher dans le mini-jeu actuel
-                    elif self.minijeu_actuel != "":
-                        reply = self.minijeux[self.minijeu_actuel].client_thread(address, request)
+                    envoyer_message(connection, reply)
 
-                    else:
-                        reply = "not_found"
+        print("Connexion coupé avec", address)
 
-                    connection.send(str.encode(reply))
+        self.deconnecter(address)
 
-        print("Connexion coupé avec", address)
+        connection.close()
 
-        # Si la connexion est coupée, on laisse la place de libre pour un autre joueur (uniquement avant que le jeu commence)
-        if self.etat == "character_select":
-            del self.joueurs[address]
 
-        if len(self.joueurs) == 0:
-            self.timeout_timer = time.time()
-            self.timeout = True
+    def admettre(self) -> "str | None":
+        """
+        Cette méthode applique le contrôle d'admission: on accepte uniquement pendant le choix des personnages
+        et s'il reste de la place.
+
+        Renvois:
+            - str ou None: Adresse attribuée au nouveau joueur (sa place est réservée), ou None s'il est refusé.
+        """
+
+        with self.condition:
+            if self.etat != "character_select" or len(self.joueurs) + self.places_reservees >= self.nb_joueurs_max:
+                return None
+
+            self.places_reservees += 1
+            self.nb_connexions += 1
+
+            return str(self.nb_connexions)
+
+
+    def connecter(self, address: str, pseudo: str) -> None:
+        """
+        Cette méthode ajoute un joueur admis dans le lobby (quel que soit le transport utilisé par son client).
+
+        Paramètres:
+            - address (str): Adresse attribuée par admettre.
+            - pseudo (str): Pseudo du joueur.
+        """
+
+        with self.condition:
+            self.joueurs[address] = Joueur("", False, pseudo)
+            self.places_reservees -= 1
+
+            # On désactive le timeout
+            self.timeout = False
+            self.notifier()
+
+        print(address + " (" + pseudo + ")" + " s'est connecté")
+
+
+    def deconnecter(self, address: str) -> None:
+        """
+        Cette méthode retire un joueur qui s'est déconnecté.
+
+        Paramètres:
+            - address (str): Adresse du joueur.
+        """
+
+        with self.condition:
+            # Si la connexion est coupée, on laisse la place de libre pour un autre joueur (uniquement avant que le jeu commence)
+            if self.etat == "character_select" and address in self.joueurs:
+                del self.joueurs[address]
+
+            if len(self.joueurs) == 0:
+                self.timeout_timer = time.time()
+                self.timeout = True
+
+            self.notifier()
 
-        connection.close()
+
+    def traiter_requete(self, address: str, request: str) -> str:
+        """
+        Cette méthode répond à une requête d'un client (envoyée par le réseau ou directement en solo).
+
+        Paramètres:
+            - address (str): Adresse du joueur qui envoie la requête.
+            - request (str): Requête du client.
+
+        Renvois:
+            - str: Réponse à envoyer au client ("closing" si le client se déconnecte).
+        """
+
+        debut = time.perf_counter()
+
+        # L'opcode de la requête (son premier octet) donne directement la fonction qui y répond
+        reply = self.requetes.traiter(address, request)
+
+        # Si on ne trouve pas la requête, on va la chercher dans le mini-jeu actuel
+        if reply is None:
+            reply = "not_found" if self.minijeu_actuel == "" else self.minijeux[self.minijeu_actuel].client_thread(address, request)
+
+        # Chaque connexion a son thread: la trace montre une ligne par joueur
+        if TRACEUR.get_actif():
+            TRACEUR.ajouter("requete", "Lobby", debut, time.perf_counter(), {"joueur": address, "requete": nom_requete(request)})
+
+        return reply
+
+
+    def requete_get_etat(self, address: str, donnees: str) -> str:
+        return self.etat if self.minijeu_actuel == "" else self.minijeux[self.minijeu_actuel].get_etat()
+
+
+    def requete_infos_serveur(self, address: str, donnees: str) -> str:
+        # Avec la version connue par le client, les informations ne sont renvoyées que si elles ont changé
+        version, reply = self.get_infos_serveur()
+        return "inchange" if donnees == str(version) else reply
+
+
+    def requete_set_perso(self, address: str, donnees: str) -> str:
+        with self.condition:
+            self.joueurs[address].set_perso(donnees)
+            self.modifier()
+
+        return "ok"
+
+
+    def requete_pret(self, address: str, donnees: str) -> str:
+        with self.condition:
+            self.joueurs[address].set_ready(True)
+            self.notifier()
+
+        if self.minijeu_actuel != "":
+            self.minijeux[self.minijeu_actuel].marquer_pret(address)
+
+        return "ok"
+
+
+    def requete_stats(self, address: str, donnees: str) -> str:
+        # Rapport des mesures du lobby et du mini-jeu en cours, avec les statistiques de chaque opcode
+        minijeu = None if self.minijeu_actuel == "" else self.minijeux[self.minijeu_actuel]
+
+        return json.dumps({
+            "lobby": self.profiler.rapport(),
+            "minijeu": None if minijeu is None else minijeu.profiler.rapport(),
+            "requetes": {
+                "lobby": self.requetes.rapport(),
+                "minijeu": None if minijeu is None else minijeu.requetes.rapport()
+            }
+        })
+
+
+    def requete_close(self, address: str, donnees: str) -> str:
+        return "closing"
 
 
     def accept_thread(self):
-        id = 0
         while self.is_running:
-            if self.etat == "character_select":
+            # accept bloque le thread (sans utiliser le processeur) jusqu'à la prochaine connexion
+            try:
                 connection, address = self.server_socket.accept()
-                # start_new_thread(self.client_thread, (connection, address[0], id))
 
-                # Temporaire
-                start_new_thread(self.client_thread, (connection, str(id + 1)))
-                id += 1
+            # Le socket a été fermé à l'arrêt du serveur
+            except OSError:
+                break
+
+            adresse_joueur = self.admettre()
+
+            if adresse_joueur is None:
+                envoyer_message(connection, "refuse")
+                connection.close()
+                continue
+
+            # start_new_thread(self.client_thread, (connection, address[0], id))
+
+            # Temporaire
+            start_new_thread(self.client_thread, (connection, adresse_joueur))
 
 
     def changer_etat(self, new_etat):
-        self.etat = new_etat
-        for ip in self.joueurs.keys():
-            self.joueurs[ip].set_ready(False)
+        with self.condition:
+            self.etat = new_etat
+            for ip in self.joueurs.keys():
+                self.joueurs[ip].set_ready(False)
+
+            self.notifier()
 
         print("Passé à l'état", self.etat)
 
 
+    def notifier(self) -> None:
+        """
+        Cette méthode recompte les joueurs prêts (uniquement quand un événement arrive) et réveille la boucle du lobby.
+        Elle doit être appelée avec self.condition.
+        """
+
+        # Les ia sont automatiquement prêtes
+        self.nb_joueurs_prets = len([joueur for joueur in self.joueurs.values() if joueur.get_ready() or joueur.get_ia()])
+        self.modifier()
+        self.condition.notify_all()
+
+
+    def modifier(self) -> None:
+        """
+        Cette méthode indique que les informations du lobby ont changé (joueurs, personnages, pièces, classement ou
+        mini-jeu actuel): leur version augmente et elles seront de nouveau envoyées aux clients.
+        """
+
+        with self.condition:
+            self.version_infos += 1
+
+
+    def get_infos_serveur(self) -> tuple:
+        """
+        Cette méthode donne les informations du lobby, encodées une seule fois par version (et non à chaque requête).
+
+        Renvois:
+            - tuple: Version des informations et informations encodées en json.
+        """
+
+        with self.condition:
+            # Le nombre de joueurs prêts d'un mini-jeu change dans le mini-jeu lui-même, qui appelle alors modifier
+            nb_prets_minijeu = None if self.minijeu_actuel == "" else self.minijeux[self.minijeu_actuel].get_nb_joueurs_prets()
+
+            if self.version_encodee != self.version_infos:
+                infos_joueurs = {joueur: {
+                    "perso": self.joueurs[joueur].get_perso(),
+                    "pseudo": self.joueurs[joueur].get_pseudo(),
+                    "pieces": self.joueurs[joueur].get_pieces()
+                } for joueur in self.joueurs.keys()}
+
+                self.infos_serveur = json.dumps({
+                    "version": self.version_infos,
+                    "nb_joueurs": len([joueur for joueur in self.joueurs.values() if not joueur.get_ia()]),
+                    "nb_joueurs_prets": self.nb_joueurs_prets if nb_prets_minijeu is None else nb_prets_minijeu - len([joueur for joueur in self.joueurs.values() if joueur.get_ia()]),
+                    "infos_joueurs": infos_joueurs,
+                    "minijeu_actuel": self.minijeu_actuel,
+                    "classement": self.classement
+                })
+                self.version_encodee = self.version_infos
+
+            return self.version_infos, self.infos_serveur
+
+
+    def tous_prets(self) -> bool:
+        """
+        Cette méthode indique si tous les joueurs sont prêts (ou si le serveur s'arrête).
+
+        Renvois:
+            - bool: True si la boucle du lobby doit se réveiller, sinon False.
+        """
+
+        return not self.is_running or (len(self.joueurs) > 0 and self.nb_joueurs_prets == len(self.joueurs))
+
+
+    def delai_fermeture(self) -> "float | None":
+        """
+        Cette méthode indique combien de temps le lobby peut attendre avant la fermeture automatique.
+
+        Renvois:
+            - float ou None: Délai en secondes, ou None s'il y a des joueurs connectés (attente sans limite).
+        """
+
+        if not self.timeout:
+            return None
+
+        return max(0, self.delai_inactivite - (time.time() - self.timeout_timer))
+
+
+    def inactif(self) -> bool:
+        """
+        Cette méthode indique si le lobby est resté sans joueur connecté pendant tout le délai d'inactivité.
+
+        Renvois:
+            - bool: True si le lobby doit se fermer, sinon False.
+        """
+
+        return self.timeout and time.time() - self.timeout_timer >= self.delai_inactivite
+
+
+    def fermer(self) -> None:
+        """
+        Cette méthode arrête le lobby et le mini-jeu en cours (session abandonnée sur un serveur dédié).
+        """
+
+        with self.condition:
+            self.is_running = False
+
+            # Le mini-jeu en cours s'arrête à son prochain tick, puis la boucle du lobby se termine
+            if self.minijeu_actuel != "":
+                self.minijeux[self.minijeu_actuel].is_running = False
+
+            self.condition.notify_all()
+
+
+    def creer_minijeu(self, minijeu: str):
+        """
+        Cette méthode crée le serveur d'un mini-jeu au moment où il est choisi (rien n'est chargé pour les autres).
+
+        Paramètres:
+            - minijeu (str): Nom du mini-jeu (élément de MINIJEUX).
+
+        Renvois:
+            - Server, MinijeuLockstep ou MinijeuDistant: Serveur du mini-jeu.
+        """
+
+        # Seuls les événements des joueurs sont envoyés, chaque client simule sa propre copie du mini-jeu
+        if self.lockstep:
+            serveur = MinijeuLockstep(minijeu, self.profiling)
+
+        # La physique du mini-jeu tourne dans son propre processus, les sockets et le json restent ici
+        elif self.processus_simulation:
+            serveur = MinijeuDistant(minijeu, self.profiling)
+
+        else:
+            serveur = importlib.import_module(minijeu + "_server").Server(self.server_socket, self.profiling)
+
+        # Le mini-jeu prévient le lobby quand son nombre de joueurs prêts (envoyé avec les informations) change
+        serveur.notifier_lobby = self.modifier
+
+        return serveur
+
+
     def select_minijeu(self): # type: ignore
-        self.minijeu_actuel = random.choice(self.minijeux_options)
+        minijeu = random.choice(self.minijeux_options)
+
+        # Le mini-jeu existe (avec ses joueurs) avant d'être annoncé aux threads des clients
+        self.minijeux[minijeu] = self.creer_minijeu(minijeu)
 
         for ip in self.joueurs.keys():
-            self.minijeux[self.minijeu_actuel].add_player(ip, self.joueurs[ip].get_perso(), self.joueurs[ip].get_ia())
+            self.minijeux[minijeu].add_player(ip, self.joueurs[ip].get_perso(), self.joueurs[ip].get_ia())
+
+        with self.condition:
+            self.minijeu_actuel = minijeu
+            self.modifier()
+
+        # Lancement du mini-jeu sélectionné (sauf si le lobby a été fermé entre temps)
+        if self.is_running:
+            self.minijeux[self.minijeu_actuel].run(self.clock)
 
-        # Lancement du mini-jeu sélectionné
-        self.minijeux[self.minijeu_actuel].run(self.clock)
+        # Un mini-jeu arrêté par fermer n'a pas de classement à compter
+        if not self.is_running:
+            return
 
         # On supprime le mini-jeu déjà joué de la liste
         self.minijeux_options.remove(self.minijeu_actuel)
@@ -277,51 +562,129 @@ class Server:
             if j > 0 and pieces_joueurs[classement_liste[j]] == pieces_joueurs[classement_liste[j - 1]]:
                 self.classement[classement_liste[j]] = self.classement[classement_liste[j - 1]]
 
+        # Pièces, classement et mini-jeu actuel ont changé
+        self.modifier()
 
-    def run(self) -> None:
-        start_new_thread(self.accept_thread, ())
 
-        while self.is_running:
-            # On désactive le serveur si aucun joueur n'est connecté dessus pendant 2 minutes
-            if time.time() - self.timeout_timer > 120 and self.timeout:
-                self.is_running = False
-                print("Aucune connexion depuis 2min, fermeture automatique du serveur")
+    def tick(self) -> bool:
+        """
+        Cette méthode permet d'exécuter un tick du lobby.
+
+        Renvois:
+            - bool: Indique s'il faut lancer un nouveau mini-jeu.
+        """
 
-            # On récupère le nombre de joueurs prêts (les ia sont automatiquement prêts)
-            self.nb_joueurs_prets = len([joueur for joueur in self.joueurs.keys() if self.joueurs[joueur].get_ready() or self.joueurs[joueur].get_ia()])
+        # On désactive le serveur si aucun joueur n'est connecté dessus pendant 2 minutes
+        if self.inactif():
+            self.is_running = False
+            print("Aucune connexion depuis " + str(self.delai_inactivite) + "s, fermeture automatique du serveur")
 
-            # Lorsque tous les joueurs sont prêts
-            if len(self.joueurs.keys()) > 0 and self.nb_joueurs_prets == len(self.joueurs.keys()):
-                # Si on a choisit les personnages, on passe aux mini-jeux
-                if self.etat == "character_select":
-                    self.changer_etat(self.etats[self.etats.index(self.etat) + 1])
+        # Lorsque tous les joueurs sont prêts (nb_joueurs_prets est recompté à chaque événement par notifier)
+        if len(self.joueurs.keys()) > 0 and self.nb_joueurs_prets == len(self.joueurs.keys()):
+            # Si on a choisit les personnages, on passe aux mini-jeux
+            if self.etat == "character_select":
+                self.changer_etat(self.etats[self.etats.index(self.etat) + 1])
 
-                    # Liste de tous les personnages
-                    liste_perso = ["mayro", "lugi", "wayro", "walugi"]
+                # Liste de tous les personnages
+                liste_perso = ["mayro", "lugi", "wayro", "walugi"]
 
-                    # Liste de tous les personnages sélectionnés
-                    liste_perso_joueurs = [joueur.get_perso() for joueur in self.joueurs.values()]
+                # Liste de tous les personnages sélectionnés
+                liste_perso_joueurs = [joueur.get_perso() for joueur in self.joueurs.values()]
 
-                    # Liste de tous les personnages à créer
-                    liste_perso_ia = [perso for perso in liste_perso if not perso in liste_perso_joueurs]
+                # Liste de tous les personnages à créer
+                liste_perso_ia = [perso for perso in liste_perso if not perso in liste_perso_joueurs]
 
-                    # Calcul du nombre de joueurs ia à créer
-                    nb_joueurs_ia = 4 - len(self.joueurs.keys())
+                # Calcul du nombre de joueurs ia à créer
+                nb_joueurs_ia = 4 - len(self.joueurs.keys())
 
-                    # Création des joueurs ia restants
+                # Création des joueurs ia restants
+                with self.condition:
                     for i in range(nb_joueurs_ia):
                         self.joueurs["ai" + str(i + 1)] = Joueur(liste_perso_ia[i])
 
-                    # Initialisation du classement (tous les joueurs partent 1er)
-                    self.classement = {joueur: 1 for joueur in self.joueurs.keys()}
+                    self.notifier()
+
+                # Initialisation du classement (tous les joueurs partent 1er)
+                self.classement = {joueur: 1 for joueur in self.joueurs.keys()}
+                self.modifier()
+
+            # On indique qu'il faut charger un mini-jeu aléatoire
+            if self.etat == "minigame_select" and len(self.minijeux_options) > 0:
+                return True
+
+        return False
 
-                if self.etat == "minigame_select" and len(self.minijeux_options) > 0:
-                    # On charge un mini-jeu aléatoire
-                    self.select_minijeu()
+
+    def run(self) -> None:
+        if self.server_socket is not None:
+            start_new_thread(self.accept_thread, ())
+
+        while self.is_running:
+            # Le lobby dort jusqu'au prochain événement. Le délai sert uniquement à la fermeture automatique: il est
+            # recalculé à chaque réveil, car il n'existe qu'une fois le dernier joueur déconnecté
+            with self.condition:
+                while not self.tous_prets() and not self.inactif():
+                    self.condition.wait(timeout=self.delai_fermeture())
+
+            self.profiler.debut_tick()
+            with self.profiler.mesure("etats"):
+                lancer_minijeu = self.tick()
+            self.profiler.fin_tick()
+
+            # Le mini-jeu tourne dans sa propre boucle (il n'est donc pas compté dans le tick du lobby)
+            if lancer_minijeu:
+                self.select_minijeu()
 
             self.current_fps = self.clock.get_fps()
             self.clock.tick(self.fps)
 
+        # Libère le port et débloque le thread qui accepte les connexions
+        if self.server_socket is not None:
+            self.server_socket.close()
+
+# ------/ Fonctions utiliatires \------
+
+def servir_processus(connexion, pseudo: str, profiling: bool = False) -> None:
+    """
+    Cette fonction fait tourner un serveur local dans un processus enfant (mode solo) et répond aux requêtes
+    que le client envoie à travers un pipe. La physique ne partage alors plus le GIL avec l'affichage.
+
+    Paramètres:
+        - connexion (Connection): Extrémité du pipe côté serveur.
+        - pseudo (str): Pseudo du joueur.
+        - profiling (bool): Active le profiler du lobby et des mini-jeux.
+    """
+
+    # utils est un script du client (il importe pygame), le serveur dédié ne le charge donc pas
+    from utils import TransportLocal
+
+    TRACEUR.set_nom_processus("serveur local")
+    serveur = Server(None, profiling)
+
+    # Le joueur est admis comme avec le transport local
+    transport = TransportLocal(serveur, pseudo)
+    connexion.send(transport.get_adresse_client())
+
+    start_new_thread(serveur.run, ())
+
+    reply = ""
+    while reply != "closing":
+        try:
+            request = connexion.recv()
+
+        # Le client a fermé le pipe (fenêtre fermée)
+        except EOFError:
+            break
+
+        reply = transport.send(request)
+        connexion.send(reply)
+
+    # Un processus enfant ne passe pas par atexit, la trace est donc écrite ici
+    TRACEUR.exporter()
+
+
 if '__main__' == __name__:
-    server = Server(input("Quel est l'adresse ip du serveur ? (exemple: 192.168.1.1): "))
+    # Utilisation: python server.py [--profile] [--processus-simulation] [--lockstep] [--sans-pygame] [--trace=<fichier.json>]
+    TRACEUR.set_nom_processus("serveur")
+    server = Server(input("Quel est l'adresse ip du serveur ? (exemple: 192.168.1.1): "), "--profile" in sys.argv, "--processus-simulation" in sys.argv, "--lockstep" in sys.argv)
     server.run()
\ No newline at end of file
@@ -0,0 +1,644 @@
+#Projet : Mayro Party
+#Auteurs : Hinata Bouaziz, Antoine Desrues, Alexandre Guillaume, Matisse Moreau
+
+# ------/ Importations des bibliothèques \------
+
+import json
+import socket
+import time
+import sys
+from _thread import start_new_thread
+from multiprocessing import get_context, cpu_count
+from queue import Queue
+from threading import Lock, Event
+
+from server import Server
+from traceur import TRACEUR
+from protocole import requete, envoyer_message, recevoir_message, SANTE_WORKERS
+
+# ------/ Constantes \------
+
+# Réponse du worker à une commande pour une session déjà fermée (admettre: refusé, requete: le client est déconnecté)
+REPONSES_SESSION_FERMEE = {"admettre": None, "requete": "closing"}
+
+# ------/ Fonctions utiliatires \------
+
+def rapport_sante(sessions: dict) -> dict:
+    """
+    Cette fonction permet de résumer la charge d'un worker.
+
+    Paramètres:
+        - sessions (dict): Serveur (lobby) de chaque session du worker.
+    Renvois:
+        - dict: Nombre de sessions et de joueurs, fps le plus bas des mini-jeux en cours et pire p99 du tick.
+    """
+
+    fps = []
+    ticks_p99 = []
+    nb_joueurs = 0
+
+    for serveur in sessions.values():
+        nb_joueurs += len([joueur for joueur in serveur.joueurs.values() if not joueur.get_ia()])
+
+        # Seuls les mini-jeux tournent à un nombre de ticks fixe (le lobby attend les événements)
+        if serveur.minijeu_actuel != "":
+            minijeu = serveur.minijeux[serveur.minijeu_actuel]
+            fps.append(minijeu.current_fps)
+
+            phases = minijeu.profiler.rapport()["phases"]
+            if "tick" in phases:
+                ticks_p99.append(phases["tick"]["p99"])
+
+    return {
+        "sessions": len(sessions),
+        "joueurs": nb_joueurs,
+        "fps_min": round(min(fps), 1) if len(fps) > 0 else None,
+        "tick_p99_ms": max(ticks_p99) if len(ticks_p99) > 0 else None
+    }
+
+
+def executer_worker(connexion, profiling: bool = False) -> None:
+    """
+    Cette fonction est le point d'entrée du processus d'un worker (voir ProcessusWorker).
+
+    Paramètres:
+        - connexion (Connection): Extrémité du pipe côté worker.
+        - profiling (bool): Active le profiler des sessions (durée de chaque phase des ticks).
+    """
+
+    TRACEUR.set_nom_processus("worker")
+    ProcessusWorker(connexion, profiling).run()
+
+    # Un processus enfant ne passe pas par atexit, la trace est donc écrite ici
+    TRACEUR.exporter()
+
+
+# ------/ Classes \------
+
+# Classe d'une session hébergée par un worker (un lobby et ses mini-jeux)
+class Session:
+
+    # ------/ Constructeur \------
+
+    def __init__(self, id_session: int, profiling: bool = False) -> None:
+        """
+        Constructeur de la classe Session.
+
+        Attributs à définir:
+            - id_session (int): Identifiant de la session (donné par le front-end).
+            - profiling (bool): Active le profiler de la session.
+
+        Attributs internes:
+            - serveur (Server): Lobby de la session.
+            - connectes (set): Adresses des clients connectés à la session.
+            - a_admis (bool): Indique si la session a déjà admis un client (elle vient sinon d'être ouverte).
+            - file (Queue): Commandes du front-end en attente pour cette session (None arrête son thread).
+        """
+
+        # Tests du type des paramètres donnés
+        assert type(id_session) == int, "Erreur: Le 1er paramètre (id_session) est censé être un entier."
+
+        self.id_session = id_session
+        self.serveur = Server(None, profiling)
+        self.connectes = set()
+        self.a_admis = False
+        self.file = Queue()
+
+
+    # ------/ Méthodes \------
+
+    def abandonnee(self) -> bool:
+        """
+        Cette méthode indique si la session peut être fermée.
+
+        Renvois:
+            - bool: True si son dernier client est parti (sans place réservée pour un nouveau), si sa partie est
+              finie ou si son délai d'inactivité est écoulé.
+        """
+
+        # Une session qui vient d'être ouverte n'a encore ni client ni place réservée: elle attend son "admettre"
+        depart = self.a_admis and len(self.connectes) == 0 and self.serveur.places_reservees == 0
+
+        return depart or not self.serveur.is_running or self.serveur.inactif()
+
+
+    def executer(self, commande: str, parametres: tuple) -> any:
+        """
+        Cette méthode exécute une commande du front-end sur le lobby de la session.
+
+        Paramètres:
+            - commande (str): "admettre", "connecter", "requete" ou "deconnecter".
+            - parametres (tuple): Paramètres de la commande (sans l'identifiant de la session).
+
+        Renvois:
+            - any: Réponse de la commande.
+        """
+
+        if commande == "admettre":
+            adresse = self.serveur.admettre()
+            self.a_admis = self.a_admis or adresse is not None
+
+            return adresse
+
+        if commande == "connecter":
+            self.connectes.add(parametres[0])
+            self.serveur.connecter(parametres[0], parametres[1])
+
+        elif commande == "requete":
+            reply = self.serveur.traiter_requete(parametres[0], parametres[1])
+
+            if reply == "closing":
+                self.connectes.discard(parametres[0])
+                self.serveur.deconnecter(parametres[0])
+
+            return reply
+
+        elif commande == "deconnecter":
+            self.connectes.discard(parametres[0])
+            self.serveur.deconnecter(parametres[0])
+
+        return None
+
+
+# Classe d'un worker vu depuis son propre processus
+class ProcessusWorker:
+
+    # ------/ Constructeur \------
+
+    def __init__(self, connexion, profiling: bool = False) -> None:
+        """
+        Constructeur de la classe ProcessusWorker.
+
+        Attributs à définir:
+            - connexion (Connection): Extrémité du pipe côté worker.
+            - profiling (bool): Active le profiler des sessions.
+
+        Attributs internes:
+            - sessions (dict): Session de chaque identifiant.
+            - verrou_sessions (Lock): Verrou qui protège le dictionnaire des sessions.
+            - verrou_envoi (Lock): Verrou qui garde chaque réponse entière sur le pipe (plusieurs threads répondent).
+        """
+
+        self.connexion = connexion
+        self.profiling = profiling
+
+        self.sessions = {}
+        self.verrou_sessions = Lock()
+        self.verrou_envoi = Lock()
+
+
+    # ------/ Méthodes \------
+
+    def repondre(self, numero: int, reply: any) -> None:
+        with self.verrou_envoi:
+            try:
+                self.connexion.send((numero, reply))
+
+            # Le front-end s'est arrêté pendant que la session traitait la commande
+            except OSError:
+                pass
+
+
+    def ouvrir(self, id_session: int) -> None:
+        """
+        Cette méthode ouvre une session: son lobby et le thread qui traite ses commandes dans l'ordre.
+
+        Paramètres:
+            - id_session (int): Identifiant de la session.
+        """
+
+        session = Session(id_session, self.profiling)
+
+        with self.verrou_sessions:
+            self.sessions[id_session] = session
+
+        start_new_thread(session.serveur.run, ())
+        start_new_thread(self.traiter_session, (session,))
+
+
+    def fermer(self, id_session: int) -> None:
+        """
+        Cette méthode ferme une session (son lobby, son mini-jeu en cours et son thread) et l'oublie.
+
+        Paramètres:
+            - id_session (int): Identifiant de la session.
+        """
+
+        with self.verrou_sessions:
+            session = self.sessions.pop(id_session, None)
+
+        # Déjà fermée par un autre thread
+        if session is None:
+            return
+
+        session.serveur.fermer()
+        session.file.put(None)
+
+        print("Session " + str(id_session) + " fermée")
+
+
+    def traiter_session(self, session: Session) -> None:
+        """
+        Cette méthode est la boucle du thread d'une session: une session lente ne retarde donc que ses propres
+        clients (chacun attend sa réponse, une file contient au plus une commande par client).
+
+        Paramètres:
+            - session (Session): Session à traiter.
+        """
+
+        while True:
+            message = session.file.get()
+
+            if message is None:
+                break
+
+            numero, commande, parametres = message[0], message[1], message[3:]
+            reply = session.executer(commande, parametres)
+
+            # La session est fermée dès que son dernier client part (avant la réponse, pour que la commande suivante
+            # la trouve déjà fermée)
+            if session.abandonnee():
+                self.fermer(session.id_session)
+
+            self.repondre(numero, reply)
+
+
+    def run(self) -> None:
+        while True:
+            try:
+                message = self.connexion.recv()
+
+            # Le front-end s'est arrêté
+            except EOFError:
+                break
+
+            numero, commande = message[0], message[1]
+
+            if commande == "ouvrir":
+                self.ouvrir(message[2])
+                self.repondre(numero, None)
+
+            elif commande == "sante":
+                # On ferme les sessions terminées ou inactives, même sans nouvelle commande de leurs clients
+                with self.verrou_sessions:
+                    abandonnees = [id_session for id_session, session in self.sessions.items() if session.abandonnee()]
+
+                for id_session in abandonnees:
+                    self.fermer(id_session)
+
+                with self.verrou_sessions:
+                    self.repondre(numero, rapport_sante({id_session: session.serveur for id_session, session in self.sessions.items()}))
+
+            else:
+                # La commande entre dans la file sous le verrou: une session fermée ensuite la traite avant de s'arrêter
+                with self.verrou_sessions:
+                    session = self.sessions.get(message[2])
+
+                    if session is not None:
+                        session.file.put(message)
+
+                # Les commandes d'une session déjà fermée reçoivent une réponse de refus
+                if session is None:
+                    self.repondre(numero, REPONSES_SESSION_FERMEE.get(commande))
+
+
+# Classe d'un worker vu depuis le front-end
+class Worker:
+
+    # ------/ Constructeur \------
+
+    def __init__(self, id_worker: int, profiling: bool = False) -> None:
+        """
+        Constructeur de la classe Worker.
+
+        Attributs à définir:
+            - id_worker (int): Numéro du worker.
+            - profiling (bool): Active le profiler des sessions du worker.
+
+        Attributs internes:
+            - connexion (Connection): Extrémité du pipe côté front-end.
+            - processus (Process): Processus du worker.
+            - verrou (Lock): Verrou qui garde chaque commande entière sur le pipe (plusieurs clients le partagent).
+            - attentes (dict): Événement et réponse de chaque commande envoyée, par numéro (le worker répond dans le
+              désordre: chaque session a son thread).
+            - nb_commandes (int): Nombre de commandes envoyées (sert de numéro).
+            - en_service (bool): Indique si le worker répond encore (False une fois son pipe fermé).
+            - nb_sessions (int): Nombre de sessions ouvertes sur ce worker.
+            - sante (dict): Dernier rapport de santé du worker.
+        """
+
+        # Tests du type des paramètres donnés
+        assert type(id_worker) == int, "Erreur: Le 1er paramètre (id_worker) est censé être un entier."
+
+        self.id_worker = id_worker
+
+        # spawn: le worker démarre avec un interpréteur neuf (et donc son propre GIL)
+        contexte = get_context("spawn")
+        self.connexion, connexion_worker = contexte.Pipe()
+        self.processus = contexte.Process(target=executer_worker, args=(connexion_worker, profiling), daemon=True)
+        self.processus.start()
+
+        self.verrou = Lock()
+        self.attentes = {}
+        self.nb_commandes = 0
+        self.en_service = True
+        self.nb_sessions = 0
+        self.sante = {"sessions": 0, "joueurs": 0, "fps_min": None, "tick_p99_ms": None}
+
+        start_new_thread(self.recevoir_reponses, ())
+
+
+    # ------/ Getters \------
+
+    def get_id_worker(self) -> int:
+        return self.id_worker
+
+    def get_nb_sessions(self) -> int:
+        return self.nb_sessions
+
+    def get_sante(self) -> dict:
+        return self.sante
+
+    def get_en_service(self) -> bool:
+        return self.en_service and self.processus.is_alive()
+
+
+    # ------/ Méthodes \------
+
+    def envoyer(self, *message) -> any:
+        """
+        Cette méthode envoie une commande au worker et attend sa réponse.
+
+        Paramètres:
+            - message: Commande ("ouvrir", "admettre", "connecter", "requete", "deconnecter" ou "sante") suivie de ses paramètres.
+
+        Renvois:
+            - any: Réponse du worker (None s'il s'est arrêté avant de répondre).
+        """
+
+        attente = [Event(), None]
+
+        with self.verrou:
+            # Le worker s'est arrêté: aucune réponse ne viendra
+            if not self.en_service:
+                return None
+
+            self.nb_commandes += 1
+            self.attentes[self.nb_commandes] = attente
+
+            try:
+                self.connexion.send((self.nb_commandes,) + message)
+
+            except OSError:
+                self.attentes.pop(self.nb_commandes)
+                return None
+
+        attente[0].wait()
+
+        return attente[1]
+
+
+    def recevoir_reponses(self) -> None:
+        """
+        Cette méthode est la boucle du thread qui remet chaque réponse du worker à la commande qui l'attend.
+        """
+
+        while True:
+            try:
+                numero, reply = self.connexion.recv()
+
+            # Le worker s'est arrêté
+            except (EOFError, OSError):
+                break
+
+            with self.verrou:
+                attente = self.attentes.pop(numero)
+
+            attente[1] = reply
+            attente[0].set()
+
+        # Les commandes encore en attente ne recevront pas de réponse
+        with self.verrou:
+            self.en_service = False
+
+            for attente in self.attentes.values():
+                attente[0].set()
+
+            self.attentes = {}
+
+
+    def maj_sante(self) -> dict:
+        """
+        Cette méthode demande un rapport de santé au worker.
+
+        Renvois:
+            - dict: Rapport de santé (voir rapport_sante), ou None si le worker s'est arrêté.
+        """
+
+        sante = self.envoyer("sante")
+
+        # Le worker est mort pendant la commande: il est arrêté pour de bon et le front-end le remplace
+        if sante is None:
+            self.arreter()
+            return None
+
+        self.sante = sante
+        self.nb_sessions = self.sante["sessions"]
+
+        return self.sante
+
+
+    def arreter(self) -> None:
+        """
+        Cette méthode arrête le processus du worker et ferme son pipe (les commandes suivantes renvoient None).
+        """
+
+        with self.verrou:
+            self.en_service = False
+
+        if self.processus.is_alive():
+            self.processus.terminate()
+
+        self.connexion.close()
+
+
+    def charge(self) -> tuple:
+        """
+        Cette méthode donne la charge du worker, utilisée pour répartir les nouvelles sessions.
+
+        Renvois:
+            - tuple: Nombre de sessions puis pire p99 du tick (le worker le moins chargé a la plus petite charge).
+        """
+
+        return (self.nb_sessions, self.sante["tick_p99_ms"] or 0)
+
+
+# Classe du front-end du serveur dédié
+class ServeurDedie:
+
+    # ------/ Constructeur \------
+
+    def __init__(self, adresse_serveur: str, nb_workers: int = cpu_count(), profiling: bool = False, intervalle_sante: "int | float" = 5) -> None:
+        """
+        Constructeur de la classe ServeurDedie.
+
+        Attributs à définir:
+            - adresse_serveur (str): Adresse ip du serveur.
+            - nb_workers (int): Nombre de processus qui font tourner les sessions.
+            - profiling (bool): Active le profiler des sessions (et de ceux des workers redémarrés).
+            - intervalle_sante (int ou float): Délai en secondes entre deux rapports de santé des workers.
+
+        Attributs internes:
+            - server_socket (socket.socket): Socket qui accepte les connexions.
+            - workers (list): Liste des workers.
+            - session_ouverte (tuple): Session qui accueille les nouveaux joueurs et son worker (ou None).
+            - nb_sessions (int): Nombre de sessions créées (sert d'identifiant).
+            - verrou (Lock): Verrou qui protège le choix de la session des nouveaux joueurs.
+        """
+
+        # Tests du type des paramètres donnés
+        assert type(nb_workers) == int and nb_workers > 0, "Erreur: Le 2ème paramètre (nb_workers) est censé être un entier positif."
+
+        self.server_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+
+        try:
+            self.server_socket.bind((adresse_serveur, 5555))
+
+        except socket.error as e:
+            print(str(e))
+
+        self.server_socket.listen(16)
+
+        self.profiling = profiling
+        self.workers = [Worker(i + 1, profiling) for i in range(nb_workers)]
+        self.intervalle_sante = intervalle_sante
+
+        self.session_ouverte = None
+        self.nb_sessions = 0
+        self.verrou = Lock()
+
+        self.is_running = True
+
+        print("Serveur dédié lancé avec " + str(nb_workers) + " workers ! En attente de connexions...")
+
+
+    # ------/ Méthodes \------
+
+    def admettre(self) -> tuple:
+        """
+        Cette méthode choisit la session d'un nouveau joueur: la session ouverte s'il reste de la place, sinon une
+        nouvelle session sur le worker le moins chargé.
+
+        Renvois:
+            - tuple: Identifiant de la session, son worker et l'adresse attribuée au joueur (None s'il est refusé).
+        """
+
+        with self.verrou:
+            # La session ouverte accepte encore des joueurs (choix des personnages pas terminé et place libre)
+            if self.session_ouverte is not None:
+                id_session, worker = self.session_ouverte
+                adresse = worker.envoyer("admettre", id_session)
+
+                if adresse is not None:
+                    return id_session, worker, adresse
+
+            # Sinon on ouvre une nouvelle session sur le worker le moins chargé (parmi ceux qui tournent encore)
+            worker = min([worker for worker in self.workers if worker.get_en_service()], key=lambda worker: worker.charge())
+            self.nb_sessions += 1
+            id_session = self.nb_sessions
+
+            worker.envoyer("ouvrir", id_session)
+            worker.nb_sessions += 1
+            self.session_ouverte = (id_session, worker)
+
+            print("Session " + str(id_session) + " ouverte sur le worker " + str(worker.get_id_worker()))
+
+            return id_session, worker, worker.envoyer("admettre", id_session)
+
+
+    def client_thread(self, connection: socket.socket) -> None:
+        id_session, worker, address = self.admettre()
+
+        if address is None:
+            envoyer_message(connection, "refuse")
+            connection.close()
+            return
+
+        envoyer_message(connection, address)
+        pseudo = recevoir_message(connection) or ""
+
+        worker.envoyer("connecter", id_session, address, pseudo)
+
+        is_connected = True
+
+        while is_connected:
+            # Attend une requête entière du client
+            request = recevoir_message(connection)
+
+            # S'il n'a pas envoyé de requête, on coupe la connexion
+            if request is None:
+                worker.envoyer("deconnecter", id_session, address)
+                is_connected = False
+
+            else:
+                # Santé de tous les workers (le reste est traité par la session du joueur)
+                if request == requete(SANTE_WORKERS):
+                    reply = json.dumps({worker.get_id_worker(): worker.get_sante() for worker in self.workers})
+
+                else:
+                    reply = worker.envoyer("requete", id_session, address, request)
+
+                    # Le worker de la session s'est arrêté: le client est déconnecté
+                    if reply is None:
+                        reply = REPONSES_SESSION_FERMEE["requete"]
+
+                if reply == "closing":
+                    is_connected = False
+
+                envoyer_message(connection, reply)
+
+        print("Session " + str(id_session) + ": connexion coupée avec", address)
+        connection.close()
+
+
+    def accept_thread(self) -> None:
+        while self.is_running:
+            try:
+                connection, address = self.server_socket.accept()
+            except OSError:
+                break
+
+            start_new_thread(self.client_thread, (connection,))
+
+
+    def run(self) -> None:
+        start_new_thread(self.accept_thread, ())
+
+        # Le front-end récupère régulièrement la santé et la charge de chaque worker
+        while self.is_running:
+            time.sleep(self.intervalle_sante)
+
+            for i in range(len(self.workers)):
+                worker = self.workers[i]
+                sante = worker.maj_sante() if worker.get_en_service() else None
+
+                # Un worker mort (même pendant la commande) est remplacé par un nouveau, ses sessions sont perdues
+                if sante is None:
+                    print("[Worker " + str(worker.get_id_worker()) + "] arrêté ! Redémarrage...")
+                    worker.arreter()
+
+                    with self.verrou:
+                        self.workers[i] = Worker(worker.get_id_worker(), self.profiling)
+
+                    continue
+
+                print("[Worker " + str(worker.get_id_worker()) + "] " + str(sante["sessions"]) + " sessions, " + str(sante["joueurs"]) + " joueurs, fps min " + str(sante["fps_min"]) + ", tick p99 " + str(sante["tick_p99_ms"]) + "ms")
+
+
+if '__main__' == __name__:
+    # Utilisation: python serveur_dedie.py [nombre de workers] [--profile] [--sans-pygame] [--trace=<fichier.json>]
+    TRACEUR.set_nom_processus("serveur dédié")
+    nb_workers = int(sys.argv[1]) if len(sys.argv) > 1 and sys.argv[1].isdigit() else cpu_count()
+
+    serveur = ServeurDedie(input("Quel est l'adresse ip du serveur ? (exemple: 192.168.1.1): "), nb_workers, "--profile" in sys.argv)
+    serveur.run()
@@ -0,0 +1,271 @@
+#Projet : Mayro Party
+#Auteurs : Hinata Bouaziz, Antoine Desrues, Alexandre Guillaume, Matisse Moreau
+
+# ------/ Importations des bibliothèques \------
+
+import json
+import random
+import hashlib
+import time
+import sys
+
+# ------/ Importations des mini-jeux serveurs \------
+
+import archer_ival_server
+import hexagon_heat_server
+import pushy_penguins_server
+import speed_hockey_server
+import trace_race_server
+
+# ------/ Constantes \------
+
+# Serveur de chaque mini-jeu
+MINIJEUX = {"archer_ival": archer_ival_server,
+            "hexagon_heat": hexagon_heat_server,
+            "pushy_penguins": pushy_penguins_server,
+            "speed_hockey": speed_hockey_server,
+            "trace_race": trace_race_server}
+
+# Nombre de valeurs dans les inputs envoyés par le client de chaque mini-jeu (x|y ou x|y|action)
+NB_INPUTS = {"archer_ival": 3, "hexagon_heat": 3, "pushy_penguins": 2, "speed_hockey": 2, "trace_race": 2}
+
+# Taille des sprites des joueurs côté client (normalement envoyée par le client avec la requête taille_joueurs)
+TAILLES_JOUEURS = {
+    "archer_ival": {"solo": {"mayro": [160, 248], "lugi": [160, 288], "wayro": [208, 280], "walugi": [152, 312]},
+                    "panneau": {"mayro": [48, 64], "lugi": [48, 74], "wayro": [62, 74], "walugi": [62, 84]}},
+    "hexagon_heat": {"mayro": [72, 96], "lugi": [72, 111], "wayro": [93, 111], "walugi": [93, 126]},
+    "pushy_penguins": {"mayro": [72, 96], "lugi": [72, 111], "wayro": [93, 111], "walugi": [93, 126]},
+    "speed_hockey": {},
+    "trace_race": {"mayro": [69, 93], "lugi": [69, 117], "wayro": [69, 105], "walugi": [60, 120]}
+}
+
+# Liste de tous les personnages
+PERSOS = ["mayro", "lugi", "wayro", "walugi"]
+
+
+# ------/ Fonctions utiliatires \------
+
+def script_aleatoire(graine: int, nb_inputs: int, duree: int = 30) -> "function":
+    """
+    Cette fonction permet de créer un script d'inputs aléatoires (mais reproductibles) pour un joueur simulé.
+
+    Paramètres:
+        - graine (int): Graine du générateur aléatoire du script.
+        - nb_inputs (int): Nombre de valeurs des inputs (2 ou 3).
+        - duree (int): Nombre de ticks pendant lesquels un même input est maintenu.
+    Renvois:
+        - function: Fonction qui prend le numéro du tick et renvoie les inputs du joueur.
+    """
+
+    # Tests du type des paramètres
+    assert type(graine) == int, "Erreur: Le 1er paramètre (graine) n'est pas un entier."
+    assert nb_inputs in (2, 3), "Erreur: Le 2ème paramètre (nb_inputs) doit valoir 2 ou 3."
+    assert type(duree) == int and duree > 0, "Erreur: Le 3ème paramètre (duree) doit être un entier positif."
+
+    rng = random.Random(graine)
+    inputs = [0] * nb_inputs
+
+    def script(tick: int) -> list:
+        # On change de direction (et éventuellement on saute / tire) toutes les "duree" ticks
+        if tick % duree == 0:
+            inputs[0] = rng.randint(-1, 1)
+            inputs[1] = rng.randint(-1, 1)
+            if nb_inputs == 3:
+                inputs[2] = 1 if rng.random() < 0.2 else 0
+
+        return list(inputs)
+
+    return script
+
+
+def hash_etat(etat: dict) -> str:
+    """
+    Cette fonction permet de calculer l'empreinte (sha1) d'un état de mini-jeu.
+
+    Paramètres:
+        - etat (dict): État du mini-jeu (doit pouvoir être converti en json).
+    Renvois:
+        - str: Empreinte de l'état en hexadécimal.
+    """
+
+    return hashlib.sha1(json.dumps(etat, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+# ------/ Classes \------
+
+# Classe d'une simulation de mini-jeu sans réseau ni affichage
+class Simulation:
+
+    # ------/ Constructeur \------
+
+    def __init__(self, minijeu: str, graine: int = 0, nb_humains: int = 1, scripts: dict = None, fps: int = 60) -> None:
+        """
+        Constructeur de la classe Simulation.
+
+        Attributs à définir:
+            - minijeu (str): Nom du mini-jeu à simuler (clé de MINIJEUX).
+            - graine (int): Graine de la simulation (le serveur et les scripts en dépendent).
+            - nb_humains (int): Nombre de joueurs non ia (ils sont pilotés par des scripts).
+            - scripts (dict): Script de chaque joueur non ia ("1", "2"...), des scripts aléatoires sont créés à défaut.
+            - fps (int): Nombre de ticks par seconde simulée.
+
+        Attributs internes:
+            - temps (float): Horloge simulée (avance de 1/fps à chaque tick).
+            - rng (random.Random): Générateur aléatoire donné au serveur.
+            - serveur (Server): Serveur du mini-jeu simulé.
+            - nb_ticks (int): Nombre de ticks exécutés.
+        """
+
+        # Tests du type des paramètres donnés
+        assert minijeu in MINIJEUX, "Erreur: Le 1er paramètre (minijeu) n'est pas un mini-jeu existant."
+        assert type(graine) == int, "Erreur: Le 2ème paramètre (graine) est censé être un entier."
+        assert type(nb_humains) == int and 0 <= nb_humains <= 4, "Erreur: Le 3ème paramètre (nb_humains) doit être compris entre 0 et 4."
+        assert scripts is None or type(scripts) == dict, "Erreur: Le 4ème paramètre (scripts) est censé être un dictionnaire."
+        assert type(fps) == int and fps > 0, "Erreur: Le 5ème paramètre (fps) est censé être un entier positif."
+
+        self.minijeu = minijeu
+        self.graine = graine
+        self.fps = fps
+
+        # Horloge et générateur aléatoire partagés avec le serveur
+        self.temps = 0.0
+        self.rng = random.Random(graine)
+        self.nb_ticks = 0
+
+        # Création du serveur sans socket (ses messages sont masqués)
+        self.serveur = MINIJEUX[minijeu].Server(None, horloge=self.horloge, rng=self.rng, silencieux=True)
+        self.serveur.fps = fps
+
+        # Ajout des joueurs (les humains d'abord, comme dans le lobby)
+        self.humains = [str(i + 1) for i in range(nb_humains)]
+        adresses = self.humains + ["ai" + str(i + 1) for i in range(4 - nb_humains)]
+        for i in range(4):
+            self.serveur.add_player(adresses[i], PERSOS[i], not adresses[i] in self.humains)
+
+        # Envoi de la taille des joueurs (normalement fait par les clients)
+        for adresse, joueur in self.serveur.joueurs.items():
+            tailles = TAILLES_JOUEURS[minijeu]
+            if minijeu == "archer_ival":
+                tailles = tailles[joueur.get_type_joueur()]
+            if joueur.get_perso() in tailles:
+                joueur.set_taille(list(tailles[joueur.get_perso()]))
+
+        # Scripts des joueurs humains
+        self.scripts = {} if scripts is None else dict(scripts)
+        for i in range(len(self.humains)):
+            if not self.humains[i] in self.scripts:
+                self.scripts[self.humains[i]] = script_aleatoire(graine * 10 + i, NB_INPUTS[minijeu])
+
+        self.serveur.is_running = True
+
+
+    # ------/ Getters \------
+
+    def get_serveur(self):
+        return self.serveur
+
+    def get_nb_ticks(self) -> int:
+        return self.nb_ticks
+
+    def get_termine(self) -> bool:
+        return not self.serveur.is_running
+
+
+    # ------/ Méthodes \------
+
+    def horloge(self) -> float:
+        """
+        Cette méthode sert d'horloge au serveur simulé (remplace time.time).
+
+        Renvois:
+            - float: Temps simulé en secondes.
+        """
+
+        return self.temps
+
+
+    def get_etat_complet(self) -> dict:
+        """
+        Cette méthode permet de récupérer l'état complet du mini-jeu simulé (sans les fps du serveur, qui ne sont pas simulés).
+
+        Renvois:
+            - dict: État du mini-jeu.
+        """
+
+        infos = self.serveur.get_infos()
+        infos.pop("fps", None)
+
+        return {"etat": self.serveur.get_etat(), "infos": infos}
+
+
+    def tick(self, empreinte: bool = True) -> str:
+        """
+        Cette méthode permet d'exécuter un tick de la simulation.
+
+        Paramètres:
+            - empreinte (bool): Indique s'il faut calculer l'empreinte de l'état (désactivé pour mesurer uniquement le serveur).
+
+        Renvois:
+            - str: Empreinte de l'état du mini-jeu après le tick (vide si elle n'est pas calculée).
+        """
+
+        etat = self.serveur.get_etat()
+
+        for adresse in self.humains:
+            # Les joueurs humains sont prêts dès que possible (sauf pendant la partie, qui se termine d'elle même)
+            if etat != "minigame_during":
+                self.serveur.marquer_pret(adresse)
+
+            # Les inputs ne sont envoyés qu'une fois le mini-jeu chargé
+            if adresse in self.serveur.inputs_joueurs:
+                self.serveur.inputs_joueurs[adresse] = self.scripts[adresse](self.nb_ticks)
+
+        self.serveur.tick()
+
+        self.temps += 1 / self.fps
+        self.nb_ticks += 1
+
+        return hash_etat(self.get_etat_complet()) if empreinte else ""
+
+
+    def executer(self, nb_ticks: int, silencieux: bool = True, empreinte: bool = True) -> list:
+        """
+        Cette méthode permet d'exécuter plusieurs ticks (ou jusqu'à la fin du mini-jeu).
+
+        Paramètres:
+            - nb_ticks (int): Nombre maximum de ticks à exécuter.
+            - silencieux (bool): Masque les messages écrits par le serveur.
+            - empreinte (bool): Indique s'il faut calculer l'empreinte de l'état à chaque tick.
+
+        Renvois:
+            - list: Empreinte de l'état après chaque tick.
+        """
+
+        assert type(nb_ticks) == int and nb_ticks >= 0, "Erreur: Le 1er paramètre (nb_ticks) doit être un entier positif."
+
+        self.serveur.silencieux = silencieux
+
+        hashes = []
+        while len(hashes) < nb_ticks and not self.get_termine():
+            hashes.append(self.tick(empreinte))
+
+        return hashes
+
+
+if '__main__' == __name__:
+    # Utilisation: python simulation.py [mini-jeu] [nombre de parties] [graine]
+    minijeu = sys.argv[1] if len(sys.argv) > 1 else "hexagon_heat"
+    nb_parties = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    graine = int(sys.argv[3]) if len(sys.argv) > 3 else 0
+
+    debut = time.perf_counter()
+    total_ticks = 0
+
+    for partie in range(nb_parties):
+        simulation = Simulation(minijeu, graine + partie)
+        hashes = simulation.executer(100000)
+        total_ticks += len(hashes)
+        print("Partie", partie, ":", len(hashes), "ticks, état final", hashes[-1])
+
+    duree = time.perf_counter() - debut
+    print(str(nb_parties) + " parties (" + str(total_ticks) + " ticks) en " + str(round(duree, 2)) + "s, soit " + str(round(nb_parties / duree * 60)) + " parties/min")
@@ -9,7 +9,10 @@ from math import floor
 import time
 from os import sep
 
-from utils import Network, scale_image_by
+from utils import Network, scale_image_by, presenter
+from hud import HUD
+from protocole import requete, GET_ETAT, PRET, DESACTIVE_SON
+from cache_ressources import charger_image, charger_son
 import json
 
 # ------/ Classes \------
@@ -56,8 +59,8 @@ class Joueur:
         self.sprites_directory = sep.join(["..", "data", "sprites", "characters", self.perso])
 
         # Définition des sprites automatiquement
-        self.sprites = {"left": [scale_image_by(pygame.image.load(sep.join([self.sprites_directory, "hockey_left" + str(i) + ".png"])), 3) for i in range(4)],
-                        "right": [scale_image_by(pygame.image.load(sep.join([self.sprites_directory, "hockey_right" + str(i) + ".png"])), 3) for i in range(4)]
+        self.sprites = {"left": [charger_image(sep.join([self.sprites_directory, "hockey_left" + str(i) + ".png"]), 3) for i in range(4)],
+                        "right": [charger_image(sep.join([self.sprites_directory, "hockey_right" + str(i) + ".png"]), 3) for i in range(4)]
         }
 
         # Initialisation / positionnement du sprite actuel
@@ -65,10 +68,10 @@ class Joueur:
         self.sprite_pos = list(self.pos)
 
         # Sprite de la plateforme du joueur
-        self.platforme = scale_image_by(pygame.image.load(sep.join(["..", "data", "sprites", "minigames", "speed_hockey", self.side + "_platform.png"])), 3)
+        self.platforme = charger_image(sep.join(["..", "data", "sprites", "minigames", "speed_hockey", self.side + "_platform.png"]), 3)
 
         # Initialisation et positionnement de l'ombre
-        self.shadow = scale_image_by(pygame.image.load(sep.join([self.sprites_directory, "shadow.png"])), 3)
+        self.shadow = charger_image(sep.join([self.sprites_directory, "shadow.png"]), 3)
         self.shadow_pos = list(self.pos)
 
 
@@ -137,13 +140,10 @@ class Joueur:
         # Tests des types de variables
         assert type(screen) == pygame.Surface, "Erreur: Le paramètre donné (screen) n'est pas une surface pygame."
 
-        # Initialisation des facteurs pour la taille de l'écran
-        screen_factor = ((screen.get_rect().size[0] / 1280), (screen.get_rect().size[1] / 720))
-
         # Affichage des sprites
-        screen.blit(scale_image_by(self.platforme, screen_factor), (round(self.pos[0] * screen_factor[0]), round(self.pos[1] * screen_factor[1])))
-        screen.blit(scale_image_by(self.shadow, screen_factor), (round(self.shadow_pos[0] * screen_factor[0]), round(self.shadow_pos[1] * screen_factor[1])))
-        screen.blit(scale_image_by(self.sprite, screen_factor), (round(self.sprite_pos[0] * screen_factor[0]), round(self.sprite_pos[1] * screen_factor[1])))
+        screen.blit(self.platforme, (round(self.pos[0]), round(self.pos[1])))
+        screen.blit(self.shadow, (round(self.shadow_pos[0]), round(self.shadow_pos[1])))
+        screen.blit(self.sprite, (round(self.sprite_pos[0]), round(self.sprite_pos[1])))
 
 
 
@@ -168,10 +168,10 @@ class Carapace:
         self.pos = [0.0, 0.0]
 
         # Sprite actuel
-        self.sprite = scale_image_by(pygame.image.load(sep.join(["..", "data", "sprites", "minigames", "speed_hockey", "carapace.png"])), 3)
+        self.sprite = charger_image(sep.join(["..", "data", "sprites", "minigames", "speed_hockey", "carapace.png"]), 3)
 
         # Paramètres du son
-        self.hit_sound = pygame.mixer.Sound(sep.join(["..", "data", "sounds", "minigames", "speed_hockey", "carapace.ogg"]))
+        self.hit_sound = charger_son(sep.join(["..", "data", "sounds", "minigames", "speed_hockey", "carapace.ogg"]))
 
 
     # ------/ Getters \------
@@ -217,11 +217,8 @@ class Carapace:
         # Tests des types de variables
         assert type(screen) == pygame.Surface, "Erreur: Le paramètre donné (screen) n'est pas une surface pygame."
 
-        # Initialisation des facteurs pour la taille de l'écran
-        screen_factor = ((screen.get_rect().size[0] / 1280), (screen.get_rect().size[1] / 720))
-
         # Affichage de la carapace
-        screen.blit(scale_image_by(self.sprite, screen_factor), (round(self.pos[0] * screen_factor[0]), round(self.pos[1] * screen_factor[1])))
+        screen.blit(self.sprite, (round(self.pos[0]), round(self.pos[1])))
 
 
 
@@ -267,11 +264,8 @@ class But:
         # Tests des types de variables
         assert type(screen) == pygame.Surface, "Erreur: Le 1er paramètre (screen) n'est pas une surface pygame."
 
-        # Initialisation des facteurs pour la taille de l'écran
-        screen_factor = ((screen.get_rect().size[0] / 1280), (screen.get_rect().size[1] / 720))
-
         # Affichage du but
-        screen.blit(scale_image_by(self.sprite, screen_factor), (round(self.pos[0] * screen_factor[0]), round(self.pos[1] * screen_factor[1])))
+        screen.blit(self.sprite, (round(self.pos[0]), round(self.pos[1])))
 
 
 
@@ -291,10 +285,10 @@ class MiniGame:
 
         Attributs internes:
             - quit (bool): Variable qui permet de détecter si le joueur a manuellement fermé le jeu.
-            - screen_factor: Les multiplicateurs pour la taille de l'écran.
 
             - show_fps (bool): Paramètre de débug permettant d'afficher les fps.
             - show_server_fps (bool): Paramètre de débug permettant d'afficher les fps du serveur.
+            - memoire (GestionnaireMemoire): Suivi de la mémoire du client (usage affiché avec les fps).
 
             - fps_font (pygame.freetype.Font): Police d'écriture pour les fps.
             - game_font (pygame.freetype.Font): Police d'écriture principale du mini-jeu.
@@ -337,7 +331,6 @@ class MiniGame:
         self.fps = fps
 
         self.quit = False
-        self.screen_factor = (0, 0)
 
         # Paramètres de débug
         self.show_fps = True
@@ -352,35 +345,38 @@ class MiniGame:
         self.objets = []
 
         # Image de fond du timer
-        self.timer_background = pygame.image.load(sep.join(["..", "data", "sprites", "minigames", "general", "timer_back.png"]))
+        self.timer_background = charger_image(sep.join(["..", "data", "sprites", "minigames", "general", "timer_back.png"]))
 
         # Sprites de toad (pour le chargement)
-        self.toad = [pygame.image.load(sep.join(["..", "data", "sprites", "minigames", "general", "toad", "toad.png"])),
-                     pygame.image.load(sep.join(["..", "data", "sprites", "minigames", "general", "toad", "toad_open.png"]))]
-        self.toad_shadow = pygame.image.load(sep.join(["..", "data", "sprites", "minigames", "general", "toad", "shadow.png"]))
-        self.toad_bubble = pygame.image.load(sep.join(["..", "data", "sprites", "minigames", "general", "toad", "bubble.png"]))
+        self.toad = [charger_image(sep.join(["..", "data", "sprites", "minigames", "general", "toad", "toad.png"])),
+                     charger_image(sep.join(["..", "data", "sprites", "minigames", "general", "toad", "toad_open.png"]))]
+        self.toad_shadow = charger_image(sep.join(["..", "data", "sprites", "minigames", "general", "toad", "shadow.png"]))
+        self.toad_bubble = charger_image(sep.join(["..", "data", "sprites", "minigames", "general", "toad", "bubble.png"]))
 
         # Sprites utilisés dans toute la classe
         minigame_directory = sep.join(["..", "data", "sprites", "minigames", "speed_hockey"])
-        self.bg = pygame.image.load(sep.join([minigame_directory, "hockey.png"]))
-        self.ligne_rouge = pygame.image.load(sep.join([minigame_directory, "ligne_rouge.png"]))
-        self.ligne_verte = pygame.image.load(sep.join([minigame_directory, "ligne_verte.png"]))
-        self.lampes_rouges = [pygame.image.load(sep.join([minigame_directory, "lampe_rouge_eteinte.png"])),
-                              pygame.image.load(sep.join([minigame_directory, "lampe_rouge.png"]))]
-        self.lampes_vertes = [pygame.image.load(sep.join([minigame_directory, "lampe_verte_eteinte.png"])),
-                              pygame.image.load(sep.join([minigame_directory, "lampe_verte.png"]))]
+        self.bg = charger_image(sep.join([minigame_directory, "hockey.png"]))
+        self.ligne_rouge = charger_image(sep.join([minigame_directory, "ligne_rouge.png"]))
+        self.ligne_verte = charger_image(sep.join([minigame_directory, "ligne_verte.png"]))
+        self.lampes_rouges = [charger_image(sep.join([minigame_directory, "lampe_rouge_eteinte.png"])),
+                              charger_image(sep.join([minigame_directory, "lampe_rouge.png"]))]
+        self.lampes_vertes = [charger_image(sep.join([minigame_directory, "lampe_verte_eteinte.png"])),
+                              charger_image(sep.join([minigame_directory, "lampe_verte.png"]))]
 
         self.carapace = Carapace()
 
-        self.buts = [But([0, 156], scale_image_by(pygame.image.load(sep.join([minigame_directory, "but_rouge.png"])), 4)),
-                     But([1180, 156], scale_image_by(pygame.image.load(sep.join([minigame_directory, "but_vert.png"])), 4))]
+        self.buts = [But([0, 156], charger_image(sep.join([minigame_directory, "but_rouge.png"]), 4)),
+                     But([1180, 156], charger_image(sep.join([minigame_directory, "but_vert.png"]), 4))]
 
         # Initialisation du son du sifflet des buts
-        self.son_but = pygame.mixer.Sound(sep.join(["..", "data", "sounds", "minigames", "speed_hockey", "sifflet.ogg"]))
+        self.son_but = charger_son(sep.join(["..", "data", "sounds", "minigames", "speed_hockey", "sifflet.ogg"]))
 
         # Initialisation du réseau
         self.net = None
 
+        # Suivi de la mémoire (donné par le jeu)
+        self.memoire = None
+
 
     # ------/ Getters \------
 
@@ -393,6 +389,9 @@ class MiniGame:
     def set_net(self, new_net) -> Network:
         self.net = new_net
 
+    def set_memoire(self, new_memoire) -> None:
+        self.memoire = new_memoire
+
 
     # ------/ Méthodes \------
 
@@ -416,7 +415,7 @@ class MiniGame:
             assert elem >= -1 and elem <= 1, "Erreur: La liste donnée doit uniquement contenir des entiers compris entre -1 et 1"
 
         # Envoie les inputs au serveur et demande des infos sur l'environnement
-        infos_environnement = json.loads(self.net.send(str(input_joueur[0]) + "|" + str(input_joueur[1])))
+        infos_environnement = self.net.etat_minijeu(str(input_joueur[0]) + "|" + str(input_joueur[1]))
         infos_joueurs = infos_environnement["joueurs"]
         pos_carapace = infos_environnement["carapace"]
         score = infos_environnement["score"]
@@ -424,23 +423,23 @@ class MiniGame:
         fps = infos_environnement["fps"]
 
         # On affiche les sprites du jeu dans un ordre d'affichage prédéfini
-        self.screen.blit(scale_image_by(self.bg, self.screen_factor), (0, 0))
+        self.screen.blit(self.bg, (0, 0))
 
         # Placement des lignes sur le terrain
-        self.screen.blit(scale_image_by(self.ligne_rouge, (4 * self.screen_factor[0], 4 * self.screen_factor[1])), (round(200 * self.screen_factor[0]), round(200 * self.screen_factor[1])))
-        self.screen.blit(scale_image_by(self.ligne_rouge, (4 * self.screen_factor[0], 4 * self.screen_factor[1])), (round(400 * self.screen_factor[0]), round(200 * self.screen_factor[1])))
+        self.screen.blit(scale_image_by(self.ligne_rouge, 4), (200, 200))
+        self.screen.blit(scale_image_by(self.ligne_rouge, 4), (400, 200))
 
-        self.screen.blit(scale_image_by(self.ligne_verte, (4 * self.screen_factor[0], 4 * self.screen_factor[1])), (round(852 * self.screen_factor[0]), round(200 * self.screen_factor[1])))
-        self.screen.blit(scale_image_by(self.ligne_verte, (4 * self.screen_factor[0], 4 * self.screen_factor[1])), (round(1052 * self.screen_factor[0]), round(200 * self.screen_factor[1])))
+        self.screen.blit(scale_image_by(self.ligne_verte, 4), (852, 200))
+        self.screen.blit(scale_image_by(self.ligne_verte, 4), (1052, 200))
 
         # Placement des lampes sur le terrain
         offset = 0
         for i in range(3):
             # On allume les lampes en fonction de la taille du score par rapport à i
             if i < score[0]:
-                self.screen.blit(scale_image_by(self.lampes_rouges[1], (2 * self.screen_factor[0], 2 * self.screen_factor[1])), (round((80 + offset) * self.screen_factor[0]), round(8 * self.screen_factor[1])))
+                self.screen.blit(scale_image_by(self.lampes_rouges[1], 2), (80 + offset, 8))
             else:
-                self.screen.blit(scale_image_by(self.lampes_rouges[0], (2 * self.screen_factor[0], 2 * self.screen_factor[1])), (round((80 + offset) * self.screen_factor[0]), round(8 * self.screen_factor[1])))
+                self.screen.blit(scale_image_by(self.lampes_rouges[0], 2), (80 + offset, 8))
             # Augmentation du décalage de chaque lampe
             offset += 100
 
@@ -448,9 +447,9 @@ class MiniGame:
         for i in range(3):
             # On allume les lampes en fonction de la taille du score par rapport à i
             if i < score[1]:
-                self.screen.blit(scale_image_by(self.lampes_vertes[1], (2 * self.screen_factor[0], 2 * self.screen_factor[1])),(round((920 + offset) * self.screen_factor[0]), round(8 * self.screen_factor[1])))
+                self.screen.blit(scale_image_by(self.lampes_vertes[1], 2),(920 + offset, 8))
             else:
-                self.screen.blit(scale_image_by(self.lampes_vertes[0], (2 * self.screen_factor[0], 2 * self.screen_factor[1])), (round((920 + offset) * self.screen_factor[0]), round(8 * self.screen_factor[1])))
+                self.screen.blit(scale_image_by(self.lampes_vertes[0], 2), (920 + offset, 8))
             # Augmentation du décalage de chaque lampe
             offset += 100
 
@@ -465,10 +464,10 @@ class MiniGame:
         # On active les sons si le serveur l'a indiqué
         if infos_joueurs[self.net.adresse_client]["lancer_son_hit"]:
             self.carapace.get_hit_sound().play()
-            self.net.send("desactive_son_hit")
+            self.net.send(requete(DESACTIVE_SON, "hit"))
         if infos_joueurs[self.net.adresse_client]["lancer_son_but"]:
             self.son_but.play()
-            self.net.send("desactive_son_but")
+            self.net.send(requete(DESACTIVE_SON, "but"))
 
         # Affichage des objets sur l'écran
         for objet in self.objets:
@@ -477,23 +476,20 @@ class MiniGame:
         # Affichage du timer seulement s'il est actuellement en train de compter
         if timer >= 0:
             # Affichage du fond du timer
-            timer_sprite = scale_image_by(self.timer_background, self.screen_factor)
+            timer_sprite = self.timer_background
             timer_background_textRect = timer_sprite.get_rect()
-            timer_background_textRect.center = (self.screen.get_rect().w // 2, round(37 * self.screen_factor[1]))
+            timer_background_textRect.center = (self.screen.get_rect().w // 2, 37)
             self.screen.blit(timer_sprite, timer_background_textRect)
 
             # Positionnement du timer au centre-haut de l'écran
             timer_text = self.game_font.render(str(timer), (255, 255, 255))
-            timer_text_scaled = scale_image_by(timer_text[0], self.screen_factor)
+            timer_text_scaled = timer_text[0]
             timer_textRect = timer_text_scaled.get_rect()
-            timer_textRect.center = (self.screen.get_rect().w // 2, round(37 * self.screen_factor[1]))
+            timer_textRect.center = (self.screen.get_rect().w // 2, 37)
 
             # Affichage du timer
             self.screen.blit(timer_text_scaled, timer_textRect)
 
-        # Initialisation des facteurs pour la taille de l'écran
-        self.screen_factor = ((self.screen.get_rect().size[0] / 1280), (self.screen.get_rect().size[1] / 720))
-
         # Debug pour afficher les fps
         if self.show_fps:
             self.fps_font.render_to(self.screen, (0, 0), "FPS: " + str(round(self.clock.get_fps())), (0, 0, 0))
@@ -502,6 +498,10 @@ class MiniGame:
         if self.show_server_fps:
             self.fps_font.render_to(self.screen, (0, 20), "S-FPS: " + str(round(fps)), (0, 0, 0))
 
+        # Debug pour afficher la mémoire prise par les images et les sons
+        if self.show_fps and self.memoire is not None:
+            self.fps_font.render_to(self.screen, (0, 40), self.memoire.texte_usage(), (0, 0, 0))
+
 
     def load(self) -> None:
         """
@@ -536,64 +536,61 @@ class MiniGame:
 
                 # Changement de taille de la fenêtre
                 elif event.type == pygame.VIDEORESIZE:
-                    self.screen = pygame.display.set_mode(event.size, pygame.HWSURFACE|pygame.DOUBLEBUF|pygame.RESIZABLE)
+                    pygame.display.set_mode(event.size, pygame.HWSURFACE|pygame.DOUBLEBUF|pygame.RESIZABLE)
 
                 # Détection des inputs du joueur
                 elif event.type == pygame.MOUSEBUTTONUP and cooldown - time.time() < 0:
-                    self.net.send("ready_for_next_state")
+                    self.net.send(requete(PRET))
 
             # Envoi d'une requête au serveur pour obtenir le nombre de joueurs et lance la partie si tous les joueurs sont prêts
-            infos_serveur = json.loads(self.net.send("infos_serveur"))
+            infos_serveur = self.net.get_infos_serveur()
             nb_joueurs = infos_serveur["nb_joueurs"]
             nb_joueurs_prets = infos_serveur["nb_joueurs_prets"]
 
-            etat = self.net.send("get_etat")
+            etat = self.net.send(requete(GET_ETAT))
             running = etat == "minigame_load" or etat == "minigame_select"
 
-            # Initialisation des facteurs pour la taille de l'écran
-            self.screen_factor = ((self.screen.get_rect().size[0] / 1280), (self.screen.get_rect().size[1] / 720))
-
             # Affichage de l'écran de chargement et du texte
             self.screen.fill((0, 0, 0))
 
             # Redimension des textes
-            nom_text = scale_image_by(self.game_font.render(nom, (255, 255, 255))[0], self.screen_factor)
+            nom_text = self.game_font.render(nom, (255, 255, 255))[0]
             nom_textRect = nom_text.get_rect()
-            nom_textRect.center = (round(640 * self.screen_factor[0]), round(70 * self.screen_factor[1]))
+            nom_textRect.center = (640, 70)
             if cooldown - time.time() > 0:
                 chargement = "CHARGEMENT..." 
             elif nb_joueurs > 1:
                 chargement = "Cliquez si vous êtes prêt pour le mini-jeu ! (" + str(nb_joueurs_prets) + "/" + str(nb_joueurs) + ")"
             else:
                 chargement = "Cliquez pour lancer le mini-jeu !"
-            chargement_text = scale_image_by(self.game_font.render(chargement, (255, 255, 255))[0], (0.8 * self.screen_factor[0], 0.8 * self.screen_factor[1]))
+            chargement_text = scale_image_by(self.game_font.render(chargement, (255, 255, 255))[0], 0.8)
             chargement_textRect = chargement_text.get_rect()
-            chargement_textRect.center = (round(640 * self.screen_factor[0]), round(680 * self.screen_factor[1]))
+            chargement_textRect.center = (640, 680)
 
             # Création du texte "controles" qui s'affiche au-dessus des touches du jouers
-            controles_text = scale_image_by(self.game_font.render("Contrôles:", (255, 255, 255))[0], self.screen_factor)
+            controles_text = self.game_font.render("Contrôles:", (255, 255, 255))[0]
 
             # Affichage des textes
             self.screen.blit(nom_text, nom_textRect)
             self.screen.blit(chargement_text, chargement_textRect)
-            self.screen.blit(controles_text, (round(960 * self.screen_factor[0]), round(200 * self.screen_factor[1])))
+            self.screen.blit(controles_text, (960, 200))
 
             # Affichage de Toad (pour présenter le mini-jeu)
-            self.screen.blit(scale_image_by(self.toad_shadow, (6 * self.screen_factor[0], 6 * self.screen_factor[1])), (round(114 * self.screen_factor[0]), round(535 * self.screen_factor[1])))
-            self.screen.blit(scale_image_by(self.toad[1], (5 * self.screen_factor[0], 5 * self.screen_factor[1])), (round(100 * self.screen_factor[0]), round(400 * self.screen_factor[1])))
-            self.screen.blit(scale_image_by(self.toad_bubble, (5 * self.screen_factor[0], 5 * self.screen_factor[1])), (round(240 * self.screen_factor[0]), round(150 * self.screen_factor[1])))
+            self.screen.blit(scale_image_by(self.toad_shadow, 6), (114, 535))
+            self.screen.blit(scale_image_by(self.toad[1], 5), (100, 400))
+            self.screen.blit(scale_image_by(self.toad_bubble, 5), (240, 150))
 
             # Affichage de la description
             for line in description:
-                description_text = scale_image_by(self.game_font.render(line, (0, 0, 0))[0], (0.7 * self.screen_factor[0], 0.7 * self.screen_factor[1]))
-                self.screen.blit(description_text, (round(260 * self.screen_factor[0]), round((170 + description.index(line) * 37) * self.screen_factor[1])))
+                description_text = scale_image_by(self.game_font.render(line, (0, 0, 0))[0], 0.7)
+                self.screen.blit(description_text, (260, 170 + description.index(line) * 37))
 
             # Création et affichage des touches du clavier pour le joueur
-            layout_joueur = scale_image_by(pygame.image.load(sep.join(["..", "data", "sprites", "minigames", "general", "layout_joueur.png"])), self.screen_factor)
-            self.screen.blit(layout_joueur, (round(930 * self.screen_factor[0]), round(300 * self.screen_factor[1])))
+            layout_joueur = charger_image(sep.join(["..", "data", "sprites", "minigames", "general", "layout_joueur.png"]))
+            self.screen.blit(layout_joueur, (930, 300))
 
             # Mise à jour de l'écran et limite de fps
-            pygame.display.flip()
+            presenter(self.screen)
             self.clock.tick(self.fps)
 
         # Lancement de l'intro du mini-jeu (si le joueur n'a pas fermé la fenêtre)
@@ -601,13 +598,13 @@ class MiniGame:
             self.start_game()
 
 
-    def start_game(self) -> None:
+    def init_partie(self) -> None:
         """
-        Cette méthode représente la phase de lancement du mini-jeu.
+        Cette méthode permet de créer les entités du mini-jeu à partir des infos envoyées par le serveur.
         """
 
         # Envoi d'une requête au serveur pour obtenir les infos de chaque joueur
-        infos_joueurs = json.loads(self.net.send("0|0"))["joueurs"]
+        infos_joueurs = self.net.etat_minijeu("0|0")["joueurs"]
 
         # Création des joueurs
         for ip in infos_joueurs.keys():
@@ -616,12 +613,21 @@ class MiniGame:
         # Initialisation de la liste des objets
         self.objets = [self.carapace] + self.buts + list(self.joueurs.values())
 
+
+    def start_game(self) -> None:
+        """
+        Cette méthode représente la phase de lancement du mini-jeu.
+        """
+
+        # Création des entités du mini-jeu
+        self.init_partie()
+
         # Initialisation des paramètres par défaut de la phase
         running = True
         prev_time = time.time()
 
         # Initialisation du texte start et de ses coordonnées de départ
-        start_image = pygame.image.load(sep.join(["..", "data", "sprites", "minigames", "general", "start.png"]))
+        start_image = charger_image(sep.join(["..", "data", "sprites", "minigames", "general", "start.png"]))
         start_image_x = -start_image.get_rect().w
         start_image_y = round((640 - start_image.get_rect().h) / 2)
 
@@ -641,10 +647,10 @@ class MiniGame:
 
                 # Changement de taille de la fenêtre
                 elif event.type == pygame.VIDEORESIZE:
-                    self.screen = pygame.display.set_mode(event.size, pygame.HWSURFACE|pygame.DOUBLEBUF|pygame.RESIZABLE)
+                    pygame.display.set_mode(event.size, pygame.HWSURFACE|pygame.DOUBLEBUF|pygame.RESIZABLE)
 
             # Envoie d'une requête au serveur pour obtenir son etat
-            etat = self.net.send("get_etat")
+            etat = self.net.send(requete(GET_ETAT))
             running = etat == "minigame_start"
 
             # Utilisation du moteur de jeu
@@ -655,17 +661,17 @@ class MiniGame:
             prev_time = time.time()
 
             # Affichage du texte start
-            self.screen.blit(scale_image_by(start_image, (4 * self.screen_factor[0], 4 * self.screen_factor[1])), (round(start_image_x * self.screen_factor[0]), round(start_image_y * self.screen_factor[1])))
+            self.screen.blit(scale_image_by(start_image, 4), (round(start_image_x), round(start_image_y)))
 
             # Arrête la phase d'intro si le texte sort de l'écran
             if not sent:
                 if start_image_x > 1280:
-                    sent = self.net.send("ready_for_next_state") == "ok"
+                    sent = self.net.send(requete(PRET)) == "ok"
 
                 # Si le texte se trouve au milieu de l'écran et que le timer n'est pas encore lancé
                 elif (start_image_x + 2000 * delta_time) > (1000 - start_image.get_rect().w) / 2 and cooldown == 0:
                     cooldown = time.time()
-                    pygame.mixer.Sound(sep.join(["..", "data", "sounds", "minigames", "start.ogg"])).play()
+                    charger_son(sep.join(["..", "data", "sounds", "minigames", "start.ogg"])).play()
 
                 # Si le timer a duré 0.5s ou qu'il n'est pas encore lancé
                 elif time.time() - cooldown > 0.5 or cooldown == 0:
@@ -674,14 +680,14 @@ class MiniGame:
                     start_image_x = round(start_image_x)
 
             # Mise à jour de l'écran et limite de fps
-            pygame.display.flip()
+            presenter(self.screen)
             self.clock.tick(self.fps)
 
         # Lancement du mini-jeu en lui même (si le joueur n'a pas fermé la fenêtre)
         if not self.quit:
 
             # Lancement du son de sifflet et la musique chargée
-            pygame.mixer.Sound(sep.join(["..", "data", "sounds", "minigames", "start_sifflet.ogg"])).play()
+            charger_son(sep.join(["..", "data", "sounds", "minigames", "start_sifflet.ogg"])).play()
             pygame.mixer.music.play(loops=-1)
 
             self.during_game()
@@ -705,10 +711,10 @@ class MiniGame:
 
                 # Changement de taille de la fenêtre
                 elif event.type == pygame.VIDEORESIZE:
-                    self.screen = pygame.display.set_mode(event.size, pygame.HWSURFACE|pygame.DOUBLEBUF|pygame.RESIZABLE)
+                    pygame.display.set_mode(event.size, pygame.HWSURFACE|pygame.DOUBLEBUF|pygame.RESIZABLE)
 
             # Envoie d'une requête au serveur pour obtenir son etat
-            etat = self.net.send("get_etat")
+            etat = self.net.send(requete(GET_ETAT))
             running = etat == "minigame_during"
 
             # Détection des inputs et réinitialisation des vecteurs de déplacement des objets
@@ -735,7 +741,7 @@ class MiniGame:
                 self.son_but.play()
 
             # Mise à jour de l'écran et limite de fps
-            pygame.display.flip()
+            presenter(self.screen)
             self.clock.tick(self.fps)
 
         # Lancement de l'affichage de fin (si le joueur n'a pas fermé la fenêtre)
@@ -756,10 +762,10 @@ class MiniGame:
 
         # Arrêt de la musique et son de fin
         pygame.mixer.music.stop()
-        pygame.mixer.Sound(sep.join(["..", "data", "sounds", "minigames", "finish.ogg"])).play()
+        charger_son(sep.join(["..", "data", "sounds", "minigames", "finish.ogg"])).play()
 
         # Initialisation du texte finish et de ses coordonnées de départ
-        finish_image = pygame.image.load(sep.join(["..", "data", "sprites", "minigames", "general", "finish.png"]))
+        finish_image = charger_image(sep.join(["..", "data", "sprites", "minigames", "general", "finish.png"]))
         finish_image_x = -finish_image.get_rect().w
         finish_image_y = round((640 - finish_image.get_rect().h) / 2)
 
@@ -779,10 +785,10 @@ class MiniGame:
 
                 # Changement de taille de la fenêtre
                 elif event.type == pygame.VIDEORESIZE:
-                    self.screen = pygame.display.set_mode(event.size, pygame.HWSURFACE|pygame.DOUBLEBUF|pygame.RESIZABLE)
+                    pygame.display.set_mode(event.size, pygame.HWSURFACE|pygame.DOUBLEBUF|pygame.RESIZABLE)
 
             # Envoie d'une requête au serveur pour obtenir son etat
-            etat = self.net.send("get_etat")
+            etat = self.net.send(requete(GET_ETAT))
             running = etat == "minigame_end"
 
             # Utilisation du moteur de jeu
@@ -793,12 +799,12 @@ class MiniGame:
             prev_time = time.time()
 
             # Affichage du texte finish
-            self.screen.blit(scale_image_by(finish_image, (4 * self.screen_factor[0], 4 * self.screen_factor[1])), (round(finish_image_x * self.screen_factor[0]), round(finish_image_y * self.screen_factor[1])))
+            self.screen.blit(scale_image_by(finish_image, 4), (round(finish_image_x), round(finish_image_y)))
 
             # Arrête la phase de fin au bout de 1.5s si le timer est déjà lancé
             if not sent:
                 if time.time() - cooldown > 1.5 and cooldown > 0:
-                    sent = self.net.send("ready_for_next_state") == "ok"
+                    sent = self.net.send(requete(PRET)) == "ok"
 
                 # Si le texte se trouve au milieu de l'écran et que le timer n'est pas encore lancé
                 elif (finish_image_x + 2000 * delta_time) > (1000 - finish_image.get_rect().w) / 2 and cooldown == 0:
@@ -810,7 +816,7 @@ class MiniGame:
                     finish_image_x = round(finish_image_x)
 
             # Mise à jour de l'écran et limite de fps
-            pygame.display.flip()
+            presenter(self.screen)
             self.clock.tick(self.fps)
 
         # Lancement de l'annonce des gagnants (si le joueur n'a pas fermé la fenêtre)
@@ -828,7 +834,7 @@ class MiniGame:
         running = True
 
         # Envoie d'une requête au serveur pour obtenir les infos du classement
-        classement = json.loads(self.net.send("0|0"))["classement"]
+        classement = self.net.etat_minijeu("0|0")["classement"]
 
         # On note tous les gagnants de la partie
         gagnants = []
@@ -841,13 +847,13 @@ class MiniGame:
 
         # Changement du texte et de la musique jouée selon différents cas
         if len(gagnants) == 0:
-            win_image = pygame.image.load(sep.join(["..", "data", "sprites", "minigames", "general", "tie.png"]))
+            win_image = charger_image(sep.join(["..", "data", "sprites", "minigames", "general", "tie.png"]))
             pygame.mixer.music.load(sep.join(["..", "data", "musics", "minigames", "draw.ogg"]))
         elif len(gagnants) > 1:
-            win_image = pygame.image.load(sep.join(["..", "data", "sprites", "minigames", "general", "wins.png"]))
+            win_image = charger_image(sep.join(["..", "data", "sprites", "minigames", "general", "wins.png"]))
             pygame.mixer.music.load(sep.join(["..", "data", "musics", "minigames", "win.ogg"]))
         else:
-            win_image = pygame.image.load(sep.join(["..", "data", "sprites", "minigames", "general", "win.png"]))
+            win_image = charger_image(sep.join(["..", "data", "sprites", "minigames", "general", "win.png"]))
             pygame.mixer.music.load(sep.join(["..", "data", "musics", "minigames", "win.ogg"]))
 
         # Timer de 5s
@@ -869,10 +875,10 @@ class MiniGame:
 
                 # Changement de taille de la fenêtre
                 elif event.type == pygame.VIDEORESIZE:
-                    self.screen = pygame.display.set_mode(event.size, pygame.HWSURFACE|pygame.DOUBLEBUF|pygame.RESIZABLE)
+                    pygame.display.set_mode(event.size, pygame.HWSURFACE|pygame.DOUBLEBUF|pygame.RESIZABLE)
 
             # Envoie d'une requête au serveur pour obtenir son etat
-            etat = self.net.send("get_etat")
+            etat = self.net.send(requete(GET_ETAT))
             running = etat == "minigame_winners"
 
             # Utilisation du moteur de jeu
@@ -886,7 +892,7 @@ class MiniGame:
 
             for gagnant in gagnants:
                 # Initialisation et positionnement du texte de chaque gagnant
-                image_gagnant = scale_image_by(pygame.image.load(sep.join(["..", "data", "sprites", "minigames", "general", gagnant + ".png"])), 4)
+                image_gagnant = charger_image(sep.join(["..", "data", "sprites", "minigames", "general", gagnant + ".png"]), 4)
                 image_rect = image_gagnant.get_rect()
                 image_rect.center = (640, 400)
 
@@ -895,23 +901,23 @@ class MiniGame:
                     image_rect.x = image_x
 
                 # Affichage du texte de chaque gagnant
-                self.screen.blit(scale_image_by(image_gagnant, self.screen_factor), (round(image_rect.x * self.screen_factor[0]), round(image_rect.y * self.screen_factor[1])))
+                self.screen.blit(image_gagnant, (image_rect.x, image_rect.y))
 
                 # On déplace le prochain texte 50 pixels plus loin
                 image_x += image_rect.w + 50
 
             # Positionnement du texte win
-            scaled_win = scale_image_by(win_image, (4 * self.screen_factor[0], 4 * self.screen_factor[1]))
+            scaled_win = scale_image_by(win_image, 4)
             win_rect = scaled_win.get_rect()
-            win_rect.center = (round(640 * self.screen_factor[0]), round(520 * self.screen_factor[1]))
+            win_rect.center = (640, 520)
 
             # Affichage du texte win
             self.screen.blit(scaled_win, win_rect)
 
             # Arrêt du script au bout du timer
             if cooldown - time.time() <= 0 and not sent:
-                sent = self.net.send("ready_for_next_state") == "ok"
+                sent = self.net.send(requete(PRET)) == "ok"
 
             # Mise à jour de l'écran et limite de fps
-            pygame.display.flip()
+            presenter(self.screen)
             self.clock.tick(self.fps)
\ No newline at end of file
@@ -5,10 +5,14 @@
 
 import json
 import socket
-import pygame
 from math import sqrt
 import time
 import random
+from threading import Condition
+
+from profiler import Profiler
+from protocole import TableRequetes, GET_ETAT, INPUTS, DESACTIVE_SON
+from moteur import Rect, instant_impact
 
 # ------/ Fonctions utiliatires \------
 
@@ -70,7 +74,7 @@ class Joueur:
 
             - frame (float): Indice du sprite à choisir.
 
-            - collision (pygame.Rect): Boîte de collision du joueur.
+            - collision (Rect): Boîte de collision du joueur.
         """
 
         # Tests du type des paramètres donnés
@@ -98,7 +102,7 @@ class Joueur:
         plateforme = 69
 
         # Boîte de collision du personnage
-        self.collision = pygame.Rect(0, 0, plateforme, plateforme - 10)
+        self.collision = Rect(0, 0, plateforme, plateforme - 10)
 
         # Initialisation des conditions du lancement des sons
         self.lancer_son_hit = False
@@ -207,7 +211,7 @@ class Joueur:
         for objet in objets:
             if objet != self:
                 # Pas de rect_x parce que le joueur est bloqué sur l'axe y
-                rect_y = pygame.Rect(self.collision.x, round(self.collision.y + self.velocity[1]), self.collision.w, self.collision.h)
+                rect_y = Rect(self.collision.x, round(self.collision.y + self.velocity[1]), self.collision.w, self.collision.h)
 
                 # On stoppe la vélocité du joueur si il collisionne avec une boîte de collision
                 for collision in objet.get_collisions():
@@ -237,10 +241,14 @@ class Carapace:
 
     # ------/ Constructeur \------
 
-    def __init__(self) -> None:
+    def __init__(self, horloge=time.time, rng=random) -> None:
         """
         Constructeur de la classe Carapace.
 
+        Attributs à définir:
+            - horloge (function): Fonction qui renvoie le temps actuel en secondes (time.time par défaut).
+            - rng (random.Random): Générateur aléatoire utilisé pour la direction (module random par défaut).
+
         Attributs internes:
             - pos (list): Position de la carapace.
             - velocity (list): Vélocité/Accélération de la carapace.
@@ -249,9 +257,12 @@ class Carapace:
 
             - cooldown_son (float): Délai entre chaque son.
 
-            - collision (pygame.Rect ou None): Boîte de collision de la carapace.
+            - collision (Rect ou None): Boîte de collision de la carapace.
         """
 
+        self.horloge = horloge
+        self.rng = rng
+
         # Caractéristiques principales
         self.pos = [0, 0]
         self.velocity = [0, 0]
@@ -265,7 +276,7 @@ class Carapace:
         self.cooldown_son = 0
 
         # Boîte de collision de la carapace
-        self.collision = pygame.Rect(0, 0, carapace, carapace)
+        self.collision = Rect(0, 0, carapace, carapace)
 
 
     # ------/ Getters \------
@@ -333,38 +344,62 @@ class Carapace:
         # Initialisation de la variable de son
         lancer_son = False
 
-        # Calcul des collisions pour chaque objets
-        for objet in objets:
-            if objet != self:
-                rect_x = pygame.Rect(round(self.collision.x + self.velocity[0]), self.collision.y, self.collision.w, self.collision.h)
-                rect_y = pygame.Rect(self.collision.x, round(self.collision.y + self.velocity[1]), self.collision.w, self.collision.h)
+        # Premier contact sur chaque axe (collision continue: même très rapide, la carapace ne traverse rien)
+        impacts = [None, None]
 
-                for collision in objet.get_collisions():
-                    # On stoppe la vélocité en x du joueur si il collisionne avec une boîte de collision en x
-                    if rect_x.colliderect(collision):
-                        self.velocity[0] = 0
+        # Seuls les objets dans la zone balayée par la carapace pendant ce tick peuvent être touchés
+        gauche = self.collision.x + min(0, self.velocity[0])
+        droite = self.collision.x + self.collision.w + max(0, self.velocity[0])
+        haut = self.collision.y + min(0, self.velocity[1])
+        bas = self.collision.y + self.collision.h + max(0, self.velocity[1])
 
-                        # On inverse sa direction en x et on ajoute 20 à sa vitesse
-                        self.direction[0] *= -1
-                        self.speed += 0.3
+        collisions = [collision for objet in objets if objet != self for collision in objet.get_collisions()
+                      if collision.x < droite and gauche < collision.x + collision.w and collision.y < bas and haut < collision.y + collision.h]
 
-                        # On met un cooldown de 0.2s ici pour éviter que le son se répète trop rapidement
-                        if self.cooldown_son - time.time() <= 0:
-                            lancer_son = True
-                            self.cooldown_son = 0.2 + time.time()
+        for axe in range(2):
+            deplacement = [self.velocity[0], 0] if axe == 0 else [0, self.velocity[1]]
 
-                    # On stoppe la vélocité en y du joueur si il collisionne avec une boîte de collision en y
-                    if rect_y.colliderect(collision):
-                        self.velocity[1] = 0
+            for collision in collisions:
+                impact = instant_impact(self.collision, deplacement, collision)
+                if impact is None or (impacts[axe] is not None and impact[0] >= impacts[axe]):
+                    continue
+
+                # Une carapace déjà dans un objet (un joueur qui avance dessus) peut en sortir si elle s'en éloigne
+                if impact[0] == 0:
+                    centre = self.collision.x + self.collision.w / 2 if axe == 0 else self.collision.y + self.collision.h / 2
+                    centre_objet = collision.x + collision.w / 2 if axe == 0 else collision.y + collision.h / 2
+                    if (centre - centre_objet) * self.velocity[axe] > 0:
+                        continue
+
+                impacts[axe] = impact[0]
+
+        # Sans contact sur un seul axe, le déplacement en diagonale peut encore accrocher le coin d'un objet (seul le
+        # premier objet touché, tous axes confondus, fait rebondir la carapace)
+        if impacts == [None, None]:
+            premier_impact = None
+
+            for collision in collisions:
+                impact = instant_impact(self.collision, self.velocity, collision)
+                if impact is not None and impact[1] != -1 and (premier_impact is None or impact[0] < premier_impact[0]):
+                    premier_impact = impact
+
+            if premier_impact is not None:
+                impacts[premier_impact[1]] = premier_impact[0]
 
-                        # On inverse sa direction en y et on ajoute 20 à sa vitesse
-                        self.direction[1] *= -1
-                        self.speed += 0.3
+        for axe in range(2):
+            if impacts[axe] is not None:
+                # La carapace avance jusqu'au contact (à un pixel près, pour ne pas chevaucher l'objet une fois arrondie)
+                distance = max(0, abs(self.velocity[axe]) * impacts[axe] - 1)
+                self.velocity[axe] = distance if self.velocity[axe] > 0 else -distance
 
-                        # On met un cooldown de 0.2s ici pour éviter que le son se répète trop rapidement
-                        if self.cooldown_son - time.time() <= 0:
-                            lancer_son = True
-                            self.cooldown_son = 0.2 + time.time()
+                # On inverse sa direction sur cet axe et on augmente sa vitesse
+                self.direction[axe] *= -1
+                self.speed += 0.3
+
+                # On met un cooldown de 0.2s ici pour éviter que le son se répète trop rapidement
+                if self.cooldown_son - self.horloge() <= 0:
+                    lancer_son = True
+                    self.cooldown_son = 0.2 + self.horloge()
 
         return lancer_son
 
@@ -396,8 +431,8 @@ class Carapace:
         directions = ([1, 1], [1, 0.5], [0.5, 1])
 
         # On en choisit une aléatoirement puis on choisit le sens où elle va aller
-        self.direction = random.choice(directions)
-        self.direction[0] *= random.choice((1, -1))
+        self.direction = self.rng.choice(directions)
+        self.direction[0] *= self.rng.choice((1, -1))
 
 
 
@@ -415,7 +450,7 @@ class Collider:
             - taille (list): Taille du collider.
 
         Attributs internes:
-            - collision (pygame.Rect): Boîte de collision du collider.
+            - collision (Rect): Boîte de collision du collider.
         """
 
         # Test des types des paramètres donnés
@@ -427,7 +462,7 @@ class Collider:
         self.taille = taille
 
         # Boîte de collision
-        self.collision = pygame.Rect(self.pos[0], self.pos[1], self.taille[0], self.taille[1])
+        self.collision = Rect(self.pos[0], self.pos[1], self.taille[0], self.taille[1])
 
 
     # ------/ Getter \------
@@ -463,8 +498,8 @@ class But:
         but = 100
 
         # Boîte de collision du but
-        self.collisions = [pygame.Rect(self.pos[0], self.pos[1] - 48, but, 133),
-                           pygame.Rect(self.pos[0], self.pos[1] + 513 - 133, but, 133)]
+        self.collisions = [Rect(self.pos[0], self.pos[1] - 48, but, 133),
+                           Rect(self.pos[0], self.pos[1] + 513 - 133, but, 133)]
 
 
     # ------/ Getter \------
@@ -479,7 +514,7 @@ class But:
 
 # Classe du serveur
 class Server:
-    def __init__(self, server_socket: socket.socket) -> None:
+    def __init__(self, server_socket: socket.socket, profiling: bool = False, horloge=time.time, rng=random, silencieux: bool = False) -> None:
         """
         Documentation ici
             - timer (float): Durée du mini-jeu.
@@ -488,7 +523,19 @@ class Server:
         """
 
         self.server_socket = server_socket
-        print("Initialisation du mini-jeu: Speed Hockey")
+
+        # Horloge et générateur aléatoire du mini-jeu (remplaçables pour simuler une partie sans réseau)
+        self.horloge = horloge
+        self.rng = rng
+
+        # Les copies du mini-jeu (lockstep, simulation) n'écrivent pas leurs messages dans la console
+        self.silencieux = silencieux
+
+        # Fonction du lobby appelée quand le nombre de joueurs prêts change (None hors du lobby)
+        self.notifier_lobby = None
+
+        if not self.silencieux:
+            print("Initialisation du mini-jeu: Speed Hockey")
 
         self.joueurs = {}
         self.inputs_joueurs = {}
@@ -496,10 +543,10 @@ class Server:
 
         # Initialisation d'un ordre aléatoire pour les mini-jeux
         self.ordre_minijeu = [i for i in range(4)]
-        random.shuffle(self.ordre_minijeu)
+        self.rng.shuffle(self.ordre_minijeu)
 
         # La position et la taille des colliders sont basés sur l'image du background
-        self.carapace = Carapace()
+        self.carapace = Carapace(self.horloge, self.rng)
         self.carapace.set_pos([605, 344])
 
         self.colliders = [Collider([87, 108], [1106, 21]), Collider([87, 641], [1106, 28])]
@@ -514,6 +561,20 @@ class Server:
         self.classement = {}
 
         self.fps = 60
+        self.profiler = Profiler("Speed Hockey", self.fps, profiling)
+
+        # Requêtes du mini-jeu, chacune trouvée directement par son opcode
+        self.requetes = TableRequetes("Speed Hockey")
+        self.requetes.enregistrer(GET_ETAT, self.requete_get_etat)
+        self.requetes.enregistrer(DESACTIVE_SON, self.requete_desactive_son)
+        self.requetes.enregistrer(INPUTS, self.requete_inputs)
+
+        # Dernier état encodé en json (publié une fois par tick et partagé par tous les clients)
+        self.snapshot = None
+
+        # Condition qui protège les joueurs prêts et réveille la boucle du mini-jeu quand un joueur est prêt
+        self.condition = Condition()
+
         self.current_fps = 0
         self.is_running = False
 
@@ -536,49 +597,120 @@ class Server:
         return self.joueurs[address]
 
     def add_player(self, address: str, perso: str, ia: bool):
-        id_minijeu = self.ordre_minijeu[len(self.joueurs)]
-        self.joueurs[address] = Joueur(perso, id_minijeu, ia, "left" if id_minijeu < 2 else "right")
+        with self.condition:
+            id_minijeu = self.ordre_minijeu[len(self.joueurs)]
+            self.joueurs[address] = Joueur(perso, id_minijeu, ia, "left" if id_minijeu < 2 else "right")
+
+            # Les ia sont automatiquement prêtes
+            if ia:
+                self.nb_joueurs_prets += 1
+
+            self.condition.notify_all()
+
+
+    def get_infos(self) -> dict:
+        """
+        Cette méthode permet de récupérer l'état du mini-jeu tel qu'il est envoyé aux clients.
+
+        Renvois:
+            - dict: Informations sur les joueurs et les entités du mini-jeu.
+        """
+
+        infos_joueurs = {joueur: {
+            "perso": self.joueurs[joueur].get_perso(),
+            "side": self.joueurs[joueur].get_side(),
+            "pos": self.joueurs[joueur].get_pos(),
+            "frame": self.joueurs[joueur].get_frame(),
+            "lancer_son_hit": self.joueurs[joueur].get_lancer_son_hit(),
+            "lancer_son_but": self.joueurs[joueur].get_lancer_son_but()
+        } for joueur in self.joueurs.keys()}
+
+        return {"joueurs": infos_joueurs, "carapace": self.carapace.get_pos(), "score": self.score, "timer": round(self.timer - self.horloge()), "classement": self.classement, "fps": self.current_fps}
 
 
     def client_thread(self, address: str, request: str) -> str:
-            if request == "get_etat":
-                reply = self.etat
+        # L'opcode de la requête (son premier octet) donne directement la fonction qui y répond
+        reply = self.requetes.traiter(address, request)
+        return "not_found" if reply is None else reply
 
-            elif request == "desactive_son_hit":
-                self.joueurs[address].set_lancer_son_hit(False)
-                reply = "ok"
 
-            elif request == "desactive_son_but":
-                self.joueurs[address].set_lancer_son_but(False)
-                reply = "ok"
+    def requete_get_etat(self, address: str, donnees: str) -> str:
+        return self.etat
 
-            elif "|" in request:
-                # Si la requête c'est ça: 1|1
-                self.inputs_joueurs[address] = [int(coord) for coord in request.split("|")]
 
-                infos_joueurs = {joueur: {
-                    "perso": self.joueurs[joueur].get_perso(),
-                    "side": self.joueurs[joueur].get_side(),
-                    "pos": self.joueurs[joueur].get_pos(),
-                    "frame": self.joueurs[joueur].get_frame(),
-                    "lancer_son_hit": self.joueurs[joueur].get_lancer_son_hit(),
-                    "lancer_son_but": self.joueurs[joueur].get_lancer_son_but()
-                } for joueur in self.joueurs.keys()}
+    def requete_desactive_son(self, address: str, donnees: str) -> str:
+        if donnees == "hit":
+            self.joueurs[address].set_lancer_son_hit(False)
+        elif donnees == "but":
+            self.joueurs[address].set_lancer_son_but(False)
+        return "ok"
 
-                reply = json.dumps({"joueurs": infos_joueurs, "carapace": self.carapace.get_pos(), "score": self.score, "timer": round(self.timer - time.time()), "classement": self.classement, "fps": self.current_fps})
 
-            else:
-                reply = "not_found"
+    def requete_inputs(self, address: str, donnees: str) -> str:
+        # Si les données c'est ça: 1|1
+        with self.profiler.mesure("inputs"):
+            self.inputs_joueurs[address] = [int(coord) for coord in donnees.split("|")]
 
-            return reply
+        # Tous les clients reçoivent le même état, encodé une seule fois par tick
+        return self.get_snapshot()
 
 
     def changer_etat(self, new_etat):
-        self.etat = new_etat
-        for ip in self.joueurs.keys():
-            self.joueurs[ip].set_ready(False)
+        with self.condition:
+            self.etat = new_etat
+            for ip in self.joueurs.keys():
+                self.joueurs[ip].set_ready(False)
+
+            # Seules les ia restent prêtes
+            self.nb_joueurs_prets = len([joueur for joueur in self.joueurs.values() if joueur.get_ia()])
+            self.condition.notify_all()
+
+        if not self.silencieux:
+            print("[Speed Hockey] Passé à l'état", self.etat)
+
+        self.notifier_prets()
+
+
+    def marquer_pret(self, address: str) -> None:
+        """
+        Cette méthode indique qu'un joueur est prêt pour l'état suivant (appelée par le thread de son client).
+
+        Paramètres:
+            - address (str): Adresse du joueur.
+        """
+
+        with self.condition:
+            if not self.joueurs[address].get_ready():
+                self.joueurs[address].set_ready(True)
+
+                # Le compteur est mis à jour ici plutôt que recompté à chaque tick
+                if not self.joueurs[address].get_ia():
+                    self.nb_joueurs_prets += 1
+
+                self.condition.notify_all()
+
+        self.notifier_prets()
+
+
+    def notifier_prets(self) -> None:
+        """
+        Cette méthode prévient le lobby que le nombre de joueurs prêts a changé (il fait partie de ses informations).
+        Elle doit être appelée sans self.condition.
+        """
+
+        if self.notifier_lobby is not None:
+            self.notifier_lobby()
+
+
+    def tous_prets(self) -> bool:
+        """
+        Cette méthode indique si tous les joueurs sont prêts pour l'état suivant.
+
+        Renvois:
+            - bool: True si tous les joueurs sont prêts, sinon False.
+        """
 
-        print("[Speed Hockey] Passé à l'état", self.etat)
+        return len(self.joueurs) > 0 and self.nb_joueurs_prets == len(self.joueurs)
 
 
     def load_game(self):
@@ -596,7 +728,7 @@ class Server:
 
     def during_game(self):
         # Le mini-jeu s'arrête si le timer s'arrête ou si l'une des deux équipes a 3 points
-        if self.timer - time.time() <= 0:
+        if self.timer - self.horloge() <= 0:
             # On immobilise la carapace à la fin du mini-jeu
             self.carapace.set_direction([0, 0])
 
@@ -617,13 +749,13 @@ class Server:
             self.timer = 0
 
         # Calcul de la physique de la carapace
-        self.carapace.calculer_velocite()
+        with self.profiler.mesure("physique"):
+            self.carapace.calculer_velocite()
+            lancer_son_hit = self.carapace.calculer_collisions(self.objets)
+            self.carapace.appliquer_velocite()
 
-        lancer_son_hit = self.carapace.calculer_collisions(self.objets)
         lancer_son_but = False
 
-        self.carapace.appliquer_velocite()
-
         # Si la carapace rentre dans le but vert
         if self.carapace.get_pos()[0] > self.buts[1].get_pos()[0]:
             # Réinitialisation de la carapace
@@ -649,56 +781,58 @@ class Server:
         # Comportement des ia
         for joueur in self.joueurs.keys():
             if self.joueurs[joueur].get_ia():
-                # On réinitialise leurs inputs
-                self.inputs_joueurs[joueur] = [0, 0]
-
-                # Joueur sur la ligne rouge la plus proche du centre
-                if self.joueurs[joueur].get_pos()[0] == 380:
-
-                    # L'ia suit la carapace si elle se trouve devant elle
-                    if self.carapace.get_pos()[0] > self.joueurs[joueur].get_pos()[0]:
+                with self.profiler.mesure("ia"):
+                    # On réinitialise leurs inputs
+                    self.inputs_joueurs[joueur] = [0, 0]
+
+                    # Joueur sur la ligne rouge la plus proche du centre
+                    if self.joueurs[joueur].get_pos()[0] == 380:
+
+                        # L'ia suit la carapace si elle se trouve devant elle
+                        if self.carapace.get_pos()[0] > self.joueurs[joueur].get_pos()[0]:
+                            if self.joueurs[joueur].get_pos()[1] < self.carapace.get_pos()[1] + 25:
+                                self.inputs_joueurs[joueur][1] += 1
+                            elif self.joueurs[joueur].get_pos()[1] > self.carapace.get_pos()[1] - 25:
+                                self.inputs_joueurs[joueur][1] -= 1
+
+                        # Sinon l'ia s'éloigne le plus possible de la carapace
+                        else:
+                            if self.joueurs[joueur].get_pos()[1] < self.carapace.get_pos()[1]:
+                                self.inputs_joueurs[joueur][1] -= 1
+                            elif self.joueurs[joueur].get_pos()[1] > self.carapace.get_pos()[1]:
+                                self.inputs_joueurs[joueur][1] += 1
+
+                    # Joueur sur la ligne verte la plus proche du centre
+                    elif self.joueurs[joueur].get_pos()[0] == 832:
+
+                        # L'ia suit la carapace si elle se trouve devant elle
+                        if self.carapace.get_pos()[0] < self.joueurs[joueur].get_pos()[0]:
+                            if self.joueurs[joueur].get_pos()[1] < self.carapace.get_pos()[1] + 25:
+                                self.inputs_joueurs[joueur][1] += 1
+                            elif self.joueurs[joueur].get_pos()[1] > self.carapace.get_pos()[1] - 25:
+                                self.inputs_joueurs[joueur][1] -= 1
+
+                        # Sinon l'ia s'éloigne le plus possible de la carapace
+                        else:
+                            if self.joueurs[joueur].get_pos()[1] < self.carapace.get_pos()[1]:
+                                self.inputs_joueurs[joueur][1] -= 1
+                            elif self.joueurs[joueur].get_pos()[1] > self.carapace.get_pos()[1]:
+                                self.inputs_joueurs[joueur][1] += 1
+
+
+                    # Joueur sur la ligne la plus éloignée du centre (rouge et verte)
+                    elif self.joueurs[joueur].get_pos()[0] == 180 or self.joueurs[joueur].get_pos()[0] == 1032:
+                        # L'ia suit la carapace quoi qu'il arrive
                         if self.joueurs[joueur].get_pos()[1] < self.carapace.get_pos()[1] + 25:
                             self.inputs_joueurs[joueur][1] += 1
                         elif self.joueurs[joueur].get_pos()[1] > self.carapace.get_pos()[1] - 25:
                             self.inputs_joueurs[joueur][1] -= 1
 
-                    # Sinon l'ia s'éloigne le plus possible de la carapace
-                    else:
-                        if self.joueurs[joueur].get_pos()[1] < self.carapace.get_pos()[1]:
-                            self.inputs_joueurs[joueur][1] -= 1
-                        elif self.joueurs[joueur].get_pos()[1] > self.carapace.get_pos()[1]:
-                            self.inputs_joueurs[joueur][1] += 1
-
-                # Joueur sur la ligne verte la plus proche du centre
-                elif self.joueurs[joueur].get_pos()[0] == 832:
-
-                    # L'ia suit la carapace si elle se trouve devant elle
-                    if self.carapace.get_pos()[0] < self.joueurs[joueur].get_pos()[0]:
-                        if self.joueurs[joueur].get_pos()[1] < self.carapace.get_pos()[1] + 25:
-                            self.inputs_joueurs[joueur][1] += 1
-                        elif self.joueurs[joueur].get_pos()[1] > self.carapace.get_pos()[1] - 25:
-                            self.inputs_joueurs[joueur][1] -= 1
-
-                    # Sinon l'ia s'éloigne le plus possible de la carapace
-                    else:
-                        if self.joueurs[joueur].get_pos()[1] < self.carapace.get_pos()[1]:
-                            self.inputs_joueurs[joueur][1] -= 1
-                        elif self.joueurs[joueur].get_pos()[1] > self.carapace.get_pos()[1]:
-                            self.inputs_joueurs[joueur][1] += 1
-
-
-                # Joueur sur la ligne la plus éloignée du centre (rouge et verte)
-                elif self.joueurs[joueur].get_pos()[0] == 180 or self.joueurs[joueur].get_pos()[0] == 1032:
-                    # L'ia suit la carapace quoi qu'il arrive
-                    if self.joueurs[joueur].get_pos()[1] < self.carapace.get_pos()[1] + 25:
-                        self.inputs_joueurs[joueur][1] += 1
-                    elif self.joueurs[joueur].get_pos()[1] > self.carapace.get_pos()[1] - 25:
-                        self.inputs_joueurs[joueur][1] -= 1
-
             # Calcul de la physique des joueurs
-            self.joueurs[joueur].calculer_velocite(self.inputs_joueurs[joueur])
-            self.joueurs[joueur].calculer_collisions(self.objets)
-            self.joueurs[joueur].appliquer_velocite()
+            with self.profiler.mesure("physique"):
+                self.joueurs[joueur].calculer_velocite(self.inputs_joueurs[joueur])
+                self.joueurs[joueur].calculer_collisions(self.objets)
+                self.joueurs[joueur].appliquer_velocite()
 
             # Indique au client s'il peut lancer le son correspondant
             if lancer_son_hit:
@@ -742,52 +876,114 @@ class Server:
         self.changer_etat(self.etats[self.etats.index(self.etat) + 1])
 
 
-    def run(self, clock) -> None:
-        self.is_running = True
+    def maj_etats(self) -> None:
+        """
+        Cette méthode permet de passer à l'état suivant du mini-jeu lorsque tous les joueurs sont prêts.
+        """
 
-        print("Lancement du mini-jeu: Speed Hockey")
-        while self.is_running:
-            # On récupère le nombre de joueurs prêts (les ia sont automatiquement prêts)
-            self.nb_joueurs_prets = len([joueur for joueur in self.joueurs.keys() if self.joueurs[joueur].get_ready() or self.joueurs[joueur].get_ia()])
+        # Lorsque tous les joueurs sont prêts (nb_joueurs_prets est tenu à jour par marquer_pret et changer_etat)
+        if self.tous_prets():
+            # On finalise la création des joueurs avant que le jeu commence
+            if self.etat == "minigame_load":
+                self.load_game()
 
-            # Lorsque tous les joueurs sont prêts
-            if len(self.joueurs.keys()) > 0 and self.nb_joueurs_prets == len(self.joueurs.keys()):
-                # On finalise la création des joueurs avant que le jeu commence
-                if self.etat == "minigame_load":
-                    self.load_game()
+            # Calcule le classement final
+            if self.etat == "minigame_end":
+                self.calculate_score()
 
-                # Calcule le classement final
-                if self.etat == "minigame_end":
-                    self.calculate_score()
+            # Si on a fini le mini-jeu, on stoppe ce serveur
+            if self.etat == "minigame_winners":
+                self.is_running = False
 
-                # Si on a fini le mini-jeu, on stoppe ce serveur
-                if self.etat == "minigame_winners":
-                    self.is_running = False
+            # Sinon on passe à l'état suivant
+            else:
+                self.changer_etat(self.etats[self.etats.index(self.etat) + 1])
 
-                # Sinon on passe à l'état suivant
-                else:
-                    self.changer_etat(self.etats[self.etats.index(self.etat) + 1])
+            if self.etat == "minigame_during":
+                # Réinitialisation de la carapace
+                self.carapace.reset()
 
-                if self.etat == "minigame_during":
-                    # Réinitialisation de la carapace
-                    self.carapace.reset()
+                # Lancement du timer
+                self.timer = self.horloge() + self.timer
 
-                    # Lancement du timer
-                    self.timer = time.time() + self.timer
 
-            # Calcul des frames pour la vitesse d'animation des personnages
-            if self.etat != "minigame_load" and self.etat != "minigame_select":
-                for joueur in self.joueurs.keys():
-                    frame = self.joueurs[joueur].get_frame() + 0.09
+    def maj_physique(self) -> None:
+        """
+        Cette méthode permet de calculer les animations et la physique des entités du mini-jeu.
+        """
 
-                    self.joueurs[joueur].set_frame(frame)
+        # Calcul des frames pour la vitesse d'animation des personnages
+        for joueur in self.joueurs.keys():
+            frame = self.joueurs[joueur].get_frame() + 0.09
 
-            # Exécution du code qui gère le mini-jeu
-            if self.etat == "minigame_during":
+            self.joueurs[joueur].set_frame(frame)
+
+
+    def tick(self) -> None:
+        """
+        Cette méthode permet d'exécuter un tick du serveur, chaque phase étant mesurée par le profiler.
+        """
+
+        with self.profiler.mesure("etats"):
+            self.maj_etats()
+
+        if self.etat != "minigame_load" and self.etat != "minigame_select":
+            with self.profiler.mesure("physique"):
+                self.maj_physique()
+
+        # Exécution du code qui gère le mini-jeu (le comportement des ia et la physique qu'il calcule sont
+        # mesurés à part, dans leurs propres phases)
+        if self.etat == "minigame_during":
+            with self.profiler.mesure("logique"):
                 self.during_game()
 
-            if self.etat == "minigame_score":
-                self.calculate_score()
+        if self.etat == "minigame_score":
+            self.calculate_score()
+
+        # L'état du tick est encodé une seule fois, quel que soit le nombre de clients
+        with self.profiler.mesure("serialisation"):
+            self.publier_snapshot()
+
+
+    def publier_snapshot(self) -> None:
+        """
+        Cette méthode encode l'état du mini-jeu et remplace d'un coup celui envoyé aux clients
+        (la chaîne précédente n'est jamais modifiée, les threads des clients peuvent donc l'envoyer sans verrou).
+        """
+
+        self.snapshot = json.dumps(self.get_infos())
+
+
+    def get_snapshot(self) -> str:
+        """
+        Cette méthode permet de récupérer le dernier état encodé du mini-jeu.
+
+        Renvois:
+            - str: État du mini-jeu en json (encodé immédiatement si aucun tick n'a encore été exécuté).
+        """
+
+        snapshot = self.snapshot
+
+        if snapshot is None:
+            snapshot = json.dumps(self.get_infos())
+
+        return snapshot
+
+
+    def run(self, clock) -> None:
+        self.is_running = True
+
+        if not self.silencieux:
+            print("Lancement du mini-jeu: Speed Hockey")
+        while self.is_running:
+            # Pendant le choix et le chargement du mini-jeu rien ne bouge, on attend donc que les joueurs soient prêts
+            if self.etat == "minigame_select" or self.etat == "minigame_load":
+                with self.condition:
+                    self.condition.wait_for(self.tous_prets, timeout=1)
+
+            self.profiler.debut_tick()
+            self.tick()
+            self.profiler.fin_tick()
 
             self.current_fps = clock.get_fps()
             clock.tick(self.fps)
\ No newline at end of file
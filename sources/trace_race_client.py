@@ -9,9 +9,79 @@ from math import floor
 import time
 from os import sep
 
-from utils import Network, scale_image_by
+from utils import Network, scale_image_by, presenter
+from hud import HUD
+from protocole import requete, GET_ETAT, PRET, TAILLE_JOUEURS, POURCENTAGES, GET_IDS_MINIJEU
+from traceur import TRACEUR
+from cache_ressources import charger_image, charger_son
 import json
 
+# ------/ Constantes \------
+
+# Sprite de chaque couleur de point, chargé une seule fois et partagé par tous les points (un tracé en compte des milliers)
+SPRITES_POINTS = {}
+
+# ------/ Fonctions utiliatires \------
+
+def calculer_pourcentages(traces: dict, bg_traces: pygame.Surface) -> tuple: # type: ignore
+    """
+    Cette fonction permet de calculer le pourcentage de réussite de chaque joueur (part du tracé de référence repassée).
+
+    Paramètres:
+        - traces (dict): Groupe de sprites (points) du tracé de chaque joueur.
+        - bg_traces (pygame.Surface): Image des tracés de référence.
+    Renvois:
+        - tuple: Le tracé de chaque joueur regroupé en une seule image (dict) et le pourcentage de chaque joueur (dict).
+    """
+
+    # Tests du type des paramètres
+    assert type(traces) == dict, "Erreur: Le 1er paramètre (traces) n'est pas un dictionnaire."
+    assert type(bg_traces) == pygame.Surface, "Erreur: Le 2ème paramètre (bg_traces) n'est pas une surface pygame."
+
+    # Initialisation des tracés dessinés par chaque joueurs
+    made_traces = {joueur: pygame.Surface((bg_traces.get_rect().w, bg_traces.get_rect().h), pygame.SRCALPHA) for joueur in traces.keys()}
+
+    for joueur in traces.keys():
+        for sprite in traces[joueur]:
+            # On regroupe chaque point dans un seul sprite de tracé
+            made_traces[joueur].blit(sprite.image, (sprite.rect.x + 20, sprite.rect.y))
+
+    # Masque de chaque tracé de chaque joueur
+    made_traces_masks = {joueur: pygame.mask.from_surface(made_traces[joueur]) for joueur in traces.keys()}
+
+    # Masque des tracés sur le terrain
+    bg_traces_mask = pygame.mask.from_surface(bg_traces)
+
+    # Nombre de pixels repassés par le joueur
+    # (overlap_area renvoie le nombre de pixels qui se superposent entre deux masques)
+    nb_pixels_joueurs = {joueur: made_traces_masks[joueur].overlap_area(bg_traces_mask, (0, 0)) for joueur in traces.keys()}
+
+    # On convertit l'image des tracés du terrain en tableau facilement compréhensible par le code
+    bg_traces_tab = pygame.PixelArray(bg_traces)
+
+    # Ou sinon je pouvais juste mettre nb_pixels_ligne = 7230 directement mais c'est plus intuitif de le calculer nous même
+    nb_pixels_ligne = 0
+
+    # Sur toute les dimensions de l'image:
+    for i in range(bg_traces.get_rect().w):
+        for j in range(bg_traces.get_rect().h):
+
+            # On compte chaque pixel qui n'est pas vide
+            if bg_traces_tab[i, j] != 0:
+                nb_pixels_ligne += 1
+
+    # On suprime le tableau de pixel (sinon on ne peut plus afficher l'image)
+    bg_traces_tab.close()
+
+    # On divise par 4 parce qu'il y a 4 lignes dans l'image
+    nb_pixels_ligne = round(nb_pixels_ligne / 4)
+
+    # On stocke les pourcentages de réussite de chaque joueur
+    pourcentages = {joueur: round((nb_pixels_joueurs[joueur] / nb_pixels_ligne) * 100, 1) for joueur in traces.keys()}
+
+    return made_traces, pourcentages
+
+
 # ------/ Classes \------
 
 # Classe du joueur
@@ -65,8 +135,8 @@ class Joueur:
 
         # Définition des sprites automatiquement
         self.sprites = {
-            "trace": [scale_image_by(pygame.image.load(sep.join([self.sprites_directory, "trace" + str(i) + ".png"])), 3) for i in range(8)],
-            "idle": scale_image_by(pygame.image.load(sep.join([self.sprites_directory, "walk_right0.png"])), 3)
+            "trace": [charger_image(sep.join([self.sprites_directory, "trace" + str(i) + ".png"]), 3) for i in range(8)],
+            "idle": charger_image(sep.join([self.sprites_directory, "walk_right0.png"]), 3)
         }
 
         # Initialisation / positionnement du sprite actuel et de la frame choisie
@@ -74,11 +144,11 @@ class Joueur:
         self.sprite_pos = list(self.pos)
 
         # Initialisation et positionnement du stylo
-        self.pen = scale_image_by(pygame.image.load(sep.join(["..", "data", "sprites", "minigames", "trace_race", self.color + "_pen.png"])), 3)
+        self.pen = charger_image(sep.join(["..", "data", "sprites", "minigames", "trace_race", self.color + "_pen.png"]), 3)
         self.pen_pos = list(self.pos)
 
         # Initialisation et positionnement de l'ombre
-        self.shadow = scale_image_by(pygame.image.load(sep.join([self.sprites_directory, "shadow.png"])), 3)
+        self.shadow = charger_image(sep.join([self.sprites_directory, "shadow.png"]), 3)
         self.shadow_pos = list(self.pos)
 
         # Initialisation de la taille du joueur (uniquement fournie au serveur)
@@ -167,18 +237,15 @@ class Joueur:
         # Tests des types de variables
         assert type(screen) == pygame.Surface, "Erreur: Le 1er paramètre (screen) n'est pas une surface pygame."
 
-        # Initialisation des facteurs pour la taille de l'écran
-        screen_factor = ((screen.get_rect().size[0] / 1280), (screen.get_rect().size[1] / 720))
-
         # Affichage de l'ombre du joueur
-        screen.blit(scale_image_by(self.shadow, screen_factor), (round(self.shadow_pos[0] * screen_factor[0]), round(self.shadow_pos[1] * screen_factor[1])))
+        screen.blit(self.shadow, (round(self.shadow_pos[0]), round(self.shadow_pos[1])))
 
         # Affiche le crayon uniquement si le joueur dessine
         if self.is_drawing:
-            screen.blit(scale_image_by(self.pen, screen_factor), (round(self.pen_pos[0] * screen_factor[0]), round(self.pen_pos[1] * screen_factor[1])))
+            screen.blit(self.pen, (round(self.pen_pos[0]), round(self.pen_pos[1])))
 
         # Affichage du sprite du joueur
-        screen.blit(scale_image_by(self.sprite, screen_factor), (round(self.pos[0] * screen_factor[0]), round(self.pos[1] * screen_factor[1])))
+        screen.blit(self.sprite, (round(self.pos[0]), round(self.pos[1])))
 
 
 
@@ -196,7 +263,7 @@ class Point(pygame.sprite.Sprite):
             - color (str): Couleur du point.
 
         Attributs internes:
-            - points (dict): Sprite de chaque couleur de point.
+            - points (dict): Sprite de chaque couleur de point (SPRITES_POINTS).
             - image (pygame.Surface): Sprite du point (hérité du parent).  
             - rect (pygame.Rect): Rectangle créé à partir du point (hérité du parent).  
         """
@@ -211,14 +278,12 @@ class Point(pygame.sprite.Sprite):
 
         self.base_pos = pos
 
-        # Sprites de chaque point
-        minigame_directory = sep.join(["..", "data", "sprites", "minigames", "trace_race"])
-        self.points = {
-            "red": pygame.image.load(sep.join([minigame_directory, "red_point.png"])),
-            "blue": pygame.image.load(sep.join([minigame_directory, "blue_point.png"])),
-            "green": pygame.image.load(sep.join([minigame_directory, "green_point.png"])),
-            "yellow": pygame.image.load(sep.join([minigame_directory, "yellow_point.png"]))
-        }
+        # Sprites de chaque point (chargés par le premier point créé)
+        if len(SPRITES_POINTS) == 0:
+            minigame_directory = sep.join(["..", "data", "sprites", "minigames", "trace_race"])
+            SPRITES_POINTS.update({color: charger_image(sep.join([minigame_directory, color + "_point.png"])) for color in ["red", "blue", "green", "yellow"]})
+
+        self.points = SPRITES_POINTS
 
         # Sprite actuel
         self.image = self.points[color]
@@ -250,15 +315,12 @@ class Point(pygame.sprite.Sprite):
             - screen (pygame.Surface): L'écran de jeu de pygame..
         """
 
-        # Initialisation des facteurs pour la taille de l'écran
-        screen_factor = ((screen.get_rect().size[0] / 1280), (screen.get_rect().size[1] / 720))
-
         # Tests du type de screen
         assert type(screen) == pygame.Surface, "Erreur: Le paramètre donné (screen) n'est pas une surface pygame."
 
         # On ne dessine pas les points s'il se trouvent en dehors de l'écran (plus d'optimisation)
         if self.rect.x > -10 and self.rect.x < 1280:
-            screen.blit(scale_image_by(self.image, screen_factor), (round(self.rect.x * screen_factor[0]), round(self.rect.y * screen_factor[1])))
+            screen.blit(self.image, (self.rect.x, self.rect.y))
 
 
 
@@ -278,10 +340,10 @@ class MiniGame:
 
         Attributs internes:
             - quit (bool): Variable qui permet de détecter si le joueur a manuellement fermé le jeu.
-            - screen_factor: Les multiplicateurs pour la taille de l'écran.
 
             - show_fps (bool): Paramètre de débug permettant d'afficher les fps du client.
             - show_server_fps (bool): Paramètre de débug permettant d'afficher les fps du serveur.
+            - memoire (GestionnaireMemoire): Suivi de la mémoire du client (usage affiché avec les fps).
 
             - fps_font (pygame.freetype.Font): Police d'écriture pour les fps.
             - game_font (pygame.freetype.Font): Police d'écriture principale du mini-jeu.
@@ -321,7 +383,6 @@ class MiniGame:
         self.fps = fps
 
         self.quit = False
-        self.screen_factor = (0, 0)
 
         # Paramètres de débug
         self.show_fps = True
@@ -336,10 +397,10 @@ class MiniGame:
         self.objets = []
 
         # Sprites de toad (pour le chargement)
-        self.toad = [pygame.image.load(sep.join(["..", "data", "sprites", "minigames", "general", "toad", "toad.png"])),
-                     pygame.image.load(sep.join(["..", "data", "sprites", "minigames", "general", "toad", "toad_open.png"]))]
-        self.toad_shadow = pygame.image.load(sep.join(["..", "data", "sprites", "minigames", "general", "toad", "shadow.png"]))
-        self.toad_bubble = pygame.image.load(sep.join(["..", "data", "sprites", "minigames", "general", "toad", "bubble.png"]))
+        self.toad = [charger_image(sep.join(["..", "data", "sprites", "minigames", "general", "toad", "toad.png"])),
+                     charger_image(sep.join(["..", "data", "sprites", "minigames", "general", "toad", "toad_open.png"]))]
+        self.toad_shadow = charger_image(sep.join(["..", "data", "sprites", "minigames", "general", "toad", "shadow.png"]))
+        self.toad_bubble = charger_image(sep.join(["..", "data", "sprites", "minigames", "general", "toad", "bubble.png"]))
 
         # Initialisation de la caméra
         self.camera_pos = [0, 0]
@@ -347,12 +408,15 @@ class MiniGame:
         # Initialisation des tracés
         self.traces = {}
 
-        self.bg = pygame.image.load(sep.join(["..", "data", "sprites", "minigames", "trace_race", "map.png"]))
-        self.bg_traces = pygame.image.load(sep.join(["..", "data", "sprites", "minigames", "trace_race", "traces.png"]))
+        self.bg = charger_image(sep.join(["..", "data", "sprites", "minigames", "trace_race", "map.png"]))
+        self.bg_traces = charger_image(sep.join(["..", "data", "sprites", "minigames", "trace_race", "traces.png"]))
 
         # Initialisation du réseau
         self.net = None
 
+        # Suivi de la mémoire (donné par le jeu)
+        self.memoire = None
+
 
     # ------/ Getters \------
 
@@ -365,6 +429,9 @@ class MiniGame:
     def set_net(self, new_net) -> Network:
         self.net = new_net
 
+    def set_memoire(self, new_memoire) -> None:
+        self.memoire = new_memoire
+
 
     # ------/ Méthodes \------
 
@@ -388,14 +455,14 @@ class MiniGame:
             assert elem >= -1 and elem <= 1, "Erreur: La liste donnée doit uniquement contenir des entiers compris entre -1 et 1"
 
         # Envoie les inputs au serveur et demande des infos sur l'environnement
-        infos_environnement = json.loads(self.net.send(str(input_joueur[0]) + "|" + str(input_joueur[1])))
+        infos_environnement = self.net.etat_minijeu(str(input_joueur[0]) + "|" + str(input_joueur[1]))
         infos_joueurs = infos_environnement["joueurs"]
         infos_point = infos_environnement["point"]
         self.camera_pos = infos_environnement["camera"]
         fps = infos_environnement["fps"]
 
         # Affichage du décor
-        self.screen.blit(scale_image_by(self.bg, self.screen_factor), (round(-self.camera_pos[0] * self.screen_factor[0]), 0))
+        self.screen.blit(self.bg, (round(-self.camera_pos[0]), 0))
 
         # Affichage des points colorés (ou du tracé entier à la fin du mini-jeu)
         for id_joueur in self.joueurs.keys():
@@ -411,10 +478,10 @@ class MiniGame:
                 for sprite in trace:
                     sprite.afficher(self.screen)
             else:
-                self.screen.blit(scale_image_by(trace, self.screen_factor), (round(-self.camera_pos[0] * self.screen_factor[0]), 0))
+                self.screen.blit(trace, (round(-self.camera_pos[0]), 0))
 
         # Affichage des tracés de référence
-        self.screen.blit(scale_image_by(self.bg_traces, self.screen_factor), (round(-self.camera_pos[0] * self.screen_factor[0]), 0))
+        self.screen.blit(self.bg_traces, (round(-self.camera_pos[0]), 0))
 
         # On met à jour la position des joueurs et des animations pour le client et on affiche les joueurs
         for id_joueur in self.joueurs.keys():
@@ -423,9 +490,6 @@ class MiniGame:
             self.joueurs[id_joueur].animer(infos_joueurs[id_joueur]["frame"])
             self.joueurs[id_joueur].afficher(self.screen)
 
-        # Initialisation des facteurs pour la taille de l'écran
-        self.screen_factor = ((self.screen.get_rect().size[0] / 1280), (self.screen.get_rect().size[1] / 720))
-
         # Debug pour afficher les fps
         if self.show_fps:
             self.fps_font.render_to(self.screen, (0, 0), "FPS: " + str(round(self.clock.get_fps())), (0, 0, 0))
@@ -434,6 +498,10 @@ class MiniGame:
         if self.show_server_fps:
             self.fps_font.render_to(self.screen, (0, 20), "S-FPS: " + str(round(fps)), (0, 0, 0))
 
+        # Debug pour afficher la mémoire prise par les images et les sons
+        if self.show_fps and self.memoire is not None:
+            self.fps_font.render_to(self.screen, (0, 40), self.memoire.texte_usage(), (0, 0, 0))
+
 
     def load(self) -> None:
         """
@@ -468,64 +536,61 @@ class MiniGame:
 
                 # Changement de taille de la fenêtre
                 elif event.type == pygame.VIDEORESIZE:
-                    self.screen = pygame.display.set_mode(event.size, pygame.HWSURFACE|pygame.DOUBLEBUF|pygame.RESIZABLE)
+                    pygame.display.set_mode(event.size, pygame.HWSURFACE|pygame.DOUBLEBUF|pygame.RESIZABLE)
 
                 # Détection des inputs du joueur
                 elif event.type == pygame.MOUSEBUTTONUP and cooldown - time.time() < 0:
-                    self.net.send("ready_for_next_state")
+                    self.net.send(requete(PRET))
 
             # Envoi d'une requête au serveur pour obtenir le nombre de joueurs et lance la partie si tous les joueurs sont prêts
-            infos_serveur = json.loads(self.net.send("infos_serveur"))
+            infos_serveur = self.net.get_infos_serveur()
             nb_joueurs = infos_serveur["nb_joueurs"]
             nb_joueurs_prets = infos_serveur["nb_joueurs_prets"]
 
-            etat = self.net.send("get_etat")
+            etat = self.net.send(requete(GET_ETAT))
             running = etat == "minigame_load" or etat == "minigame_select"
 
-            # Initialisation des facteurs pour la taille de l'écran
-            self.screen_factor = ((self.screen.get_rect().size[0] / 1280), (self.screen.get_rect().size[1] / 720))
-
             # Affichage de l'écran de chargement et du texte
             self.screen.fill((0, 0, 0))
 
             # Redimension des textes
-            nom_text = scale_image_by(self.game_font.render(nom, (255, 255, 255))[0], self.screen_factor)
+            nom_text = self.game_font.render(nom, (255, 255, 255))[0]
             nom_textRect = nom_text.get_rect()
-            nom_textRect.center = (round(640 * self.screen_factor[0]), round(70 * self.screen_factor[1]))
+            nom_textRect.center = (640, 70)
             if cooldown - time.time() > 0:
                 chargement = "CHARGEMENT..." 
             elif nb_joueurs > 1:
                 chargement = "Cliquez si vous êtes prêt pour le mini-jeu ! (" + str(nb_joueurs_prets) + "/" + str(nb_joueurs) + ")"
             else:
                 chargement = "Cliquez pour lancer le mini-jeu !"
-            chargement_text = scale_image_by(self.game_font.render(chargement, (255, 255, 255))[0], (0.8 * self.screen_factor[0], 0.8 * self.screen_factor[1]))
+            chargement_text = scale_image_by(self.game_font.render(chargement, (255, 255, 255))[0], 0.8)
             chargement_textRect = chargement_text.get_rect()
-            chargement_textRect.center = (round(640 * self.screen_factor[0]), round(680 * self.screen_factor[1]))
+            chargement_textRect.center = (640, 680)
 
             # Création du texte "controles" qui s'affiche au-dessus des touches du jouers
-            controles_text = scale_image_by(self.game_font.render("Contrôles:", (255, 255, 255))[0], self.screen_factor)
+            controles_text = self.game_font.render("Contrôles:", (255, 255, 255))[0]
 
             # Affichage des textes
             self.screen.blit(nom_text, nom_textRect)
             self.screen.blit(chargement_text, chargement_textRect)
-            self.screen.blit(controles_text, (round(960 * self.screen_factor[0]), round(200 * self.screen_factor[1])))
+            self.screen.blit(controles_text, (960, 200))
 
             # Affichage de Toad (pour présenter le mini-jeu)
-            self.screen.blit(scale_image_by(self.toad_shadow, (6 * self.screen_factor[0], 6 * self.screen_factor[1])), (round(114 * self.screen_factor[0]), round(535 * self.screen_factor[1])))
-            self.screen.blit(scale_image_by(self.toad[1], (5 * self.screen_factor[0], 5 * self.screen_factor[1])), (round(100 * self.screen_factor[0]), round(400 * self.screen_factor[1])))
-            self.screen.blit(scale_image_by(self.toad_bubble, (5 * self.screen_factor[0], 5 * self.screen_factor[1])), (round(240 * self.screen_factor[0]), round(150 * self.screen_factor[1])))
+            self.screen.blit(scale_image_by(self.toad_shadow, 6), (114, 535))
+            self.screen.blit(scale_image_by(self.toad[1], 5), (100, 400))
+            self.screen.blit(scale_image_by(self.toad_bubble, 5), (240, 150))
 
             # Affichage de la description
             for line in description:
-                description_text = scale_image_by(self.game_font.render(line, (0, 0, 0))[0], (0.7 * self.screen_factor[0], 0.7 * self.screen_factor[1]))
-                self.screen.blit(description_text, (round(260 * self.screen_factor[0]), round((170 + description.index(line) * 37) * self.screen_factor[1])))
+                description_text = scale_image_by(self.game_font.render(line, (0, 0, 0))[0], 0.7)
+                self.screen.blit(description_text, (260, 170 + description.index(line) * 37))
 
             # Création et affichage des touches du clavier pour le joueur
-            layout_joueur = scale_image_by(pygame.image.load(sep.join(["..", "data", "sprites", "minigames", "general", "layout_joueur.png"])), self.screen_factor)
-            self.screen.blit(layout_joueur, (round(930 * self.screen_factor[0]), round(300 * self.screen_factor[1])))
+            layout_joueur = charger_image(sep.join(["..", "data", "sprites", "minigames", "general", "layout_joueur.png"]))
+            self.screen.blit(layout_joueur, (930, 300))
 
             # Mise à jour de l'écran et limite de fps
-            pygame.display.flip()
+            presenter(self.screen)
             self.clock.tick(self.fps)
 
         # Lancement de l'intro du mini-jeu (si le joueur n'a pas fermé la fenêtre)
@@ -533,20 +598,20 @@ class MiniGame:
             self.start_game()
 
 
-    def start_game(self) -> None:
+    def init_partie(self) -> None:
         """
-        Cette méthode représente la phase de lancement du mini-jeu.
+        Cette méthode permet de créer les entités du mini-jeu à partir des infos envoyées par le serveur.
         """
 
         # Envoi d'une requête au serveur pour obtenir les infos de chaque joueur
-        infos_joueurs = json.loads(self.net.send("0|0"))["joueurs"]
+        infos_joueurs = self.net.etat_minijeu("0|0")["joueurs"]
 
         # Création des joueurs
         for ip in infos_joueurs.keys():
             self.joueurs[ip] = Joueur(infos_joueurs[ip]["perso"], infos_joueurs[ip]["color"])
 
         # Envoi de la taille du joueur au serveur
-        self.net.send(json.dumps({"taille_joueurs": {joueur: self.joueurs[joueur].get_taille() for joueur in self.joueurs.keys()}}))
+        self.net.send(requete(TAILLE_JOUEURS, json.dumps({joueur: self.joueurs[joueur].get_taille() for joueur in self.joueurs.keys()})))
 
         # Initialisation de la liste des objets
         self.objets = self.joueurs
@@ -554,12 +619,21 @@ class MiniGame:
         # Initialisation des tracés de chaque joueur
         self.traces = {joueur: pygame.sprite.Group() for joueur in self.joueurs}
 
+
+    def start_game(self) -> None:
+        """
+        Cette méthode représente la phase de lancement du mini-jeu.
+        """
+
+        # Création des entités du mini-jeu
+        self.init_partie()
+
         # Initialisation des paramètres par défaut de la phase
         running = True
         prev_time = time.time()
 
         # Initialisation du texte start et de ses coordonnées de départ
-        start_image = pygame.image.load(sep.join(["..", "data", "sprites", "minigames", "general", "start.png"]))
+        start_image = charger_image(sep.join(["..", "data", "sprites", "minigames", "general", "start.png"]))
         start_image_x = -start_image.get_rect().w
         start_image_y = round((640 - start_image.get_rect().h) / 2)
 
@@ -579,10 +653,10 @@ class MiniGame:
 
                 # Changement de taille de la fenêtre
                 elif event.type == pygame.VIDEORESIZE:
-                    self.screen = pygame.display.set_mode(event.size, pygame.HWSURFACE|pygame.DOUBLEBUF|pygame.RESIZABLE)
+                    pygame.display.set_mode(event.size, pygame.HWSURFACE|pygame.DOUBLEBUF|pygame.RESIZABLE)
 
             # Envoie d'une requête au serveur pour obtenir son etat
-            etat = self.net.send("get_etat")
+            etat = self.net.send(requete(GET_ETAT))
             running = etat == "minigame_start"
 
             # Utilisation du moteur de jeu
@@ -593,17 +667,17 @@ class MiniGame:
             prev_time = time.time()
 
             # Affichage du texte start
-            self.screen.blit(scale_image_by(start_image, (4 * self.screen_factor[0], 4 * self.screen_factor[1])), (round(start_image_x * self.screen_factor[0]), round(start_image_y * self.screen_factor[1])))
+            self.screen.blit(scale_image_by(start_image, 4), (round(start_image_x), round(start_image_y)))
 
             # Arrête la phase d'intro si le texte sort de l'écran
             if not sent:
                 if start_image_x > 1280:
-                    sent = self.net.send("ready_for_next_state") == "ok"
+                    sent = self.net.send(requete(PRET)) == "ok"
 
                 # Si le texte se trouve au milieu de l'écran et que le timer n'est pas encore lancé
                 elif (start_image_x + 2000 * delta_time) > (1000 - start_image.get_rect().w) / 2 and cooldown == 0:
                     cooldown = time.time()
-                    pygame.mixer.Sound(sep.join(["..", "data", "sounds", "minigames", "start.ogg"])).play()
+                    charger_son(sep.join(["..", "data", "sounds", "minigames", "start.ogg"])).play()
 
                 # Si le timer a duré 0.5s ou qu'il n'est pas encore lancé
                 elif time.time() - cooldown > 0.5 or cooldown == 0:
@@ -612,14 +686,14 @@ class MiniGame:
                     start_image_x = round(start_image_x)
 
             # Mise à jour de l'écran et limite de fps
-            pygame.display.flip()
+            presenter(self.screen)
             self.clock.tick(self.fps)
 
         # Lancement du mini-jeu en lui même (si le joueur n'a pas fermé la fenêtre)
         if not self.quit:
 
             # Lancement du son de sifflet et la musique chargée
-            pygame.mixer.Sound(sep.join(["..", "data", "sounds", "minigames", "start_sifflet.ogg"])).play()
+            charger_son(sep.join(["..", "data", "sounds", "minigames", "start_sifflet.ogg"])).play()
             pygame.mixer.music.play(loops=-1)
 
             self.during_game()
@@ -634,7 +708,7 @@ class MiniGame:
         running = True
 
         # Lancement du son de sifflet et la musique chargée
-        pygame.mixer.Sound(sep.join(["..", "data", "sounds", "minigames", "start_sifflet.ogg"])).play()
+        charger_son(sep.join(["..", "data", "sounds", "minigames", "start_sifflet.ogg"])).play()
         pygame.mixer.music.play()
 
         # Boucle principale de cette phase du jeu
@@ -647,10 +721,10 @@ class MiniGame:
 
                 # Changement de taille de la fenêtre
                 elif event.type == pygame.VIDEORESIZE:
-                    self.screen = pygame.display.set_mode(event.size, pygame.HWSURFACE|pygame.DOUBLEBUF|pygame.RESIZABLE)
+                    pygame.display.set_mode(event.size, pygame.HWSURFACE|pygame.DOUBLEBUF|pygame.RESIZABLE)
 
             # Envoie d'une requête au serveur pour obtenir son etat
-            etat = self.net.send("get_etat")
+            etat = self.net.send(requete(GET_ETAT))
             running = etat == "minigame_during"
 
             # Détection des inputs et réinitialisation des vecteurs de déplacement des joueurs
@@ -684,7 +758,7 @@ class MiniGame:
             """
 
             # Mise à jour de l'écran et limite de fps
-            pygame.display.flip()
+            presenter(self.screen)
             self.clock.tick(self.fps)
 
         # Lancement de l'affichage de fin (si le joueur n'a pas fermé la fenêtre)
@@ -703,10 +777,10 @@ class MiniGame:
 
         # Arrêt de la musique et son de fin
         pygame.mixer.music.stop()
-        pygame.mixer.Sound(sep.join(["..", "data", "sounds", "minigames", "finish.ogg"])).play()
+        charger_son(sep.join(["..", "data", "sounds", "minigames", "finish.ogg"])).play()
 
         # Initialisation du texte finish et de ses coordonnées de départ
-        finish_image = pygame.image.load(sep.join(["..", "data", "sprites", "minigames", "general", "finish.png"]))
+        finish_image = charger_image(sep.join(["..", "data", "sprites", "minigames", "general", "finish.png"]))
         finish_image_x = -finish_image.get_rect().w
         finish_image_y = round((640 - finish_image.get_rect().h) / 2)
 
@@ -726,10 +800,10 @@ class MiniGame:
 
                 # Changement de taille de la fenêtre
                 elif event.type == pygame.VIDEORESIZE:
-                    self.screen = pygame.display.set_mode(event.size, pygame.HWSURFACE|pygame.DOUBLEBUF|pygame.RESIZABLE)
+                    pygame.display.set_mode(event.size, pygame.HWSURFACE|pygame.DOUBLEBUF|pygame.RESIZABLE)
 
             # Envoie d'une requête au serveur pour obtenir son etat
-            etat = self.net.send("get_etat")
+            etat = self.net.send(requete(GET_ETAT))
             running = etat == "minigame_end"
 
             # Utilisation du moteur de jeu
@@ -740,12 +814,12 @@ class MiniGame:
             prev_time = time.time()
 
             # Affichage du texte finish
-            self.screen.blit(scale_image_by(finish_image, (4 * self.screen_factor[0], 4 * self.screen_factor[1])), (round(finish_image_x * self.screen_factor[0]), round(finish_image_y * self.screen_factor[1])))
+            self.screen.blit(scale_image_by(finish_image, 4), (round(finish_image_x), round(finish_image_y)))
 
             # Arrête la phase de fin au bout de 1.5s si le timer est déjà lancé
             if not sent:
                 if time.time() - cooldown > 1.5 and cooldown > 0:
-                    sent = self.net.send("ready_for_next_state") == "ok"
+                    sent = self.net.send(requete(PRET)) == "ok"
 
                 # Si le texte se trouve au milieu de l'écran et que le timer n'est pas encore lancé
                 elif (finish_image_x + 2000 * delta_time) > (1000 - finish_image.get_rect().w) / 2 and cooldown == 0:
@@ -757,7 +831,7 @@ class MiniGame:
                     finish_image_x = round(finish_image_x)
 
             # Mise à jour de l'écran et limite de fps
-            pygame.display.flip()
+            presenter(self.screen)
             self.clock.tick(self.fps)
 
         # Lancement du calcul des scores (si le joueur n'a pas fermé la fenêtre)
@@ -774,55 +848,15 @@ class MiniGame:
         running = True
         prev_time = time.time()
 
-        # Initialisation des tracés dessinés par chaque joueurs
-        made_traces = {joueur: pygame.Surface((self.bg_traces.get_rect().w, self.bg_traces.get_rect().h), pygame.SRCALPHA) for joueur in self.joueurs.keys()}
-
-        for joueur in self.joueurs.keys():
-            for sprite in self.traces[joueur]:
-                # On regroupe chaque point dans un seul sprite de tracé
-                made_traces[joueur].blit(sprite.image, (sprite.rect.x + 20, sprite.rect.y))
-
-            # On remplace le groupe de sprites par le nouveau tracé pour optimiser les performances
-            self.traces[joueur] = made_traces[joueur]
-
-        # Masque de chaque tracé de chaque joueur
-        made_traces_masks = {joueur: pygame.mask.from_surface(made_traces[joueur]) for joueur in self.joueurs.keys()}
-
-        # Masque des tracés sur le terrain
-        bg_traces_mask = pygame.mask.from_surface(self.bg_traces)
-
-        # Nombre de pixels repassés par le joueur
-        # (overlap_area renvoie le nombre de pixels qui se superposent entre deux masques)
-        nb_pixels_joueurs = {joueur: made_traces_masks[joueur].overlap_area(bg_traces_mask, (0, 0)) for joueur in self.joueurs.keys()}
-
-        # On convertit l'image des tracés du terrain en tableau facilement compréhensible par le code
-        bg_traces_tab = pygame.PixelArray(self.bg_traces)
-
-        # Ou sinon je pouvais juste mettre nb_pixels_ligne = 7230 directement mais c'est plus intuitif de le calculer nous même
-        nb_pixels_ligne = 0
-
-        # Sur toute les dimensions de l'image:
-        for i in range(self.bg_traces.get_rect().w):
-            for j in range(self.bg_traces.get_rect().h):
-
-                # On compte chaque pixel qui n'est pas vide
-                if bg_traces_tab[i, j] != 0:
-                    nb_pixels_ligne += 1
-
-        # On suprime le tableau de pixel (sinon on ne peut plus afficher l'image)
-        bg_traces_tab.close()
-
-        # On divise par 4 parce qu'il y a 4 lignes dans l'image
-        nb_pixels_ligne = round(nb_pixels_ligne / 4)
-
-        # On stocke les pourcentages de réussite de chaque joueur
-        pourcentages = {joueur: round((nb_pixels_joueurs[joueur] / nb_pixels_ligne) * 100, 1) for joueur in self.joueurs.keys()}
+        # Calcul du pourcentage de réussite de chaque joueur (les tracés sont regroupés en une seule image par joueur)
+        with TRACEUR.intervalle("calculer_pourcentages"):
+            self.traces, pourcentages = calculer_pourcentages(self.traces, self.bg_traces)
 
         # On utilise toujours la méthode simple: on trie automatiquement les clés du dictionnaire
         sorted_pourcentages = sorted(pourcentages, key=pourcentages.get, reverse=True)
 
         # Sprite du fond des pourcentages
-        pourcent_back = pygame.image.load(sep.join(["..", "data", "sprites", "minigames", "trace_race", "pourcent_back.png"]))
+        pourcent_back = charger_image(sep.join(["..", "data", "sprites", "minigames", "trace_race", "pourcent_back.png"]))
 
         # Les pourcentages qui seront utilisés pour l'affichage
         draw_pourcentages = {joueur: 0 for joueur in self.joueurs.keys()}
@@ -834,7 +868,7 @@ class MiniGame:
         sent = False
 
         # Roulements de tambour
-        pygame.mixer.Sound(sep.join(["..", "data", "sounds", "minigames", "trace_race", "drum_roll.ogg"])).play()
+        charger_son(sep.join(["..", "data", "sounds", "minigames", "trace_race", "drum_roll.ogg"])).play()
 
         # Boucle principale de cette phase du jeu
         while running and not self.quit:
@@ -846,15 +880,15 @@ class MiniGame:
 
                 # Changement de taille de la fenêtre
                 elif event.type == pygame.VIDEORESIZE:
-                    self.screen = pygame.display.set_mode(event.size, pygame.HWSURFACE|pygame.DOUBLEBUF|pygame.RESIZABLE)
+                    pygame.display.set_mode(event.size, pygame.HWSURFACE|pygame.DOUBLEBUF|pygame.RESIZABLE)
 
             # Arrêt de la méthode à la fin du temps imparti
             if timer - time.time() <= 0 and not sent:
-                ids_minijeu = self.net.send(json.dumps({"pourcentages": list(sorted_pourcentages)}))
-                sent = self.net.send("ready_for_next_state") == "ok"
+                ids_minijeu = self.net.send(requete(POURCENTAGES, json.dumps(list(sorted_pourcentages))))
+                sent = self.net.send(requete(PRET)) == "ok"
 
             # Envoie d'une requête au serveur pour obtenir son etat
-            etat = self.net.send("get_etat")
+            etat = self.net.send(requete(GET_ETAT))
             running = etat == "minigame_score"
 
             # Utilisation du moteur de jeu et mise à jour du temps passé
@@ -873,19 +907,19 @@ class MiniGame:
                     draw_pourcentages[joueur] = pourcentages[joueur]
 
                 # Définition du décalage pour chaque joueur
-                ids_minijeu = json.loads(self.net.send("get_ids_minijeu"))
+                ids_minijeu = json.loads(self.net.send(requete(GET_IDS_MINIJEU)))
                 pourcent_pos_y = 90 + (150 * int(ids_minijeu[joueur]))
 
                 # Affichage des pourcentages
-                self.screen.blit(scale_image_by(pourcent_back, (4 * self.screen_factor[0], 4 * self.screen_factor[1])), (round(1000 * self.screen_factor[0]), round(pourcent_pos_y * self.screen_factor[1])))
+                self.screen.blit(scale_image_by(pourcent_back, 4), (1000, pourcent_pos_y))
                 pourcentage_text = self.game_font.render(str(round(draw_pourcentages[joueur], 1)) + "%", (255, 255, 255))
-                pourcentage_text_scaled = scale_image_by(pourcentage_text[0], self.screen_factor)
+                pourcentage_text_scaled = pourcentage_text[0]
 
                 # Affichage du pourcentage
-                self.screen.blit(pourcentage_text_scaled, (round(1013 * self.screen_factor[0]), round((pourcent_pos_y + 20) * self.screen_factor[1])))
+                self.screen.blit(pourcentage_text_scaled, (1013, pourcent_pos_y + 20))
 
             # Mise à jour de l'écran et limite de fps
-            pygame.display.flip()
+            presenter(self.screen)
             self.clock.tick(self.fps)
 
         # Lancement de l'annonce des gagnants (si le joueur n'a pas fermé la fenêtre)
@@ -903,7 +937,7 @@ class MiniGame:
         running = True
 
         # Envoie d'une requête au serveur pour obtenir les infos du classement
-        classement = json.loads(self.net.send("0|0"))["classement"]
+        classement = self.net.etat_minijeu("0|0")["classement"]
 
         # On note tous les gagnants de la partie
         gagnants = []
@@ -916,13 +950,13 @@ class MiniGame:
 
         # Changement du texte et de la musique jouée selon différents cas
         if len(gagnants) == 0:
-            win_image = pygame.image.load(sep.join(["..", "data", "sprites", "minigames", "general", "tie.png"]))
+            win_image = charger_image(sep.join(["..", "data", "sprites", "minigames", "general", "tie.png"]))
             pygame.mixer.music.load(sep.join(["..", "data", "musics", "minigames", "draw.ogg"]))
         elif len(gagnants) > 1:
-            win_image = pygame.image.load(sep.join(["..", "data", "sprites", "minigames", "general", "wins.png"]))
+            win_image = charger_image(sep.join(["..", "data", "sprites", "minigames", "general", "wins.png"]))
             pygame.mixer.music.load(sep.join(["..", "data", "musics", "minigames", "win.ogg"]))
         else:
-            win_image = pygame.image.load(sep.join(["..", "data", "sprites", "minigames", "general", "win.png"]))
+            win_image = charger_image(sep.join(["..", "data", "sprites", "minigames", "general", "win.png"]))
             pygame.mixer.music.load(sep.join(["..", "data", "musics", "minigames", "win.ogg"]))
 
         # Timer de 5s
@@ -944,10 +978,10 @@ class MiniGame:
 
                 # Changement de taille de la fenêtre
                 elif event.type == pygame.VIDEORESIZE:
-                    self.screen = pygame.display.set_mode(event.size, pygame.HWSURFACE|pygame.DOUBLEBUF|pygame.RESIZABLE)
+                    pygame.display.set_mode(event.size, pygame.HWSURFACE|pygame.DOUBLEBUF|pygame.RESIZABLE)
 
             # Envoie d'une requête au serveur pour obtenir son etat
-            etat = self.net.send("get_etat")
+            etat = self.net.send(requete(GET_ETAT))
             running = etat == "minigame_winners"
 
             # Utilisation du moteur de jeu
@@ -961,7 +995,7 @@ class MiniGame:
 
             for gagnant in gagnants:
                 # Initialisation et positionnement du texte de chaque gagnant
-                image_gagnant = scale_image_by(pygame.image.load(sep.join(["..", "data", "sprites", "minigames", "general", gagnant + ".png"])), 4)
+                image_gagnant = charger_image(sep.join(["..", "data", "sprites", "minigames", "general", gagnant + ".png"]), 4)
                 image_rect = image_gagnant.get_rect()
                 image_rect.center = (640, 400)
 
@@ -970,23 +1004,23 @@ class MiniGame:
                     image_rect.x = image_x
 
                 # Affichage du texte de chaque gagnant
-                self.screen.blit(scale_image_by(image_gagnant, self.screen_factor), (round(image_rect.x * self.screen_factor[0]), round(image_rect.y * self.screen_factor[1])))
+                self.screen.blit(image_gagnant, (image_rect.x, image_rect.y))
 
                 # On déplace le prochain texte 50 pixels plus loin
                 image_x += image_rect.w + 50
 
             # Positionnement du texte win
-            scaled_win = scale_image_by(win_image, (4 * self.screen_factor[0], 4 * self.screen_factor[1]))
+            scaled_win = scale_image_by(win_image, 4)
             win_rect = scaled_win.get_rect()
-            win_rect.center = (round(640 * self.screen_factor[0]), round(520 * self.screen_factor[1]))
+            win_rect.center = (640, 520)
 
             # Affichage du texte win
             self.screen.blit(scaled_win, win_rect)
 
             # Arrêt du script au bout du timer
             if cooldown - time.time() <= 0 and not sent:
-                sent = self.net.send("ready_for_next_state") == "ok"
+                sent = self.net.send(requete(PRET)) == "ok"
 
             # Mise à jour de l'écran et limite de fps
-            pygame.display.flip()
+            presenter(self.screen)
             self.clock.tick(self.fps)
\ No newline at end of file
@@ -5,13 +5,75 @@
 
 import json
 import socket
-import pygame
 from math import sqrt
 import random
-from os import sep
+import time
+from threading import Condition
+
+from profiler import Profiler
+from protocole import TableRequetes, GET_ETAT, INPUTS, TAILLE_JOUEURS, POURCENTAGES, GET_IDS_MINIJEU
+from moteur import Rect, charger_masque, masque_leger, octets_ligne
+
+# ------/ Constantes \------
+
+# Directions données par le champ de l'ia (un octet par position du crayon, voir champ_ia)
+IA_BAS = 1          # Le tracé est sous le crayon
+IA_HAUT = 2         # Le tracé est au-dessus du crayon
+IA_POINTE = 4       # Le tracé est au niveau de la pointe du crayon
+
+# Champ de l'ia, calculé une seule fois par processus (voir champ_ia)
+CHAMP_IA = {}
 
 # ------/ Fonctions utiliatires \------
 
+def champ_ia() -> dict:
+    """
+    Cette fonction précalcule, pour chaque position possible du crayon d'une ia, les trois tests de collision
+    entre le masque du crayon et celui des tracés d'origine (en dessous, au-dessus et à la pointe du crayon).
+    L'ia n'a ensuite plus qu'un octet à lire par tick, au lieu de trois comparaisons de masques.
+
+    Renvois:
+        - dict: Taille du crayon, "directions" (octets, une ligne de "largeur" octets par rangée, combinaison de
+        IA_BAS, IA_HAUT et IA_POINTE), "largeur", "hauteur" et "origine" (case de la position (0, 0) du crayon).
+    """
+
+    if len(CHAMP_IA) > 0:
+        return CHAMP_IA
+
+    crayon = masque_leger(charger_masque("crayon"))
+    largeur_crayon, hauteur_crayon = crayon.get_size()
+
+    # Le pixel (x, y) de ce masque indique si le crayon placé en (x - largeur + 1, y - hauteur + 1) touche un tracé
+    contacts = masque_leger(charger_masque("traces")).convolve(crayon)
+    largeur_contacts, hauteur_contacts = contacts.get_size()
+    lignes = contacts.get_lignes()
+
+    def ligne(y: int) -> int:
+        return lignes[y] if 0 <= y < hauteur_contacts else 0
+
+    # Le champ déborde de 5 pixels à gauche et de la hauteur du crayon + 5 pixels en hauteur: chaque test vaut 0
+    # en dehors, comme un overlap qui sort des tracés
+    largeur = largeur_contacts + 5
+    hauteur = hauteur_contacts + hauteur_crayon + 5
+    directions = bytearray()
+
+    for y in range(-hauteur_crayon, hauteur_contacts + 5):
+        # Mêmes décalages que les tests des ia dans during_game (sous le crayon, 5 pixels au-dessus, 5 pixels devant)
+        bas = octets_ligne(ligne(y + hauteur_crayon) << 5, largeur)
+        haut = octets_ligne(ligne(y - 5) << 5, largeur)
+        pointe = octets_ligne(ligne(y), largeur)
+
+        directions += (bas * IA_BAS | haut * IA_HAUT | pointe * IA_POINTE).to_bytes(largeur, "little")
+
+    CHAMP_IA["taille_crayon"] = (largeur_crayon, hauteur_crayon)
+    CHAMP_IA["directions"] = bytes(directions)
+    CHAMP_IA["largeur"] = largeur
+    CHAMP_IA["hauteur"] = hauteur
+    CHAMP_IA["origine"] = (largeur_crayon - 1 + 5, 2 * hauteur_crayon - 1)
+
+    return CHAMP_IA
+
+
 def normalize(vecteur: list) -> list:
     """
     Cette fonction permet de "normaliser" un vecteur donné. Elle sert lors des calculs du mouvement
@@ -45,33 +107,6 @@ def normalize(vecteur: list) -> list:
 
     return n_v
 
-def scale_image_by(image: pygame.Surface, taille: "int | float | tuple") -> pygame.Surface: # type: ignore
-    """
-    Cette fonction permet d'agrandir une image par un nombre taille.
-
-    Paramètres:
-        - image (pygame.Surface): une image chargé avec pygame.
-        - taille (int, float ou tuple): un nombre ou une liste de 2 nombres représentant le facteur pour agrandir l'image.
-    Renvois:
-        - pygame.Surface: la même image agrandie.
-    Pré-conditions:
-        - image doit être une image chargé avec pygame.
-    Post-conditions:
-        - La fonction doit renvoyer la même image donnée par l'utilisateur, mais agrandie par
-        le nombre taille donné.
-    """
-
-    # Tests de type de variables
-    assert type(image) == pygame.Surface, "Erreur: Le 1er paramètre (image) n'est pas une image chargé avec pygame."
-    assert type(taille) == int or type(taille) == float or type(taille) == tuple, "Erreur: Le 2ème paramètre (taille) n'est pas un nombre ou un tuple."
-
-    # On renvoie l'image transformée
-    if type(taille) != tuple:
-        return pygame.transform.scale(image, (round(image.get_rect().w * taille), round(image.get_rect().h * taille)))
-    else:
-        # On fait les modifications nécessaires si on renvoie une liste de deux tailles différentes
-        return pygame.transform.scale(image, (round(image.get_rect().w * taille[0]), round(image.get_rect().h * taille[1])))
-
 
 # ------/ Classes \------
 
@@ -97,7 +132,7 @@ class Joueur:
 
             - frame (float): Indice du sprite à choisir.
 
-            - collision (pygame.Rect): Boîte de collision du joueur.
+            - collision (Rect): Boîte de collision du joueur.
 
             - taille (list): Dimensions du sprite du joueur (fournis par le client).
         """
@@ -127,7 +162,7 @@ class Joueur:
         self.frame = 0
 
         # Boîte de collision du personnage
-        self.collision = pygame.Rect(0, 0, 42, 20)
+        self.collision = Rect(0, 0, 42, 20)
 
         # Initialisation de la taille du joueur (qui sera définie lors du début de partie)
         self.taille = [0, 0]
@@ -233,8 +268,8 @@ class Joueur:
         for objet in objets:
             if objet != self:
                 coef_ia = 20 if self.ia else 0
-                rect_x = pygame.Rect(self.collision.x + round(self.velocity[0]) + coef_ia, self.collision.y, self.collision.w, self.collision.h)
-                rect_y = pygame.Rect(self.collision.x, self.collision.y + round(self.velocity[1]), self.collision.w, self.collision.h)
+                rect_x = Rect(self.collision.x + round(self.velocity[0]) + coef_ia, self.collision.y, self.collision.w, self.collision.h)
+                rect_y = Rect(self.collision.x, self.collision.y + round(self.velocity[1]), self.collision.w, self.collision.h)
 
                 for collision in objet.get_collisions():
                     if rect_x.colliderect(collision):
@@ -303,7 +338,7 @@ class Collider:
             - following_camera (bool): Indique si le collider doit suivre le mouvement de la caméra.
 
         Attributs internes:
-            - collision (pygame.Rect): Boîte de collision du collider.
+            - collision (Rect): Boîte de collision du collider.
         """
 
         # Test des types des paramètres donnés
@@ -317,7 +352,7 @@ class Collider:
         self.following_camera = following_camera
 
         # Boîte de collision
-        self.collision = pygame.Rect(self.pos[0], self.pos[1], self.taille[0], self.taille[1])
+        self.collision = Rect(self.pos[0], self.pos[1], self.taille[0], self.taille[1])
 
 
     # ------/ Getter \------
@@ -360,7 +395,7 @@ class Collider:
 
 # Classe du serveur
 class Server:
-    def __init__(self, server_socket: socket.socket) -> None:
+    def __init__(self, server_socket: socket.socket, profiling: bool = False, horloge=time.time, rng=random, silencieux: bool = False) -> None:
         """
         Documentation ici
             - timer (float): Durée du mini-jeu.
@@ -369,7 +404,19 @@ class Server:
         """
 
         self.server_socket = server_socket
-        print("Initialisation du mini-jeu: Trace Race")
+
+        # Horloge et générateur aléatoire du mini-jeu (remplaçables pour simuler une partie sans réseau)
+        self.horloge = horloge
+        self.rng = rng
+
+        # Les copies du mini-jeu (lockstep, simulation) n'écrivent pas leurs messages dans la console
+        self.silencieux = silencieux
+
+        # Fonction du lobby appelée quand le nombre de joueurs prêts change (None hors du lobby)
+        self.notifier_lobby = None
+
+        if not self.silencieux:
+            print("Initialisation du mini-jeu: Trace Race")
 
         self.joueurs = {}
         self.inputs_joueurs = {}
@@ -377,7 +424,7 @@ class Server:
 
         # Initialisation d'un ordre aléatoire pour les mini-jeux
         self.ordre_minijeu = [i for i in range(4)]
-        random.shuffle(self.ordre_minijeu)
+        self.rng.shuffle(self.ordre_minijeu)
 
         self.liste_couleurs = ["red", "blue", "green", "yellow"]
 
@@ -395,6 +442,22 @@ class Server:
         self.classement = {}
 
         self.fps = 60
+        self.profiler = Profiler("Trace Race", self.fps, profiling)
+
+        # Requêtes du mini-jeu, chacune trouvée directement par son opcode
+        self.requetes = TableRequetes("Trace Race")
+        self.requetes.enregistrer(GET_ETAT, self.requete_get_etat)
+        self.requetes.enregistrer(TAILLE_JOUEURS, self.requete_taille_joueurs)
+        self.requetes.enregistrer(POURCENTAGES, self.requete_pourcentages)
+        self.requetes.enregistrer(GET_IDS_MINIJEU, self.requete_get_ids_minijeu)
+        self.requetes.enregistrer(INPUTS, self.requete_inputs)
+
+        # Dernier état encodé en json (publié une fois par tick et partagé par tous les clients)
+        self.snapshot = None
+
+        # Condition qui protège les joueurs prêts et réveille la boucle du mini-jeu quand un joueur est prêt
+        self.condition = Condition()
+
         self.current_fps = 0
         self.is_running = False
 
@@ -409,13 +472,9 @@ class Server:
         # Initialisation des derniers points de chaque joueur
         self.last_point = {}
 
-        # Chargement des tracés d'origines pour pouvoir les traiter
-        self.bg_traces = pygame.image.load(sep.join(["..", "data", "sprites", "minigames", "trace_race", "traces.png"]))
-        self.crayon_joueur = scale_image_by(pygame.image.load(sep.join(["..", "data", "sprites", "minigames", "trace_race", "blue_pen.png"])), 3)
-
-        # Masques à définir pour l'ia
-        self.pen_mask = pygame.mask.from_surface(self.crayon_joueur)
-        self.bg_traces_mask = pygame.mask.from_surface(self.bg_traces)
+        # Champ de l'ia, calculé au premier serveur et partagé par tous ceux du processus
+        self.champ_ia = champ_ia()
+        self.taille_crayon = self.champ_ia["taille_crayon"]
 
 
     def get_classement(self):
@@ -432,58 +491,132 @@ class Server:
         return self.joueurs[address]
 
     def add_player(self, address: str, perso: str, ia: bool):
-        id_minijeu = self.ordre_minijeu[len(self.joueurs)]
-        self.joueurs[address] = Joueur(perso, id_minijeu, ia, self.liste_couleurs[id_minijeu])
+        with self.condition:
+            id_minijeu = self.ordre_minijeu[len(self.joueurs)]
+            self.joueurs[address] = Joueur(perso, id_minijeu, ia, self.liste_couleurs[id_minijeu])
+
+            # Les ia sont automatiquement prêtes
+            if ia:
+                self.nb_joueurs_prets += 1
+
+            self.condition.notify_all()
+
+
+    def get_infos(self) -> dict:
+        """
+        Cette méthode permet de récupérer l'état du mini-jeu tel qu'il est envoyé aux clients.
+
+        Renvois:
+            - dict: Informations sur les joueurs et les entités du mini-jeu.
+        """
+
+        infos_joueurs = {joueur: {
+            "perso": self.joueurs[joueur].get_perso(),
+            "color": self.joueurs[joueur].get_color(),
+            "pos": self.joueurs[joueur].get_pos(),
+            "frame": self.joueurs[joueur].get_frame(),
+            "is_drawing": self.joueurs[joueur].get_is_drawing()
+        } for joueur in self.joueurs.keys()}
+
+        return {"joueurs": infos_joueurs, "camera": self.camera_pos, "point": self.last_point, "score": self.score, "classement": self.classement, "fps": self.current_fps}
 
 
     def client_thread(self, address: str, request: str) -> str:
-            if request == "get_etat":
-                reply = self.etat
+        # L'opcode de la requête (son premier octet) donne directement la fonction qui y répond
+        reply = self.requetes.traiter(address, request)
+        return "not_found" if reply is None else reply
 
-            elif "taille_joueurs" in request:
-                taille = json.loads(request)["taille_joueurs"]
-                for ip in taille.keys():
-                    self.joueurs[ip].set_taille([taille[ip][0], taille[ip][1]])
-                reply = "ok"
 
-            elif "pourcentages" in request:
-                sorted_pourcentages = json.loads(request)["pourcentages"]
+    def requete_get_etat(self, address: str, donnees: str) -> str:
+        return self.etat
 
-                # On s'en sert créer le classement
-                for i in range(len(sorted_pourcentages)):
-                    joueur = sorted_pourcentages[i]
-                    self.classement[joueur] = i + 1
-                reply = "ok"
 
-            elif request == "get_ids_minijeu":
-                reply = json.dumps({joueur: self.joueurs[joueur].get_id_minijeu() for joueur in self.joueurs.keys()})
+    def requete_taille_joueurs(self, address: str, donnees: str) -> str:
+        taille = json.loads(donnees)
+        for ip in taille.keys():
+            self.joueurs[ip].set_taille([taille[ip][0], taille[ip][1]])
+        return "ok"
 
-            elif "|" in request:
-                # Si la requête c'est ça: 1|1
-                self.inputs_joueurs[address] = [int(coord) for coord in request.split("|")]
 
-                infos_joueurs = {joueur: {
-                    "perso": self.joueurs[joueur].get_perso(),
-                    "color": self.joueurs[joueur].get_color(),
-                    "pos": self.joueurs[joueur].get_pos(),
-                    "frame": self.joueurs[joueur].get_frame(),
-                    "is_drawing": self.joueurs[joueur].get_is_drawing()
-                } for joueur in self.joueurs.keys()}
+    def requete_pourcentages(self, address: str, donnees: str) -> str:
+        sorted_pourcentages = json.loads(donnees)
 
-                reply = json.dumps({"joueurs": infos_joueurs, "camera": self.camera_pos, "point": self.last_point, "score": self.score, "classement": self.classement, "fps": self.current_fps})
+        # On s'en sert créer le classement
+        for i in range(len(sorted_pourcentages)):
+            joueur = sorted_pourcentages[i]
+            self.classement[joueur] = i + 1
+        return "ok"
+
+
+    def requete_get_ids_minijeu(self, address: str, donnees: str) -> str:
+        return json.dumps({joueur: self.joueurs[joueur].get_id_minijeu() for joueur in self.joueurs.keys()})
 
-            else:
-                reply = "not_found"
 
-            return reply
+    def requete_inputs(self, address: str, donnees: str) -> str:
+        # Si les données c'est ça: 1|1
+        with self.profiler.mesure("inputs"):
+            self.inputs_joueurs[address] = [int(coord) for coord in donnees.split("|")]
+
+        # Tous les clients reçoivent le même état, encodé une seule fois par tick
+        return self.get_snapshot()
 
 
     def changer_etat(self, new_etat):
-        self.etat = new_etat
-        for ip in self.joueurs.keys():
-            self.joueurs[ip].set_ready(False)
+        with self.condition:
+            self.etat = new_etat
+            for ip in self.joueurs.keys():
+                self.joueurs[ip].set_ready(False)
+
+            # Seules les ia restent prêtes
+            self.nb_joueurs_prets = len([joueur for joueur in self.joueurs.values() if joueur.get_ia()])
+            self.condition.notify_all()
+
+        if not self.silencieux:
+            print("[Trace Race] Passé à l'état", self.etat)
+
+        self.notifier_prets()
+
+
+    def marquer_pret(self, address: str) -> None:
+        """
+        Cette méthode indique qu'un joueur est prêt pour l'état suivant (appelée par le thread de son client).
+
+        Paramètres:
+            - address (str): Adresse du joueur.
+        """
+
+        with self.condition:
+            if not self.joueurs[address].get_ready():
+                self.joueurs[address].set_ready(True)
 
-        print("[Trace Race] Passé à l'état", self.etat)
+                # Le compteur est mis à jour ici plutôt que recompté à chaque tick
+                if not self.joueurs[address].get_ia():
+                    self.nb_joueurs_prets += 1
+
+                self.condition.notify_all()
+
+        self.notifier_prets()
+
+
+    def notifier_prets(self) -> None:
+        """
+        Cette méthode prévient le lobby que le nombre de joueurs prêts a changé (il fait partie de ses informations).
+        Elle doit être appelée sans self.condition.
+        """
+
+        if self.notifier_lobby is not None:
+            self.notifier_lobby()
+
+
+    def tous_prets(self) -> bool:
+        """
+        Cette méthode indique si tous les joueurs sont prêts pour l'état suivant.
+
+        Renvois:
+            - bool: True si tous les joueurs sont prêts, sinon False.
+        """
+
+        return len(self.joueurs) > 0 and self.nb_joueurs_prets == len(self.joueurs)
 
 
     def load_game(self):
@@ -523,33 +656,39 @@ class Server:
         for joueur in self.joueurs.keys():
 
             # On récupère la position du crayon
-            pen_pos = [round(self.joueurs[joueur].get_pos()[0] + self.joueurs[joueur].get_taille()[0] - self.crayon_joueur.get_rect().w) + 6,
-                       round(self.joueurs[joueur].get_pos()[1] + self.joueurs[joueur].get_taille()[1] - self.crayon_joueur.get_rect().h) - 8]
+            pen_pos = [round(self.joueurs[joueur].get_pos()[0] + self.joueurs[joueur].get_taille()[0] - self.taille_crayon[0]) + 6,
+                       round(self.joueurs[joueur].get_pos()[1] + self.joueurs[joueur].get_taille()[1] - self.taille_crayon[1]) - 8]
 
             if self.joueurs[joueur].get_ia():
-                # On réinitialise leurs inputs
-                self.inputs_joueurs[joueur] = [0, 0]
-
-                if self.joueurs[joueur].get_is_drawing():
-                    # Calcul des offsets pour les opérations avec les masques
-                    mask_x_offset = pen_pos[0] + round(self.camera_pos[0])
-                    mask_y_offset = pen_pos[1] + round(self.camera_pos[1])
-
-                    # On détecte si le tracé est proche du haut de la texture du crayon (donc doit aller vers le bas, difficile à expliquer)
-                    if self.bg_traces_mask.overlap(self.pen_mask, (mask_x_offset, mask_y_offset + self.crayon_joueur.get_rect().h)):
-                        self.inputs_joueurs[joueur][1] += 1
-
-                    # On détecte si le tracé est proche du bas de la texture du crayon (donc doit aller vers le haut, difficile à expliquer)
-                    elif self.bg_traces_mask.overlap(self.pen_mask, (mask_x_offset, mask_y_offset - 5)):
-                        self.inputs_joueurs[joueur][1] -= 1
-
-                    # On détecte si le tracé est se trouve au niveau de la pointe du crayon
-                    if self.bg_traces_mask.overlap(self.pen_mask, (mask_x_offset + 5, mask_y_offset)):
-                        self.inputs_joueurs[joueur][0] += 1
-                    else:
-                        # Fait des mouvements aléatoires et prie pour que ça le décoince
-                        self.inputs_joueurs[joueur][random.randint(0, 1)] = random.randint(-1, 1)
-                        self.inputs_joueurs[joueur][random.randint(0, 1)] = random.randint(-1, 1)
+                with self.profiler.mesure("ia"):
+                    # On réinitialise leurs inputs
+                    self.inputs_joueurs[joueur] = [0, 0]
+
+                    if self.joueurs[joueur].get_is_drawing():
+                        # Case du champ de l'ia qui correspond à la position du crayon sur les tracés
+                        x = pen_pos[0] + round(self.camera_pos[0]) + self.champ_ia["origine"][0]
+                        y = pen_pos[1] + round(self.camera_pos[1]) + self.champ_ia["origine"][1]
+
+                        if 0 <= x < self.champ_ia["largeur"] and 0 <= y < self.champ_ia["hauteur"]:
+                            direction = self.champ_ia["directions"][y * self.champ_ia["largeur"] + x]
+                        else:
+                            direction = 0
+
+                        # On détecte si le tracé est proche du haut de la texture du crayon (donc doit aller vers le bas, difficile à expliquer)
+                        if direction & IA_BAS:
+                            self.inputs_joueurs[joueur][1] += 1
+
+                        # On détecte si le tracé est proche du bas de la texture du crayon (donc doit aller vers le haut, difficile à expliquer)
+                        elif direction & IA_HAUT:
+                            self.inputs_joueurs[joueur][1] -= 1
+
+                        # On détecte si le tracé est se trouve au niveau de la pointe du crayon
+                        if direction & IA_POINTE:
+                            self.inputs_joueurs[joueur][0] += 1
+                        else:
+                            # Fait des mouvements aléatoires et prie pour que ça le décoince
+                            self.inputs_joueurs[joueur][self.rng.randint(0, 1)] = self.rng.randint(-1, 1)
+                            self.inputs_joueurs[joueur][self.rng.randint(0, 1)] = self.rng.randint(-1, 1)
 
             # Léger délai entre chaque placement de point sinon grosse baisse de performance
             if self.joueurs[joueur].get_is_drawing():
@@ -567,75 +706,137 @@ class Server:
             self.camera_speed = 0
 
 
-    def run(self, clock) -> None:
-        self.is_running = True
+    def maj_etats(self) -> None:
+        """
+        Cette méthode permet de passer à l'état suivant du mini-jeu lorsque tous les joueurs sont prêts.
+        """
 
-        print("Lancement du mini-jeu: Trace Race")
-        while self.is_running:
-            # On récupère le nombre de joueurs prêts (les ia sont automatiquement prêts)
-            self.nb_joueurs_prets = len([joueur for joueur in self.joueurs.keys() if self.joueurs[joueur].get_ready() or self.joueurs[joueur].get_ia()])
-
-            # Lorsque tous les joueurs sont prêts
-            if len(self.joueurs.keys()) > 0 and self.nb_joueurs_prets == len(self.joueurs.keys()):
-                # On finalise la création des joueurs avant que le jeu commence
-                if self.etat == "minigame_load":
-                    self.load_game()
-
-                # Calcule le classement final
-                if self.etat == "minigame_end":
-                    # Réinitialisation de la caméra
-                    self.camera_pos = [0, 0]
-                    self.camera_speed = 10
-
-                    # On positionne tous les joueurs après la ligne d'arrivée
-                    for joueur in self.joueurs.values():
-                        joueur.set_pos([2851, joueur.get_pos()[1]])     # (2851 = taille du background - taille de l'écran + 230)
-
-                # Si on a fini le mini-jeu, on stoppe ce serveur
-                if self.etat == "minigame_winners":
-                    self.is_running = False
-
-                # Sinon on passe à l'état suivant
-                else:
-                    self.changer_etat(self.etats[self.etats.index(self.etat) + 1])
-
-                if self.etat == "minigame_during":
-                    # Changement de la vitesse de la caméra
-                    self.camera_speed = 1
-
-            # Calcul des frames pour la vitesse d'animation des personnages
-            if self.etat != "minigame_load" and self.etat != "minigame_select":
-                for joueur in self.joueurs.keys():
-                    frame = self.joueurs[joueur].get_frame() + 0.18
-
-                    # N'a pas d'animation s'il ne dessine pas
-                    if self.joueurs[joueur].get_is_drawing():
-                        # L'animation reste figée si le joueur est immobile
-                        if self.inputs_joueurs[joueur][0] == 0 and self.inputs_joueurs[joueur][1] == 0: frame = 0
-                    else:
-                        frame = 0
+        # Lorsque tous les joueurs sont prêts (nb_joueurs_prets est tenu à jour par marquer_pret et changer_etat)
+        if self.tous_prets():
+            # On finalise la création des joueurs avant que le jeu commence
+            if self.etat == "minigame_load":
+                self.load_game()
 
-                    self.joueurs[joueur].set_frame(frame)
+            # Calcule le classement final
+            if self.etat == "minigame_end":
+                # Réinitialisation de la caméra
+                self.camera_pos = [0, 0]
+                self.camera_speed = 10
 
-                    # Calcul de la physique des joueurs
-                    self.joueurs[joueur].calculer_velocite(self.inputs_joueurs[joueur])
-                    self.joueurs[joueur].calculer_collisions(self.objets)
-                    self.joueurs[joueur].appliquer_velocite(self.camera_speed)
+                # On positionne tous les joueurs après la ligne d'arrivée
+                for joueur in self.joueurs.values():
+                    joueur.set_pos([2851, joueur.get_pos()[1]])     # (2851 = taille du background - taille de l'écran + 230)
 
-                # On met à jour la position de tous les colliders qui suivent la caméra
-                for collider in self.colliders:
-                    if collider.get_following_camera():
-                        collider.update_positions(self.camera_speed)
+            # Si on a fini le mini-jeu, on stoppe ce serveur
+            if self.etat == "minigame_winners":
+                self.is_running = False
 
-                # Mouvement de la caméra
-                self.camera_pos[0] += self.camera_speed
+            # Sinon on passe à l'état suivant
+            else:
+                self.changer_etat(self.etats[self.etats.index(self.etat) + 1])
 
-            # Exécution du code qui gère le mini-jeu
             if self.etat == "minigame_during":
+                # Changement de la vitesse de la caméra
+                self.camera_speed = 1
+
+
+    def maj_physique(self) -> None:
+        """
+        Cette méthode permet de calculer les animations et la physique des entités du mini-jeu.
+        """
+
+        # Calcul des frames pour la vitesse d'animation des personnages
+        for joueur in self.joueurs.keys():
+            frame = self.joueurs[joueur].get_frame() + 0.18
+
+            # N'a pas d'animation s'il ne dessine pas
+            if self.joueurs[joueur].get_is_drawing():
+                # L'animation reste figée si le joueur est immobile
+                if self.inputs_joueurs[joueur][0] == 0 and self.inputs_joueurs[joueur][1] == 0: frame = 0
+            else:
+                frame = 0
+
+            self.joueurs[joueur].set_frame(frame)
+
+            # Calcul de la physique des joueurs
+            self.joueurs[joueur].calculer_velocite(self.inputs_joueurs[joueur])
+            self.joueurs[joueur].calculer_collisions(self.objets)
+            self.joueurs[joueur].appliquer_velocite(self.camera_speed)
+
+        # On met à jour la position de tous les colliders qui suivent la caméra
+        for collider in self.colliders:
+            if collider.get_following_camera():
+                collider.update_positions(self.camera_speed)
+
+        # Mouvement de la caméra
+        self.camera_pos[0] += self.camera_speed
+
+
+    def tick(self) -> None:
+        """
+        Cette méthode permet d'exécuter un tick du serveur, chaque phase étant mesurée par le profiler.
+        """
+
+        with self.profiler.mesure("etats"):
+            self.maj_etats()
+
+        if self.etat != "minigame_load" and self.etat != "minigame_select":
+            with self.profiler.mesure("physique"):
+                self.maj_physique()
+
+        # Exécution du code qui gère le mini-jeu (le comportement des ia et la physique qu'il calcule sont
+        # mesurés à part, dans leurs propres phases)
+        if self.etat == "minigame_during":
+            with self.profiler.mesure("logique"):
                 self.during_game()
 
-            if self.etat == "minigame_score":
-                self.calculate_score()
+        if self.etat == "minigame_score":
+            self.calculate_score()
+
+        # L'état du tick est encodé une seule fois, quel que soit le nombre de clients
+        with self.profiler.mesure("serialisation"):
+            self.publier_snapshot()
+
+
+    def publier_snapshot(self) -> None:
+        """
+        Cette méthode encode l'état du mini-jeu et remplace d'un coup celui envoyé aux clients
+        (la chaîne précédente n'est jamais modifiée, les threads des clients peuvent donc l'envoyer sans verrou).
+        """
+
+        self.snapshot = json.dumps(self.get_infos())
+
+
+    def get_snapshot(self) -> str:
+        """
+        Cette méthode permet de récupérer le dernier état encodé du mini-jeu.
+
+        Renvois:
+            - str: État du mini-jeu en json (encodé immédiatement si aucun tick n'a encore été exécuté).
+        """
+
+        snapshot = self.snapshot
+
+        if snapshot is None:
+            snapshot = json.dumps(self.get_infos())
+
+        return snapshot
+
+
+    def run(self, clock) -> None:
+        self.is_running = True
+
+        if not self.silencieux:
+            print("Lancement du mini-jeu: Trace Race")
+        while self.is_running:
+            # Pendant le choix et le chargement du mini-jeu rien ne bouge, on attend donc que les joueurs soient prêts
+            if self.etat == "minigame_select" or self.etat == "minigame_load":
+                with self.condition:
+                    self.condition.wait_for(self.tous_prets, timeout=1)
+
+            self.profiler.debut_tick()
+            self.tick()
+            self.profiler.fin_tick()
 
             self.current_fps = clock.get_fps()
             clock.tick(self.fps)
\ No newline at end of file
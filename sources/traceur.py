@@ -0,0 +1,216 @@
+#Projet : Mayro Party
+#Auteurs : Hinata Bouaziz, Antoine Desrues, Alexandre Guillaume, Matisse Moreau
+
+# ------/ Importations des bibliothèques \------
+
+import os
+import sys
+import json
+import time
+import atexit
+import threading
+from collections import deque
+from multiprocessing import parent_process
+
+# ------/ Constantes \------
+
+# Fichier de la trace (--trace=<fichier>), None si le traçage est désactivé
+FICHIER_TRACE = next((argument[len("--trace="):] for argument in sys.argv if argument.startswith("--trace=")), None)
+
+# Nombre maximum d'événements gardés (les plus anciens sont oubliés, une session de jeu en produit beaucoup)
+NB_EVENEMENTS = 200000
+
+# ------/ Classes \------
+
+# Classe d'une mesure de la trace en cours (utilisable avec with)
+class _Intervalle:
+    def __init__(self, traceur: "Traceur", nom: str, categorie: str, args: "dict | None") -> None:
+        self.traceur = traceur
+        self.nom = nom
+        self.categorie = categorie
+        self.args = args
+        self.debut = 0.0
+
+    def __enter__(self) -> None:
+        self.debut = time.perf_counter()
+
+    def __exit__(self, *args) -> bool:
+        self.traceur.ajouter(self.nom, self.categorie, self.debut, time.perf_counter(), self.args)
+        return False
+
+
+# Classe d'une mesure vide (traçage désactivé)
+class _IntervalleVide:
+    def __enter__(self) -> None:
+        return None
+
+    def __exit__(self, *args) -> bool:
+        return False
+
+
+# Instance unique partagée par tous les appels quand le traçage est désactivé
+_INTERVALLE_VIDE = _IntervalleVide()
+
+
+# Classe qui enregistre une chronologie des frames du client et des ticks du serveur (format Chrome trace-event)
+class Traceur:
+
+    # ------/ Constructeur \------
+
+    def __init__(self, fichier: "str | None" = None) -> None:
+        """
+        Constructeur de la classe Traceur.
+
+        Attributs à définir:
+            - fichier (str ou None): Fichier où la trace est écrite (None pour désactiver le traçage).
+
+        Attributs internes:
+            - actif (bool): Indique si les intervalles sont enregistrés.
+            - nom_processus (str): Nom du processus affiché par le lecteur de trace.
+            - evenements (deque): Nom, catégorie, début, durée (en secondes), thread et arguments de chaque intervalle.
+            - noms_threads (dict): Nom de chaque thread qui a enregistré un intervalle.
+        """
+
+        self.fichier = fichier
+        self.actif = fichier is not None
+        self.nom_processus = os.path.basename(sys.argv[0]) if len(sys.argv) > 0 else "python"
+
+        self.evenements = deque(maxlen=NB_EVENEMENTS)
+        self.noms_threads = {}
+
+
+    # ------/ Getters \------
+
+    def get_actif(self) -> bool:
+        return self.actif
+
+    def get_evenements(self) -> deque:
+        return self.evenements
+
+
+    # ------/ Setters \------
+
+    def set_nom_processus(self, new_nom_processus: str) -> None:
+        self.nom_processus = new_nom_processus
+
+
+    # ------/ Méthodes \------
+
+    def intervalle(self, nom: str, categorie: str = "client", args: "dict | None" = None) -> "_Intervalle | _IntervalleVide":
+        """
+        Cette méthode permet d'enregistrer un intervalle nommé avec un bloc with.
+
+        Paramètres:
+            - nom (str): Nom de l'intervalle (frame, net.send, tick...).
+            - categorie (str): Catégorie de l'intervalle (client, nom du serveur...).
+            - args (dict ou None): Informations affichées avec l'intervalle.
+
+        Renvois:
+            - _Intervalle ou _IntervalleVide: Objet à utiliser avec with (vide si le traçage est désactivé).
+        """
+
+        if not self.actif:
+            return _INTERVALLE_VIDE
+
+        return _Intervalle(self, nom, categorie, args)
+
+
+    def ajouter(self, nom: str, categorie: str, debut: float, fin: float, args: "dict | None" = None) -> None:
+        """
+        Cette méthode ajoute un intervalle déjà mesuré (depuis n'importe quel thread).
+
+        Paramètres:
+            - nom (str): Nom de l'intervalle.
+            - categorie (str): Catégorie de l'intervalle.
+            - debut (float): Début (time.perf_counter, commun à tous les processus de la machine).
+            - fin (float): Fin de l'intervalle.
+            - args (dict ou None): Informations affichées avec l'intervalle.
+        """
+
+        if not self.actif:
+            return
+
+        thread = threading.get_ident()
+        if not thread in self.noms_threads:
+            self.noms_threads[thread] = threading.current_thread().name
+
+        # deque.append est atomique: les threads du serveur peuvent ajouter sans verrou
+        self.evenements.append((nom, categorie, debut, fin - debut, thread, args))
+
+
+    def chemin_export(self) -> str:
+        """
+        Cette méthode donne le fichier de la trace de ce processus (les processus enfants, qui ont les mêmes
+        arguments, écrivent à côté du fichier demandé).
+
+        Renvois:
+            - str: Chemin du fichier.
+        """
+
+        if parent_process() is None:
+            return self.fichier
+
+        racine, extension = os.path.splitext(self.fichier)
+        return racine + "." + str(os.getpid()) + (extension or ".json")
+
+
+    def exporter(self) -> "str | None":
+        """
+        Cette méthode écrit la trace au format Chrome trace-event (à ouvrir avec chrome://tracing ou ui.perfetto.dev).
+
+        Renvois:
+            - str ou None: Fichier écrit, ou None si le traçage est désactivé.
+        """
+
+        if not self.actif:
+            return None
+
+        pid = os.getpid()
+        evenements = [{"name": "process_name", "ph": "M", "pid": pid, "tid": 0, "args": {"name": self.nom_processus}}]
+        evenements += [{"name": "thread_name", "ph": "M", "pid": pid, "tid": thread, "args": {"name": nom}} for thread, nom in list(self.noms_threads.items())]
+
+        # Horodatages en microsecondes, comme l'attend le format
+        for nom, categorie, debut, duree, thread, args in list(self.evenements):
+            evenement = {"name": nom, "cat": categorie, "ph": "X", "ts": round(debut * 1e6, 1), "dur": round(duree * 1e6, 1), "pid": pid, "tid": thread}
+            if args is not None:
+                evenement["args"] = args
+            evenements.append(evenement)
+
+        chemin = self.chemin_export()
+        with open(chemin, "w") as sortie:
+            json.dump({"traceEvents": evenements, "displayTimeUnit": "ms"}, sortie)
+
+        print("Trace écrite dans " + chemin + " (" + str(len(self.evenements)) + " intervalles)")
+
+        return chemin
+
+
+# ------/ Fonctions utiliatires \------
+
+def fusionner(fichiers: list, sortie: str) -> None:
+    """
+    Cette fonction réunit les traces de plusieurs processus (client, serveur, simulations) en une seule.
+
+    Paramètres:
+        - fichiers (list): Fichiers de trace à réunir.
+        - sortie (str): Fichier de la trace complète.
+    """
+
+    evenements = []
+    for fichier in fichiers:
+        with open(fichier) as entree:
+            evenements += json.load(entree)["traceEvents"]
+
+    with open(sortie, "w") as fichier_sortie:
+        json.dump({"traceEvents": evenements, "displayTimeUnit": "ms"}, fichier_sortie)
+
+
+# Traceur du processus (activé avec --trace=<fichier>), la trace est écrite à la fin du programme
+TRACEUR = Traceur(FICHIER_TRACE)
+atexit.register(TRACEUR.exporter)
+
+
+if '__main__' == __name__:
+    # Utilisation: python traceur.py <sortie.json> <trace1.json> <trace2.json>... (réunit les traces de plusieurs processus)
+    assert len(sys.argv) > 2, "Erreur: Utilisation: python traceur.py <sortie.json> <trace1.json> <trace2.json>..."
+    fusionner(sys.argv[2:], sys.argv[1])
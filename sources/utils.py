@@ -5,6 +5,24 @@
 
 import pygame
 import socket
+import json
+import time
+from collections import deque
+from multiprocessing import get_context
+
+from hud import HUD
+from traceur import TRACEUR
+from protocole import requete, nom_requete, envoyer_message, recevoir_message, INFOS_SERVEUR, INPUTS, EMPREINTE
+from lockstep import PairLockstep
+
+# ------/ Constantes \------
+
+# Nombre de temps de réponse gardés par le réseau (pour le HUD)
+NB_RTTS = 240
+
+# Taille de l'image rendue par le jeu (celle pour laquelle les images et les positions ont été prévues),
+# agrandie d'un coup à la taille de la fenêtre
+TAILLE_RENDU = (1280, 720)
 
 # ------/ Fonctions utiliatires \------
 
@@ -35,23 +53,98 @@ def scale_image_by(image: pygame.Surface, taille: "int | float | tuple") -> pyga
         # On fait les modifications nécessaires si on renvoie une liste de deux tailles différentes
         return pygame.transform.scale(image, (round(image.get_rect().w * taille[0]), round(image.get_rect().h * taille[1])))
 
+
+def creer_rendu() -> pygame.Surface: # type: ignore
+    """
+    Cette fonction permet de créer l'image dans laquelle le jeu dessine chaque frame (à la place de la fenêtre).
+
+    Renvois:
+        - pygame.Surface: Image de taille TAILLE_RENDU, au format de la fenêtre (pour que l'agrandissement soit rapide).
+    """
+
+    rendu = pygame.Surface(TAILLE_RENDU)
+
+    return rendu.convert() if pygame.display.get_surface() is not None else rendu
+
+
+def presenter(rendu: pygame.Surface) -> None: # type: ignore
+    """
+    Cette fonction permet d'afficher une frame: l'image de rendu est agrandie une seule fois à la taille de la fenêtre.
+
+    Paramètres:
+        - rendu (pygame.Surface): Image de rendu (voir creer_rendu).
+    """
+
+    # Le HUD de performances (F3) est dessiné par-dessus la frame
+    HUD.afficher(rendu)
+
+    debut = time.perf_counter()
+    fenetre = pygame.display.get_surface()
+
+    # Fenêtre à la taille native: une simple copie
+    if fenetre.get_size() == rendu.get_size():
+        fenetre.blit(rendu, (0, 0))
+
+    # Sinon l'image est agrandie directement dans la fenêtre (sans créer de nouvelle image à chaque frame)
+    else:
+        pygame.transform.scale(rendu, fenetre.get_size(), fenetre)
+
+    pygame.display.flip()
+
+    HUD.fin_frame(time.perf_counter() - debut)
+
+
+def position_souris() -> tuple:
+    """
+    Cette fonction permet de récupérer la position de la souris dans l'image de rendu.
+
+    Renvois:
+        - tuple: Position de la souris ramenée à TAILLE_RENDU (la fenêtre peut avoir n'importe quelle taille).
+    """
+
+    x, y = pygame.mouse.get_pos()
+    largeur, hauteur = pygame.display.get_surface().get_size()
+
+    return (x * TAILLE_RENDU[0] // largeur, y * TAILLE_RENDU[1] // hauteur)
+
 # ------/ Classes utiliatires \------
 
-# Classe du réseau
-class Network:
+# Classe du transport par socket (parties en multijoueur)
+class TransportSocket:
     def __init__(self, adresse_serveur: str, pseudo: str):
         """
-        Constructeur de la classe Network.
+        Constructeur de la classe TransportSocket.
+
+        Attributs à définir:
+            - adresse_serveur (str): Adresse ip du serveur, suivie si besoin de son port ("192.168.1.1:5556", pour
+            passer par proxy_reseau.py).
+            - pseudo (str): Pseudo du joueur.
         """
 
 
         self.client = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
         self.adresse_serveur = adresse_serveur
         self.port = 5555
+
+        # Port précisé après l'adresse (serveur sur un autre port, ou proxy_reseau.py)
+        if adresse_serveur.count(":") == 1:
+            self.adresse_serveur, port = adresse_serveur.split(":")
+            self.port = int(port)
+
         self.serveur = (self.adresse_serveur, self.port)
         self.adresse_client = self.connect()
-        self.client.send(str.encode(pseudo))
-        print("Connecté au serveur !")
+
+        # Le serveur refuse la connexion s'il est plein ou si la partie a déjà commencé
+        if self.adresse_client == "refuse":
+            self.client.close()
+            print("Connexion refusée par le serveur")
+        else:
+            envoyer_message(self.client, pseudo)
+            print("Connecté au serveur !")
+
+
+    def get_adresse_client(self) -> str:
+        return self.adresse_client
 
 
     def connect(self) -> str:
@@ -61,7 +154,10 @@ class Network:
 
         # On se connecte en attendant une réponse du serveur
         self.client.connect(self.serveur)
-        return self.client.recv(2048).decode()
+        adresse = recevoir_message(self.client)
+
+        # Connexion coupée par le serveur avant de recevoir l'adresse
+        return "refuse" if adresse is None else adresse
 
 
     def send(self, data: str) -> str:
@@ -70,8 +166,233 @@ class Network:
         """
 
         try:
-            self.client.send(str.encode(data))
-            reply = self.client.recv(2048).decode()
-            return reply
+            envoyer_message(self.client, data)
+            reply = recevoir_message(self.client)
+            return "" if reply is None else reply
         except socket.error as e:
             return str(e)
+
+
+# Classe du transport local (mode solo: le serveur tourne dans le même processus que le client)
+class TransportLocal:
+    def __init__(self, serveur, pseudo: str):
+        """
+        Constructeur de la classe TransportLocal.
+
+        Attributs à définir:
+            - serveur (Server): Serveur du lobby lancé dans ce processus.
+            - pseudo (str): Pseudo du joueur.
+
+        Attributs internes:
+            - adresse_client (str): Adresse attribuée par le serveur ("refuse" s'il n'y a plus de place).
+        """
+
+        self.serveur = serveur
+
+        # Même contrôle d'admission que pour une connexion par socket
+        adresse = self.serveur.admettre()
+        self.adresse_client = "refuse" if adresse is None else adresse
+
+        if adresse is not None:
+            self.serveur.connecter(adresse, pseudo)
+
+
+    def get_adresse_client(self) -> str:
+        return self.adresse_client
+
+
+    def send(self, data: str) -> str:
+        """
+        Cette fonction permet d'envoyer des requêtes au serveur en appelant directement son traitement
+        (aucun socket, aucun encodage en octets et aucune limite de taille pour la réponse).
+        """
+
+        reply = self.serveur.traiter_requete(self.adresse_client, data)
+
+        # Le client se déconnecte
+        if reply == "closing":
+            self.serveur.deconnecter(self.adresse_client)
+
+        return reply
+
+
+# Classe du transport vers un processus enfant (mode solo avec la simulation dans un autre processus)
+class TransportProcessus:
+    def __init__(self, cible: "function", pseudo: str):
+        """
+        Constructeur de la classe TransportProcessus.
+
+        Attributs à définir:
+            - cible (function): Fonction lancée dans le processus enfant, elle reçoit l'extrémité du pipe et le pseudo
+            (server.servir_processus).
+            - pseudo (str): Pseudo du joueur.
+
+        Attributs internes:
+            - connexion (Connection): Extrémité du pipe côté client.
+            - processus (Process): Processus qui fait tourner le lobby et les mini-jeux.
+            - adresse_client (str): Adresse attribuée par le serveur.
+        """
+
+        # spawn plutôt que fork: le processus enfant ne doit pas hériter de la fenêtre et du son de pygame
+        contexte = get_context("spawn")
+        self.connexion, connexion_enfant = contexte.Pipe()
+
+        self.processus = contexte.Process(target=cible, args=(connexion_enfant, pseudo), daemon=True)
+        self.processus.start()
+
+        # Le processus enfant commence par envoyer l'adresse attribuée au joueur
+        self.adresse_client = self.connexion.recv()
+
+
+    def get_adresse_client(self) -> str:
+        return self.adresse_client
+
+
+    def send(self, data: str) -> str:
+        """
+        Cette fonction permet d'envoyer des requêtes au serveur du processus enfant à travers le pipe.
+        """
+
+        try:
+            self.connexion.send(data)
+            reply = self.connexion.recv()
+        except (EOFError, OSError) as e:
+            return str(e)
+
+        # Le client se déconnecte, le processus enfant s'arrête
+        if reply == "closing":
+            self.connexion.close()
+            self.processus.join(1)
+
+        return reply
+
+
+# Classe du réseau
+class Network:
+    def __init__(self, adresse_serveur: str, pseudo: str, serveur=None, processus: "function" = None):
+        """
+        Constructeur de la classe Network.
+
+        Attributs à définir:
+            - adresse_serveur (str): Adresse ip du serveur.
+            - pseudo (str): Pseudo du joueur.
+            - serveur (Server): Serveur lancé dans ce processus (mode solo), les requêtes passent alors par un
+            transport local au lieu d'un socket.
+            - processus (function): Fonction qui héberge le serveur dans un processus enfant (mode solo), les requêtes
+            passent alors par un pipe.
+
+        Attributs internes:
+            - rtts (deque): Temps de réponse (en secondes) des dernières requêtes.
+            - attente (float): Temps total passé à attendre les réponses du serveur.
+            - octets_envoyes (int): Taille totale des requêtes envoyées.
+            - octets_recus (int): Taille totale des réponses reçues.
+            - infos_serveur (dict): Dernières informations du lobby reçues.
+            - version_infos (int): Version de ces informations (-1 avant la première réponse).
+            - pair (PairLockstep ou None): Copie du mini-jeu actuel si le serveur est en lockstep.
+        """
+
+        self.adresse_serveur = adresse_serveur
+
+        if processus is not None:
+            self.transport = TransportProcessus(processus, pseudo)
+        elif serveur is not None:
+            self.transport = TransportLocal(serveur, pseudo)
+        else:
+            self.transport = TransportSocket(adresse_serveur, pseudo)
+
+        self.adresse_client = self.transport.get_adresse_client()
+
+        # Mesures affichées par le HUD de performances
+        self.rtts = deque(maxlen=NB_RTTS)
+        self.attente = 0.0
+        self.octets_envoyes = 0
+        self.octets_recus = 0
+
+        self.infos_serveur = {}
+        self.version_infos = -1
+
+        self.pair = None
+
+
+    def get_rtts(self) -> deque:
+        return self.rtts
+
+    def get_attente(self) -> float:
+        return self.attente
+
+    def get_octets(self) -> tuple:
+        return (self.octets_envoyes, self.octets_recus)
+
+
+    def send(self, data: str) -> str:
+        """
+        Cette fonction permet d'envoyer des requêtes au serveur (et mesure le temps de réponse).
+        """
+
+        debut = time.perf_counter()
+        reply = self.transport.send(data)
+        duree = time.perf_counter() - debut
+
+        self.rtts.append(duree)
+        self.attente += duree
+
+        if TRACEUR.get_actif():
+            TRACEUR.ajouter("net.send", "client", debut, debut + duree, {"requete": nom_requete(data), "octets_recus": len(reply)})
+
+        # Requêtes et réponses sont en ascii (à part les pseudos): un caractère par octet
+        self.octets_envoyes += len(data)
+        self.octets_recus += len(reply)
+
+        return reply
+
+
+    def get_infos_serveur(self) -> dict:
+        """
+        Cette fonction permet d'obtenir les informations du lobby. Le serveur ne les renvoie (et le client ne les
+        décode) que si elles ont changé depuis la dernière version reçue.
+
+        Renvois:
+            - dict: Informations du lobby (nombre de joueurs, joueurs prêts, joueurs, mini-jeu actuel et classement).
+        """
+
+        reponse = self.send(requete(INFOS_SERVEUR, str(self.version_infos)))
+
+        if reponse != "inchange":
+            with HUD.mesure("decodage"):
+                self.infos_serveur = json.loads(reponse)
+            self.version_infos = self.infos_serveur["version"]
+
+        return self.infos_serveur
+
+
+    def etat_minijeu(self, inputs: str) -> dict:
+        """
+        Cette fonction permet d'envoyer les inputs du joueur et d'obtenir l'état du mini-jeu. En lockstep, le serveur
+        ne renvoie que les événements des joueurs: l'état vient alors de la copie du mini-jeu simulée ici.
+
+        Paramètres:
+            - inputs (str): Inputs du joueur séparés par des "|" (exemple: 1|0|1).
+        Renvois:
+            - dict: État du mini-jeu (joueurs, entités, classement...).
+        """
+
+        reponse = self.send(requete(INPUTS, inputs))
+
+        with HUD.mesure("decodage"):
+            infos = json.loads(reponse)
+
+            # La première réponse d'un mini-jeu en lockstep donne sa graine et ses joueurs
+            if "init" in infos:
+                self.pair = PairLockstep(infos["init"])
+
+            if "t" in infos:
+                infos = self.pair.avancer(infos["t"], infos["e"])
+
+        # L'empreinte de l'état est comparée à celle du serveur (une fois par seconde de jeu)
+        if self.pair is not None:
+            for tick, valeur in self.pair.prendre_empreintes():
+                if self.send(requete(EMPREINTE, str(tick) + "|" + valeur)) == "desynchronise" and not self.pair.get_desynchronise():
+                    self.pair.set_desynchronise(True)
+                    print("Désynchronisation avec le serveur au tick " + str(tick))
+
+        return infos
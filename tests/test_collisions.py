@@ -0,0 +1,148 @@
+#Projet : Mayro Party
+#Auteurs : Hinata Bouaziz, Antoine Desrues, Alexandre Guillaume, Matisse Moreau
+
+# Tests des collisions continues (python -m pytest tests, depuis la racine du projet)
+
+# ------/ Importations des bibliothèques \------
+
+import os
+import sys
+import random
+import unittest
+
+# Les scripts du jeu utilisent des chemins relatifs au dossier sources
+DOSSIER_SOURCES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "sources")
+os.chdir(DOSSIER_SOURCES)
+sys.path.insert(0, DOSSIER_SOURCES)
+
+import speed_hockey_server
+import archer_ival_server
+
+# ------/ Constantes \------
+
+# Fréquences de tick des serveurs auxquelles les objets rapides ne doivent rien traverser (les déplacements par
+# tick sont alors 3, 2 ou 1 fois plus grands qu'à 60 ticks par seconde)
+FREQUENCES = (20, 30, 60)
+
+# Tirs aléatoires essayés à chaque fréquence
+NB_TIRS = 300
+GRAINE = 1
+
+# ------/ Fonctions utiliatires \------
+
+def chevauchement_trajet(rect: list, deplacement: list, obstacle) -> bool:
+    """
+    Cette fonction indique si un rectangle chevauche un obstacle pendant un déplacement, en le vérifiant à de
+    nombreuses positions intermédiaires (indépendamment de la collision continue des serveurs).
+
+    Paramètres:
+        - rect (list): Position et taille du rectangle au début du déplacement (x, y, largeur, hauteur).
+        - deplacement (list): Déplacement effectué.
+        - obstacle (Rect): Boîte de collision de l'obstacle.
+    Renvois:
+        - bool: True si le rectangle est entré dans l'obstacle, sinon False.
+    """
+
+    x, y, w, h = rect
+    for etape in range(65):
+        position_x = x + deplacement[0] * etape / 64
+        position_y = y + deplacement[1] * etape / 64
+
+        if position_x < obstacle.x + obstacle.w and obstacle.x < position_x + w and position_y < obstacle.y + obstacle.h and obstacle.y < position_y + h:
+            return True
+
+    return False
+
+# ------/ Tests \------
+
+class TestCarapaceCoin(unittest.TestCase):
+    def lancer(self, murs: list) -> speed_hockey_server.Carapace:
+        # Carapace de 66 pixels en (0, 0) qui part en diagonale vers le bas à droite
+        carapace = speed_hockey_server.Carapace(horloge=lambda: 0)
+        carapace.set_pos([0, 0])
+        carapace.set_direction([1, 1])
+        carapace.velocity = [20, 20]
+
+        carapace.calculer_collisions([carapace] + murs)
+
+        return carapace
+
+
+    def test_coin_sur_les_deux_axes(self) -> None:
+        # Un mur à droite et un mur en bas, chacun touché sur son axe
+        carapace = self.lancer([speed_hockey_server.Collider([76, 0], [30, 300]), speed_hockey_server.Collider([0, 71], [300, 30])])
+
+        self.assertEqual(carapace.get_direction(), [-1, -1])
+        self.assertEqual(carapace.velocity, [9, 4])
+
+
+    def test_coin_en_diagonale(self) -> None:
+        # Les deux murs ne sont touchés qu'en diagonale: celui de droite au moment 0.6 par le haut (axe y), celui du
+        # bas au moment 0.7 par la gauche (axe x). Seul le premier fait rebondir la carapace, dans les deux ordres
+        droite = speed_hockey_server.Collider([70, 78], [30, 300])
+        bas = speed_hockey_server.Collider([80, 72], [300, 30])
+
+        for murs in ([droite, bas], [bas, droite]):
+            carapace = self.lancer(murs)
+
+            self.assertEqual(carapace.get_direction(), [1, -1])
+            self.assertEqual(carapace.velocity[0], 20)
+            self.assertAlmostEqual(carapace.velocity[1], 11)
+
+
+class TestTraversees(unittest.TestCase):
+    def test_carapace(self) -> None:
+        for frequence in FREQUENCES:
+            with self.subTest(frequence=frequence):
+                rng = random.Random(GRAINE)
+                pas = 60 / frequence
+
+                for tir in range(NB_TIRS):
+                    # Carapace lancée vers un joueur, des vitesses du début de partie jusqu'aux plus rapides observées
+                    joueur = speed_hockey_server.Collider([600, 300], [69, 59])
+                    carapace = speed_hockey_server.Carapace(horloge=lambda: 0.0)
+
+                    vitesse = rng.uniform(12, 150) * pas
+                    direction = list(rng.choice(([1, 0], [1, 0.5], [1, 1], [0.5, 1])))
+                    distance = rng.uniform(1, 300)
+                    carapace.set_pos([600 - 66 - distance, rng.uniform(300 - 65, 300 + 58) - distance * direction[1] / direction[0]])
+                    carapace.set_direction(direction)
+
+                    for tick in range(20):
+                        carapace.speed = vitesse
+                        carapace.calculer_velocite()
+                        carapace.calculer_collisions([joueur])
+
+                        debut = [round(carapace.get_pos()[0]), round(carapace.get_pos()[1]), 66, 66]
+                        deplacement = list(carapace.velocity)
+                        carapace.appliquer_velocite()
+
+                        self.assertFalse(chevauchement_trajet(debut, deplacement, joueur.get_collisions()[0]), "tir " + str(tir) + ", tick " + str(tick))
+
+
+    def test_fleche(self) -> None:
+        for frequence in FREQUENCES:
+            with self.subTest(frequence=frequence):
+                rng = random.Random(GRAINE)
+                pas = 60 / frequence
+
+                for tir in range(NB_TIRS):
+                    # Flèche tirée vers un ennemi, qu'elle doit toucher avant de le dépasser
+                    ennemi = archer_ival_server.Ennemi()
+                    ennemi.set_pos([rng.uniform(300, 900), 300])
+                    ennemi.collision.x, ennemi.collision.y = round(ennemi.get_pos()[0]), 300
+
+                    fleche = archer_ival_server.Fleche([round(ennemi.get_pos()[0] + rng.uniform(-19, 63)), round(300 + 124 - 46 + rng.uniform(1, 200))], 0)
+                    fleche.speed = rng.uniform(5, 100) * pas
+
+                    touche = False
+                    while not touche and fleche.get_pos()[1] + 46 > 300 - 46:
+                        fleche.calculer_velocite([0, -1])
+                        touche = fleche.calculer_collisions([ennemi])
+                        fleche.appliquer_velocite()
+
+                    self.assertTrue(touche, "tir " + str(tir))
+
+
+if '__main__' == __name__:
+    unittest.main()
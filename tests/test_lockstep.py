@@ -0,0 +1,55 @@
+#Projet : Mayro Party
+#Auteurs : Hinata Bouaziz, Antoine Desrues, Alexandre Guillaume, Matisse Moreau
+
+# Tests du mode lockstep (python -m pytest tests, depuis la racine du projet)
+
+# ------/ Importations des bibliothèques \------
+
+import os
+import sys
+import json
+import unittest
+
+# Les scripts du jeu utilisent des chemins relatifs au dossier sources
+DOSSIER_SOURCES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "sources")
+os.chdir(DOSSIER_SOURCES)
+sys.path.insert(0, DOSSIER_SOURCES)
+
+import lockstep
+
+# ------/ Tests \------
+
+class TestJournal(unittest.TestCase):
+    def setUp(self) -> None:
+        self.minijeu = lockstep.MinijeuLockstep("trace_race", graine=1)
+
+        for address, perso, ia in (("1", "mayro", False), ("2", "lugi", False), ("ai1", "wayro", True), ("ai2", "walugi", True)):
+            self.minijeu.add_player(address, perso, ia)
+
+
+    def inputs(self, address: str, donnees: str) -> list:
+        return json.loads(self.minijeu.requete_inputs(address, donnees))["e"]
+
+
+    def test_elagage(self) -> None:
+        self.inputs("1", "1|0")
+        self.minijeu.tick()
+
+        # Le joueur 2 n'a encore rien reçu: le journal est gardé en entier
+        self.assertEqual(len(self.minijeu.journal), 1)
+        self.assertEqual(self.inputs("2", "0|1"), [[0, ["i", "1", [1, 0]]]])
+        self.minijeu.tick()
+
+        # Le premier événement a été envoyé aux deux joueurs, seul le second reste
+        self.assertEqual(self.inputs("1", "1|0"), [[0, ["i", "1", [1, 0]]], [1, ["i", "2", [0, 1]]]])
+        self.assertEqual(self.minijeu.journal, [[1, ["i", "2", [0, 1]]]])
+        self.assertEqual(self.minijeu.curseurs, {"1": 1, "2": 0})
+
+        # Le joueur 2 reçoit toujours ce qui lui manque
+        self.assertEqual(self.inputs("2", "0|1"), [[1, ["i", "2", [0, 1]]]])
+        self.assertEqual(self.minijeu.journal, [])
+        self.assertEqual(self.minijeu.curseurs, {"1": 0, "2": 0})
+
+
+if '__main__' == __name__:
+    unittest.main()
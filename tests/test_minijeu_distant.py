@@ -0,0 +1,66 @@
+#Projet : Mayro Party
+#Auteurs : Hinata Bouaziz, Antoine Desrues, Alexandre Guillaume, Matisse Moreau
+
+# Tests du tampon des états entre la simulation et le lobby (python -m pytest tests, depuis la racine du projet)
+
+# ------/ Importations des bibliothèques \------
+
+import os
+import sys
+import json
+import marshal
+import threading
+import unittest
+from multiprocessing import Pipe
+
+# Les scripts du jeu utilisent des chemins relatifs au dossier sources
+DOSSIER_SOURCES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "sources")
+os.chdir(DOSSIER_SOURCES)
+sys.path.insert(0, DOSSIER_SOURCES)
+
+import minijeu_distant
+from anneau import AnneauPartage
+
+# ------/ Tests \------
+
+class TestEtatsVolumineux(unittest.TestCase):
+    def setUp(self) -> None:
+        self.anneau = AnneauPartage(64, 4)
+
+
+    def tearDown(self) -> None:
+        self.anneau.fermer()
+
+
+    def test_enregistrement_trop_grand(self) -> None:
+        self.anneau.ecrire(b"a" * 64)
+
+        # Refusé sans rien écraser, même avec python -O
+        self.assertEqual(self.anneau.ecrire(b"b" * 65), 0)
+        self.assertEqual(self.anneau.get_nb_ecrits(), 1)
+        self.assertEqual(self.anneau.lire(1), b"a" * 64)
+        self.assertIsNone(self.anneau.lire(2))
+
+
+    def test_infos_par_le_pipe(self) -> None:
+        # Etat publié sans ses infos, comme le fait la simulation quand elles ne tiennent pas dans un emplacement
+        minijeu = minijeu_distant.MinijeuDistant("pushy_penguins")
+        minijeu.etats = self.anneau
+        minijeu.commandes, commandes_simulation = Pipe()
+        self.anneau.ecrire(marshal.dumps(("minigame_during", 2, 60.0, None)))
+
+        infos = {"pingouins": [[i, i] for i in range(1000)]}
+
+        def simulation() -> None:
+            message = commandes_simulation.recv()
+            commandes_simulation.send(infos if message == ("infos",) else None)
+
+        threading.Thread(target=simulation, daemon=True).start()
+
+        self.assertEqual(minijeu.get_etat(), "minigame_during")
+        self.assertEqual(minijeu.get_nb_joueurs_prets(), 2)
+        self.assertEqual(json.loads(minijeu.get_snapshot()), infos)
+
+
+if '__main__' == __name__:
+    unittest.main()
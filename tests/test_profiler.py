@@ -0,0 +1,71 @@
+#Projet : Mayro Party
+#Auteurs : Hinata Bouaziz, Antoine Desrues, Alexandre Guillaume, Matisse Moreau
+
+# Tests du profiler des serveurs (python -m pytest tests, depuis la racine du projet)
+
+# ------/ Importations des bibliothèques \------
+
+import os
+import sys
+import time
+import unittest
+
+# Les scripts du jeu utilisent des chemins relatifs au dossier sources
+DOSSIER_SOURCES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "sources")
+os.chdir(DOSSIER_SOURCES)
+sys.path.insert(0, DOSSIER_SOURCES)
+
+from profiler import Profiler
+
+# ------/ Tests \------
+
+class TestPhases(unittest.TestCase):
+    def test_phases_imbriquees(self) -> None:
+        profiler = Profiler("test", actif=True)
+
+        profiler.debut_tick()
+        with profiler.mesure("logique"):
+            # L'ia de chaque joueur est mesurée dans la logique du mini-jeu, mais comptée à part
+            for i in range(2):
+                with profiler.mesure("ia"):
+                    time.sleep(0.02)
+        profiler.fin_tick()
+
+        phases = profiler.rapport()["phases"]
+
+        # Une seule mesure par tick pour chaque phase (la somme des deux ia)
+        self.assertEqual(phases["ia"]["n"], 1)
+        self.assertGreaterEqual(phases["ia"]["p50"], 40)
+
+        # La logique ne compte pas le temps de l'ia
+        self.assertLess(phases["logique"]["p50"], 10)
+        self.assertGreaterEqual(phases["tick"]["p50"], 40)
+
+
+    def test_profiler_inactif(self) -> None:
+        profiler = Profiler("test", actif=False)
+
+        profiler.debut_tick()
+        with profiler.mesure("logique"):
+            pass
+        profiler.fin_tick()
+
+        # Sans profiler, les ticks ne sont pas mesurés
+        self.assertEqual(profiler.rapport()["phases"], {})
+
+
+    def test_reset_pendant_un_tick(self) -> None:
+        profiler = Profiler("test", actif=True)
+
+        profiler.debut_tick()
+        with profiler.mesure("ia"):
+            time.sleep(0.02)
+        profiler.reset()
+        profiler.fin_tick()
+
+        # La phase mesurée avant le reset ne compte pas dans les nouvelles mesures
+        self.assertNotIn("ia", profiler.rapport()["phases"])
+
+
+if '__main__' == __name__:
+    unittest.main()
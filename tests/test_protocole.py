@@ -0,0 +1,71 @@
+#Projet : Mayro Party
+#Auteurs : Hinata Bouaziz, Antoine Desrues, Alexandre Guillaume, Matisse Moreau
+
+# Tests du découpage des messages envoyés par socket (python -m pytest tests, depuis la racine du projet)
+
+# ------/ Importations des bibliothèques \------
+
+import os
+import sys
+import socket
+import threading
+import unittest
+
+# Les scripts du jeu utilisent des chemins relatifs au dossier sources
+DOSSIER_SOURCES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "sources")
+os.chdir(DOSSIER_SOURCES)
+sys.path.insert(0, DOSSIER_SOURCES)
+
+import protocole
+
+# ------/ Tests \------
+
+class TestMessages(unittest.TestCase):
+    def setUp(self) -> None:
+        self.client, self.serveur = socket.socketpair()
+
+
+    def tearDown(self) -> None:
+        self.client.close()
+        self.serveur.close()
+
+
+    def test_message_plus_grand_qu_un_recv(self) -> None:
+        # Plus grand que TAILLE_LECTURE, et envoyé depuis un autre thread pour ne pas remplir le buffer du socket
+        message = "é" * (protocole.TAILLE_LECTURE * 4)
+        envoi = threading.Thread(target=protocole.envoyer_message, args=(self.client, message))
+        envoi.start()
+
+        self.assertEqual(protocole.recevoir_message(self.serveur), message)
+        envoi.join()
+
+
+    def test_message_arrive_en_morceaux(self) -> None:
+        donnees = "ok".encode("utf-8")
+        self.client.sendall(len(donnees).to_bytes(protocole.TAILLE_ENTETE, "big")[:2])
+
+        envoi = threading.Timer(0.05, self.client.sendall, (len(donnees).to_bytes(protocole.TAILLE_ENTETE, "big")[2:] + donnees,))
+        envoi.start()
+
+        self.assertEqual(protocole.recevoir_message(self.serveur), "ok")
+        envoi.join()
+
+
+    def test_messages_successifs(self) -> None:
+        protocole.envoyer_message(self.client, "premier")
+        protocole.envoyer_message(self.client, "")
+        protocole.envoyer_message(self.client, "dernier")
+
+        self.assertEqual(protocole.recevoir_message(self.serveur), "premier")
+        self.assertEqual(protocole.recevoir_message(self.serveur), "")
+        self.assertEqual(protocole.recevoir_message(self.serveur), "dernier")
+
+
+    def test_connexion_coupee(self) -> None:
+        self.client.close()
+
+        self.assertIsNone(protocole.recevoir_message(self.serveur))
+
+
+if '__main__' == __name__:
+    unittest.main()
\ No newline at end of file
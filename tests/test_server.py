@@ -0,0 +1,93 @@
+#Projet : Mayro Party
+#Auteurs : Hinata Bouaziz, Antoine Desrues, Alexandre Guillaume, Matisse Moreau
+
+# Tests du lobby (python -m pytest tests, depuis la racine du projet)
+
+# ------/ Importations des bibliothèques \------
+
+import os
+import sys
+import json
+import time
+import threading
+import unittest
+
+# Les scripts du jeu utilisent des chemins relatifs au dossier sources
+DOSSIER_SOURCES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "sources")
+os.chdir(DOSSIER_SOURCES)
+sys.path.insert(0, DOSSIER_SOURCES)
+
+import server
+
+# ------/ Tests \------
+
+class TestFermetureAutomatique(unittest.TestCase):
+    def test_fermeture_apres_deconnexion(self) -> None:
+        # Le lobby attend sans limite tant qu'un joueur est connecté, puis doit se fermer une fois le dernier parti
+        serveur = server.Server(None)
+        serveur.delai_inactivite = 0.3
+
+        adresse = serveur.admettre()
+        serveur.connecter(adresse, "joueur")
+
+        thread = threading.Thread(target=serveur.run, daemon=True)
+        thread.start()
+        time.sleep(0.2)
+        self.assertTrue(serveur.is_running)
+
+        serveur.deconnecter(adresse)
+        thread.join(timeout=5)
+
+        self.assertFalse(thread.is_alive())
+        self.assertFalse(serveur.is_running)
+
+
+    def test_pas_de_fermeture_avec_un_joueur(self) -> None:
+        serveur = server.Server(None)
+        serveur.delai_inactivite = 0.1
+        serveur.connecter(serveur.admettre(), "joueur")
+
+        thread = threading.Thread(target=serveur.run, daemon=True)
+        thread.start()
+        time.sleep(0.4)
+
+        self.assertTrue(serveur.is_running)
+
+        # Arrêt du lobby pour ne pas laisser tourner le thread
+        serveur.fermer()
+        thread.join(timeout=5)
+
+        self.assertFalse(thread.is_alive())
+
+
+class TestVersionInfos(unittest.TestCase):
+    def test_version_des_joueurs_prets(self) -> None:
+        serveur = server.Server(None)
+        adresse = serveur.admettre()
+        serveur.connecter(adresse, "joueur")
+
+        # Mini-jeu choisi comme dans select_minijeu, sans le lancer
+        minijeu = serveur.creer_minijeu("speed_hockey")
+        serveur.minijeux["speed_hockey"] = minijeu
+        for ip in serveur.joueurs.keys():
+            minijeu.add_player(ip, serveur.joueurs[ip].get_perso(), serveur.joueurs[ip].get_ia())
+
+        with serveur.condition:
+            serveur.minijeu_actuel = "speed_hockey"
+            serveur.modifier()
+
+        # Lire les informations ne change pas leur version
+        version = serveur.get_infos_serveur()[0]
+        self.assertEqual(serveur.get_infos_serveur()[0], version)
+
+        # Un joueur prêt dans le mini-jeu en crée une nouvelle
+        minijeu.marquer_pret(adresse)
+        version_pret, infos = serveur.get_infos_serveur()
+
+        self.assertGreater(version_pret, version)
+        self.assertEqual(json.loads(infos)["nb_joueurs_prets"], 1)
+        self.assertEqual(serveur.get_infos_serveur()[0], version_pret)
+
+
+if '__main__' == __name__:
+    unittest.main()
@@ -0,0 +1,123 @@
+#Projet : Mayro Party
+#Auteurs : Hinata Bouaziz, Antoine Desrues, Alexandre Guillaume, Matisse Moreau
+
+# Tests des workers du serveur dédié (python -m pytest tests, depuis la racine du projet)
+
+# ------/ Importations des bibliothèques \------
+
+import os
+import sys
+import time
+import threading
+import unittest
+from multiprocessing import Pipe
+
+# Les scripts du jeu utilisent des chemins relatifs au dossier sources
+DOSSIER_SOURCES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "sources")
+os.chdir(DOSSIER_SOURCES)
+sys.path.insert(0, DOSSIER_SOURCES)
+
+import serveur_dedie
+
+# ------/ Tests \------
+
+class TestSessionsWorker(unittest.TestCase):
+    def setUp(self) -> None:
+        # Le worker tourne dans un thread du test (le pipe est le même qu'avec un processus)
+        self.connexion, connexion_worker = Pipe()
+        self.worker = serveur_dedie.ProcessusWorker(connexion_worker)
+        threading.Thread(target=self.worker.run, daemon=True).start()
+        self.nb_commandes = 0
+
+
+    def tearDown(self) -> None:
+        for id_session in list(self.worker.sessions.keys()):
+            self.worker.fermer(id_session)
+
+        self.connexion.close()
+
+
+    def envoyer(self, *message) -> int:
+        self.nb_commandes += 1
+        self.connexion.send((self.nb_commandes,) + message)
+
+        return self.nb_commandes
+
+
+    def commande(self, *message) -> any:
+        numero = self.envoyer(*message)
+        self.assertTrue(self.connexion.poll(5))
+        reponse = self.connexion.recv()
+        self.assertEqual(reponse[0], numero)
+
+        return reponse[1]
+
+
+    def test_fermeture_au_dernier_depart(self) -> None:
+        self.commande("ouvrir", 1)
+        adresse = self.commande("admettre", 1)
+        self.commande("connecter", 1, adresse, "joueur")
+        serveur = self.worker.sessions[1].serveur
+
+        self.commande("deconnecter", 1, adresse)
+
+        # La session est fermée dès le départ de son dernier client, même si son lobby attend encore
+        self.assertNotIn(1, self.worker.sessions)
+        self.assertFalse(serveur.is_running)
+
+        # Les commandes qui arrivent ensuite sont refusées
+        self.assertIsNone(self.commande("admettre", 1))
+        self.assertEqual(self.commande("requete", 1, adresse, "get"), "closing")
+
+
+    def test_fermeture_apres_inactivite(self) -> None:
+        self.commande("ouvrir", 1)
+        self.worker.sessions[1].serveur.delai_inactivite = 0.1
+        time.sleep(0.2)
+
+        rapport = self.commande("sante")
+
+        self.assertEqual(rapport["sessions"], 0)
+        self.assertNotIn(1, self.worker.sessions)
+
+
+    def test_sante_avant_admission(self) -> None:
+        # Un rapport de santé entre l'ouverture et le premier "admettre" ne doit pas fermer la session
+        self.commande("ouvrir", 1)
+
+        self.assertEqual(self.commande("sante")["sessions"], 1)
+        self.assertIsNotNone(self.commande("admettre", 1))
+
+
+    def test_session_lente(self) -> None:
+        for id_session in (1, 2):
+            self.commande("ouvrir", id_session)
+            self.commande("connecter", id_session, self.commande("admettre", id_session), "joueur")
+
+        # Une requête lente de la session 1 ne doit pas retarder la session 2
+        self.worker.sessions[1].serveur.traiter_requete = lambda address, request: time.sleep(1) or "lent"
+
+        self.envoyer("requete", 1, "1", "get")
+        numero = self.envoyer("requete", 2, "1", "get")
+
+        self.assertTrue(self.connexion.poll(0.5))
+        self.assertEqual(self.connexion.recv()[0], numero)
+
+
+class TestWorkerArrete(unittest.TestCase):
+    def test_worker_mort(self) -> None:
+        worker = serveur_dedie.Worker(1)
+        self.assertEqual(worker.maj_sante()["sessions"], 0)
+
+        worker.processus.kill()
+        worker.processus.join()
+
+        # Le front-end voit un worker arrêté au lieu de planter sur une réponse manquante
+        self.assertIsNone(worker.maj_sante())
+        self.assertFalse(worker.get_en_service())
+        self.assertIsNone(worker.envoyer("admettre", 1))
+        self.assertEqual(worker.get_sante()["sessions"], 0)
+
+
+if '__main__' == __name__:
+    unittest.main()
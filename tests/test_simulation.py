@@ -0,0 +1,59 @@
+#Projet : Mayro Party
+#Auteurs : Hinata Bouaziz, Antoine Desrues, Alexandre Guillaume, Matisse Moreau
+
+# Tests du déterminisme des mini-jeux simulés (python -m pytest tests, depuis la racine du projet)
+
+# ------/ Importations des bibliothèques \------
+
+import os
+import sys
+import unittest
+
+# Les scripts du jeu utilisent des chemins relatifs au dossier sources
+DOSSIER_SOURCES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "sources")
+os.chdir(DOSSIER_SOURCES)
+sys.path.insert(0, DOSSIER_SOURCES)
+
+import simulation
+
+# ------/ Constantes \------
+
+# Parties jouées à la suite pour chaque mini-jeu (la graine de chaque partie est GRAINE + son numéro)
+NB_PARTIES = 2
+GRAINE = 0
+NB_TICKS_MAX = 100000
+
+# ------/ Fonctions utiliatires \------
+
+def empreintes_finales(minijeu: str) -> list:
+    """
+    Cette fonction joue NB_PARTIES parties d'un mini-jeu à la suite, comme python simulation.py.
+
+    Paramètres:
+        - minijeu (str): Nom du mini-jeu.
+    Renvois:
+        - list: Nombre de ticks et empreinte de l'état final de chaque partie.
+    """
+
+    resultats = []
+    for partie in range(NB_PARTIES):
+        hashes = simulation.Simulation(minijeu, GRAINE + partie).executer(NB_TICKS_MAX)
+        resultats.append((len(hashes), hashes[-1]))
+
+    return resultats
+
+# ------/ Tests \------
+
+class TestDeterminisme(unittest.TestCase):
+    def test_deux_executions_identiques(self) -> None:
+        for minijeu in simulation.MINIJEUX:
+            with self.subTest(minijeu=minijeu):
+                premiere = empreintes_finales(minijeu)
+
+                # Chaque partie doit se terminer avant la limite de ticks
+                self.assertTrue(all(nb_ticks < NB_TICKS_MAX for nb_ticks, _ in premiere))
+                self.assertEqual(empreintes_finales(minijeu), premiere)
+
+
+if '__main__' == __name__:
+    unittest.main()